@@ -3,8 +3,16 @@ import time
 
 from applications.glue_dispensing_application.settings import GlueSettingKey
 from applications.glue_dispensing_application.glue_process.state_machine.GlueProcessState import GlueProcessState
-from modules.utils import files, robot_utils
-from modules.utils.custom_logging import log_debug_message
+from applications.glue_dispensing_application.glue_process.pump_trace import PumpTraceBuffer
+from modules.utils import robot_utils
+from modules.utils.custom_logging import log_debug_message, log_throttled
+
+SAMPLE_TIMEOUT = 0.1  # Longest wait for a robot monitor sample before pause/stop is checked again
+NEAR_FINAL_LOG_INTERVAL = 0.5  # s between repeats of the per-sample "close to final point" message
+CHECKPOINT_REACHED_DISTANCE = 1.0  # mm
+CHECKPOINT_LOOKAHEAD = 8  # Checkpoints ahead of the cursor tested per sample
+SPEED_DEADBAND = 100  # Pump speed change that is worth a Modbus write (~1% of the default 10000)
+MIN_WRITE_INTERVAL = 0.02  # Seconds between two Modbus speed writes
 
 # State Management Functions
 def is_point_reached(currentPos, targetPoint, threshold):
@@ -27,7 +35,7 @@ def check_robot_state(state_machine, robotService, start_point_index, furthest_c
         last_completed_point = start_point_index + furthest_checkpoint_passed - 1 if furthest_checkpoint_passed > 0 else start_point_index
         next_target_point = start_point_index + furthest_checkpoint_passed
         
-        log_debug_message(robotService.robot_service_logger_context,
+        log_debug_message(robotService.logger_context,
             message=f"Robot state changed to {current_state}, last completed point: {last_completed_point}, should resume from point {next_target_point} (furthest_checkpoint_passed={furthest_checkpoint_passed})")
         return True, next_target_point
     
@@ -41,7 +49,7 @@ def is_first_point_reached(currentPos, first_point, threshold, robotService, sta
     if not first_point_reached:
         first_point_reached = is_point_reached(currentPos, first_point, threshold)
         if first_point_reached:
-            log_debug_message(robotService.robot_service_logger_context,
+            log_debug_message(robotService.logger_context,
                 message=f"First point {start_point_index} reached, starting pump speed adjustments")
             return True, True
         else:
@@ -63,49 +71,54 @@ def is_final_point_reached(currentPos, final_point, remaining_path, furthest_che
         if len(remaining_path) >= 2:
             second_to_last_required = len(remaining_path) - 2  # Index of second-to-last point
             if furthest_checkpoint_passed > second_to_last_required:
-                log_debug_message(robotService.robot_service_logger_context,
+                log_debug_message(robotService.logger_context,
                     message=f"Final point reached and passed through second-to-last point (checkpoint {second_to_last_required}), path complete")
                 return True
             else:
-                log_debug_message(robotService.robot_service_logger_context,
-                    message=f"Close to final point but haven't passed second-to-last point yet (need checkpoint {second_to_last_required}, current: {furthest_checkpoint_passed})")
+                # Checked on every monitor sample while the robot approaches the end
+                log_throttled(robotService.logger_context, NEAR_FINAL_LOG_INTERVAL,
+                              "Close to final point but haven't passed second-to-last point yet (need checkpoint %d, current: %d)",
+                              second_to_last_required, furthest_checkpoint_passed)
         else:
-            log_debug_message(robotService.robot_service_logger_context,
+            log_debug_message(robotService.logger_context,
                 message="Final point reached (path has <2 points), path complete")
             return True
 
     return False
 
 # Checkpoint Management Functions
-def update_checkpoint_progress(currentPos, remaining_path, furthest_checkpoint_passed, start_point_index, robotService):
+def update_checkpoint_progress(currentPos, remaining_path, furthest_checkpoint_passed, start_point_index, robotService,
+                               trace=None):
     """
-    Update furthest checkpoint passed and log progress.
+    Advance the checkpoint cursor. The next CHECKPOINT_LOOKAHEAD checkpoints are tested first,
+    so a sample costs the same at the start and at the end of a long path. If none of them is
+    reached, the rest of the path is scanned and the cursor jumps to the first checkpoint the
+    robot is at, so samples that skipped a run of dense checkpoints cannot stall the cursor.
     Returns: updated furthest_checkpoint_passed value
     """
-    for i in range(furthest_checkpoint_passed, len(remaining_path)):
-        checkpoint = remaining_path[i]
-        distance_to_checkpoint = robot_utils.calculate_distance_between_points(currentPos, checkpoint)
-
-        if distance_to_checkpoint < 1:
-            log_checkpoint_reached(start_point_index + i, distance_to_checkpoint, start_point_index, i + 1)
-            # Robot has passed this checkpoint - set to the next point we should head toward
-            furthest_checkpoint_passed = i + 1  # +1 because we've passed this point, now head to next
-            log_debug_message(robotService.robot_service_logger_context,
-                message=f"Passed checkpoint {start_point_index + i}, next target will be point {start_point_index + furthest_checkpoint_passed}")
-    
-    return furthest_checkpoint_passed
+    passed = furthest_checkpoint_passed
+    window_end = min(len(remaining_path), furthest_checkpoint_passed + CHECKPOINT_LOOKAHEAD)
+    for i in range(furthest_checkpoint_passed, window_end):
+        if robot_utils.calculate_distance_between_points(currentPos, remaining_path[i]) < CHECKPOINT_REACHED_DISTANCE:
+            passed = i + 1  # +1 because we've passed this point, now head to next
+
+    if passed == furthest_checkpoint_passed:
+        for i in range(window_end, len(remaining_path)):
+            if robot_utils.calculate_distance_between_points(currentPos, remaining_path[i]) < CHECKPOINT_REACHED_DISTANCE:
+                passed = i + 1
+                break
+
+    if passed != furthest_checkpoint_passed:
+        if trace is not None:
+            trace.record("checkpoint", time.time(), start_point_index + passed - 1)
+        log_debug_message(robotService.logger_context, "Passed checkpoint %d, next target will be point %d",
+                          start_point_index + passed - 1, start_point_index + passed)
+    return passed
 
 def get_current_target_checkpoint(remaining_path, furthest_checkpoint_passed):
     """Get the current target checkpoint for robot movement"""
     return remaining_path[min(furthest_checkpoint_passed, len(remaining_path) - 1)]
 
-def log_checkpoint_reached(checkpoint_index, distance, start_point_index, furthest_checkpoint_passed):
-    """Log when a checkpoint is reached"""
-    message = f"Checkpoint {checkpoint_index} reached (distance: {distance:.3f} mm)\n"
-    files.write_to_debug_file("robot_pump_values.txt", message)
-    message = "\n"
-    files.write_to_debug_file("robot_pump_values.txt", message)
-
 # Speed Calculation Functions
 def calculate_velocity_compensation(current_velocity, glue_speed_coefficient):
     """Calculate velocity-based compensation for pump speed"""
@@ -128,16 +141,29 @@ def calculate_pump_speed_adjustments(current_velocity, current_acceleration, glu
     
     return velocity_compensation + accel_compensation, velocity_compensation, accel_compensation
 
-# Debug/Logging Functions
-def log_debug_data(robotService, current_velocity, current_acceleration, velocity_compensation, accel_compensation, adjustedPumpSpeed, last_write_time):
-    """Log comprehensive debug data to file and return updated last_write_time"""
-    current_time = time.time()
-    delta_time = current_time - last_write_time
-    
-    message = f"dt: {delta_time} Pos {robotService.get_current_position()} Vel: {float(current_velocity):.3f}, Acc: {float(current_acceleration):.3f}, Vel Com: {float(velocity_compensation):.3f}, Acc Comp {accel_compensation:.3f}, Pump speed: {float(adjustedPumpSpeed):.3f}\n"
-    files.write_to_debug_file("robot_pump_values.txt", message)
-    
-    return current_time
+class PumpSpeedWriter:
+    """Writes the pump speed over Modbus only when it moved by the deadband and the last write is old enough."""
+
+    def __init__(self, glueSprayService, motorAddress, deadband=SPEED_DEADBAND, min_interval=MIN_WRITE_INTERVAL):
+        self.glueSprayService = glueSprayService
+        self.motorAddress = motorAddress
+        self.deadband = deadband
+        self.min_interval = min_interval
+        self.last_speed = None
+        self.last_write_time = 0.0
+        self.writes = 0
+
+    def update(self, speed: int) -> bool:
+        """Returns True if the speed was written."""
+        now = time.monotonic()
+        if self.last_speed is not None and \
+                (abs(speed - self.last_speed) < self.deadband or now - self.last_write_time < self.min_interval):
+            return False
+        self.glueSprayService.adjustMotorSpeed(motorAddress=self.motorAddress, speed=speed)
+        self.last_speed = speed
+        self.last_write_time = now
+        self.writes += 1
+        return True
 
 # Configuration Class
 class PumpAdjustmentConfig:
@@ -162,7 +188,9 @@ def adjustPumpSpeedDynamically(
         execution_context=None
 ):
     """
-    Enhanced version that tracks robot progress through the entire path.
+    Tracks robot progress through the path and adapts the pump speed to the robot's motion.
+    Runs once per robot monitor sample instead of spinning; the pump is written only on
+    meaningful speed changes and the trace is buffered in memory and flushed in the background.
     Returns (success, current_point_index) for precise pause/resume handling.
     """
     print(f"adjustPumpSpeedDynamically called with start_point_index={start_point_index}")
@@ -171,71 +199,64 @@ def adjustPumpSpeedDynamically(
     # Signal ready to main thread
     if ready_event is not None:
         ready_event.set()
-        log_debug_message(robotService.robot_service_logger_context, message="Pump thread signaled ready to main thread")
-        log_debug_message(robotService.robot_service_logger_context, message="Pump thread ready - signaled to main thread")
+        log_debug_message(robotService.logger_context, message="Pump thread ready - signaled to main thread")
 
-    # Initialize variables
-    start_time = time.time()
-    last_write_time = start_time
     remaining_path = path[start_point_index:]
-    log_debug_message(robotService.robot_service_logger_context,
-        f"adjustPumpSpeedWhileRobotIsMoving2: Starting with {len(remaining_path)} points, start_index={start_point_index}")
+    log_debug_message(robotService.logger_context,
+        f"adjustPumpSpeedDynamically: Starting with {len(remaining_path)} points, start_index={start_point_index}")
 
     first_point = remaining_path[0]
     final_point = remaining_path[-1]
     furthest_checkpoint_passed = 0
     first_point_reached = False
-
-    # Main processing loop
-    while True:
-        # Check if robot is paused or stopped
-        should_exit, next_target_point = check_robot_state(execution_context.state_machine if execution_context else None, robotService, start_point_index, furthest_checkpoint_passed)
-        if should_exit:
-            return False, next_target_point
-
-        # Get current position
-        current_pos = robotService.get_current_position()
-        if current_pos is None:
-            time.sleep(robotService.robot_state_manager_cycle_time)
-            continue
-
-        # Check if first point is reached
-        first_point_reached, should_continue = is_first_point_reached(
-            current_pos, first_point, threshold, robotService, start_point_index, first_point_reached
-        )
-        if not should_continue:
-            time.sleep(robotService.robot_state_manager_cycle_time)
-            continue
-
-        # Check if final point is reached
-        if is_final_point_reached(current_pos, final_point, remaining_path, furthest_checkpoint_passed, threshold, robotService):
-            break
-
-        # Update checkpoint progress
-        furthest_checkpoint_passed = update_checkpoint_progress(
-            current_pos, remaining_path, furthest_checkpoint_passed, start_point_index, robotService
-        )
-
-        # Get current robot motion data
-        current_velocity = robotService.get_current_velocity()
-        current_acceleration = robotService.get_current_acceleration()
-
-        # Calculate pump speed adjustments
-        adjusted_pump_speed, velocity_compensation, accel_compensation = calculate_pump_speed_adjustments(
-            current_velocity, current_acceleration, glue_speed_coefficient, glue_acceleration_coefficient
-        )
-
-        # Log debug data
-        last_write_time = log_debug_data(
-            robotService, current_velocity, current_acceleration, 
-            velocity_compensation, accel_compensation, adjusted_pump_speed, last_write_time
-        )
-
-        # Apply pump speed adjustment
-        glueSprayService.adjustMotorSpeed(motorAddress=motorAddress, speed=int(adjusted_pump_speed))
+    sample_seq = 0
+    writer = PumpSpeedWriter(glueSprayService, motorAddress)
+    trace = PumpTraceBuffer().start()
+
+    try:
+        while True:
+            # Check if robot is paused or stopped
+            should_exit, next_target_point = check_robot_state(execution_context.state_machine if execution_context else None, robotService, start_point_index, furthest_checkpoint_passed)
+            if should_exit:
+                return False, next_target_point
+
+            # Sleep until the monitor delivers a new pose
+            sample_seq, current_pos = robotService.wait_for_robot_sample(sample_seq, timeout=SAMPLE_TIMEOUT)
+            if current_pos is None:
+                continue
+
+            # Check if first point is reached
+            first_point_reached, should_continue = is_first_point_reached(
+                current_pos, first_point, threshold, robotService, start_point_index, first_point_reached
+            )
+            if not should_continue:
+                continue
+
+            # Check if final point is reached
+            if is_final_point_reached(current_pos, final_point, remaining_path, furthest_checkpoint_passed, threshold, robotService):
+                break
+
+            furthest_checkpoint_passed = update_checkpoint_progress(
+                current_pos, remaining_path, furthest_checkpoint_passed, start_point_index, robotService, trace
+            )
+
+            # Get current robot motion data
+            current_velocity = robotService.get_current_velocity()
+            current_acceleration = robotService.get_current_acceleration()
+
+            adjusted_pump_speed, velocity_compensation, accel_compensation = calculate_pump_speed_adjustments(
+                current_velocity, current_acceleration, glue_speed_coefficient, glue_acceleration_coefficient
+            )
+            written = writer.update(int(adjusted_pump_speed))
+            trace.record("sample", time.time(), current_pos, current_velocity, current_acceleration,
+                         velocity_compensation, accel_compensation, adjusted_pump_speed, written)
+    finally:
+        trace.close()
+        log_debug_message(robotService.logger_context,
+            message=f"Pump speed written {writer.writes} times, {trace.dropped} trace records dropped")
 
     # Path completed successfully
-    log_debug_message(robotService.robot_service_logger_context, message="RobotService.adjustPumpSpeedWhileRobotIsMoving2 ALL POINTS REACHED! ")
+    log_debug_message(robotService.logger_context, message="adjustPumpSpeedDynamically ALL POINTS REACHED! ")
     final_progress = start_point_index + len(remaining_path) - 1
     return True, final_progress
 
@@ -258,7 +279,8 @@ def start_dynamic_pump_speed_adjustment_thread(service,
                                                path,
                                                reach_end_threshold,
                                                pump_ready_event,
-                                               start_point_index=0):
+                                               start_point_index=0,
+                                               execution_context=None):
 
     pump_thread = PumpThreadWithResult(
         target=adjustPumpSpeedDynamically,
@@ -271,7 +293,8 @@ def start_dynamic_pump_speed_adjustment_thread(service,
             path,  # path (must be sequence)
             reach_end_threshold,  # threshold
             start_point_index,  # start_point_index
-            pump_ready_event  # ready_event
+            pump_ready_event,  # ready_event
+            execution_context  # execution_context (pause/stop detection)
         )
     )
     pump_thread.start()
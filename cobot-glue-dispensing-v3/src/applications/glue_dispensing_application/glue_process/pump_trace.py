@@ -0,0 +1,78 @@
+import threading
+
+from modules.utils import files
+
+TRACE_FILE = "robot_pump_values.txt"
+TRACE_CAPACITY = 4096  # Samples kept in memory between flushes (~30 s of 8 ms samples)
+FLUSH_INTERVAL = 0.5  # Seconds between background flushes
+
+
+class PumpTraceBuffer:
+    """
+    Preallocated ring of pump-controller trace records with a background flusher.
+
+    The controller thread is the only producer: record() stores a tuple in the next slot and
+    bumps the write counter - no lock, no formatting, no I/O. A flusher thread formats and
+    appends everything written since its last pass to the trace file. If the producer gets
+    more than ``capacity`` records ahead of the flusher, the oldest ones are dropped and
+    counted in ``dropped``.
+
+    Record kinds:
+        ("sample", t, position, velocity, acceleration, velocity_comp, accel_comp, pump_speed, written)
+        ("checkpoint", t, index)
+    """
+
+    def __init__(self, file_name: str = TRACE_FILE, capacity: int = TRACE_CAPACITY,
+                 flush_interval: float = FLUSH_INTERVAL):
+        self.file_name = file_name
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self._slots = [None] * capacity
+        self._written = 0  # only advanced by the producer
+        self._flushed = 0  # only advanced by the flusher
+        self.dropped = 0
+        self._flush_lock = threading.Lock()  # flusher vs. close(), never taken by the producer
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="PumpTraceFlusher", daemon=True)
+        self._thread.start()
+        return self
+
+    def record(self, *fields):
+        self._slots[self._written % self.capacity] = fields
+        self._written += 1
+
+    def close(self):
+        """Stop the flusher and write whatever is still buffered."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    def flush(self):
+        with self._flush_lock:
+            end = self._written
+            start = max(self._flushed, end - self.capacity)
+            self.dropped += start - self._flushed
+            if start == end:
+                return
+            lines = [self._format(self._slots[i % self.capacity]) for i in range(start, end)]
+            self._flushed = end
+        files.write_to_debug_file(self.file_name, "".join(lines))
+
+    """PRIVATE METHODS SECTION"""
+
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+
+    def _format(self, record):
+        if record[0] == "checkpoint":
+            _, timestamp, index = record
+            return f"Checkpoint {index} reached at {timestamp:.3f}\n\n"
+        _, timestamp, position, velocity, acceleration, velocity_comp, accel_comp, pump_speed, written = record
+        return (f"t: {timestamp:.3f} Pos {position} Vel: {float(velocity):.3f}, Acc: {float(acceleration):.3f}, "
+                f"Vel Com: {float(velocity_comp):.3f}, Acc Comp {float(accel_comp):.3f}, "
+                f"Pump speed: {float(pump_speed):.3f}{'' if written else ' (held)'}\n")
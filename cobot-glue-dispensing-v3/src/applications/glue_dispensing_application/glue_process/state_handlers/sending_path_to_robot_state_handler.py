@@ -20,9 +20,21 @@ HandlerResult = namedtuple(
     ]
 )
 
+class _StateCancellationToken(CancellationToken):
+    """Cancelled explicitly or as soon as the state machine is paused or stopped."""
+
+    def __init__(self, state_machine):
+        super().__init__()
+        self.state_machine = state_machine
+
+    def is_cancelled(self) -> bool:
+        return super().is_cancelled() or \
+            self.state_machine.state in (GlueProcessState.PAUSED, GlueProcessState.STOPPED)
+
+
 def handle_send_path_to_robot(context,logger_context):
     """
-    Sends path points to robot with immediate pause support using cancellation tokens.
+    Sends the path to the robot as one streamed trajectory, checking for pause/stop before every point.
     Returns a HandlerResult describing success/failure and next FSM state.
     """
     path = context.current_path
@@ -35,49 +47,54 @@ def handle_send_path_to_robot(context,logger_context):
         message=f"Sending {len(path)} points to robot with pause support (path index {path_index})"
     )
 
-    # Create a cancellation token that monitors state machine
-    cancellation_token = CancellationToken()
-    
-    for i, point in enumerate(path, start_point_index):
-        # Check for pause/stop before each movement
-        if context.state_machine.state == GlueProcessState.PAUSED:
-            context.save_progress(path_index, i)
-            log_debug_message(logger_context, message=f"Paused before point {i}")
-            result = HandlerResult(True, True, GlueProcessState.PAUSED, path_index, i, path, settings)
-            update_context_from_handler_result(context, result)
-            return result.next_state
+    # Cancelled as soon as the state machine leaves the sending state
+    cancellation_token = _StateCancellationToken(context.state_machine)
 
+    def on_progress(progress):
+        log_debug_message(logger_context,
+                          message=f"Sent point {progress.point_index} ({progress.commands_sent} commands, "
+                                  f"{progress.elapsed * 1000:.0f} ms)")
+
+    try:
+        trajectory = context.robot_service.execute_trajectory(
+            path,
+            velocity=settings.get(RobotSettingKey.VELOCITY.value, 10),
+            acceleration=settings.get(RobotSettingKey.ACCELERATION.value, 30),
+            blend_radius=1,
+            index_offset=start_point_index,
+            cancellation_token=cancellation_token,
+            on_progress=on_progress,
+        )
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        log_error_message(logger_context, message=f"Exception while sending path: {e}")
+        result = HandlerResult(False, False, GlueProcessState.ERROR, path_index, start_point_index, path, settings)
+        update_context_from_handler_result(context, result)
+        return result.next_state
+
+    i = trajectory.next_index
+    if trajectory.cancelled:
         if context.state_machine.state == GlueProcessState.STOPPED:
             log_debug_message(logger_context, message=f"Stopped before point {i}")
             result = HandlerResult(True, False, GlueProcessState.STOPPED, path_index, i, path, settings)
-            update_context_from_handler_result(context, result)
-            return result.next_state
-        try:
-            # Send move command (non-blocking)
-            ret = context.robot_service.robot.move_liner(
-                position=point,
-                tool=context.robot_service.robot_config.robot_tool,
-                user=context.robot_service.robot_config.robot_user,
-                vel=settings.get(RobotSettingKey.VELOCITY.value, 10),
-                acc=settings.get(RobotSettingKey.ACCELERATION.value, 30),
-                blendR=1,
-            )
-
-            if ret != 0:
-                log_error_message(logger_context, message=f"MoveL failed with code {ret} at point {i}")
-                result = HandlerResult(False, False, GlueProcessState.ERROR, path_index, i, path, settings)
-                update_context_from_handler_result(context, result)
-                return result.next_state
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            log_error_message(logger_context, message=f"Exception at point {i}: {e}")
-            result = HandlerResult(False, False, GlueProcessState.ERROR, path_index, i, path, settings)
-            update_context_from_handler_result(context, result)
-            return result.next_state
+        else:
+            context.save_progress(path_index, i)
+            log_debug_message(logger_context, message=f"Paused before point {i}")
+            result = HandlerResult(True, True, GlueProcessState.PAUSED, path_index, i, path, settings)
+        update_context_from_handler_result(context, result)
+        return result.next_state
+
+    if trajectory.code != 0:
+        log_error_message(logger_context, message=f"Trajectory failed with code {trajectory.code} at point {i}")
+        result = HandlerResult(False, False, GlueProcessState.ERROR, path_index, i, path, settings)
+        update_context_from_handler_result(context, result)
+        return result.next_state
 
     # All points completed successfully
-    log_debug_message(logger_context, message="All points sent and reached. Path completed.")
+    log_debug_message(logger_context,
+                      message=f"All points sent in {trajectory.upload_time * 1000:.1f} ms "
+                              f"(largest gap {trajectory.max_command_gap * 1000:.1f} ms).")
     result = HandlerResult(True, False, GlueProcessState.WAIT_FOR_PATH_COMPLETION, path_index, 0, path, settings)
     update_context_from_handler_result(context, result)
     return result.next_state
@@ -31,6 +31,7 @@ def handle_start_pump_adjustment_thread(context,logger_context,should_adjust_pum
                 reach_end_threshold=float(context.current_settings.get(GlueSettingKey.REACH_END_THRESHOLD.value, 1.0)),
                 pump_ready_event=pump_ready_event,
                 start_point_index=context.current_point_index,
+                execution_context=context,
             )
             log_debug_message(logger_context, message="Pump adjustment thread started.")
         except Exception as e:
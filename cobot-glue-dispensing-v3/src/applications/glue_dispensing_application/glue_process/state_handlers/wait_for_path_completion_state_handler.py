@@ -3,6 +3,9 @@ import time
 from applications.glue_dispensing_application.glue_process.state_machine.GlueProcessState import GlueProcessState
 from modules.utils.custom_logging import log_debug_message, log_error_message
 
+STATE_CHECK_INTERVAL = 0.1  # Longest wait between pause/stop checks (waits return early on completion)
+MOTION_COMPLETION_TIMEOUT = 300.0  # Give up waiting for the robot's motion-done event after this many seconds
+
 HandlerResult = namedtuple(
     "HandlerResult",
     [
@@ -69,7 +72,7 @@ def handle_wait_for_path_completion(context,logger_context) -> GlueProcessState:
                 result = HandlerResult(True, False, GlueProcessState.STOPPED, path_index, context.current_point_index, path, settings)
                 update_context_from_handler_result(context, result)
                 return result.next_state
-            time.sleep(0.1)
+            pump_thread.join(timeout=STATE_CHECK_INTERVAL)  # returns as soon as the thread ends
 
         # Get the pump thread result to capture final progress
         final_point_index = len(path) - 1  # Default to last point
@@ -130,7 +133,8 @@ def _wait_for_robot_motion_completion(context, logger_context, path_index, path,
         # Wait for robot trajectory to complete
         # Note: This assumes robot_service has a way to check if motion is complete
         robot_service = context.robot_service
-        
+        wait_started = time.time()
+
         while True:
             state = context.state_machine.state
             
@@ -148,21 +152,20 @@ def _wait_for_robot_motion_completion(context, logger_context, path_index, path,
                 update_context_from_handler_result(context, result)
                 return result.next_state
             
-            # Check if robot motion is complete
-            # For now, we'll assume a simple timeout or use robot status
-            # TODO: Implement proper robot motion completion detection
-            if hasattr(robot_service, 'is_motion_complete') and robot_service.is_motion_complete():
+            if not hasattr(robot_service, 'wait_for_motion_complete'):
+                # Robot service without a motion-done event - keep the old fixed delay
+                time.sleep(0.5)
+                break
+
+            # Woken by the monitor's samples; returns as soon as the robot reports motion done
+            if robot_service.wait_for_motion_complete(timeout=STATE_CHECK_INTERVAL):
                 log_debug_message(logger_context, message=f"[WAIT] Robot motion completed for path {path_index}")
                 break
-            
-            # Simple fallback - wait a bit and assume motion is complete after reasonable time
-            # This is not ideal but prevents infinite loops
-            # TODO: Replace with proper robot status monitoring
-            time.sleep(0.5)
-            
-            # For now, assume motion completes after a short delay
-            # In a real implementation, you would check robot trajectory status
-            break
+
+            if time.time() - wait_started > MOTION_COMPLETION_TIMEOUT:
+                log_error_message(logger_context, message=f"[WAIT] No motion-done event for path {path_index} "
+                                                          f"after {MOTION_COMPLETION_TIMEOUT}s - assuming completion")
+                break
         
         # Motion completed successfully
         final_point_index = len(path) - 1  # Assume robot reached the end
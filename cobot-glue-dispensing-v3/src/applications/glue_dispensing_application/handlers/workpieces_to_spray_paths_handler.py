@@ -1,3 +1,5 @@
+from dataclasses import dataclass
+
 import numpy as np
 
 from applications.glue_dispensing_application.settings.enums import GlueSettingKey
@@ -5,17 +7,32 @@ from applications.glue_dispensing_application.settings.enums import GlueSettingK
 
 
 from modules.shared.core.ContourStandartized import Contour
-from modules.utils import utils
-from modules.utils.contours import flatten_and_convert_to_list
+from modules.utils import batched_transform
+from modules.utils.path_simplification import DEFAULT_PATH_TOLERANCE_MM, rdp_indices
+
+COMPUTE_ANGLE_BASED_ON_WIDTH = False
+FOLLOW_WORKPIECE_ORIENTATION = False
+
+
+@dataclass
+class _PathSegment:
+    """One path of a job before it is turned into robot poses."""
+    points: object  # (N, 2) / (N, 1, 2) array or nested list of image (or robot) points
+    settings: dict
+    workpiece_height: float
+    orientation: float
+    transform: bool  # image -> robot transformation needed
 
 
 class WorkpieceToSprayPathsGenerator:
-    def __init__(self, application):
+    def __init__(self, application, path_tolerance_mm=DEFAULT_PATH_TOLERANCE_MM):
         self.application = application
+        # Points closer than this (mm) to the simplified path are dropped; 0 keeps every point
+        self.path_tolerance_mm = path_tolerance_mm
 
     def generate_robot_paths(self, workpieces, debug=False):
         print(f"generate_robot_paths called with {len(workpieces)} workpieces")
-        generate_paths = []
+        segments = []
         for workpiece_i, workpiece in enumerate(workpieces):
             sprayPatternContour = workpiece.get_spray_pattern_contours()
             sprayPatternFill = workpiece.get_spray_pattern_fills()
@@ -28,9 +45,8 @@ class WorkpieceToSprayPathsGenerator:
             # print("Orientation before transform: ", orientation)
             # calculate orientation based on transformed points
             contour_data = workpiece.contour["contour"]
-            contour_points = contour_data.reshape(-1, 2).tolist()
-            robot_points = (contour_points)
-            robot_points_contour_obj = Contour(contour_points=np.array(robot_points))
+            robot_points = np.asarray(contour_data).reshape(-1, 2)
+            robot_points_contour_obj = Contour(contour_points=robot_points)
             orientation = robot_points_contour_obj.getOrientation()
 
             # ✅ Check if spray pattern exists and has data
@@ -39,49 +55,56 @@ class WorkpieceToSprayPathsGenerator:
 
             # --- CASE 1: No spray pattern, fall back to outer contour ---
             if not has_spray_contours and not has_spray_fills:
-                main_contour_path = self.handle_workpiece_main_contour( workpiece, robot_points, workpiece_height, orientation)
-                generate_paths.append(main_contour_path)
+                segments.append(self._main_contour_segment(workpiece, robot_points, workpiece_height, orientation))
                 continue
             # --- CASE 2 & 3: Process spray contours and fills using unified handler ---
             if has_spray_contours:
-                contour_paths = self.handle_workpiece_paths( sprayPatternContour, workpiece_height, orientation, debug,
-                                       label="CONTOUR")
-                for path in contour_paths:
-                    generate_paths.append(path)
+                segments.extend(self._entry_segments(sprayPatternContour, workpiece_height, orientation, debug,
+                                                     label="CONTOUR"))
 
             if has_spray_fills:
-                fill_paths = self.handle_workpiece_paths(sprayPatternFill, workpiece_height, orientation, debug, label="FILL")
-                for path in fill_paths:
-                    generate_paths.append(path)
+                segments.extend(self._entry_segments(sprayPatternFill, workpiece_height, orientation, debug,
+                                                     label="FILL"))
 
-        return generate_paths
+        # The whole job goes through the transformation and pose building at once
+        return self._build_paths(segments)
 
     def handle_workpiece_main_contour(self,match,robot_points,workpiece_height,orientation=0):
-        # Get main contour data
-        if isinstance(match.contour, dict) and "contour" in match.contour:
-            contour_data = match.contour["contour"]
-            main_settings = match.contour.get("settings", {})
-        else:
-            contour_data = match.contour
-            main_settings = {}
+        return self._build_paths([self._main_contour_segment(match, robot_points, workpiece_height, orientation)])[0]
 
-        # Convert to list format if numpy array
-        if isinstance(contour_data, np.ndarray):
-            contour_points = contour_data.reshape(-1, 2).tolist()
-        else:
-            contour_points = flatten_and_convert_to_list(contour_data)
+    def handle_workpiece_paths(self, entries, workpiece_height, orientation=0, debug=False, label="TRANSFORMATION"):
+        return self._build_paths(self._entry_segments(entries, workpiece_height, orientation, debug, label))
 
-        # Close contour if not already closed
-        if contour_points and contour_points[0] != contour_points[-1]:
-            contour_points.append(contour_points[0])
+    def convert_to_robot_path(self, points_2d, settings, workpiece_height, orientation=0):
+        """Convert 2D points to robot path format [x, y, z, rx, ry, rz]"""
+        segment = _PathSegment(points_2d, settings, workpiece_height, orientation, transform=False)
+        return self._build_paths([segment])[0][0]
 
-        # Convert to robot path format with Z, RX, RY, RZ
-        robot_path = self.convert_to_robot_path(robot_points, main_settings, workpiece_height, orientation)
+    def contour_to_robot_path(self,contour,settings,workpiece_height,orientation):
+        segment = _PathSegment(contour, settings, workpiece_height, orientation, transform=True)
+        return self._build_paths([segment])[0][0]
+
+    def transform_to_robot_coordinates(self, points):
+        """Transform 2D points from camera coordinates to robot coordinates with transducer offset applied at rz=0"""
+        if len(points) == 0:
+            return []
+        x_offset, y_offset = self.application.get_transducer_offsets()
+        return batched_transform.transform_points(self.application.visionService.cameraToRobotMatrix,
+                                                  np.asarray(points, dtype=np.float32).reshape(-1, 2),
+                                                  x_offset, y_offset).tolist()
 
-        return (robot_path, main_settings)
+    """PRIVATE METHODS SECTION"""
 
-    def handle_workpiece_paths(self, entries, workpiece_height, orientation=0, debug=False, label="TRANSFORMATION"):
-        paths = []
+    def _main_contour_segment(self, match, robot_points, workpiece_height, orientation):
+        # Main contour settings; the points used are robot_points as given (no transformation)
+        if isinstance(match.contour, dict) and "contour" in match.contour:
+            main_settings = match.contour.get("settings", {})
+        else:
+            main_settings = {}
+        return _PathSegment(robot_points, main_settings, workpiece_height, orientation, transform=False)
+
+    def _entry_segments(self, entries, workpiece_height, orientation, debug, label):
+        segments = []
         for entry in entries:
             # --- Validate contour existence and content ---
             contour_data = entry.get("contour", None)
@@ -99,21 +122,11 @@ class WorkpieceToSprayPathsGenerator:
                     print(f"⚠️ Skipping {label} entry: missing or empty settings -> {entry}")
                 continue
 
-            # --- Process the valid entry ---
-            robot_path = self.contour_to_robot_path(contour_data,settings,workpiece_height,orientation)
-            paths.append((robot_path, settings))
-        return paths
-
-    def convert_to_robot_path(self, points_2d, settings, workpiece_height, orientation=0):
-        """Convert 2D points to robot path format [x, y, z, rx, ry, rz]"""
+            segments.append(_PathSegment(contour_data, settings, workpiece_height, orientation, transform=True))
+        return segments
 
-        COMPUTE_ANGLE_BASED_ON_WIDTH = False
-        FOLLOW_WORKPIECE_ORIENTATION = False
-
-        robot_path = []
-        # orientation = 0
-        print("Settings in _convert_to_robot_path: ", settings)
-        # Extract settings with defaults
+    def _pose_values(self, settings, workpiece_height, orientation):
+        """(z, rz) of a path from its spray settings."""
         spray_height = float(settings.get(GlueSettingKey.SPRAYING_HEIGHT.value))
         rz_angle = float(settings.get(GlueSettingKey.RZ_ANGLE.value))
 
@@ -127,64 +140,37 @@ class WorkpieceToSprayPathsGenerator:
             rz_angle = rz_angle + orientation
 
         safety_min_z = self.application.robotService.robot_config.safety_limits.z_min
-
-        print("safety_min_z ->", type(safety_min_z), safety_min_z)
-        print("spray_height ->", type(spray_height), spray_height)
-        print("workpiece_height ->", type(workpiece_height), workpiece_height)
         z_height = safety_min_z + spray_height + int(workpiece_height)
-        print("z_height: ", z_height)
-
-        for i, point in enumerate(points_2d):
-            if len(point) >= 2:
-                robot_point = [
-                    float(point[0]),  # x
-                    float(point[1]),  # y
-                    z_height,  # z
-                    180.0,  # rx (standard orientation)
-                    0.0,  # ry
-                    rz_angle  # rz
-                ]
-                robot_path.append(robot_point)
-
-        return robot_path
-
-
-    def contour_to_robot_path(self,contour,settings,workpiece_height,orientation):
-        pts = flatten_and_convert_to_list(contour)
-        robot_points = self.transform_to_robot_coordinates( pts)
-        robot_path = self.convert_to_robot_path( robot_points, settings, workpiece_height, orientation)
-        return robot_path
-
-    def transform_to_robot_coordinates(self, points):
-        """Transform 2D points from camera coordinates to robot coordinates with transducer offset applied at rz=0"""
-        if not points:
+        return z_height, rz_angle
+
+    def _build_paths(self, segments):
+        """
+        [(robot path, settings)] for the segments of a job: one concatenated point array, one
+        homography + offset pass for every segment that needs it, the pose columns filled in
+        one go, then each path simplified on its view of the result.
+        """
+        if not segments:
             return []
+        # float64 keeps untransformed points exact; transformed ones go through float32 like before
+        points, offsets = batched_transform.concat_segments([segment.points for segment in segments],
+                                                            dtype=np.float64)
+        lengths = batched_transform.segment_lengths(offsets)
+        transform_rows = np.repeat([segment.transform for segment in segments], lengths)
+        if transform_rows.any():
+            x_offset, y_offset = self.application.get_transducer_offsets()
+            points[transform_rows] = batched_transform.transform_points(
+                self.application.visionService.cameraToRobotMatrix, points[transform_rows], x_offset, y_offset)
+
+        pose_values = [self._pose_values(segment.settings, segment.workpiece_height, segment.orientation)
+                       for segment in segments]
+        z_heights = [z for z, _ in pose_values]
+        rz_angles = [rz for _, rz in pose_values]
+        poses = batched_transform.robot_poses(points, offsets, z_heights, rz_angles)
 
-        # Convert to numpy array for transformation
-        np_points = np.array(points, dtype=np.float32).reshape(-1, 1, 2)
-        print("Points before transformation: ", np_points)
-
-        # Apply camera to robot transformation with transducer offset correction
-        # Offset is applied at rz=0 since rotation will be handled later in robot path generation
-        # The offset parameters can be configured via settings or hardcoded based on hardware specs
-        transformed = utils.applyTransformation(
-            cameraToRobotMatrix=self.application.visionService.cameraToRobotMatrix,
-            contours=np_points,
-            apply_transducer_offset=True,  # Enable transducer offset correction
-            x_offset=self.application.get_transducer_offsets()[0],  # X offset in mm (configure based on your transducer)
-            y_offset=self.application.get_transducer_offsets()[1],
-            dynamic_offsets_config=self.application.get_dynamic_offsets_config()
-            # Y offset in mm (configure based on your transducer)
-        )
-        print("Transformed points: ", transformed)
-
-        # Convert back to list format
-        result = []
-        for point in transformed:
-            # Flatten nested point structure
-            while isinstance(point, (list, tuple, np.ndarray)) and len(point) == 1:
-                point = point[0]
-            if len(point) >= 2:
-                result.append([float(point[0]), float(point[1])])
-
-        return result
+        paths = []
+        for segment, path in zip(segments, batched_transform.split_segments(poses, offsets)):
+            simplified = path[rdp_indices(path, self.path_tolerance_mm)] if len(path) >= 3 else path
+            paths.append((simplified.tolist(), segment.settings))
+        print(f"Built {len(paths)} robot paths: {len(poses)} -> {sum(len(path) for path, _ in paths)} points "
+              f"after simplification")
+        return paths
@@ -1,6 +1,9 @@
+import copy
+
 import numpy as np
 
 from applications.glue_dispensing_application.model.workpiece.GlueWorkpieceField import GlueWorkpieceField
+from applications.glue_dispensing_application.model.workpiece.workpiece_geometry import pack_geometry
 from core.model.workpiece.Workpiece import BaseWorkpiece
 
 
@@ -78,10 +81,11 @@ class GlueWorkpiece(BaseWorkpiece, JsonSerializable):
         """
         Return list of spray pattern contour entries.
         Each entry is a dict: {"contour": np.ndarray, "settings": dict}
+        The (N, 2) arrays are views of the stored float32 points, not copies - don't modify them in place.
         """
         contours = []
         for entry in self.sprayPattern.get("Contour", []):
-            contour_points = np.array(entry.get("contour", []), dtype=np.float32).reshape(-1, 2)
+            contour_points = np.asarray(entry.get("contour", []), dtype=np.float32).reshape(-1, 2)
             contours.append({
                 "contour": contour_points,
                 "settings": entry.get("settings", {})
@@ -92,17 +96,36 @@ class GlueWorkpiece(BaseWorkpiece, JsonSerializable):
     def get_spray_pattern_fills(self):
         """
         Return list of spray pattern fill entries.
-        Each entry is a dict: {"contou  r": np.ndarray, "settings": dict}
+        Each entry is a dict: {"contour": np.ndarray, "settings": dict}
+        The (N, 2) arrays are views of the stored float32 points, not copies - don't modify them in place.
         """
         fills = []
         for entry in self.sprayPattern.get("Fill", []):
-            contour_points = np.array(entry.get("contour", []), dtype=np.float32).reshape(-1, 2)
+            contour_points = np.asarray(entry.get("contour", []), dtype=np.float32).reshape(-1, 2)
             fills.append({
                 "contour": contour_points,
                 "settings": entry.get("settings", {})
             })
         return fills
 
+    def copy_with_shared_geometry(self):
+        """
+        Cheap copy for per-cycle variants of a library workpiece (e.g. aligned matches).
+
+        The copy gets its own contour / spray pattern containers, so transformed arrays can be
+        assigned on it without touching this workpiece, while the point arrays, settings and all
+        other attributes are shared. Shared arrays must be replaced, never modified in place.
+        """
+        clone = copy.copy(self)
+        if isinstance(self.contour, dict):
+            clone.contour = dict(self.contour)
+        if isinstance(self.sprayPattern, dict):
+            clone.sprayPattern = {
+                key: [dict(entry) if isinstance(entry, dict) else entry for entry in entries]
+                for key, entries in self.sprayPattern.items()
+            }
+        return clone
+
     def set_main_contour(self, contour):
       self.contour["contour"] = contour
 
@@ -194,15 +217,27 @@ class GlueWorkpiece(BaseWorkpiece, JsonSerializable):
         else:
             spray_pattern_dict = convert_ndarray_to_list(workpiece.sprayPattern)
 
-        workpiece.contour = contour_data
-        workpiece.sprayPattern = spray_pattern_dict
-        return workpiece.to_dict()
+        # Converted geometry only goes into the output dict - the workpiece itself is left untouched
+        data = workpiece.to_dict()
+        data[GlueWorkpieceField.CONTOUR.value] = contour_data
+        data[GlueWorkpieceField.SPRAY_PATTERN.value] = spray_pattern_dict
+        return data
+
+    @staticmethod
+    def serialize_packed(workpiece, geometry_file):
+        """
+        Like serialize, but with the contour and spray pattern points moved into a float32 blob
+        (see workpiece_geometry). Returns (JSON-ready dict, (N, 2) blob); geometry_file is the
+        sidecar name recorded in the dict. deserialize accepts the dict once unpack_geometry has
+        put the points back.
+        """
+        return pack_geometry(workpiece.to_dict(), geometry_file)
 
     @staticmethod
     def deserialize(data):
         def convert_list_to_ndarray(obj):
             if isinstance(obj, dict) and "contour" in obj:
-                arr = np.array(obj["contour"], dtype=np.float32)
+                arr = np.asarray(obj["contour"], dtype=np.float32)  # float32 arrays (binary geometry) are kept as is
 
                 # ✅ Normalize shape to (N, 1, 2)
                 if arr.ndim == 1 and arr.shape[0] == 2:
@@ -0,0 +1,133 @@
+"""
+Binary sidecar for workpiece geometry.
+
+The point arrays of the main contour and spray pattern are written as one flat float32
+(N, 2) .npy blob next to the workpiece JSON; in the JSON every point list is replaced by its
+row range in the blob ({"rows": [start, stop]}), so the JSON keeps the structure and settings
+and the blob is the offsets-addressed geometry. Loading reads the blob in one go (or maps
+it) and hands out (n, 1, 2) views into it - no per-point Python lists on either side.
+
+Points are stored as float32, the dtype GlueWorkpiece.deserialize uses, so JSON -> binary ->
+workpiece gives the same arrays as JSON -> workpiece.
+"""
+import os
+from typing import Tuple
+
+import numpy as np
+
+GEOMETRY_FILE_KEY = "geometryFile"
+GEOMETRY_FORMAT_KEY = "geometryFormat"
+GEOMETRY_FORMAT = 1
+GEOMETRY_SUFFIX = "_geometry.npy"
+ROWS_KEY = "rows"
+GEOMETRY_FIELDS = ("contour", "sprayPattern")
+
+
+def geometry_path_for(json_path: str) -> str:
+    """Sidecar path of a workpiece JSON file: <name>_workpiece.json -> <name>_workpiece_geometry.npy."""
+    return os.path.splitext(json_path)[0] + GEOMETRY_SUFFIX
+
+
+def is_packed(data: dict) -> bool:
+    return GEOMETRY_FILE_KEY in data
+
+
+def pack_geometry(data: dict, geometry_file: str) -> Tuple[dict, np.ndarray]:
+    """
+    Move the points of data's geometry fields into one (N, 2) float32 blob.
+
+    Args:
+        data: workpiece dict (to_dict / serialize output); point entries may be arrays or lists.
+        geometry_file: sidecar file name recorded in the returned dict.
+
+    Returns:
+        (JSON-ready dict with row ranges instead of points, blob)
+    """
+    chunks = []
+    offset = [0]
+
+    def pack(obj):
+        if isinstance(obj, dict) and "contour" in obj:
+            points = np.asarray(obj["contour"], dtype=np.float32).reshape(-1, 2)
+            start = offset[0]
+            offset[0] += len(points)
+            chunks.append(points)
+            packed = dict(obj)
+            packed["contour"] = {ROWS_KEY: [start, offset[0]]}
+            packed["settings"] = dict(obj.get("settings", {}))
+            return packed
+        if isinstance(obj, dict):
+            return {key: pack(value) for key, value in obj.items()}
+        if isinstance(obj, list):
+            return [pack(item) for item in obj]
+        return obj
+
+    packed = dict(data)
+    for field in GEOMETRY_FIELDS:
+        if field in packed:
+            packed[field] = pack(packed[field])
+    packed[GEOMETRY_FILE_KEY] = geometry_file
+    packed[GEOMETRY_FORMAT_KEY] = GEOMETRY_FORMAT
+    blob = np.concatenate(chunks) if chunks else np.empty((0, 2), dtype=np.float32)
+    return packed, np.ascontiguousarray(blob, dtype=np.float32)
+
+
+def unpack_geometry(data: dict, blob: np.ndarray) -> dict:
+    """Inverse of pack_geometry: row ranges become (n, 1, 2) float32 views into blob."""
+    if data.get(GEOMETRY_FORMAT_KEY) != GEOMETRY_FORMAT:
+        raise ValueError(f"Unsupported workpiece geometry format: {data.get(GEOMETRY_FORMAT_KEY)}")
+
+    def unpack(obj):
+        if isinstance(obj, dict) and isinstance(obj.get("contour"), dict) and ROWS_KEY in obj["contour"]:
+            start, stop = obj["contour"][ROWS_KEY]
+            unpacked = dict(obj)
+            unpacked["contour"] = blob[start:stop].reshape(-1, 1, 2)
+            return unpacked
+        if isinstance(obj, dict):
+            return {key: unpack(value) for key, value in obj.items()}
+        if isinstance(obj, list):
+            return [unpack(item) for item in obj]
+        return obj
+
+    unpacked = {key: value for key, value in data.items() if key not in (GEOMETRY_FILE_KEY, GEOMETRY_FORMAT_KEY)}
+    for field in GEOMETRY_FIELDS:
+        if field in unpacked:
+            unpacked[field] = unpack(unpacked[field])
+    return unpacked
+
+
+def save_geometry(path: str, blob: np.ndarray) -> None:
+    """Write the blob atomically (temp file + rename)."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, blob, allow_pickle=False)
+    os.replace(tmp_path, path)
+
+
+def load_geometry(path: str, mmap: bool = False) -> np.ndarray:
+    """Read a blob; mmap=True maps it read-only instead of reading it."""
+    blob = np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False)
+    if blob.dtype != np.float32 or blob.ndim != 2 or blob.shape[1] != 2:
+        raise ValueError(f"{path} is not a workpiece geometry blob: {blob.dtype} {blob.shape}")
+    return blob
+
+
+def load_packed(json_path: str, data: dict, mmap: bool = False) -> dict:
+    """unpack_geometry with the blob referenced by data, resolved next to json_path."""
+    blob = load_geometry(os.path.join(os.path.dirname(json_path), data[GEOMETRY_FILE_KEY]), mmap)
+    return unpack_geometry(data, blob)
+
+
+def inline_geometry(data: dict) -> dict:
+    """JSON-ready copy of an unpacked dict with every point array turned back into nested lists."""
+
+    def inline(obj):
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if isinstance(obj, dict):
+            return {key: inline(value) for key, value in obj.items()}
+        if isinstance(obj, list):
+            return [inline(item) for item in obj]
+        return obj
+
+    return inline(data)
@@ -28,18 +28,17 @@ def measure_height_at_position(context: HeightMeasureContext,position: tuple):
     # 2.Turn laser on and measure height
     time.sleep(1)  # wait for brightness to stabilize
     skip_images_count = 5
-    while skip_images_count > 0:
-        # skip initial images to allow auto-exposure to stabilize
-        _ = context.vision_service.getLatestFrame()
-        skip_images_count -= 1
-        if skip_images_count <= 0:
-            break
-    latest_image = context.vision_service.getLatestFrame()
-    # convert to RGB
-    latest_image = cv2.cvtColor(latest_image, cv2.COLOR_BGR2RGB)
-
+    # skip initial images to allow auto-exposure to stabilize
+    frame_ring = context.vision_service.frame_ring
+    seq = frame_ring.seq
+    for _ in range(skip_images_count):
+        seq, _ = frame_ring.wait_for_newer(seq, timeout=1.0)
+    _, latest_image = context.vision_service.waitForNewFrame(seq, timeout=1.0)
     if latest_image is None:
         context.laser.turnOff()
         return False, "Failed to capture image for height measurement"
+
+    # convert to RGB
+    latest_image = cv2.cvtColor(latest_image, cv2.COLOR_BGR2RGB)
     cv2.imwrite("debug_laser_image.png", latest_image)
     return context.laser_tracking_service.measure_height(latest_image)
\ No newline at end of file
@@ -4,17 +4,29 @@ Description:
     Workpieces are stored in a structured directory format based on date and timestamp,
     enabling easy versioning and tracking of saved workpieces.
 
+    A WorkpieceIndex manifest maps workpiece IDs to their files, so startup only stats the
+    storage tree and lookups by ID don't walk it. Geometry is deserialised on first access
+    and re-read when the file's mtime changes.
+
+    With binary_geometry the contour and spray pattern points are written to a float32 .npy
+    sidecar next to the JSON (see workpiece_geometry); files in either format are loaded.
+
     It expects workpieces classes to inherit from JsonSerializable to enable proper
     (de)serialization.
 """
 
-import copy
 import datetime
 import json
 import os
 import shutil
-from typing import Type
-
+import threading
+from typing import List
+
+from applications.glue_dispensing_application.model.workpiece.workpiece_geometry import geometry_path_for, \
+    is_packed, load_packed, save_geometry
+from applications.glue_dispensing_application.repositories.workpiece.workpiece_index import WorkpieceIndex, \
+    WorkpieceIndexEntry
+from modules.contour_matching.matching.descriptor_cache import get_descriptor_cache
 from modules.shared.core.interfaces.JsonSerializable import JsonSerializable
 
 
@@ -33,14 +45,15 @@ class GlueWorkpieceJsonRepository:
     FOLDER_NAME = "workpieces"
     WORKPIECE_FILE_SUFFIX = "_workpiece.json"  # Ensure the files have this suffix
 
-    def __init__(self, directory, fields, dataClass):
+    def __init__(self, directory, fields, dataClass, binary_geometry=False):
         """
-              Initializes the repository and attempts to load existing data.
+              Initializes the repository and indexes the existing workpiece files.
 
               Args:
                   baseDir (str): Root directory where the workpieces folder exists.
                   fields (list): Expected fields for workpieces validation or display.
                   dataClass (Type): Class type implementing JsonSerializable.
+                  binary_geometry (bool): Save geometry to a .npy sidecar (needs dataClass.serialize_packed).
 
               Raises:
                   TypeError: If `dataClass` is not a subclass of JsonSerializable.
@@ -52,48 +65,46 @@ class GlueWorkpieceJsonRepository:
         self.directory = directory
         self.dataClass = dataClass
         self.fields = fields
-        # check if dataClass is JsonSerializable
-
-        self.data = self.loadData()
+        self.binary_geometry = binary_geometry and hasattr(dataClass, "serialize_packed")
         self.visited_dirs = set()  # Track visited directories to avoid repetition
         if not os.path.exists(self.directory):
             print(f"Directory {self.directory} does not exist.")
             raise FileNotFoundError(f"Directory {self.directory} not found.")
 
+        self._lock = threading.RLock()
+        self._workpieces = {}  # workpiece ID -> (mtime_ns of the loaded file, deserialized workpiece)
+        self.index = WorkpieceIndex(self.directory, self.WORKPIECE_FILE_SUFFIX)
+        reread = self.index.load()
+        print(f"Indexed {len(self.index)} workpieces in {self.directory} ({reread} files re-read)")
+
+    @property
+    def data(self) -> List[JsonSerializable]:
+        """All workpieces, deserialised on first access."""
+        return self.loadData()
+
     def loadData(self):
         """
-        Recursively iterates over all directories inside the base directory, deserializes all JSON files,
-        and returns a list of objects of the provided class type (e.g., Workpiece).
+        Returns a list of objects of the provided class type (e.g., Workpiece) for every indexed
+        workpiece file. Files are only deserialized the first time or when they changed on disk.
         """
-        objects = []
-
-        # Check if the base directory exists
-        if not os.path.exists(self.directory):
-            print(f"Directory {self.directory} does not exist.")
-            return objects
-        else:
-            # print(f"Directory exists: {self.directory}")
-            pass
-        # print(f"Directory: {self.directory}")
-        # Walk through all subdirectories and files
-        for root, _, files in os.walk(self.directory):
-            # print(f"Root: {root}")
-            for file in files:
-                # print(f"File: {file}")
-                file_path = os.path.join(root, file)
-                # print(f"File Path: {file_path}")  # Debugging: check the full file path
-                try:
-                    with open(file_path, 'r') as f:
-                        data = json.load(f)  # Load JSON data
-                        print(f"Loaded Data: {data}")  # Debugging: Show the loaded data
-                        obj = self.dataClass.deserialize(data)  # Deserialize into the appropriate object
-                        # print(f"Deserialized Object: {obj}")  # Debugging: Show the deserialized object
-                        objects.append(obj)
-                except Exception as e:
-                    print(f"Error loading object from {file_path}: {e}")
-                    raise Exception(f"Error loading object: {e}")
-
-        return objects
+        with self._lock:
+            workpiece_ids = list(self.index.entries)
+            objects = [self.get_workpiece_by_id(workpiece_id) for workpiece_id in workpiece_ids]
+        return [obj for obj in objects if obj is not None]
+
+    def get_summaries(self) -> List[WorkpieceIndexEntry]:
+        """Index entries (ID, path, name, mtime, thumbnail, contour bounds) without loading any geometry."""
+        with self._lock:
+            return list(self.index.entries.values())
+
+    def refresh(self):
+        """Pick up workpiece files added, changed or removed outside the repository."""
+        with self._lock:
+            self.index.refresh()
+            for workpiece_id in list(self._workpieces):
+                if workpiece_id not in self.index:
+                    del self._workpieces[workpiece_id]
+                    get_descriptor_cache().remove(workpiece_id)
 
     def save_workpiece(self, workpiece):
         """
@@ -109,71 +120,53 @@ class GlueWorkpieceJsonRepository:
 
         print(f"WorkpieceJsonRepository.saveWorkpiece called with ID: {workpiece.workpieceId}")
 
-        # Ensure data list exists
-        if self.data is None:
-            self.data = []
-
         workpiece_id = str(workpiece.workpieceId)
 
-        # Prepare serialized data
-        serialized_data = json.dumps(self.dataClass.serialize(copy.deepcopy(workpiece)), indent=4)
-
-        # Try to find existing workpiece in memory and on disk
-        existing_index = None
-        for i, wp in enumerate(self.data):
-            if hasattr(wp, "workpieceId") and str(wp.workpieceId) == workpiece_id:
-                existing_index = i
-                break
-
-        # If exists on disk, find its file and overwrite
-        existing_file_path = None
-        if existing_index is not None:
-            for root, _, files in os.walk(self.directory):
-                for file in files:
-                    if file.endswith(self.WORKPIECE_FILE_SUFFIX):
-                        file_path = os.path.join(root, file)
-                        try:
-                            with open(file_path, "r") as f:
-                                data = json.load(f)
-                            file_workpiece_id = data.get("workpieceId") or data.get("id")
-                            if str(file_workpiece_id) == workpiece_id:
-                                existing_file_path = file_path
-                                break
-                        except Exception:
-                            continue
-                if existing_file_path:
-                    break
+        with self._lock:
+            entry = self.index.get(workpiece_id)
+            existing_file_path = self.index.absolute_path(entry) if entry is not None else None
+            if existing_file_path is not None and not os.path.exists(existing_file_path):
+                existing_file_path = None
 
-        try:
-            if existing_file_path:
-                # Overwrite existing file
-                with open(existing_file_path, "w") as f:
-                    f.write(serialized_data)
-                # Update in-memory object
-                if existing_index is not None:
-                    self.data[existing_index] = workpiece
-                return True, "Workpiece updated successfully"
-            else:
-                # Create new timestamped directory and save as new file
-                today_date = datetime.datetime.now().strftime(self.DATE_FORMAT)
-                timestamp = datetime.datetime.now().strftime(self.TIMESTAMP_FORMAT)
-                date_dir = os.path.join(self.directory, today_date)
-                timestamp_dir = os.path.join(date_dir, timestamp)
-                os.makedirs(timestamp_dir, exist_ok=True)
-                file_path = os.path.join(timestamp_dir, f"{timestamp}{self.WORKPIECE_FILE_SUFFIX}")
+            try:
+                if existing_file_path:
+                    # Overwrite existing file
+                    file_path = existing_file_path
+                    message = "Workpiece updated successfully"
+                else:
+                    # Create new timestamped directory and save as new file
+                    today_date = datetime.datetime.now().strftime(self.DATE_FORMAT)
+                    timestamp = datetime.datetime.now().strftime(self.TIMESTAMP_FORMAT)
+                    date_dir = os.path.join(self.directory, today_date)
+                    timestamp_dir = os.path.join(date_dir, timestamp)
+                    os.makedirs(timestamp_dir, exist_ok=True)
+                    file_path = os.path.join(timestamp_dir, f"{timestamp}{self.WORKPIECE_FILE_SUFFIX}")
+                    message = "Workpiece saved successfully"
+
+                # Prepare serialized data
+                geometry_path = geometry_path_for(file_path)
+                if self.binary_geometry:
+                    serialized, blob = self.dataClass.serialize_packed(workpiece, os.path.basename(geometry_path))
+                    save_geometry(geometry_path, blob)
+                    serialized_data = json.dumps(serialized, indent=4)
+                else:
+                    serialized = self.dataClass.serialize(workpiece)
+                    serialized_data = json.dumps(serialized, indent=4)
                 with open(file_path, "w") as file:
                     file.write(serialized_data)
-                # Append or replace in-memory list
-                print(f"Workpiece saved to new file: {file_path}")
-                if existing_index is not None:
-                    self.data[existing_index] = workpiece
-                else:
-                    self.data.append(workpiece)
-                return True, "Workpiece saved successfully"
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            return False, f"Error saving workpiece: {e}"
+                if not self.binary_geometry and os.path.exists(geometry_path):
+                    os.remove(geometry_path)  # replaced by the inline geometry
+                if not existing_file_path:
+                    print(f"Workpiece saved to new file: {file_path}")
+
+                self.index.update(workpiece_id, file_path, serialized)
+                self._workpieces[workpiece_id] = (self.index.get(workpiece_id).mtime_ns, workpiece)
+                get_descriptor_cache().put(workpiece)
+                return True, message
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                return False, f"Error saving workpiece: {e}"
 
     def deleteWorkpiece(self, workpieceId):
         """
@@ -184,69 +177,39 @@ class GlueWorkpieceJsonRepository:
 
         Returns:
             tuple: (bool, str) where bool indicates success, and str contains a message.
-
-        Raises:
-            Exception: If workpiece not found or deletion fails.
         """
         print(f"WorkpieceJsonRepository.deleteWorkpiece called with ID: {workpieceId}")
-        print(f"Repository data length: {len(self.data) if self.data else 'None'}")
+        workpiece_id = str(workpieceId)
         try:
-            # Find the workpiece in the data list
-            workpiece_to_delete = None
-            workpiece_index = None
-
-            for i, workpiece in enumerate(self.data):
-                if hasattr(workpiece, 'workpieceId') and str(workpiece.workpieceId) == str(workpieceId):
-                    workpiece_to_delete = workpiece
-                    workpiece_index = i
-                    print(f"Workpiece found in memory: {workpiece}")
-                    break
-
-            if workpiece_to_delete is None:
-                return False, f"Workpiece with ID '{workpieceId}' not found."
-
-            # Find and delete the corresponding file/directory on filesystem
-            file_deleted = False
-            for root, dirs, files in os.walk(self.directory):
-                for file in files:
-                    if file.endswith(self.WORKPIECE_FILE_SUFFIX):
-                        file_path = os.path.join(root, file)
-                        try:
-                            # Load the file to check if it contains our workpiece
-                            with open(file_path, 'r') as f:
-                                data = json.load(f)
-                                # Check if this file contains the workpiece we want to delete
-                                file_workpiece_id = data.get('workpieceId') or data.get('id')
-                                if str(file_workpiece_id) == str(workpieceId):
-                                    # Delete the entire timestamp directory (contains the workpiece file)
-                                    parent_dir = os.path.dirname(file_path)
-                                    shutil.rmtree(parent_dir)
-                                    print(f"Deleted workpiece directory: {parent_dir}")
-
-                                    # Check if the date directory is also empty and delete it
-                                    try:
-                                        date_dir = os.path.dirname(parent_dir)
-                                        if not os.listdir(date_dir):
-                                            os.rmdir(date_dir)
-                                            print(f"Deleted empty date directory: {date_dir}")
-                                    except OSError:
-                                        # Directory not empty or other issues, that's fine
-                                        pass
-
-                                    file_deleted = True
-                                    break
-                        except Exception as e:
-                            print(f"Error checking file {file_path}: {e}")
-                            continue
-
-                if file_deleted:
-                    break
-
-            if not file_deleted:
-                return False, f"Workpiece file for ID '{workpieceId}' not found on filesystem."
-
-            # Remove from in-memory data
-            self.data.pop(workpiece_index)
+            with self._lock:
+                entry = self.index.get(workpiece_id)
+                if entry is None:
+                    return False, f"Workpiece with ID '{workpieceId}' not found."
+
+                file_path = self.index.absolute_path(entry)
+                if not os.path.exists(file_path):
+                    self.index.remove(workpiece_id)
+                    self._workpieces.pop(workpiece_id, None)
+                    return False, f"Workpiece file for ID '{workpieceId}' not found on filesystem."
+
+                # Delete the entire timestamp directory (contains the workpiece file)
+                parent_dir = os.path.dirname(file_path)
+                shutil.rmtree(parent_dir)
+                print(f"Deleted workpiece directory: {parent_dir}")
+
+                # Check if the date directory is also empty and delete it
+                try:
+                    date_dir = os.path.dirname(parent_dir)
+                    if not os.listdir(date_dir):
+                        os.rmdir(date_dir)
+                        print(f"Deleted empty date directory: {date_dir}")
+                except OSError:
+                    # Directory not empty or other issues, that's fine
+                    pass
+
+                self.index.remove(workpiece_id)
+                self._workpieces.pop(workpiece_id, None)
+                get_descriptor_cache().remove(workpieceId)
 
             return True, f"Workpiece '{workpieceId}' deleted successfully."
 
@@ -254,6 +217,10 @@ class GlueWorkpieceJsonRepository:
             print(f"Error deleting workpiece {workpieceId}: {e}")
             return False, f"Error deleting workpiece: {str(e)}"
 
+    def delete_workpiece_by_id(self, workpieceId):
+        """Alias of deleteWorkpiece, the name BaseWorkpieceService calls."""
+        return self.deleteWorkpiece(workpieceId)
+
     def get_workpiece_by_id(self, workpieceId):
         """
         Retrieves a workpiece by its ID.
@@ -264,7 +231,39 @@ class GlueWorkpieceJsonRepository:
         Returns:
             JsonSerializable: The workpiece object if found, else None.
         """
-        for workpiece in self.data:
-            if hasattr(workpiece, 'workpieceId') and str(workpiece.workpieceId) == str(workpieceId):
-                return workpiece
-        return None
+        workpiece_id = str(workpieceId)
+        with self._lock:
+            entry = self.index.get(workpiece_id)
+            if entry is None:
+                return None
+            if self.index.is_stale(entry):
+                # Edited or removed outside the repository
+                self.refresh()
+                entry = self.index.get(workpiece_id)
+                if entry is None:
+                    return None
+
+            cached = self._workpieces.get(workpiece_id)
+            if cached is not None and cached[0] == entry.mtime_ns:
+                return cached[1]
+
+            workpiece = self._load(entry)
+            self._workpieces[workpiece_id] = (entry.mtime_ns, workpiece)
+            return workpiece
+
+    """PRIVATE METHODS SECTION"""
+
+    def _load(self, entry: WorkpieceIndexEntry):
+        file_path = self.index.absolute_path(entry)
+        try:
+            with open(file_path, 'r') as f:
+                data = json.load(f)
+            if is_packed(data):
+                data = load_packed(file_path, data)
+            obj = self.dataClass.deserialize(data)  # Deserialize into the appropriate object
+        except Exception as e:
+            print(f"Error loading object from {file_path}: {e}")
+            raise Exception(f"Error loading object: {e}")
+        # Describe it once here so matching only has to describe new contours
+        get_descriptor_cache().put(obj)
+        return obj
@@ -0,0 +1,118 @@
+"""
+Description:
+    Converts the *_workpiece.json files of a workpiece storage tree between inline JSON
+    geometry and the binary .npy geometry sidecar (see workpiece_geometry).
+
+    Every converted file is checked before it is replaced: the workpiece deserialised from the
+    new format must serialise to exactly the same data as the one from the old format. Points
+    are float32 in both, so nothing the application loads changes. The repository index picks
+    the rewritten files up by their mtime on the next start.
+
+Run from the src directory:
+    PYTHONPATH=. python -m applications.glue_dispensing_application.repositories.workpiece.migrate_workpiece_geometry \
+        <storage_dir> [--to binary|json] [--dry-run]
+"""
+import argparse
+import json
+import os
+
+from applications.glue_dispensing_application.model.workpiece.GlueWorkpiece import GlueWorkpiece
+from applications.glue_dispensing_application.model.workpiece.workpiece_geometry import geometry_path_for, \
+    inline_geometry, is_packed, load_packed, pack_geometry, save_geometry, unpack_geometry
+from applications.glue_dispensing_application.repositories.workpiece.glue_workpiece_json_repository import \
+    GlueWorkpieceJsonRepository
+
+TO_BINARY = "binary"
+TO_JSON = "json"
+
+
+def find_workpiece_files(directory):
+    suffix = GlueWorkpieceJsonRepository.WORKPIECE_FILE_SUFFIX
+    for root, _, files in os.walk(directory):
+        for file in sorted(files):
+            if file.endswith(suffix):
+                yield os.path.join(root, file)
+
+
+def migrate_file(json_path, target=TO_BINARY, dry_run=False):
+    """
+    Convert one workpiece file. Returns (json bytes before, bytes after incl. sidecar), or None
+    if the file already is in the target format.
+
+    Raises:
+        ValueError: If the converted file would not load to the same workpiece.
+    """
+    with open(json_path, "r") as f:
+        data = json.load(f)
+    geometry_path = geometry_path_for(json_path)
+    size_before = os.path.getsize(json_path) + (os.path.getsize(geometry_path) if is_packed(data) else 0)
+
+    if target == TO_BINARY:
+        if is_packed(data):
+            return None
+        converted, blob = pack_geometry(data, os.path.basename(geometry_path))
+        _verify(data, unpack_geometry(converted, blob), json_path)
+    else:
+        if not is_packed(data):
+            return None
+        blob = None
+        converted = inline_geometry(load_packed(json_path, data))
+        _verify(load_packed(json_path, data), converted, json_path)
+
+    serialized = json.dumps(converted, indent=4)
+    size_after = len(serialized.encode()) + (blob.nbytes + 128 if blob is not None else 0)
+    if dry_run:
+        return size_before, size_after
+
+    if blob is not None:
+        save_geometry(geometry_path, blob)
+    tmp_path = json_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(serialized)
+    os.replace(tmp_path, json_path)
+    if blob is None and os.path.exists(geometry_path):
+        os.remove(geometry_path)
+    return size_before, size_after
+
+
+def migrate_directory(directory, target=TO_BINARY, dry_run=False):
+    """Convert every workpiece file under directory. Returns (converted, skipped, failed, bytes before, bytes after)."""
+    converted = skipped = failed = 0
+    total_before = total_after = 0
+    for json_path in find_workpiece_files(directory):
+        try:
+            result = migrate_file(json_path, target, dry_run)
+        except Exception as e:
+            print(f"Failed to convert {json_path}: {e}")
+            failed += 1
+            continue
+        if result is None:
+            skipped += 1
+            continue
+        converted += 1
+        total_before += result[0]
+        total_after += result[1]
+    return converted, skipped, failed, total_before, total_after
+
+
+def _verify(original, converted, json_path):
+    expected = GlueWorkpiece.serialize(GlueWorkpiece.deserialize(original))
+    actual = GlueWorkpiece.serialize(GlueWorkpiece.deserialize(converted))
+    if expected != actual:
+        raise ValueError(f"Converted {json_path} does not round-trip to the same workpiece")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", help="workpiece storage directory")
+    parser.add_argument("--to", choices=[TO_BINARY, TO_JSON], default=TO_BINARY, dest="target")
+    parser.add_argument("--dry-run", action="store_true", help="verify and report sizes without writing")
+    args = parser.parse_args()
+
+    converted, skipped, failed, before, after = migrate_directory(args.directory, args.target, args.dry_run)
+    print(f"{'Would convert' if args.dry_run else 'Converted'} {converted} workpieces to {args.target} "
+          f"({before / 1e6:.1f} MB -> {after / 1e6:.1f} MB), {skipped} already {args.target}, {failed} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Description:
+    Manifest of the workpiece storage tree, kept next to the timestamped workpiece folders.
+
+    For every *_workpiece.json it records ID, path, name, mtime/size and a small summary
+    (thumbnail image in the workpiece folder, bounds of the main contour), so the repository
+    can list and look up workpieces without reading their geometry. On startup the tree is
+    scanned with stat only; files whose mtime or size changed since the manifest was written
+    are re-read to refresh their entry, everything else is taken from the manifest.
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from applications.glue_dispensing_application.model.workpiece.workpiece_geometry import is_packed, load_packed
+
+MANIFEST_FILE = "workpiece_index.json"
+MANIFEST_VERSION = 1
+THUMBNAIL_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+
+@dataclass
+class WorkpieceIndexEntry:
+    """Index entry of one workpiece file. path is relative to the storage directory."""
+    workpiece_id: str
+    path: str
+    name: Optional[str]
+    mtime_ns: int
+    size: int
+    thumbnail_path: Optional[str] = None
+    bounds: Optional[List[float]] = None  # [min_x, min_y, max_x, max_y] of the main contour
+
+
+class WorkpieceIndex:
+    """
+    ID -> WorkpieceIndexEntry map of a workpiece storage directory, persisted as MANIFEST_FILE.
+
+    Not thread safe on its own - the repository serialises access.
+    """
+
+    def __init__(self, directory, file_suffix):
+        self.directory = directory
+        self.file_suffix = file_suffix
+        self.manifest_path = os.path.join(directory, MANIFEST_FILE)
+        self.entries: Dict[str, WorkpieceIndexEntry] = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, workpiece_id):
+        return str(workpiece_id) in self.entries
+
+    def get(self, workpiece_id) -> Optional[WorkpieceIndexEntry]:
+        return self.entries.get(str(workpiece_id))
+
+    def absolute_path(self, entry: WorkpieceIndexEntry) -> str:
+        return os.path.join(self.directory, entry.path)
+
+    def load(self):
+        """Read the manifest and bring it up to date with the files on disk. Returns the number of re-read files."""
+        self.entries = self._read_manifest()
+        return self.refresh()
+
+    def refresh(self):
+        """
+        Stat every workpiece file; add new files, drop deleted ones and re-read changed ones.
+        Writes the manifest if anything changed. Returns the number of re-read files.
+        """
+        known = {entry.path: entry for entry in self.entries.values()}
+        entries = {}
+        reread = 0
+        for relative_path, stat in self._scan():
+            entry = known.get(relative_path)
+            if entry is None or entry.mtime_ns != stat.st_mtime_ns or entry.size != stat.st_size:
+                entry = self._read_entry(relative_path, stat)
+                reread += 1
+                if entry is None:
+                    continue
+            if entry.workpiece_id in entries:
+                print(f"Duplicate workpiece ID {entry.workpiece_id} in {relative_path}, "
+                      f"keeping {entries[entry.workpiece_id].path}")
+                continue
+            entries[entry.workpiece_id] = entry
+
+        changed = reread > 0 or entries.keys() != self.entries.keys()
+        self.entries = entries
+        if changed:
+            self.save()
+        return reread
+
+    def update(self, workpiece_id, absolute_path, data: dict):
+        """Record a workpiece file the repository has just written (data is its serialised content)."""
+        relative_path = os.path.relpath(absolute_path, self.directory)
+        stat = os.stat(absolute_path)
+        self.entries[str(workpiece_id)] = self._make_entry(str(workpiece_id), relative_path, stat, data)
+        self.save()
+
+    def remove(self, workpiece_id):
+        if self.entries.pop(str(workpiece_id), None) is not None:
+            self.save()
+
+    def is_stale(self, entry: WorkpieceIndexEntry) -> bool:
+        """True if the file changed (or vanished) since the entry was recorded."""
+        try:
+            stat = os.stat(self.absolute_path(entry))
+        except OSError:
+            return True
+        return stat.st_mtime_ns != entry.mtime_ns or stat.st_size != entry.size
+
+    def save(self):
+        """Write the manifest atomically (temp file + rename)."""
+        manifest = {"version": MANIFEST_VERSION, "entries": [asdict(entry) for entry in self.entries.values()]}
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    """PRIVATE METHODS SECTION"""
+
+    def _read_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, "r") as f:
+                manifest = json.load(f)
+            if manifest.get("version") != MANIFEST_VERSION:
+                return {}
+            entries = (WorkpieceIndexEntry(**entry) for entry in manifest.get("entries", []))
+            return {entry.workpiece_id: entry for entry in entries}
+        except Exception as e:
+            print(f"Ignoring unreadable workpiece index {self.manifest_path}: {e}")
+            return {}
+
+    def _scan(self):
+        """(relative path, stat) of every workpiece file, in a stable order."""
+        found = []
+        stack = [self.directory]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for dir_entry in it:
+                        if dir_entry.is_dir(follow_symlinks=False):
+                            stack.append(dir_entry.path)
+                        elif dir_entry.name.endswith(self.file_suffix):
+                            found.append((os.path.relpath(dir_entry.path, self.directory), dir_entry.stat()))
+            except OSError as e:
+                print(f"Error scanning {current}: {e}")
+        found.sort(key=lambda item: item[0])
+        return found
+
+    def _read_entry(self, relative_path, stat):
+        file_path = os.path.join(self.directory, relative_path)
+        try:
+            with open(file_path, "r") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Error indexing workpiece file {file_path}: {e}")
+            return None
+        workpiece_id = data.get("workpieceId") or data.get("id")
+        if workpiece_id is None:
+            print(f"Workpiece file {file_path} has no workpieceId, skipping")
+            return None
+        return self._make_entry(str(workpiece_id), relative_path, stat, data)
+
+    def _make_entry(self, workpiece_id, relative_path, stat, data):
+        if is_packed(data):
+            try:
+                data = load_packed(os.path.join(self.directory, relative_path), data, mmap=True)
+            except Exception as e:
+                print(f"Error reading geometry of {relative_path}: {e}")
+        return WorkpieceIndexEntry(
+            workpiece_id=workpiece_id,
+            path=relative_path,
+            name=data.get("name"),
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            thumbnail_path=self._find_thumbnail(os.path.dirname(relative_path)),
+            bounds=_contour_bounds(data.get("contour")),
+        )
+
+    def _find_thumbnail(self, relative_dir):
+        try:
+            names = sorted(os.listdir(os.path.join(self.directory, relative_dir)))
+        except OSError:
+            return None
+        for name in names:
+            if name.lower().endswith(THUMBNAIL_EXTENSIONS):
+                return os.path.join(relative_dir, name)
+        return None
+
+
+def _contour_bounds(contour) -> Optional[List[float]]:
+    """[min_x, min_y, max_x, max_y] of a serialised main contour ({"contour": points} or raw points)."""
+    try:
+        if isinstance(contour, dict):
+            contour = contour.get("contour")
+        elif isinstance(contour, list) and contour and isinstance(contour[0], dict):
+            contour = np.concatenate([np.asarray(segment.get("contour", []), dtype=float).reshape(-1, 2)
+                                      for segment in contour])
+        points = np.asarray(contour, dtype=float).reshape(-1, 2)
+    except (TypeError, ValueError, AttributeError):
+        return None
+    if points.size == 0:
+        return None
+    return [float(v) for v in (*points.min(axis=0), *points.max(axis=0))]
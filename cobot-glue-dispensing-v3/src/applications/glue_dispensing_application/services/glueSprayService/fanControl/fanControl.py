@@ -2,7 +2,7 @@
 from typing import List, Optional
 from dataclasses import dataclass
 
-from modules.modbusCommunication import ModbusController
+from modules.modbusCommunication import ModbusController, ModbusPriority
 
 
 @dataclass
@@ -118,7 +118,7 @@ class FanControl(ModbusController):
         fan_state = FanState()
         
         try:
-            client = self.getModbusClient(self.fanId)
+            client = self.getModbusClient(self.fanId, priority=ModbusPriority.SENSOR)
             current_speed, modbus_error = client.read(self.fanSpeed_address)
             client.close()
             
@@ -4,7 +4,7 @@ from dataclasses import dataclass
 
 from applications.glue_dispensing_application.services.glueSprayService.generatorControl.timer import Timer
 from modules.Statistics import Statistics
-from modules.modbusCommunication import ModbusController
+from modules.modbusCommunication import ModbusController, ModbusPriority
 from modules.utils.custom_logging import setup_logger, log_if_enabled, LoggingLevel
 
 ENABLE_LOGGING = True
@@ -148,7 +148,7 @@ class GeneratorControl(ModbusController):
         generator_state = GeneratorState()
         
         try:
-            client = self.getModbusClient(self.relaysId)
+            client = self.getModbusClient(self.relaysId, priority=ModbusPriority.SENSOR)
             
             # Read generator on/off state from register 10
             state_value, modbus_error = client.read(10)
@@ -7,7 +7,7 @@ from applications.glue_dispensing_application.services.glueSprayService.motorCon
 from applications.glue_dispensing_application.services.glueSprayService.motorControl.errorCodes import MotorErrorCode
 
 
-from modules.modbusCommunication import ModbusController
+from modules.modbusCommunication import ModbusController, ModbusPriority
 from modules.utils.custom_logging import LoggingLevel, log_if_enabled, setup_logger
 
 ENABLE_LOGGING = True
@@ -415,7 +415,7 @@ class MotorControl(ModbusController):
         # Check if we have a reusable connection
         if self._adjust_client is None or not self._adjust_client_connected:
             try:
-                self._adjust_client = self.getModbusClient(self.motorsId)
+                self._adjust_client = self.getModbusClient(self.motorsId, priority=ModbusPriority.PUMP_SPEED)
                 self._adjust_client_connected = True
                 log_if_enabled(enabled=ENABLE_LOGGING,
                               logger=motor_control_logger,
@@ -627,7 +627,7 @@ class MotorControl(ModbusController):
     def motorState(self, motor_address) -> MotorState:
         """Get single motor state as MotorState object."""
         try:
-            client = self.getModbusClient(self.motorsId)
+            client = self.getModbusClient(self.motorsId, priority=ModbusPriority.HEALTH_CHECK)
             motor_state = self.healthCheck.health_check_motor(client, motor_address)
             client.close()
             return motor_state
@@ -651,7 +651,7 @@ class MotorControl(ModbusController):
         motor_addresses = [0, 2, 4, 6]
         
         try:
-            client = self.getModbusClient(self.motorsId)
+            client = self.getModbusClient(self.motorsId, priority=ModbusPriority.HEALTH_CHECK)
             all_motors_state = self.healthCheck.health_check_all_motors(client, motor_addresses)
             client.close()
             return all_motors_state
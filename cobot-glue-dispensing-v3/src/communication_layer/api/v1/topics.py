@@ -38,6 +38,8 @@ class SystemTopics(TopicCategory):
     # Glue process state
     OPERATION_STATE = "application/operation/state"
     APPLICATION_STATE = "application/state"
+    # Message broker metrics (request: answered by the broker itself)
+    BROKER_STATS = "broker/stats"
 
 
 class RobotTopics(TopicCategory):
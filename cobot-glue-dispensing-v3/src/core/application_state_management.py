@@ -62,6 +62,7 @@ class ApplicationMessagePublisher:
         self.brightness_region_topic = VisionTopics.BRIGHTNESS_REGION
         self.robot_trajectory_image_topic = RobotTopics.TRAJECTORY_UPDATE_IMAGE
         self.trajectory_start_topic = RobotTopics.TRAJECTORY_START
+        self.broker.register_latest_value_topic(SystemTopics.APPLICATION_STATE)
 
 
     def publish_state(self, state):
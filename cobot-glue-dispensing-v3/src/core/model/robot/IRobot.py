@@ -11,6 +11,8 @@ class FeedbackCode(IntEnum):
     MOTION_ERROR = 4            # Motion could not be completed
 
 class IRobot(ABC):
+    supports_trajectory_streaming = False  # True if the spline/servo streaming methods below are implemented
+    supports_circular_moves = False  # True if move_circular is implemented
 
     @abstractmethod
     def move_cartesian(self, position, tool=0, user=0, vel=30, acc=30, blendR=0):
@@ -45,6 +47,72 @@ class IRobot(ABC):
                   list: Result from robot linear move command.
               """
 
+    def move_circular(self, via, position, tool=0, user=0, vel=30, acc=30, blendR=0):
+        """
+              Executes a circular movement through via to the specified position.
+
+              Args:
+                  via (list): Intermediate TCP pose on the arc [X, Y, Z, A, B, C].
+                  position (list): Target TCP pose [X, Y, Z, A, B, C].
+                  vel (float): Velocity percentage (0-100).
+                  acc (float): Acceleration percentage (0-100).
+                  blendR (float): Blending radius for smooth transitions.
+
+              Returns:
+                  int: 0 on success, error code otherwise.
+              """
+
+    def spline_start(self, average_time_ms=2000):
+        """
+              Opens a spline block; the following spline points are queued by the controller.
+
+              Args:
+                  average_time_ms (int): Global average transition time between points.
+
+              Returns:
+                  int: 0 on success, error code otherwise.
+              """
+
+    def spline_point(self, position, tool=0, user=0, last=False, vel=30, acc=30, blendR=0):
+        """
+              Appends one point to the open spline block.
+
+              Args:
+                  position (list): Target TCP pose [X, Y, Z, A, B, C].
+                  last (bool): True for the final point of the block.
+                  vel (float): Velocity percentage (0-100).
+
+              Returns:
+                  int: 0 on success, error code otherwise.
+              """
+
+    def spline_end(self):
+        """
+              Closes the spline block.
+              """
+
+    def servo_start(self):
+        """
+              Enters Cartesian servo mode.
+              """
+
+    def servo_cart(self, position, period=0.008):
+        """
+              Sends one absolute Cartesian servo target; expected once per period.
+
+              Args:
+                  position (list): Target TCP pose [X, Y, Z, A, B, C].
+                  period (float): Command period in seconds.
+
+              Returns:
+                  int: 0 on success, error code otherwise.
+              """
+
+    def servo_end(self):
+        """
+              Leaves Cartesian servo mode.
+              """
+
     def get_current_position(self):
         """
               Retrieves the current TCP (tool center point) position.
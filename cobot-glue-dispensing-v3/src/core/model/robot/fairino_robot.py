@@ -1,5 +1,6 @@
 import platform
 import logging
+import time
 
 from modules.utils.custom_logging import setup_logger, LoggerContext, log_info_message, log_error_message, log_debug_message
 from core.model.robot.IRobot import IRobot
@@ -16,6 +17,7 @@ else:
     raise Exception("Unsupported OS")
 
 ENABLE_LOGGING = True  # Enable or disable logging
+STATE_STREAM_MAX_AGE = 0.1  # Seconds a state-stream sample is trusted before falling back to XML-RPC
 # Initialize logger if enabled
 if ENABLE_LOGGING:
     robot_logger = setup_logger("RobotWrapper")
@@ -40,6 +42,37 @@ class TestRobotWrapper(IRobot):
         print(f"[MOCK] MoveL -> pos={position}, tool={tool}, user={user}, vel={vel}, acc={acc}, blendR={blendR}")
         return 0
 
+    supports_circular_moves = True
+
+    def move_circular(self, via, position, tool=0, user=0, vel=30, acc=30, blendR=0):
+        print(f"[MOCK] MoveC -> via={via}, pos={position}, tool={tool}, user={user}, vel={vel}, acc={acc}, blendR={blendR}")
+        return 0
+
+    # Trajectory streaming - per-point calls stay silent, only block boundaries are printed
+    supports_trajectory_streaming = True
+
+    def spline_start(self, average_time_ms=2000):
+        print(f"[MOCK] NewSplineStart -> averageTime={average_time_ms}")
+        return 0
+
+    def spline_point(self, position, tool=0, user=0, last=False, vel=30, acc=30, blendR=0):
+        return 0
+
+    def spline_end(self):
+        print("[MOCK] NewSplineEnd called")
+        return 0
+
+    def servo_start(self):
+        print("[MOCK] ServoMoveStart called")
+        return 0
+
+    def servo_cart(self, position, period=0.008):
+        return 0
+
+    def servo_end(self):
+        print("[MOCK] ServoMoveEnd called")
+        return 0
+
     def start_jog(self,axis:RobotAxis,direction:Direction,step,vel,acc):
         print(f"[MOCK] StartJOG -> axis={axis}, direction={direction}, step={step}, vel={vel}, acc={acc}")
         return 0
@@ -142,13 +175,95 @@ class FairinoRobot(IRobot):
         log_debug_message(self.logger_context, f"MoveL to {position} with tool {tool}, user {user}, vel {vel}, acc {acc}, blendR {blendR} -> result: {result}")
         return result
 
+    supports_circular_moves = True
+
+    def move_circular(self, via, position, tool=0, user=0, vel=30, acc=30, blendR=0):
+        """
+              Executes a circular movement through via to position.
+
+              Returns:
+                  int: 0 on success, error code otherwise.
+              """
+        result = self.robot.MoveC(via, tool, user, position, tool, user, vel_p=vel, acc_p=acc, vel_t=vel, acc_t=acc,
+                                  blendR=blendR)
+        log_debug_message(self.logger_context, f"MoveC via {via} to {position} with tool {tool}, user {user}, vel {vel}, acc {acc}, blendR {blendR} -> result: {result}")
+        return result
+
+    supports_trajectory_streaming = True
+
+    def spline_start(self, average_time_ms=2000):
+        """
+              Opens a NewSpline block (type 1: the given points are path points).
+
+              Returns:
+                  int: 0 on success, error code otherwise.
+              """
+        result = self.robot.NewSplineStart(1, average_time_ms)
+        log_debug_message(self.logger_context, f"NewSplineStart averageTime {average_time_ms} -> result: {result}")
+        return result
+
+    def spline_point(self, position, tool=0, user=0, last=False, vel=30, acc=30, blendR=0):
+        """
+              Appends one point to the open NewSpline block. The SDK ignores vel/acc of
+              spline points, so the velocity percentage is applied as the point's override.
+              Not logged per point - a path has thousands of them.
+
+              Returns:
+                  int: 0 on success, error code otherwise.
+              """
+        return self.robot.NewSplinePoint(position, tool, user, 1 if last else 0, ovl=vel, blendR=blendR)
+
+    def spline_end(self):
+        """
+              Closes the NewSpline block.
+              """
+        result = self.robot.NewSplineEnd()
+        log_debug_message(self.logger_context, f"NewSplineEnd -> result: {result}")
+        return result
+
+    def servo_start(self):
+        """
+              Enters servo mode for ServoCart streaming.
+              """
+        result = self.robot.ServoMoveStart()
+        log_debug_message(self.logger_context, f"ServoMoveStart -> result: {result}")
+        return result
+
+    def servo_cart(self, position, period=0.008):
+        """
+              Sends one absolute base-frame ServoCart target (mode 0) with command period period.
+
+              Returns:
+                  int: 0 on success, error code otherwise.
+              """
+        return self.robot.ServoCart(0, position, cmdT=period)
+
+    def servo_end(self):
+        """
+              Leaves servo mode.
+              """
+        result = self.robot.ServoMoveEnd()
+        log_debug_message(self.logger_context, f"ServoMoveEnd -> result: {result}")
+        return result
+
+    def get_state_stream(self):
+        """
+        The SDK's real-time state stream parser (port 20004), or None if unavailable.
+        Monitors use it to follow the robot without XML-RPC round-trips.
+        """
+        return getattr(self.robot, "state_stream", None)
+
     def get_current_position(self):
         """
               Retrieves the current TCP (tool center point) position.
+              Served from the real-time state stream when it is fresh, otherwise via XML-RPC.
 
               Returns:
                   list: Current robot TCP pose.
               """
+        state = self._fresh_stream_state()
+        if state is not None:
+            return list(state.tl_cur_pos)
         try:
             currentPose = self.robot.GetActualTCPPose()
         except Exception as e:
@@ -164,7 +279,9 @@ class FairinoRobot(IRobot):
         return currentPose
 
     def get_current_velocity(self):
-        pass
+        """Composite TCP speed (mm/s) from the real-time state stream, or None if it is stale."""
+        state = self._fresh_stream_state()
+        return float(state.actual_TCP_CmpSpeed[0]) if state is not None else None
 
     def get_current_acceleration(self):
         pass
@@ -242,6 +359,16 @@ class FairinoRobot(IRobot):
         print(f"RobotWrapper: ResetAllError called")
         return self.robot.ResetAllError()
 
+    """PRIVATE METHODS SECTION"""
+
+    def _fresh_stream_state(self):
+        stream = self.get_state_stream()
+        if stream is None or stream.latest is None or stream.latest_timestamp is None:
+            return None
+        if time.time() - stream.latest_timestamp > STATE_STREAM_MAX_AGE:
+            return None
+        return stream.latest
+
 if __name__ == "__main__":
     # robot = RobotWrapper("192.168.58.2")
     # robot.printSdkVersion()
@@ -20,6 +20,7 @@ class RobotStateManager:
         self.acceleration = 0.0
         self.robotState = RobotState.STATIONARY
         self.robotStateTopic = RobotTopics.ROBOT_STATE
+        self.broker.register_latest_value_topic(self.robotStateTopic)  # samples of a still robot are dropped
         self.monitor = robot_monitor
         self.monitor.set_data_callback(self.on_motion_data)
 
@@ -90,3 +91,22 @@ class RobotStateManager:
             "state": self.robotState
         }
 
+    def get_latest_position(self):
+        """Newest pose seen by the monitor (may be fresher than the rate-limited published state)."""
+        position = self.monitor.current_pos
+        return position if position is not None else self.position
+
+    def is_motion_done(self):
+        return self.monitor.is_motion_done()
+
+    def wait_for_sample(self, after_seq=0, timeout=None):
+        """Block until the monitor delivers a sample newer than after_seq; returns (seq, position)."""
+        return self.monitor.wait_for_sample(after_seq, timeout)
+
+    def wait_for_position(self, target, threshold, timeout, cancellation_token=None):
+        """Block until the robot is within threshold (mm) of target, woken by each monitor sample."""
+        return self.monitor.wait_for_position(target, threshold, timeout, cancellation_token)
+
+    def wait_for_motion_done(self, timeout, cancellation_token=None):
+        """Block until the monitor reports the robot as still."""
+        return self.monitor.wait_for_motion_done(timeout, cancellation_token)
@@ -8,6 +8,8 @@ from core.application.interfaces.ISubscriptionModule import ISubscriptionModule
 from core.application_state_management import SubscriptionManger
 from core.model.robot.IRobot import IRobot
 from core.services.robot_service.impl.robot_monitor.state_manager import BaseRobotServiceStateManager
+from core.services.robot_service.impl.trajectory_executor import TrajectoryExecutor, TrajectoryBackend, \
+    DEFAULT_TRAJECTORY_BACKEND
 from core.services.robot_service.interfaces.IRobotService import IRobotService
 from core.system_state_management import ServiceState
 from frontend.core.services.domain.RobotService import RobotAxis
@@ -15,6 +17,7 @@ from frontend.core.services.domain.RobotService import RobotAxis
 from core.model.robot.enums.axis import Direction
 from modules.shared.MessageBroker import MessageBroker
 from modules.utils import robot_utils
+from modules.utils.path_simplification import DEFAULT_PATH_TOLERANCE_MM
 from modules.utils.custom_logging import LoggerContext, setup_logger, log_info_message, log_debug_message
 
 ENABLE_ROBOT_SERVICE_LOGGING = True
@@ -65,6 +68,7 @@ class RobotServiceMessagePublisher:
         self.trajectory_stop_topic = RobotTopics.TRAJECTORY_STOP
         self.trajectory_break_topic = RobotTopics.TRAJECTORY_BREAK
         self.threshold_region_topic = VisionTopics.THRESHOLD_REGION
+        self.broker.register_latest_value_topic(self.state_topic)
 
     def publish_state(self,state):
         self.broker.publish(self.state_topic, state)
@@ -306,38 +310,65 @@ class RobotService(IRobotService):
 
     def _waitForRobotToReachPosition(self, endPoint, threshold, delay, timeout=1, cancellation_token=None):
         """Wait for robot to reach target position with state awareness"""
-        start_time = time.time()
         log_info_message(self.logger_context,
                          message=f"_waitForRobotToReachPosition CALLED WITH  endPoint={endPoint},threshold={threshold},delay = {delay},timeout = {timeout}")
 
-        while True:
-            print(f"RobotService: Waiting for robot to reach position {endPoint} with threshold {threshold}mm")
-            # Check cancellation token (replaces state machine dependency)
-            if cancellation_token is not None and cancellation_token.is_cancelled():
-                log_debug_message(self.logger_context,
-                                  message=f"Operation cancelled via cancellation token: {cancellation_token.get_cancellation_reason()}")
-                return False
+        # Woken by every monitor sample instead of sleep-polling the position
+        if self.robot_state_manager.wait_for_position(endPoint, threshold, timeout, cancellation_token):
+            log_debug_message(self.logger_context,
+                              message=f"Robot reached target position {endPoint} within threshold {threshold}mm")
+            return True
 
-            # Check timeout
-            if time.time() - start_time > timeout:
-                log_debug_message(self.logger_context,
-                                  message=f"Timeout reached while waiting for robot position {endPoint}")
-                return False
+        if cancellation_token is not None and cancellation_token.is_cancelled():
+            log_debug_message(self.logger_context,
+                              message=f"Operation cancelled via cancellation token: {cancellation_token.get_cancellation_reason()}")
+        else:
+            log_debug_message(self.logger_context,
+                              message=f"Timeout reached while waiting for robot position {endPoint}")
+        return False
+
+    def is_motion_complete(self):
+        """True while the robot reports no motion (controller in-position flag when streamed)."""
+        return self.robot_state_manager.is_motion_done()
+
+    def wait_for_robot_sample(self, after_seq=0, timeout=None):
+        """
+        Block until the robot monitor delivers a pose newer than after_seq.
 
-            # Check position
-            current_position = self.get_current_position()
-            if current_position is None:
-                time.sleep(0.1)
-                continue
+        Returns:
+            tuple: (sample_seq, position), or (after_seq, None) on timeout
+        """
+        return self.robot_state_manager.wait_for_sample(after_seq, timeout)
 
-            distance = robot_utils.calculate_distance_between_points(current_position, endPoint)
+    def wait_for_motion_complete(self, timeout, cancellation_token=None):
+        """Block until the robot stops moving; returns False on timeout or cancellation."""
+        return self.robot_state_manager.wait_for_motion_done(timeout, cancellation_token)
 
-            if distance < threshold:
-                log_debug_message(self.logger_context,
-                                  message=f"Robot reached target position {endPoint} within threshold {threshold}mm")
-                return True
+    def execute_trajectory(self, path, velocity, acceleration, blend_radius=1, index_offset=0,
+                           cancellation_token=None, on_progress=None, backend=None,
+                           arc_tolerance=DEFAULT_PATH_TOLERANCE_MM):
+        """
+        Hand a whole path to the robot in one go (NewSpline block or ServoCart stream when the
+        robot supports streaming, blended MoveL/MoveC segments fitted within arc_tolerance mm
+        otherwise - arc_tolerance only applies to that fallback). Returns once every point has been sent - use wait_for_motion_complete() to
+        wait for the motion itself.
 
-            time.sleep(0.01)
+        Returns:
+            TrajectoryResult: error code, resume index, upload time and largest command gap
+        """
+        if backend is None:
+            backend = DEFAULT_TRAJECTORY_BACKEND if getattr(self.robot, "supports_trajectory_streaming", False) \
+                else TrajectoryBackend.MOVE_L
+        executor = TrajectoryExecutor(self.robot, backend, arc_tolerance=arc_tolerance)
+        result = executor.execute(path, tool=self.robot_config.robot_tool, user=self.robot_config.robot_user,
+                                  velocity=velocity, acceleration=acceleration, blend_radius=blend_radius,
+                                  index_offset=index_offset, cancellation_token=cancellation_token,
+                                  on_progress=on_progress)
+        log_debug_message(self.logger_context,
+                          message=f"Trajectory ({executor.backend.value}) sent {result.commands_sent} commands in "
+                                  f"{result.upload_time * 1000:.1f} ms, largest gap {result.max_command_gap * 1000:.1f} ms"
+                                  f" -> code {result.code}, cancelled {result.cancelled}")
+        return result
 
     def add_subscription_module(self, module: "ISubscriptionModule"):
         """
@@ -361,7 +392,7 @@ class RobotService(IRobotService):
 
     def get_current_position(self):
         """Get current robot position"""
-        return self.robot_state_manager.position
+        return self.robot_state_manager.get_latest_position()
         # return self.robot.getCurrentPosition()
 
     def enable_robot(self):
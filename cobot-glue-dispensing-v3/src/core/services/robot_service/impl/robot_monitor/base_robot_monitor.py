@@ -3,6 +3,10 @@ import time
 from abc import abstractmethod
 
 from core.services.robot_service.interfaces.IRobotMonitor import IRobotMonitor
+from modules.utils import robot_utils
+
+MOTION_DONE_SPEED = 1.0  # mm/s below which a polled robot is considered still (matches RobotStateManager)
+CANCEL_CHECK_INTERVAL = 0.05  # Longest a wait sleeps before re-checking its cancellation token
 
 
 class BaseRobotMonitor(IRobotMonitor):
@@ -14,11 +18,16 @@ class BaseRobotMonitor(IRobotMonitor):
         self.current_velocity = 0.0
         self.current_acceleration = 0.0
         self.current_pos = None
+        self.timestamp = None
 
         self.prev_velocity = None
         self.prev_pos = None
         self.prev_time = None
 
+        # Every new sample bumps sample_seq and wakes the waiters (pose changed / motion done events)
+        self._sample_condition = threading.Condition()
+        self.sample_seq = 0
+
     def run(self):
         """Continuous motion data collection loop."""
         while not self._stop_event.is_set():
@@ -42,6 +51,7 @@ class BaseRobotMonitor(IRobotMonitor):
 
                 # Send motion data back to manager
                 self.data_callback(self.current_pos, self.current_velocity, self.current_acceleration, current_time)
+                self._notify_sample(current_time)
 
                 self.prev_pos = self.current_pos
                 self.prev_time = current_time
@@ -61,6 +71,53 @@ class BaseRobotMonitor(IRobotMonitor):
         self._stop_event.set()
         self._thread.join()
 
+    def is_motion_done(self) -> bool:
+        """True while the robot is not moving. Monitors with a controller flag override this."""
+        return self.current_pos is not None and abs(self.current_velocity or 0.0) < MOTION_DONE_SPEED
+
+    def wait_for_sample(self, after_seq: int = 0, timeout: float = None):
+        """
+        Block until a sample newer than after_seq arrives ("pose changed" event).
+
+        Returns:
+            tuple: (sample_seq, position), or (after_seq, None) on timeout
+        """
+        with self._sample_condition:
+            if not self._sample_condition.wait_for(lambda: self.sample_seq > after_seq, timeout=timeout):
+                return after_seq, None
+            return self.sample_seq, self.current_pos
+
+    def wait_until(self, predicate, timeout: float, cancellation_token=None) -> bool:
+        """
+        Evaluate predicate on every new sample until it holds.
+        Returns False on timeout or when the cancellation token is cancelled.
+        """
+        deadline = time.monotonic() + timeout
+        with self._sample_condition:
+            while True:
+                if predicate():
+                    return True
+                if cancellation_token is not None and cancellation_token.is_cancelled():
+                    return False
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._sample_condition.wait(min(remaining, CANCEL_CHECK_INTERVAL))
+
+    def wait_for_position(self, target, threshold: float, timeout: float, cancellation_token=None) -> bool:
+        """Wait until the TCP is within threshold (mm) of target."""
+        def reached():
+            return self.current_pos is not None and \
+                robot_utils.calculate_distance_between_points(self.current_pos, target) < threshold
+
+        return self.wait_until(reached, timeout, cancellation_token)
+
+    def wait_for_motion_done(self, timeout: float, cancellation_token=None) -> bool:
+        """Wait until a sample received after this call reports the robot as still."""
+        start_seq = self.sample_seq
+        return self.wait_until(lambda: self.sample_seq > start_seq and self.is_motion_done(),
+                               timeout, cancellation_token)
+
     @abstractmethod
     def get_current_position(self):
         raise NotImplementedError
@@ -71,4 +128,12 @@ class BaseRobotMonitor(IRobotMonitor):
 
     @abstractmethod
     def get_current_acceleration(self):
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    """PRIVATE METHODS SECTION"""
+
+    def _notify_sample(self, timestamp):
+        with self._sample_condition:
+            self.timestamp = timestamp
+            self.sample_seq += 1
+            self._sample_condition.notify_all()
@@ -0,0 +1,72 @@
+import time
+
+from modules.utils import robot_utils
+from core.model.robot import fairino_robot
+from core.services.robot_service.impl.robot_monitor.base_robot_monitor import BaseRobotMonitor
+
+FRAME_TIMEOUT = 0.5  # Seconds without a state frame before the monitor reports an error
+CONTROLLER_STOPPED = 1  # RobotStatePkg.robot_state: 1-stopped, 2-running, 3-paused, 4-drag
+
+
+class FairinoStateStreamMonitor(BaseRobotMonitor):
+    """
+    Follows the robot through the SDK's real-time state stream (port 20004) instead of
+    polling GetActualTCPPose over XML-RPC.
+
+    Pose, composite TCP speed and the controller's in-position flag are taken from every
+    frame (~8 ms), so waiters on pose/motion-done events react at the controller rate. The
+    data callback to the RobotStateManager is still rate limited to cycle_time.
+    """
+
+    def __init__(self, robot_ip, cycle_time=0.03, robot=None):
+        super().__init__(cycle_time=cycle_time)
+        if robot is None:
+            robot = fairino_robot.FairinoRobot(robot_ip)
+        self.robot = robot  # shares the robot's SDK connection - no second RPC/state socket
+        self.stream = robot.get_state_stream()
+        if self.stream is None:
+            raise ValueError(f"{type(robot).__name__} has no real-time state stream")
+        self.controller_motion_done = False
+        self.state = None  # newest RobotStatePkg
+
+    def run(self):
+        """Follow the state stream; one iteration per controller frame."""
+        seq = 0
+        last_callback = 0.0
+        while not self._stop_event.is_set():
+            seq, state = self.stream.wait_for_newer(seq, timeout=FRAME_TIMEOUT)
+            current_time = time.time()
+            if state is None:
+                print(f"ERROR: No robot state frame for {FRAME_TIMEOUT}s")
+                self.data_callback(None, None, None, current_time, error=True)
+                continue
+
+            self.state = state
+            self.current_pos = list(state.tl_cur_pos)
+            self.current_velocity = float(state.actual_TCP_CmpSpeed[0])
+            self.controller_motion_done = state.motion_done == 1 and state.robot_state == CONTROLLER_STOPPED
+            self._notify_sample(self.stream.latest_timestamp or current_time)
+
+            if current_time - last_callback < self.cycle_time:
+                continue
+            if self.prev_velocity is not None:
+                self.dt = current_time - self.prev_time
+                self.current_acceleration = self.get_current_acceleration()
+            self.data_callback(self.current_pos, self.current_velocity, self.current_acceleration, current_time)
+            last_callback = current_time
+            self.prev_pos = self.current_pos
+            self.prev_time = current_time
+            self.prev_velocity = self.current_velocity
+
+    def is_motion_done(self) -> bool:
+        return self.controller_motion_done
+
+    def get_current_position(self):
+        return self.current_pos
+
+    def get_current_velocity(self):
+        return self.current_velocity
+
+    def get_current_acceleration(self):
+        # Same per-sample difference the polling monitors report
+        return robot_utils.calculate_acceleration(self.current_velocity, self.prev_velocity, self.dt, use_dt=False)
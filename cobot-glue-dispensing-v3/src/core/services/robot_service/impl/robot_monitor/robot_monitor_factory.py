@@ -11,10 +11,13 @@ import logging
 from core.model.robot.robot_types import RobotType
 from core.services.robot_service.interfaces.IRobotMonitor import IRobotMonitor
 from .fairino_monitor import FairinoRobotMonitor
+from .fairino_stream_monitor import FairinoStateStreamMonitor
 from .zero_error_monitor import ZeroErrorRobotMonitor
 
 logger = logging.getLogger(__name__)
 
+USE_STATE_STREAM_MONITOR = True  # Follow Fairino robots through the SDK state stream instead of XML-RPC polling
+
 
 class RobotMonitorCreationError(Exception):
     """Raised when robot monitor creation fails"""
@@ -50,6 +53,9 @@ class RobotMonitorFactory:
             logger.info(f"Creating robot monitor for type: {robot_type.value} with IP: {robot_ip}")
             
             if robot_type == RobotType.FAIRINO:
+                if USE_STATE_STREAM_MONITOR and robot is not None and hasattr(robot, "get_state_stream") \
+                        and robot.get_state_stream() is not None:
+                    return FairinoStateStreamMonitor(robot_ip, cycle_time, robot, **kwargs)
                 return FairinoRobotMonitor(robot_ip, cycle_time, **kwargs)
             
             elif robot_type == RobotType.ZERO_ERROR:
@@ -0,0 +1,231 @@
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Optional
+
+import numpy as np
+
+from modules.utils.path_simplification import MotionType, fit_primitives
+
+DEFAULT_TRAJECTORY_BACKEND = "spline"  # Backend used for robots that support trajectory streaming
+SERVO_PERIOD = 0.008  # Seconds between ServoCart commands (the controller's cycle)
+SPLINE_AVERAGE_TIME_MS = 500  # NewSplineStart global average transition time
+PROGRESS_INTERVAL = 10  # Points between progress reports
+
+
+class TrajectoryBackend(Enum):
+    MOVE_L = "move_l"  # one blended MoveL per point (legacy)
+    SPLINE = "spline"  # NewSplineStart / NewSplinePoint... / NewSplineEnd
+    SERVO = "servo"  # ServoMoveStart, ServoCart at a fixed period, ServoMoveEnd
+
+
+@dataclass
+class TrajectoryProgress:
+    point_index: int  # path index (with index_offset) of the last point handed to the controller
+    points_total: int
+    commands_sent: int
+    elapsed: float
+
+
+@dataclass
+class TrajectoryResult:
+    code: int  # 0 on success, otherwise the robot's error code
+    next_index: int  # first path index (with index_offset) not yet handed to the controller
+    cancelled: bool
+    commands_sent: int
+    upload_time: float  # seconds from the first to the last command
+    max_command_gap: float  # longest interval between two consecutive commands
+
+
+class TrajectoryExecutor:
+    """
+    Hands a whole path to the robot as one streamed trajectory.
+
+    SPLINE uploads the points back to back inside a NewSpline block; the controller
+    queues them and moves while the rest is still being sent, so the RPC latency is
+    hidden behind the motion instead of appearing between points. SERVO resamples the
+    path by arc length to one target per servo period at the requested TCP speed and
+    sends them on a fixed schedule. MOVE_L keeps the per-point MoveL behaviour for
+    robots without streaming support; with an arc_tolerance it fits the path with
+    MoveL/MoveC segments first and sends one command per segment. The fitting is a
+    fallback only: streaming robots use SPLINE or SERVO, which take every point.
+
+    The cancellation token is checked before every command; a cancelled run returns the
+    index to resume from.
+    """
+
+    def __init__(self, robot, backend=DEFAULT_TRAJECTORY_BACKEND, servo_period: float = SERVO_PERIOD,
+                 spline_average_time_ms: int = SPLINE_AVERAGE_TIME_MS, progress_interval: int = PROGRESS_INTERVAL,
+                 arc_tolerance: Optional[float] = None):
+        self.robot = robot
+        self.backend = TrajectoryBackend(backend)
+        self.arc_tolerance = arc_tolerance  # mm; MOVE_L only, None sends every point
+        self.servo_period = servo_period
+        self.spline_average_time_ms = spline_average_time_ms
+        self.progress_interval = max(1, progress_interval)
+
+    def execute(self, path, tool: int, user: int, velocity: float, acceleration: float, blend_radius: float = 1,
+                index_offset: int = 0, cancellation_token=None,
+                on_progress: Optional[Callable[[TrajectoryProgress], None]] = None) -> TrajectoryResult:
+        """
+        Args:
+            path: sequence of [x, y, z, rx, ry, rz] poses
+            velocity: percentage for MOVE_L / SPLINE, TCP speed in mm/s for SERVO
+            index_offset: index of path[0] in the caller's numbering (used in progress and results)
+        """
+        points = [list(map(float, point)) for point in path]  # converted once, not per RPC
+        run = _Run(len(points), index_offset, cancellation_token, on_progress, self.progress_interval)
+        if not points:
+            return run.result(0)
+        if self.backend is TrajectoryBackend.SPLINE:
+            return self._execute_spline(points, tool, user, velocity, acceleration, blend_radius, run)
+        if self.backend is TrajectoryBackend.SERVO:
+            return self._execute_servo(points, velocity, run)
+        return self._execute_move_l(points, tool, user, velocity, acceleration, blend_radius, run)
+
+    """PRIVATE METHODS SECTION"""
+
+    def _execute_move_l(self, points, tool, user, velocity, acceleration, blend_radius, run):
+        if self.arc_tolerance and getattr(self.robot, "supports_circular_moves", False):
+            return self._execute_primitives(points, tool, user, velocity, acceleration, blend_radius, run)
+        for i, point in enumerate(points):
+            if run.cancelled():
+                return run.result(0, cancelled=True)
+            ret = self.robot.move_liner(position=point, tool=tool, user=user, vel=velocity, acc=acceleration,
+                                        blendR=blend_radius)
+            run.sent(i)
+            if ret != 0:
+                return run.result(ret, failed_index=i)
+        return run.result(0)
+
+    def _execute_primitives(self, points, tool, user, velocity, acceleration, blend_radius, run):
+        if run.cancelled():
+            return run.result(0, cancelled=True)
+        # The segments start at points[0], so it is approached with a plain MoveL first
+        ret = self.robot.move_liner(position=points[0], tool=tool, user=user, vel=velocity, acc=acceleration,
+                                    blendR=blend_radius)
+        run.sent(0)
+        if ret != 0:
+            return run.result(ret, failed_index=0)
+        segment_start = 0
+        for primitive in fit_primitives(points, self.arc_tolerance):
+            if run.cancelled():
+                return run.result(0, cancelled=True)
+            target = points[primitive.end_index]
+            if primitive.kind is MotionType.MOVE_C:
+                ret = self.robot.move_circular(points[primitive.via_index], target, tool=tool, user=user,
+                                               vel=velocity, acc=acceleration, blendR=blend_radius)
+            else:
+                ret = self.robot.move_liner(position=target, tool=tool, user=user, vel=velocity, acc=acceleration,
+                                            blendR=blend_radius)
+            if ret != 0:
+                return run.result(ret, failed_index=segment_start + 1)
+            run.sent(primitive.end_index)
+            segment_start = primitive.end_index
+        return run.result(0)
+
+    def _execute_spline(self, points, tool, user, velocity, acceleration, blend_radius, run):
+        ret = self.robot.spline_start(self.spline_average_time_ms)
+        if ret != 0:
+            return run.result(ret, failed_index=0)
+        try:
+            last = len(points) - 1
+            for i, point in enumerate(points):
+                if run.cancelled():
+                    return run.result(0, cancelled=True)
+                ret = self.robot.spline_point(point, tool, user, last=(i == last), vel=velocity, acc=acceleration,
+                                              blendR=blend_radius)
+                run.sent(i)
+                if ret != 0:
+                    return run.result(ret, failed_index=i)
+            return run.result(0)
+        finally:
+            self.robot.spline_end()
+
+    def _execute_servo(self, points, speed_mm_s, run):
+        targets, point_indices = resample_by_arc_length(np.asarray(points), speed_mm_s * self.servo_period)
+        ret = self.robot.servo_start()
+        if ret != 0:
+            return run.result(ret, failed_index=0)
+        try:
+            next_tick = time.perf_counter()
+            for target, point_index in zip(targets.tolist(), point_indices.tolist()):
+                if run.cancelled():
+                    return run.result(0, cancelled=True)
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                elif -delay > self.servo_period:
+                    next_tick = time.perf_counter()  # fell behind - don't burst to catch up
+                ret = self.robot.servo_cart(target, self.servo_period)
+                run.sent(point_index)
+                if ret != 0:
+                    return run.result(ret, failed_index=point_index)
+                next_tick += self.servo_period
+            return run.result(0)
+        finally:
+            self.robot.servo_end()
+
+
+def resample_by_arc_length(points: np.ndarray, step_mm: float):
+    """
+    Resample (N, 6) poses to equally spaced (step_mm along the xyz path) targets.
+    Orientations are unwrapped before interpolation so ±180° crossings stay continuous.
+
+    Returns:
+        tuple: ((M, 6) targets ending exactly on the last point, (M,) index of the
+        last input point at or before each target)
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if len(points) < 2 or step_mm <= 0:
+        return points.copy(), np.arange(len(points))
+    arc = np.concatenate(([0.0], np.cumsum(np.linalg.norm(np.diff(points[:, :3], axis=0), axis=1))))
+    samples = np.arange(step_mm, arc[-1], step_mm)
+    samples = np.append(samples, arc[-1])
+    poses = points.copy()
+    poses[:, 3:] = np.degrees(np.unwrap(np.radians(poses[:, 3:]), axis=0))
+    targets = np.column_stack([np.interp(samples, arc, poses[:, k]) for k in range(poses.shape[1])])
+    targets[:, 3:] = 180.0 - (180.0 - targets[:, 3:]) % 360.0  # back to (-180, 180]
+    segment = np.clip(np.searchsorted(arc, samples, side="right") - 1, 0, len(points) - 1)
+    return targets, segment
+
+
+class _Run:
+    """Bookkeeping of one execute() call: progress, cancellation and timing."""
+
+    def __init__(self, total, index_offset, cancellation_token, on_progress, progress_interval):
+        self.total = total
+        self.index_offset = index_offset
+        self.cancellation_token = cancellation_token
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self.commands = 0
+        self.last_index = -1
+        self.first_command = None
+        self.last_command = None
+        self.max_gap = 0.0
+        self.started = time.perf_counter()
+
+    def cancelled(self) -> bool:
+        return self.cancellation_token is not None and self.cancellation_token.is_cancelled()
+
+    def sent(self, index: int):
+        now = time.perf_counter()
+        if self.last_command is not None:
+            self.max_gap = max(self.max_gap, now - self.last_command)
+        else:
+            self.first_command = now
+        self.last_command = now
+        self.commands += 1
+        advanced = index != self.last_index
+        self.last_index = index
+        if self.on_progress is not None and advanced and \
+                (index % self.progress_interval == 0 or index == self.total - 1):
+            self.on_progress(TrajectoryProgress(point_index=index + self.index_offset, points_total=self.total,
+                                                commands_sent=self.commands, elapsed=now - self.started))
+
+    def result(self, code, cancelled=False, failed_index=None) -> TrajectoryResult:
+        next_index = failed_index if failed_index is not None else self.last_index + 1
+        upload_time = (self.last_command - self.first_command) if self.first_command is not None else 0.0
+        return TrajectoryResult(code=code, next_index=next_index + self.index_offset, cancelled=cancelled,
+                                commands_sent=self.commands, upload_time=upload_time, max_command_gap=self.max_gap)
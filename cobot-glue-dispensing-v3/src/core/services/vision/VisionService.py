@@ -8,8 +8,15 @@ import os
 import json
 import cv2
 import threading
+import time
 from pathlib import Path
 from modules.shared.MessageBroker import MessageBroker
+from core.services.vision.frame_ring_buffer import FrameRingBuffer
+from modules.VisionSystem.vision_pipeline import VisionPipeline
+
+FRAME_RING_SLOTS = 4  # Frames kept in the ring - readers' views stay valid for FRAME_RING_SLOTS - 2 further frames
+# Run capture / correction / contour detection on separate threads instead of one sequential loop
+ENABLE_PIPELINED_VISION = False
 
 
 
@@ -24,6 +31,7 @@ class _VisionService(VisionSystem):
     Attributes:
         MAX_QUEUE_SIZE (int): Maximum number of frames to store in the queue.
         frameQueue (queue.Queue): A queue to store the most recent frames for processing.
+        frame_ring (FrameRingBuffer): Preallocated ring holding the latest frames, shared by all frame consumers.
         contours (list): Detected contours in the current frame.
         workAreaCorners (dict): Coordinates defining the workpieces pickup area.
         filteredContours (list): Contours that are filtered based on the work area.
@@ -66,8 +74,12 @@ class _VisionService(VisionSystem):
         self.MAX_QUEUE_SIZE = 100  # Maximum number of frames to store in the queue
         self.frameQueue = queue.Queue(maxsize=self.MAX_QUEUE_SIZE)
         self.superRun = super().run
-        self.latest_frame = None
+        self.frame_ring = FrameRingBuffer(slots=FRAME_RING_SLOTS)
         self.frame_lock = threading.Lock()
+        # Latest-image subscribers (dashboard) are fed from the ring on their own thread,
+        # so a slow UI only drops frames instead of stalling capture
+        self.message_publisher.attach_frame_ring(self.frame_ring)
+        self.pipeline = None
 
         self.contours = None
         self.workAreaCorners = None
@@ -177,29 +189,101 @@ class _VisionService(VisionSystem):
         #     # print("No workAreaCorners found. Set them first.")
         #     pass
 
+        if ENABLE_PIPELINED_VISION:
+            self.pipeline = VisionPipeline(self, on_result=self._on_frame_processed)
+            self.pipeline.start()
+            self.pipeline.join()
+            return
+
         while True:
+            capture_time = time.monotonic()
             self.contours, frame, _ = super().run()
             if frame is None:
                 continue
 
-            with self.frame_lock:
-                self.latest_frame = frame
+            self.frame_ring.write(frame, captured_at=capture_time)
+
+    def _on_frame_processed(self, contours, frame, capture_time):
+        # Called from the pipeline's detection stage for every finished frame
+        self.contours = contours
+        self.frame_ring.write(frame, captured_at=capture_time)
+
+    def getPipelineStats(self):
+        """
+            Returns per-stage latency and FPS of the pipelined vision loop.
+
+            Returns:
+                dict or None: Stage statistics, or None when the sequential loop is used.
+            """
+        if self.pipeline is None:
+            return None
+        return self.pipeline.get_stats()
+
+    @property
+    def latest_frame(self):
+        """Read-only view of the newest BGR frame in the ring (None before the first frame)."""
+        _, frame = self.frame_ring.latest()
+        return frame
 
     def getLatestFrame(self):
         """
-            Retrieves the latest frame from the queue.
+            Retrieves the latest frame from the frame ring.
 
             Returns:
-                numpy.ndarray or None: The most recent frame, or None if the queue is empty.
+                numpy.ndarray or None: The most recent frame converted to RGB, or None if no frame was captured yet.
             """
+        _, frame = self.frame_ring.latest()
+        if frame is None:
+            return None
+        # convert to RGB before returning - the conversion also gives the caller its own writable copy
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
 
-        with self.frame_lock:
-            if self.latest_frame is None:
-                return None
-            # convert to RGB before returning
-            return cv2.cvtColor(self.latest_frame, cv2.COLOR_BGR2RGB)
+    def getLatestFrameView(self):
+        """
+            Returns the newest BGR frame without copying it.
 
-        return frame
+            Returns:
+                tuple: (seq, numpy.ndarray or None) - the frame sequence number and a read-only view
+                of the frame. The view is only valid while frame_ring.is_current(seq) is True.
+            """
+        return self.frame_ring.latest()
+
+    def waitForNewFrame(self, after_seq=0, timeout=None):
+        """
+            Blocks until a frame newer than after_seq has been captured.
+
+            Args:
+                after_seq (int): Sequence number of the last frame the caller has seen (0 - any frame).
+                timeout (float): Maximum time to wait in seconds, None to wait indefinitely.
+
+            Returns:
+                tuple: (seq, numpy.ndarray or None) - the sequence number and the frame converted to RGB,
+                or (after_seq, None) on timeout.
+            """
+        seq, frame = self.frame_ring.wait_for_newer(after_seq, timeout)
+        if frame is None:
+            return seq, None
+        return seq, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+    def waitForFrameCapturedAfter(self, timestamp, timeout=None):
+        """
+            Blocks until the newest frame was captured after timestamp.
+
+            Used after robot moves: a frame that is merely newer than the move may still have
+            been exposed during the motion and only left the processing pipeline afterwards.
+
+            Args:
+                timestamp (float): time.monotonic() the frame's capture has to start after.
+                timeout (float): Maximum time to wait in seconds, None to wait indefinitely.
+
+            Returns:
+                tuple: (seq, numpy.ndarray or None) - the sequence number and the frame converted to RGB,
+                or (seq, None) on timeout.
+            """
+        seq, frame = self.frame_ring.wait_for_captured_after(timestamp, timeout)
+        if frame is None:
+            return seq, None
+        return seq, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
 
     def getContours(self):
         """
@@ -0,0 +1,145 @@
+import threading
+import time
+
+import numpy as np
+
+
+class FrameRingBuffer:
+    """
+    Preallocated N-slot ring of camera frames shared between one producer and many consumers.
+
+    The capture thread copies each frame into the next slot in place (no per-frame
+    allocation) and tags it with a monotonically increasing sequence number.
+    Consumers never block the producer: they either take a read-only view of the
+    newest frame or wait for "a frame newer than seq X". Slow consumers simply
+    skip the frames they were too slow to see.
+
+    A view stays valid until the producer wraps around the ring and reuses its slot,
+    i.e. for the next ``slots - 1`` frames. Consumers that hold on to a frame longer
+    than that should copy it, or check ``is_current(seq)`` after using it.
+    """
+
+    def __init__(self, slots: int = 4):
+        if slots < 2:
+            raise ValueError("FrameRingBuffer needs at least 2 slots")
+        self.slots = slots
+        self._buffers = [None] * slots
+        self._views = [None] * slots
+        self._slot_seq = [0] * slots
+        self._slot_captured_at = [None] * slots
+        self._seq = 0
+        self._timestamp = None
+        self._condition = threading.Condition()
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the newest frame (0 when nothing was written yet)."""
+        return self._seq
+
+    @property
+    def timestamp(self):
+        """Monotonic time at which the newest frame was written."""
+        return self._timestamp
+
+    @property
+    def captured_at(self):
+        """Monotonic capture time of the newest frame (None when nothing was written yet)."""
+        return self._slot_captured_at[self._seq % self.slots] if self._seq else None
+
+    def write(self, frame: np.ndarray, captured_at: float = None) -> int:
+        """
+        Copy a frame into the next slot and publish it to waiting consumers.
+
+        Args:
+            frame: the frame to store
+            captured_at: time.monotonic() at which the camera read of this frame started.
+                Frames that went through a processing pipeline are written well after they
+                were captured; defaults to the write time.
+
+        Returns:
+            int: the sequence number assigned to the frame
+        """
+        next_seq = self._seq + 1
+        index = next_seq % self.slots
+
+        buffer = self._buffers[index]
+        if buffer is None or buffer.shape != frame.shape or buffer.dtype != frame.dtype:
+            # First frame or resolution change - (re)allocate this slot
+            buffer = np.empty_like(frame)
+            view = buffer.view()
+            view.flags.writeable = False
+            self._buffers[index] = buffer
+            self._views[index] = view
+
+        np.copyto(buffer, frame)
+
+        with self._condition:
+            self._timestamp = time.monotonic()
+            self._slot_seq[index] = next_seq
+            self._slot_captured_at[index] = self._timestamp if captured_at is None else captured_at
+            self._seq = next_seq
+            self._condition.notify_all()
+        return next_seq
+
+    def latest(self):
+        """
+        Returns:
+            tuple: (seq, read-only view of the newest frame), or (0, None) if empty
+        """
+        with self._condition:
+            return self._latest_locked()
+
+    def wait_for_newer(self, after_seq: int = 0, timeout: float = None):
+        """
+        Block until a frame with a sequence number greater than ``after_seq`` is available.
+
+        Returns:
+            tuple: (seq, read-only view), or (after_seq, None) on timeout
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._seq > after_seq, timeout=timeout):
+                return after_seq, None
+            return self._latest_locked()
+
+    def wait_for_captured_after(self, timestamp: float, timeout: float = None):
+        """
+        Block until the newest frame was captured after ``timestamp`` (time.monotonic()).
+
+        Unlike wait_for_newer this skips frames that were already in flight through the
+        processing pipeline at ``timestamp`` - e.g. frames exposed while the robot moved.
+
+        Returns:
+            tuple: (seq, read-only view), or (seq of the newest frame, None) on timeout
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._newest_captured_after(timestamp), timeout=timeout):
+                return self._seq, None
+            return self._latest_locked()
+
+    def is_current(self, seq: int) -> bool:
+        """True while the slot holding frame ``seq`` has not been overwritten."""
+        # The producer fills slot seq+1 before bumping self._seq, so one slot
+        # beyond the newest frame may already be in the middle of a write
+        return seq > 0 and self._seq - seq < self.slots - 1
+
+    def clear(self):
+        with self._condition:
+            self._buffers = [None] * self.slots
+            self._views = [None] * self.slots
+            self._slot_seq = [0] * self.slots
+            self._slot_captured_at = [None] * self.slots
+            self._timestamp = None
+
+    """PRIVATE METHODS SECTION"""
+
+    def _newest_captured_after(self, timestamp):
+        captured_at = self._slot_captured_at[self._seq % self.slots] if self._seq else None
+        return captured_at is not None and captured_at > timestamp
+
+    def _latest_locked(self):
+        if self._seq == 0:
+            return 0, None
+        index = self._seq % self.slots
+        if self._slot_seq[index] != self._seq:
+            return self._seq, None
+        return self._seq, self._views[index]
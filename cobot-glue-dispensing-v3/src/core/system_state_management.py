@@ -89,6 +89,7 @@ class SystemStateManager:
         self.system_state: SystemState = SystemState.UNKNOWN
         self.subscribers: list[Callable] = []
         self.broker=broker
+        self.broker.register_latest_value_topic("system/state")  # the 1s tick only publishes changes
         self.system_state_publisher = None
         self.__register_all_services()
 
@@ -1,10 +1,17 @@
 from PyQt6.QtGui import QColor
 
+from modules.utils.path_simplification import DEFAULT_PATH_TOLERANCE_MM
+
 # ============================================================================
 # CAMERA FEED CONSTANTS
 # ============================================================================
 CAMERA_FEED_UPDATE_INTERVAL_MS = 100  # Update camera feed every 100 ms
 
+# ============================================================================
+# ROBOT PATH EXPORT
+# ============================================================================
+ROBOT_PATH_TOLERANCE = DEFAULT_PATH_TOLERANCE_MM  # Points closer than this to the simplified path are dropped; 0 keeps all
+
 # ============================================================================
 # MODE CONSTANTS
 # ============================================================================
@@ -1,6 +1,8 @@
 from matplotlib import pyplot as plt
 from PyQt6.QtWidgets import QMessageBox
 
+from frontend.contour_editor.constants import ROBOT_PATH_TOLERANCE
+
 
 class DataExportManager:
     def __init__(self, editor):
@@ -22,9 +24,9 @@ class DataExportManager:
 
         return robot_path_dict
 
-    def save_robot_path_to_txt(self, filename="robot_path.txt", samples_per_segment=5):
-        """Save robot path as simple coordinate list to text file"""
-        path = self.editor.manager.get_robot_path(samples_per_segment)
+    def save_robot_path_to_txt(self, filename="robot_path.txt", samples_per_segment=5, tolerance=ROBOT_PATH_TOLERANCE):
+        """Save robot path as simple coordinate list to text file (simplified within tolerance)"""
+        path = self.editor.manager.get_robot_path(samples_per_segment, tolerance=tolerance)
         try:
             with open(filename, 'w') as f:
                 for pt in path:
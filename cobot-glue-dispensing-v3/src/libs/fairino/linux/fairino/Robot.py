@@ -14,8 +14,6 @@ import sys
 import ctypes
 from ctypes import *
 
-from Cython.Compiler.Options import error_on_unknown_names
-
 is_init =False
 class ROBOT_AUX_STATE(Structure):
     _pack_ = 1
@@ -116,6 +114,153 @@ class RobotStatePkg(Structure):
         ("check_sum", c_ushort)]  # 校验和
 
 
+class RobotStateStreamParser:
+    """
+    Incremental framer for the real-time state stream (port 20004).
+
+    Frame layout: 0x5A5A head, 1 byte frame counter, uint16 LE data length, data,
+    uint16 LE checksum (sum of all preceding frame bytes, mod 65536).
+
+    Bytes are received straight into a preallocated buffer (recv_into on a memoryview),
+    frame heads are located with bytearray.find and only the newest valid frame of each
+    receive is materialised as a RobotStatePkg (one from_buffer_copy at its offset, so
+    readers of the previous state are never affected by later frames). Consumers can
+    block on wait_for_newer() instead of polling robot_state_pkg.
+    """
+
+    HEADER = b"\x5a\x5a"
+    PREFIX_SIZE = 5  # head + frame counter + data length
+    CHECKSUM_SIZE = 2
+
+    def __init__(self, struct_type=RobotStatePkg, buffer_size=1024 * 16):
+        self.struct_type = struct_type
+        self.frame_size = ctypes.sizeof(struct_type)
+        self.min_data_len = self.frame_size - self.PREFIX_SIZE - self.CHECKSUM_SIZE
+        self.buffer = bytearray(buffer_size)
+        self.view = memoryview(self.buffer)
+        self.start = 0  # first unparsed byte
+        self.end = 0  # end of received data
+        self.latest = None  # newest valid RobotStatePkg
+        self.latest_timestamp = None  # time.time() when latest was received
+        self.sequence = 0  # increases with every published state
+        self._condition = threading.Condition()
+        self._last_frame_cnt = None
+        self.frames = 0  # valid frames
+        self.checksum_errors = 0  # frames dropped for a wrong checksum
+        self.length_errors = 0  # heads dropped for an impossible data length
+        self.skipped_bytes = 0  # bytes discarded while searching for a head
+        self.missed_frames = 0  # gaps in the frame counter (frames the controller sent but we never saw)
+
+    def recv_from(self, sock):
+        """Receive once from sock into the buffer and parse. Returns the byte count of recv_into."""
+        self._make_room()
+        received = sock.recv_into(self.view[self.end:])
+        if received > 0:
+            self.end += received
+            self._parse()
+        return received
+
+    def feed(self, data):
+        """Parse bytes that were received elsewhere (replays, tests). Returns the number of valid frames."""
+        frames_before = self.frames
+        data = memoryview(data)
+        while len(data):
+            self._make_room()
+            count = min(len(data), len(self.buffer) - self.end)
+            self.view[self.end:self.end + count] = data[:count]
+            self.end += count
+            data = data[count:]
+            self._parse()
+        return self.frames - frames_before
+
+    def wait_for_newer(self, after_seq=0, timeout=None):
+        """
+        Block until a state newer than after_seq was received.
+
+        Returns:
+            tuple: (sequence, RobotStatePkg), or (after_seq, None) on timeout
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.sequence > after_seq, timeout=timeout):
+                return after_seq, None
+            return self.sequence, self.latest
+
+    def reset(self):
+        """Forget buffered bytes (after a reconnect); counters are kept."""
+        self.start = self.end = 0
+        self._last_frame_cnt = None
+
+    @property
+    def counters(self):
+        return {"frames": self.frames, "checksum_errors": self.checksum_errors,
+                "length_errors": self.length_errors, "skipped_bytes": self.skipped_bytes,
+                "missed_frames": self.missed_frames}
+
+    def _make_room(self):
+        # Move the unparsed tail to the front once the buffer can't hold another frame after it
+        if len(self.buffer) - self.end >= self.frame_size and self.start < self.end:
+            return
+        pending = self.end - self.start
+        if pending >= len(self.buffer):
+            # No head in a full buffer - keep only the last byte (may be half of one)
+            self.skipped_bytes += pending - 1
+            self.buffer[0] = self.buffer[self.end - 1]
+            self.start, self.end = 0, 1
+            return
+        self.buffer[:pending] = self.buffer[self.start:self.end]
+        self.start, self.end = 0, pending
+
+    def _parse(self):
+        buffer = self.buffer
+        newest = -1
+        while True:
+            head = buffer.find(self.HEADER, self.start, self.end)
+            if head < 0:
+                # keep a trailing 0x5A, it may be the first byte of the next head
+                keep = 1 if self.end > self.start and buffer[self.end - 1] == 0x5A else 0
+                self.skipped_bytes += self.end - self.start - keep
+                self.start = self.end - keep
+                break
+            self.skipped_bytes += head - self.start
+            self.start = head
+            if self.end - head < self.PREFIX_SIZE:
+                break
+
+            data_len = buffer[head + 3] | (buffer[head + 4] << 8)
+            total = self.PREFIX_SIZE + data_len + self.CHECKSUM_SIZE
+            if data_len < self.min_data_len or total > len(buffer):
+                self.length_errors += 1
+                self.start = head + 1  # not a real head - resynchronise on the next one
+                continue
+            if self.end - head < total:
+                break  # frame incomplete - wait for more data
+
+            checksum_at = head + self.PREFIX_SIZE + data_len
+            checksum = buffer[checksum_at] | (buffer[checksum_at + 1] << 8)
+            if sum(self.view[head:checksum_at]) & 0xFFFF != checksum:
+                self.checksum_errors += 1
+                self.start = head + 1
+                continue
+
+            self._count_frame(buffer[head + 2])
+            newest = head
+            self.start = head + total
+
+        if newest >= 0:
+            state = self.struct_type.from_buffer_copy(buffer, newest)
+            with self._condition:
+                self.latest = state
+                self.latest_timestamp = time.time()
+                self.sequence += 1
+                self._condition.notify_all()
+
+    def _count_frame(self, frame_cnt):
+        if self._last_frame_cnt is not None:
+            self.missed_frames += (frame_cnt - self._last_frame_cnt - 1) & 0xFF
+        self._last_frame_cnt = frame_cnt
+        self.frames += 1
+
+
 class BufferedFileHandler(RotatingFileHandler):
     def __init__(self, filename, mode='a', maxBytes=0, backupCount=0, encoding=None, delay=False):
         super().__init__(filename, mode, maxBytes, backupCount, encoding, delay)
@@ -205,6 +350,7 @@ class RPC():
         self.sock_cli_state = None
         self.robot_realstate_exit = False
         self.robot_state_pkg = RobotStatePkg#机器人状态数据
+        self.state_stream = RobotStateStreamParser()  # 实时状态数据帧解析器
 
         self.stop_event = threading.Event()  # 停止事件
         thread= threading.Thread(target=self.robot_state_routine_thread)#创建线程循环接收机器人状态数据
@@ -253,80 +399,20 @@ class RPC():
         """处理机器人状态数据包的线程例程"""
 
         while(1):
-            recvbuf = bytearray(self.BUFFER_SIZE)
-            tmp_recvbuf = bytearray(self.BUFFER_SIZE)
-            state_pkg = bytearray(self.BUFFER_SIZE)
-            find_head_flag = False
-            index = 0
-            length = 0
-            tmp_len = 0
+            self.state_stream.reset()
             if not self.connect_to_robot():
                 return
 
             try:
                 # while not self.robot_realstate_exit:
                 while not self.robot_realstate_exit and not self.stop_event.is_set():
-                    recvbyte = self.sock_cli_state.recv_into(recvbuf)
+                    recvbyte = self.state_stream.recv_from(self.sock_cli_state)
                     if recvbyte <= 0:
                         self.sock_cli_state.close()
                         print("接收机器人状态字节 -1")
                         return
-                    else:
-                        if tmp_len > 0:
-                            if tmp_len + recvbyte <= self.BUFFER_SIZE:
-                                recvbuf = tmp_recvbuf[:tmp_len] + recvbuf[:recvbyte]
-                                recvbyte += tmp_len
-                                tmp_len = 0
-                            else:
-                                tmp_len = 0
-
-                        for i in range(recvbyte):
-                            if format(recvbuf[i], '02X') == "5A" and not find_head_flag:
-                                if i + 4 < recvbyte:
-                                    if format(recvbuf[i+1], '02X') == "5A":
-                                        find_head_flag = True
-                                        state_pkg[0] = recvbuf[i]
-                                        index += 1
-                                        length = length | recvbuf[i + 4]
-                                        length = length << 8
-                                        length = length | recvbuf[i + 3]
-                                    else:
-                                        continue
-                                else:
-                                    tmp_recvbuf[:recvbyte - i] = recvbuf[i:recvbyte]
-                                    tmp_len = recvbyte - i
-                                    break
-                            elif find_head_flag and index < length + 5:
-                                state_pkg[index] = recvbuf[i]
-                                index += 1
-                            elif find_head_flag and index >= length + 5:
-                                if i + 1 < recvbyte:
-                                    checksum = sum(state_pkg[:index])
-                                    checkdata = 0
-                                    checkdata = checkdata | recvbuf[i + 1]
-                                    checkdata = checkdata << 8
-                                    checkdata = checkdata | recvbuf[i]
-
-                                    if checksum == checkdata:
-                                        self.robot_state_pkg = RobotStatePkg.from_buffer_copy(recvbuf)
-                                        # current_time = datetime.now()
-                                        # print("get robot_state_pkg current_time = datetime.datetime.now()",current_time)
-                                        find_head_flag = False
-                                        index = 0
-                                        length = 0
-                                        i += 1
-                                    else:
-                                        find_head_flag = False
-                                        index = 0
-                                        length = 0
-                                        i += 1
-                                else:
-                                    print("4.2")
-                                    tmp_recvbuf[:recvbyte - i] = recvbuf[i:recvbyte]
-                                    tmp_len = recvbyte - i
-                                    break
-                            else:
-                                continue
+                    if self.state_stream.latest is not None:
+                        self.robot_state_pkg = self.state_stream.latest
             except Exception as ex:
                 self.SDK_state=False
                 # self.reconnect()
@@ -13,7 +13,8 @@ from core.controllers.vision.camera_system_controller import CameraSystemControl
 from core.services.robot_service.impl.RobotStateManager import RobotStateManager
 from core.services.robot_service.impl.base_robot_service import RobotService
 
-from core.services.robot_service.impl.robot_monitor.fairino_monitor import FairinoRobotMonitor
+from core.model.robot.robot_types import RobotType
+from core.services.robot_service.impl.robot_monitor.robot_monitor_factory import RobotMonitorFactory
 from frontend.core.utils.localization import setup_localization
 
 # Import SystemStateManager and related components
@@ -33,6 +34,7 @@ from core.controllers.settings.SettingsController import SettingsController
 from core.services.settings.SettingsService import SettingsService
 from core.services.vision.VisionService import VisionServiceSingleton
 from modules.utils import PathResolver
+from modules.contour_matching import CompareContours
 
 setup_localization()
 
@@ -90,6 +92,12 @@ if __name__ == "__main__":
     repository = GlueWorkPieceRepositorySingleton().get_instance()
     workpieceService = GlueWorkpieceService(repository=repository)
 
+    # PRELOAD THE CONTOUR MATCHING MODEL (only when ML matching is enabled)
+    try:
+        CompareContours.preload_matching_model()
+    except Exception as e:
+        print(f"Contour matching model not preloaded: {e}")
+
     # CREATE A DEFAULT ROBOT SERVICE FOR SYSTEM INITIALIZATION
     # Note: This will be replaced by application-specific robot services in ApplicationFactory
     if testRobot:
@@ -99,7 +107,10 @@ if __name__ == "__main__":
         from core.model.robot import fairino_robot
         default_robot = fairino_robot.FairinoRobot(robot_config.robot_ip)
     
-    robot_monitor = FairinoRobotMonitor(robot_config.robot_ip, cycle_time=0.03)
+    # The factory picks the state-stream monitor when enabled and the robot provides a stream,
+    # and falls back to XML-RPC polling otherwise
+    robot_type = RobotType.TEST if testRobot else RobotType.FAIRINO
+    robot_monitor = RobotMonitorFactory.create_monitor(robot_type, robot_config.robot_ip, default_robot, cycle_time=0.03)
     robot_state_manager = RobotStateManager(robot_monitor=robot_monitor)
     robotService = RobotService(default_robot, settings_service, robot_state_manager)
 
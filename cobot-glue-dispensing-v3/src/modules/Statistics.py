@@ -3,14 +3,19 @@ import json
 import os
 import datetime
 import sys
+import threading
 from enum import Enum
 
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidgetItem, \
     QApplication, QTableWidget
 
-STATISTICS_PATH = os.path.join(os.path.dirname(__file__), "storage", "statistics.json")
+from modules.statistics.backend.StatsStore import StatsStore
+
+STATISTICS_PATH = os.path.join(os.path.dirname(__file__), "storage", "statistics.json")  # imported once, then unused
+STATISTICS_DB_PATH = os.path.join(os.path.dirname(__file__), "storage", "statistics.db")
 STARTED_AT_KEY = "started_at"
+META_DOCUMENT = "meta"
 
 class StatisticKey(Enum):
     GENERATOR_ON_SECONDS = "generator_on_seconds"
@@ -18,16 +23,36 @@ class StatisticKey(Enum):
     PUMP_RPM = "pump_rpm"
 
 class Statistics:
-    """Class to manage statistics."""
-    _stats = None
+    """
+    Class to manage statistics.
+
+    Values live in a StatsStore (SQLite, WAL mode): increments update memory and are
+    committed in batches, so counting on every generator/pump cycle costs no file rewrite.
+    Per-pump values are stored as "<key>/<pump id>" and returned nested by get_statistics().
+    """
+    _store = None
+    _store_lock = threading.Lock()
 
     @staticmethod
     def _now_iso():
         return datetime.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
 
     @staticmethod
-    def get_statistics():
-        """Read and return statistics as a dict."""
+    def _get_store():
+        # Increments come from the generator and motor threads: a second StatsStore on the
+        # same database would flush its own absolute totals over the other one's
+        if Statistics._store is None:
+            with Statistics._store_lock:
+                if Statistics._store is None:  # Double-checked locking
+                    store = StatsStore(STATISTICS_DB_PATH)
+                    if store.get_document(META_DOCUMENT) is None:
+                        Statistics._write_statistics(store, Statistics._read_json_statistics())
+                    Statistics._store = store
+        return Statistics._store
+
+    @staticmethod
+    def _read_json_statistics():
+        """statistics.json of the JSON backend, imported on first start."""
         if not os.path.exists(STATISTICS_PATH):
             return {}
         with open(STATISTICS_PATH, "r") as f:
@@ -36,6 +61,19 @@ class Statistics:
             except Exception:
                 return {}
 
+    @staticmethod
+    def get_statistics():
+        """Return statistics as a dict."""
+        store = Statistics._get_store()
+        stats = {STARTED_AT_KEY: Statistics.getStartedAt()}
+        for key, value in store.values().items():
+            group, _, item = key.partition("/")
+            if item:
+                stats.setdefault(group, {})[item] = value
+            else:
+                stats[key] = value
+        return stats
+
     @staticmethod
     def _default_stats():
         """Return the canonical zeroed structure for statistics."""
@@ -49,75 +87,66 @@ class Statistics:
     @staticmethod
     def resetAllToZero():
         """Reset all statistics values to 0, including nested dicts, and update start time."""
-        Statistics._ensure_stats_loaded()
-
-        def zero_values(d):
-            for key, value in list(d.items()):
-                if isinstance(value, dict):
-                    zero_values(value)
-                else:
-                    # only numeric/stat values should be zeroed; preserve non-numeric keys if any
-                    try:
-                        d[key] = 0
-                    except Exception:
-                        d[key] = 0
-
-        # If no meaningful stats exist, replace with defaults
-        if not Statistics._stats or all(k == STARTED_AT_KEY for k in Statistics._stats.keys()):
-            Statistics._stats = Statistics._default_stats()
-        else:
-            zero_values(Statistics._stats)
-            # ensure canonical keys exist
-            for k, v in Statistics._default_stats().items():
-                if k not in Statistics._stats:
-                    Statistics._stats[k] = v if isinstance(v, dict) else 0
-
-            # update started_at to now
-            Statistics._stats[STARTED_AT_KEY] = Statistics._now_iso()
-
-        Statistics.update_statistics(Statistics._stats)
+        store = Statistics._get_store()
+        for key in store.values():
+            store.set(key, 0)
+        Statistics.update_statistics(Statistics._default_stats())
 
     @staticmethod
     def update_statistics(new_stats):
-        """Update statistics.json with new values."""
-        os.makedirs(os.path.dirname(STATISTICS_PATH), exist_ok=True)
-        with open(STATISTICS_PATH, "w") as f:
-            json.dump(new_stats, f, indent=2)
+        """Store the values of new_stats (nested dicts are per-pump values)."""
+        Statistics._write_statistics(Statistics._get_store(), new_stats)
+
+    @staticmethod
+    def _write_statistics(store, new_stats):
+        for key, value in new_stats.items():
+            if key == STARTED_AT_KEY:
+                continue
+            if isinstance(value, dict):
+                for subkey, subval in value.items():
+                    store.set(f"{key}/{subkey}", subval)
+            else:
+                store.set(key, value)
+        started_at = (new_stats.get(STARTED_AT_KEY)
+                      or (store.get_document(META_DOCUMENT) or {}).get(STARTED_AT_KEY)
+                      or Statistics._now_iso())
+        store.put_document(META_DOCUMENT, {STARTED_AT_KEY: started_at})
 
     @staticmethod
     def _ensure_stats_loaded():
-        if Statistics._stats is None:
-            Statistics._stats = Statistics.get_statistics() or {}
-            # ensure started_at exists
-            if STARTED_AT_KEY not in Statistics._stats or not Statistics._stats.get(STARTED_AT_KEY):
-                Statistics._stats[STARTED_AT_KEY] = Statistics._now_iso()
-                Statistics.update_statistics(Statistics._stats)
+        Statistics._get_store()
 
     @staticmethod
     def clearAll():
         """Clear all statistics and set a new start time and zeroed structure."""
-        Statistics._stats = Statistics._default_stats()
-        Statistics.update_statistics(Statistics._stats)
+        Statistics._get_store().clear()
+        Statistics.update_statistics(Statistics._default_stats())
+
+    @staticmethod
+    def flush():
+        """Commit pending changes now instead of with the next periodic flush."""
+        Statistics._get_store().flush()
+
+    @staticmethod
+    def getHistory(key, start=None, end=None, bucket_seconds=3600):
+        """Increments of key (e.g. "generator_on_seconds", "pump_on_seconds/1") per time bucket."""
+        return Statistics._get_store().history(key, start, end, bucket_seconds)
 
     @staticmethod
     def _set_by_key(key, value):
         """Set a statistic value by key."""
-        Statistics._ensure_stats_loaded()
-        Statistics._stats[key] = value
-        Statistics.update_statistics(Statistics._stats)
+        Statistics._get_store().set(key, value)
 
     @staticmethod
     def _getByKey(key):
         """Get a statistic value by key."""
-        Statistics._ensure_stats_loaded()
-        return Statistics._stats.get(key, None)
+        return Statistics._get_store().get(key)
 
     # START TIME accessor
     @staticmethod
     def getStartedAt():
         """Return the ISO timestamp when statistics collection started (string)."""
-        Statistics._ensure_stats_loaded()
-        return Statistics._stats.get(STARTED_AT_KEY)
+        return (Statistics._get_store().get_document(META_DOCUMENT) or {}).get(STARTED_AT_KEY)
 
     # GENERATOR ON SECONDS methods
     @staticmethod
@@ -145,51 +174,40 @@ class Statistics:
     @staticmethod
     def incrementGeneratorOnSeconds(seconds):
         """Increment the total seconds the generator has been on."""
-        current_seconds = Statistics.getGeneratorOnSeconds() or 0
-        Statistics.setGeneratorOnSeconds(current_seconds + seconds)
+        Statistics._get_store().increment(StatisticKey.GENERATOR_ON_SECONDS.value, seconds)
 
     # PUMP ON TIME methods
     @staticmethod
     def getPumpOnTimeById(pump_id):
         """Get the total seconds a specific pump has been on."""
-        return Statistics._getByKey(f"{StatisticKey.PUMP_ON_SECONDS.value}_{pump_id}") or \
-               (Statistics._getByKey(StatisticKey.PUMP_ON_SECONDS.value) or {}).get(str(pump_id))
+        return Statistics._getByKey(f"{StatisticKey.PUMP_ON_SECONDS.value}/{pump_id}")
 
     @staticmethod
     def setPumpOnTimeById(pump_id, seconds):
         """Set the total seconds a specific pump has been on."""
-        # ensure nested dict exists
-        Statistics._ensure_stats_loaded()
-        pumps = Statistics._stats.setdefault(StatisticKey.PUMP_ON_SECONDS.value, {})
-        pumps[str(pump_id)] = seconds
-        Statistics.update_statistics(Statistics._stats)
+        Statistics._set_by_key(f"{StatisticKey.PUMP_ON_SECONDS.value}/{pump_id}", seconds)
 
     @staticmethod
     def incrementPumpOnTimeById(pump_id, seconds):
         """Increment the total seconds a specific pump has been on."""
-        current_seconds = Statistics.getPumpOnTimeById(pump_id) or 0
-        Statistics.setPumpOnTimeById(pump_id, current_seconds + seconds)
+        Statistics._get_store().increment(f"{StatisticKey.PUMP_ON_SECONDS.value}/{pump_id}", seconds)
 
     # PUMP RPM methods
     @staticmethod
     def getPumpRpmById(pump_id):
         """Get the RPM of a specific pump."""
-        return Statistics._getByKey(f"{StatisticKey.PUMP_RPM.value}_{pump_id}") or \
-               (Statistics._getByKey(StatisticKey.PUMP_RPM.value) or {}).get(str(pump_id))
+        return Statistics._getByKey(f"{StatisticKey.PUMP_RPM.value}/{pump_id}")
 
     @staticmethod
     def setPumpRpmById(pump_id, rpm):
         """Set the RPM of a specific pump."""
-        Statistics._ensure_stats_loaded()
-        rpms = Statistics._stats.setdefault(StatisticKey.PUMP_RPM.value, {})
-        rpms[str(pump_id)] = rpm
-        Statistics.update_statistics(Statistics._stats)
+        Statistics._set_by_key(f"{StatisticKey.PUMP_RPM.value}/{pump_id}", rpm)
 
     @staticmethod
     def incrementPumpRpmById(pump_id, rpm):
         """Increment the RPM of a specific pump."""
-        current_rpm = Statistics.getPumpRpmById(pump_id) or 0
-        Statistics.setPumpRpmById(pump_id, current_rpm + rpm)
+        Statistics._get_store().increment(f"{StatisticKey.PUMP_RPM.value}/{pump_id}", rpm)
+
 
 
 
@@ -249,11 +267,7 @@ class StatisticsViewer(QMainWindow):
         try:
             stats = Statistics.get_statistics() or {}
         except Exception:
-            # fallback: try to access internal copy
-            try:
-                stats = Statistics._stats or {}
-            except Exception:
-                stats = {}
+            stats = {}
 
         # Ensure started_at is present via accessor when available
         try:
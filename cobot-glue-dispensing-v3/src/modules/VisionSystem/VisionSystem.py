@@ -25,8 +25,6 @@ from modules.VisionSystem.handlers.camera_calibration_handler import (
 )
 from modules.VisionSystem.handlers.contour_detection_handler import handle_contour_detection
 
-# External or domain-specific image processing
-from libs.plvision.PLVision import ImageProcessing
 from modules.shared.tools.GlueCell import log_if_enabled
 
 # Conditional logging import
@@ -126,12 +124,19 @@ class VisionSystem:
         if self.isSystemCalibrated:
             self.cameraMatrix = self.data_manager.get_camera_matrix()
             self.cameraDist = self.data_manager.get_distortion_coefficients()
+            self.data_manager.build_correction_maps(self.cameraMatrix,
+                                                    self.cameraDist,
+                                                    self.camera_settings.get_camera_width(),
+                                                    self.camera_settings.get_camera_height())
 
         # Initialize image variables
         self.image = None
         self.rawImage = None
         self.correctedImage = None
         self.rawMode = False
+        # When True, contour detection runs on the raw frame and only the contour
+        # points are corrected; use it when the corrected frame is not displayed
+        self.correctContoursOnly = False
 
         # Initialize skip frames counter
         self.current_skip_frames = 0
@@ -196,7 +201,9 @@ class VisionSystem:
             return None, None, None
 
         self.state_manager.update_state(ServiceState.IDLE)
-        self.rawImage = self.image.copy()
+        # No copy needed: brightness adjustment and correction produce new arrays, and
+        # handlers copy the frame before drawing on it in place
+        self.rawImage = self.image
 
         # Handle brightness adjustment if enabled
         if self.camera_settings.get_brightness_auto():
@@ -215,26 +222,32 @@ class VisionSystem:
     def correctImage(self, imageParam):
         """
         Undistorts and applies perspective correction to the given image.
+        Uses the precomputed remap table from the DataManager's correction engine,
+        so each frame costs a single cv2.remap.
         """
-        # First, undistort the image using camera calibration parameters
-        imageParam = ImageProcessing.undistortImage(
+        # Perspective transformation is folded in only when available (single-image calibrations with ArUco markers)
+        return self.data_manager.correction_engine.correct(
             imageParam,
             self.cameraMatrix,
             self.cameraDist,
+            self.perspectiveMatrix,
             self.camera_settings.get_camera_width(),
-            self.camera_settings.get_camera_height(),
-            crop=False
+            self.camera_settings.get_camera_height()
         )
 
-        # Apply perspective transformation if available (only for single-image calibrations with ArUco markers)
-        if self.perspectiveMatrix is not None:
-            imageParam = cv2.warpPerspective(
-                imageParam,
-                self.perspectiveMatrix,
-                (self.camera_settings.get_camera_width(), self.camera_settings.get_camera_height())
-            )
-
-        return imageParam
+    def correctContours(self, contours):
+        """
+        Maps contours detected on the raw image into corrected image coordinates
+        without correcting the whole frame.
+        """
+        return self.data_manager.correction_engine.correct_contours(
+            contours,
+            self.cameraMatrix,
+            self.cameraDist,
+            self.perspectiveMatrix,
+            self.camera_settings.get_camera_width(),
+            self.camera_settings.get_camera_height()
+        )
 
     def on_threshold_update(self,message):
         # message format {"region": "pickup"})
@@ -0,0 +1,79 @@
+import cv2
+import numpy as np
+
+# Fixed-point bits used when rasterising the polygon, so sub-pixel corners are honoured
+RASTER_SHIFT = 4
+
+OUTSIDE = 0
+INSIDE = 1
+EDGE = 2  # Pixels close to the polygon outline - resolved exactly with pointPolygonTest
+
+
+class AreaMask:
+    """
+    Rasterised work-area polygon used for fast point containment checks.
+
+    The polygon is filled once into a mask covering only its bounding box. A containment
+    check for a whole contour is then a single vectorised lookup instead of one
+    cv2.pointPolygonTest call per point. Only the few points that fall on the thin band
+    of pixels along the outline are checked with pointPolygonTest, so the result is
+    identical to pointPolygonTest(...) >= 0 (points on the edge count as inside).
+    """
+
+    def __init__(self, polygon_points):
+        points = np.asarray(polygon_points, dtype=np.float32).reshape(-1, 2)
+        if len(points) < 3:
+            raise ValueError("Area polygon needs at least 3 points")
+
+        self.polygon = points
+        x_min, y_min = np.floor(points.min(axis=0)).astype(np.int64)
+        x_max, y_max = np.ceil(points.max(axis=0)).astype(np.int64)
+        self.offset = np.array([x_min, y_min], dtype=np.int64)
+        width = int(x_max - x_min) + 1
+        height = int(y_max - y_min) + 1
+
+        scale = 1 << RASTER_SHIFT
+        fixed = np.round((points - self.offset) * scale).astype(np.int32).reshape(-1, 1, 2)
+        mask = np.zeros((height, width), dtype=np.uint8)
+        cv2.fillPoly(mask, [fixed], INSIDE, lineType=cv2.LINE_8, shift=RASTER_SHIFT)
+        # Rasterisation is only approximate along the outline - mark a band there for exact checks
+        cv2.polylines(mask, [fixed], True, EDGE, thickness=3, lineType=cv2.LINE_8, shift=RASTER_SHIFT)
+        self.mask = mask
+
+    def contains(self, points) -> np.ndarray:
+        """
+        Args:
+            points: array-like of shape (N, 2) or (N, 1, 2)
+
+        Returns:
+            np.ndarray: boolean array of shape (N,), True for points inside the area
+        """
+        pts = np.rint(np.asarray(points).reshape(-1, 2)).astype(np.int64) - self.offset
+        height, width = self.mask.shape
+        in_bounds = (pts[:, 0] >= 0) & (pts[:, 0] < width) & (pts[:, 1] >= 0) & (pts[:, 1] < height)
+        labels = np.full(len(pts), OUTSIDE, dtype=np.uint8)
+        inside = pts[in_bounds]
+        labels[in_bounds] = self.mask[inside[:, 1], inside[:, 0]]
+
+        result = labels == INSIDE
+        for index in np.flatnonzero(labels == EDGE):
+            x, y = pts[index] + self.offset
+            result[index] = cv2.pointPolygonTest(self.polygon, (float(x), float(y)), False) >= 0
+        return result
+
+    def contains_all(self, points) -> bool:
+        """True if every point of a contour lies inside the area."""
+        pts = np.rint(np.asarray(points).reshape(-1, 2)).astype(np.int64) - self.offset
+        if len(pts) == 0:
+            return True
+        height, width = self.mask.shape
+        if (pts.min(axis=0) < 0).any() or pts[:, 0].max() >= width or pts[:, 1].max() >= height:
+            return False
+
+        labels = self.mask[pts[:, 1], pts[:, 0]]
+        if (labels == OUTSIDE).any():
+            return False
+        for x, y in pts[labels == EDGE] + self.offset:
+            if cv2.pointPolygonTest(self.polygon, (float(x), float(y)), False) < 0:
+                return False
+        return True
@@ -55,10 +55,13 @@ class BrightnessManager:
     #     return adjustedFrame
 
     def adjust_brightness(self):
+        self.vision_system.image = self.adjust_frame(self.vision_system.image)
+
+    def adjust_frame(self, frame):
+        """Runs one PID brightness step for the given frame and returns the adjusted frame."""
         area_p1, area_p2, area_p3, area_p4 = (940, 612), (1004, 614), (1004, 662), (940, 660)
         area = np.array([area_p1, area_p2, area_p3, area_p4], dtype=np.float32)
-        adjusted_frame = self.brightnessController.adjustBrightness(self.vision_system.image, self.brightnessAdjustment,area)
+        adjusted_frame = self.brightnessController.adjustBrightness(frame, self.brightnessAdjustment,area)
         current_brightness = self.brightnessController.calculateBrightness(adjusted_frame,area)
         self.brightnessAdjustment = self.brightnessController.compute(current_brightness)
-        adjusted_frame = self.brightnessController.adjustBrightness(self.vision_system.image, self.brightnessAdjustment)
-        self.vision_system.image = adjusted_frame
\ No newline at end of file
+        return self.brightnessController.adjustBrightness(frame, self.brightnessAdjustment)
\ No newline at end of file
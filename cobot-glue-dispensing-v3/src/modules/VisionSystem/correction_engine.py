@@ -0,0 +1,152 @@
+import threading
+
+import cv2
+import numpy as np
+
+# Same free-scaling parameter that ImageProcessing.undistortImage uses, so the
+# remapped image matches the previous undistort + warpPerspective output
+UNDISTORT_ALPHA = 0.5
+
+
+class CorrectionEngine:
+    """
+    Precomputed image correction (undistortion + optional perspective warp).
+
+    Instead of calling cv2.undistort and cv2.warpPerspective on every frame,
+    the engine folds both steps into a single fixed-point (CV_16SC2) remap
+    table. The table is rebuilt only when the calibration data or the output
+    resolution changes; every frame is then corrected with one cv2.remap.
+
+    The engine can also map contour points from raw to corrected image
+    coordinates, so callers that do not need the corrected frame itself can
+    skip the full-image remap altogether.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (map1, map2, new_camera_matrix) swapped as one tuple so readers on the
+        # capture thread never see half-updated tables
+        self._tables = None
+        self._key = None
+
+    def invalidate(self):
+        """Drop the cached tables; they are rebuilt on the next correction."""
+        with self._lock:
+            self._tables = None
+            self._key = None
+
+    def is_ready(self):
+        return self._tables is not None
+
+    def build(self, camera_matrix, dist_coeffs, perspective_matrix, width, height):
+        """
+        Build the combined undistort + perspective remap table for the given
+        calibration and output resolution.
+        """
+        if camera_matrix is None:
+            raise Exception("camera_matrix can not be None")
+        if dist_coeffs is None:
+            raise Exception("dist_coeffs can not be None")
+
+        size = (int(width), int(height))
+        new_camera_matrix, _ = cv2.getOptimalNewCameraMatrix(camera_matrix, dist_coeffs, size,
+                                                             UNDISTORT_ALPHA, size)
+
+        # map_x/map_y give, for every undistorted pixel, its location in the raw frame
+        map_x, map_y = cv2.initUndistortRectifyMap(camera_matrix, dist_coeffs, None,
+                                                   new_camera_matrix, size, cv2.CV_32FC1)
+
+        if perspective_matrix is not None:
+            # warpPerspective samples src at M^-1 * (x, y), which is exactly the
+            # composition we need: final pixel -> undistorted pixel -> raw pixel.
+            # Pixels that fall outside the undistorted frame map to -1 so remap
+            # fills them with the border value, like warpPerspective did.
+            map_x = cv2.warpPerspective(map_x, perspective_matrix, size,
+                                        flags=cv2.INTER_LINEAR,
+                                        borderMode=cv2.BORDER_CONSTANT, borderValue=-1)
+            map_y = cv2.warpPerspective(map_y, perspective_matrix, size,
+                                        flags=cv2.INTER_LINEAR,
+                                        borderMode=cv2.BORDER_CONSTANT, borderValue=-1)
+
+        map1, map2 = cv2.convertMaps(map_x, map_y, cv2.CV_16SC2)
+
+        tables = (map1, map2, new_camera_matrix)
+        with self._lock:
+            self._tables = tables
+            self._key = self._make_key(camera_matrix, dist_coeffs, perspective_matrix, size)
+        return tables
+
+    def correct(self, image, camera_matrix, dist_coeffs, perspective_matrix, width, height):
+        """
+        Undistort and perspective-correct an image with the cached remap table,
+        building it first if the calibration or resolution changed.
+        """
+        if image is None:
+            raise ValueError("Image can not be None")
+
+        map1, map2, _ = self._ensure(camera_matrix, dist_coeffs, perspective_matrix, width, height)
+        return cv2.remap(image, map1, map2, interpolation=cv2.INTER_LINEAR)
+
+    def correct_points(self, points, camera_matrix, dist_coeffs, perspective_matrix, width, height):
+        """
+        Map raw image points to corrected image coordinates.
+
+        Args:
+            points: array-like of shape (N, 2) or (N, 1, 2)
+
+        Returns:
+            np.ndarray: float32 points of shape (N, 1, 2)
+        """
+        _, _, new_camera_matrix = self._ensure(camera_matrix, dist_coeffs, perspective_matrix, width, height)
+
+        pts = np.asarray(points, dtype=np.float32).reshape(-1, 1, 2)
+        if len(pts) == 0:
+            return pts
+
+        pts = cv2.undistortPoints(pts, camera_matrix, dist_coeffs, P=new_camera_matrix)
+        if perspective_matrix is not None:
+            pts = cv2.perspectiveTransform(pts, perspective_matrix)
+        return pts
+
+    def correct_contours(self, contours, camera_matrix, dist_coeffs, perspective_matrix, width, height):
+        """
+        Map a list of raw-image contours to corrected image coordinates.
+        All contours are transformed in a single batch and returned as int32
+        arrays, matching the layout produced by cv2.findContours.
+        """
+        if not contours:
+            return []
+
+        lengths = [len(cnt) for cnt in contours]
+        stacked = np.concatenate([np.asarray(cnt).reshape(-1, 2) for cnt in contours])
+        corrected = self.correct_points(stacked, camera_matrix, dist_coeffs, perspective_matrix, width, height)
+        corrected = np.rint(corrected).astype(np.int32)
+
+        offsets = np.cumsum(lengths)[:-1]
+        return list(np.split(corrected, offsets))
+
+    """PRIVATE METHODS SECTION"""
+
+    @staticmethod
+    def _make_key(camera_matrix, dist_coeffs, perspective_matrix, size):
+        # The key keeps references to the source arrays and is compared by
+        # identity: new calibration data always arrives as new array objects
+        # (np.load / calibration result), so this is a cheap per-frame check
+        return camera_matrix, dist_coeffs, perspective_matrix, size
+
+    def _is_current(self, key, camera_matrix, dist_coeffs, perspective_matrix, size):
+        if key is None:
+            return False
+        cached_mtx, cached_dist, cached_perspective, cached_size = key
+        return (cached_mtx is camera_matrix
+                and cached_dist is dist_coeffs
+                and cached_perspective is perspective_matrix
+                and cached_size == size)
+
+    def _ensure(self, camera_matrix, dist_coeffs, perspective_matrix, width, height):
+        size = (int(width), int(height))
+        with self._lock:
+            tables, key = self._tables, self._key
+        if tables is None or not self._is_current(key, camera_matrix, dist_coeffs, perspective_matrix, size):
+            tables = self.build(camera_matrix, dist_coeffs, perspective_matrix, width, height)
+        return tables
@@ -2,6 +2,8 @@ import os
 
 import numpy as np
 
+from modules.VisionSystem.area_mask import AreaMask
+from modules.VisionSystem.correction_engine import CorrectionEngine
 from modules.utils.custom_logging import log_if_enabled, LoggingLevel
 
 
@@ -28,6 +30,8 @@ class DataManager:
         self.cameraData = None
         self.perspectiveMatrix = None
         self.isSystemCalibrated = False
+        self.correction_engine = CorrectionEngine()
+        self._area_masks = {}
         self.build_storage_paths()
 
 
@@ -53,6 +57,7 @@ class DataManager:
         self.spray_area_points_path = os.path.join(self.storage_path, 'sprayAreaPoints.npy')
 
     def loadWorkAreaPoints(self):
+        self.invalidate_area_masks()
         try:
             self.workAreaPoints = np.load(self.work_area_points_path)
             self.work_area_polygon = np.array(self.workAreaPoints, dtype=np.int32).reshape((-1, 1, 2))
@@ -134,6 +139,8 @@ class DataManager:
                            level=LoggingLevel.ERROR,
                            message=f"Camera calibration data file not found at {self.camera_data_path}",
                            broadcast_to_ui=False)
+        finally:
+            self.correction_engine.invalidate()
 
 
     def loadPerspectiveMatrix(self):
@@ -147,6 +154,22 @@ class DataManager:
                            level=LoggingLevel.INFO,
                            message=f"No perspective matrix found at: {self.perspective_matrix_path}",
                            broadcast_to_ui=False)
+        finally:
+            self.correction_engine.invalidate()
+
+    def build_correction_maps(self, camera_matrix, dist_coeffs, width, height):
+        """
+        Precompute the undistort + perspective remap table for the loaded calibration.
+        Called once calibration data is available so the first frame does not pay for it.
+        """
+        if camera_matrix is None or dist_coeffs is None:
+            return
+        self.correction_engine.build(camera_matrix, dist_coeffs, self.perspectiveMatrix, width, height)
+        log_if_enabled(enabled=self.ENABLE_LOGGING,
+                       logger=self.logger,
+                       level=LoggingLevel.INFO,
+                       message=f"Image correction maps built for {width}x{height}",
+                       broadcast_to_ui=False)
 
 
 
@@ -231,6 +254,36 @@ class DataManager:
                            broadcast_to_ui=False)
             return False, f"Error saving work area points: {str(e)}"
 
+    def get_area_mask(self, area_type):
+        """
+        Returns the cached rasterised mask (AreaMask) for the 'spray' or 'pickup' area,
+        building it on first use. Returns None if the area points are not defined.
+
+        Each mask is cached together with the points array it was built from and is only
+        reused while that same array is current, so a mask built from the old polygon while
+        saveWorkAreaPoints/loadWorkAreaPoints swap the points in is never served afterwards.
+        """
+        if area_type == 'spray':
+            points = self.sprayAreaPoints
+        elif area_type == 'pickup':
+            points = self.pickupAreaPoints
+        else:
+            raise ValueError(f"Invalid area_type: {area_type}. Must be 'pickup' or 'spray'")
+
+        cached = self._area_masks.get(area_type)
+        if cached is not None and cached[0] is points:
+            return cached[1]
+
+        if points is None or len(points) < 3:
+            return None
+
+        mask = AreaMask(points)
+        self._area_masks[area_type] = (points, mask)
+        return mask
+
+    def invalidate_area_masks(self):
+        self._area_masks = {}
+
     def get_camera_matrix(self):
         return self.cameraData['mtx'] if self.cameraData is not None else None
 
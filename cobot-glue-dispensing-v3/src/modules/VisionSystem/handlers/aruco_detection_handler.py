@@ -44,10 +44,7 @@ def detect_aruco_markers(vision_system,log_enabled,logger, flip=False, image=Non
     arucoDetector = ArucoDetector(arucoDict=aruco_dict)
     try:
         arucoCorners, arucoIds = arucoDetector.detectAll(image)
-        log_if_enabled(enabled=log_enabled,
-                       logger=logger,
-                       level=LoggingLevel.INFO,
-                       message=f"Detected {len(arucoIds)} ArUco markers",
+        log_if_enabled(log_enabled, logger, LoggingLevel.INFO, "Detected %d ArUco markers", len(arucoIds),
                        broadcast_to_ui=False)
     except Exception as e:
         print(e)
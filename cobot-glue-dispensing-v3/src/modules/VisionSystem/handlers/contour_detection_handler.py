@@ -81,10 +81,13 @@ def filter_contours_by_area(vision_system, contours):
     """
     Filters contours based on minimum and maximum area settings.
     """
-    filteredContours = [cnt for cnt in contours if
-                        cv2.contourArea(cnt) > vision_system.camera_settings.get_min_contour_area()]
-    filteredContours = [cnt for cnt in filteredContours if
-                        cv2.contourArea(cnt) < vision_system.camera_settings.get_max_contour_area()]
+    min_area = vision_system.camera_settings.get_min_contour_area()
+    max_area = vision_system.camera_settings.get_max_contour_area()
+    filteredContours = []
+    for cnt in contours:
+        area = cv2.contourArea(cnt)
+        if min_area < area < max_area:
+            filteredContours.append(cnt)
     return filteredContours
 
 # Squared distance function
@@ -92,14 +95,10 @@ def sq_dist(p1, p2):
     return (p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2
 
 def all_inside_spray_area(vision_system, contour):
-    for pt in contour:
-        if cv2.pointPolygonTest(
-            vision_system.data_manager.sprayAreaPoints.astype(np.float32),
-            (float(pt[0][0]), float(pt[0][1])),
-            False
-        ) < 0:
-            return False
-    return True
+    spray_area_mask = vision_system.data_manager.get_area_mask('spray')
+    if spray_area_mask is None:
+        return True
+    return spray_area_mask.contains_all(contour)
 
 def sort_contours_by_proximity(contours, start_point):
     sorted_contours = []
@@ -118,44 +117,55 @@ def sort_contours_by_proximity(contours, start_point):
 
     return sorted_contours
 
-def handle_contour_detection(vision_system,sort=False):
+def prepare_detection_image(vision_system, image):
     """
-    Detect, filter, and sort contours in the image.
-    Returns (sorted_contours, corrected_image, None)
+    Calibration handling step of contour detection.
+    Returns (detection_image, correct_points_only): the corrected frame (or the raw frame
+    when only the contour points are corrected / the system is not calibrated).
     """
-    # --- Step 1: Calibration handling ---
-    if vision_system.isSystemCalibrated:
-        vision_system.correctedImage = vision_system.correctImage(vision_system.image.copy())
-    else:
-        cv2.putText(
-            vision_system.image,
-            "System is not calibrated",
-            (10, 50),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            1,
-            (0, 0, 255),
-            2,
-        )
-        vision_system.correctedImage = vision_system.image
+    correct_points_only = vision_system.isSystemCalibrated and vision_system.correctContoursOnly
+    if correct_points_only:
+        # Frame is not displayed - detect on the raw frame and correct only the contour points
+        return image, True
 
+    if vision_system.isSystemCalibrated:
+        return vision_system.correctImage(image), False
+
+    # rawImage shares the captured frame - draw the warning on a copy
+    image = image.copy()
+    cv2.putText(
+        image,
+        "System is not calibrated",
+        (10, 50),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        1,
+        (0, 0, 255),
+        2,
+    )
+    return image, False
+
+def detect_contours_in_image(vision_system, image, correct_points_only=False, sort=False):
+    """
+    Find, filter, sort and publish contours in an already prepared (corrected) image.
+    Returns (sorted_contours, image, None)
+    """
     # --- Step 2: Find and filter contours ---
-    contours = findContours(vision_system, vision_system.correctedImage)
+    contours = findContours(vision_system, image)
+    if correct_points_only:
+        contours = vision_system.correctContours(contours)
     approx_contours = approxContours(vision_system, contours)
     filtered_contours = filter_contours_by_area(vision_system, approx_contours)
 
-    contours_inside_spray_area = []
-    for cnt in filtered_contours:
-
-        if vision_system.data_manager.sprayAreaPoints is None:
+    spray_area_mask = vision_system.data_manager.get_area_mask('spray')
+    if spray_area_mask is None:
+        if filtered_contours:
             print(f"[WARNING] [handle_contour_detection] Spray area points not defined, skipping spray area check.")
-            contours_inside_spray_area.append(cnt)
-            continue
-
-        if all_inside_spray_area(vision_system, cnt) :
-            contours_inside_spray_area.append(cnt)
+        contours_inside_spray_area = list(filtered_contours)
+    else:
+        contours_inside_spray_area = [cnt for cnt in filtered_contours if spray_area_mask.contains_all(cnt)]
 
     if not contours_inside_spray_area:
-        return None, vision_system.correctedImage, None
+        return None, image, None
 
     final_contours = None
     if sort is True:
@@ -167,12 +177,23 @@ def handle_contour_detection(vision_system,sort=False):
         final_contours = contours_inside_spray_area
 
     # --- Step 4: Optional visualization ---
-    if vision_system.camera_settings.get_draw_contours():
-        cv2.drawContours(vision_system.correctedImage, final_contours, -1, (0, 255, 0), 1)
+    # (skipped in points-only mode - the corrected contours do not line up with the raw frame)
+    if vision_system.camera_settings.get_draw_contours() and not correct_points_only:
+        cv2.drawContours(image, final_contours, -1, (0, 255, 0), 1)
 
-    # --- Step 5: Publish latest image ---
-    vision_system.message_publisher.publish_latest_image(vision_system.correctedImage)
+    # --- Step 5: Publish latest image (services with a frame ring publish it from the ring) ---
+    if not vision_system.message_publisher.publishes_from_frame_ring():
+        vision_system.message_publisher.publish_latest_image(image)
 
-    return final_contours, vision_system.correctedImage, None
+    return final_contours, image, None
 
+def handle_contour_detection(vision_system,sort=False):
+    """
+    Detect, filter, and sort contours in the image.
+    Returns (sorted_contours, corrected_image, None)
+    """
+    # --- Step 1: Calibration handling ---
+    vision_system.correctedImage, correct_points_only = prepare_detection_image(vision_system, vision_system.image)
 
+    # --- Steps 2-5: Detection, filtering, visualization and publishing ---
+    return detect_contours_in_image(vision_system, vision_system.correctedImage, correct_points_only, sort)
@@ -1,3 +1,5 @@
+import threading
+
 from communication_layer.api.v1.topics import VisionTopics
 from modules.shared.MessageBroker import MessageBroker
 class MessagePublisher:
@@ -8,10 +10,32 @@ class MessagePublisher:
         self.thresh_image_topic = VisionTopics.THRESHOLD_IMAGE
         self.stateTopic = VisionTopics.SERVICE_STATE
         self.topic = VisionTopics.CALIBRATION_FEEDBACK
+        self.frame_ring = None
+        self._frame_ring_thread = None
+        # State is re-published on a fixed tick, images on every frame - subscribers only need the newest
+        self.broker.register_latest_value_topic(self.stateTopic)
+        self.broker.register_latest_value_topic(self.latest_image_topic, suppress_unchanged=False)
+        self.broker.register_latest_value_topic(self.thresh_image_topic, suppress_unchanged=False)
 
     def publish_latest_image(self,image):
         self.broker.publish(self.latest_image_topic, {"image": image})
 
+    def attach_frame_ring(self, frame_ring):
+        """
+        Publish latest images from a FrameRingBuffer on a dedicated thread instead of
+        from the capture loop. Subscribers receive read-only views of the newest frame;
+        frames produced while they are still busy are skipped.
+        """
+        self.frame_ring = frame_ring
+        if self._frame_ring_thread is None:
+            self._frame_ring_thread = threading.Thread(target=self._publish_from_frame_ring,
+                                                       name="VisionLatestImagePublisher",
+                                                       daemon=True)
+            self._frame_ring_thread.start()
+
+    def publishes_from_frame_ring(self):
+        return self.frame_ring is not None
+
     def publish_calibration_image_captured(self,calibration_images):
         self.broker.publish(self.calibration_image_captured_topic, calibration_images)
 
@@ -23,4 +47,12 @@ class MessagePublisher:
         self.broker.publish(self.stateTopic, state)
 
     def publish_calibration_feedback(self,feedback):
-        self.broker.publish(self.topic, feedback)
\ No newline at end of file
+        self.broker.publish(self.topic, feedback)
+
+    def _publish_from_frame_ring(self):
+        last_seq = 0
+        while True:
+            last_seq, frame = self.frame_ring.wait_for_newer(last_seq, timeout=1.0)
+            if frame is None:
+                continue
+            self.publish_latest_image(frame)
@@ -0,0 +1,245 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from core.system_state_management import ServiceState
+from modules.VisionSystem.handlers.contour_detection_handler import (
+    prepare_detection_image,
+    detect_contours_in_image
+)
+
+DEFAULT_QUEUE_SIZE = 2  # Frames buffered between two stages before the oldest one is dropped
+STATS_WINDOW = 30  # Number of frames used for the per-stage latency / FPS averages
+
+
+class DropOldestQueue:
+    """
+    Bounded hand-off queue between two pipeline stages.
+    When the queue is full the oldest item is discarded, so a slow downstream stage
+    always works on the most recent frame and never stalls the upstream stage.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_QUEUE_SIZE):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self._items = deque()
+        self._maxsize = maxsize
+        self._condition = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item):
+        with self._condition:
+            if len(self._items) >= self._maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._condition.notify()
+
+    def get(self, timeout: float = None):
+        """Returns the oldest queued item, or None if nothing arrived within timeout."""
+        with self._condition:
+            if not self._condition.wait_for(lambda: len(self._items) > 0, timeout=timeout):
+                return None
+            return self._items.popleft()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class StageStats:
+    """Rolling latency and throughput statistics for one pipeline stage."""
+
+    def __init__(self, name: str, window: int = STATS_WINDOW):
+        self.name = name
+        self._latencies = deque(maxlen=window)
+        self._timestamps = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.frames = 0
+
+    def record(self, started: float, finished: float):
+        with self._lock:
+            self._latencies.append(finished - started)
+            self._timestamps.append(finished)
+            self.frames += 1
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            latencies = list(self._latencies)
+            timestamps = list(self._timestamps)
+            frames = self.frames
+
+        latency_ms = 1000.0 * sum(latencies) / len(latencies) if latencies else 0.0
+        max_latency_ms = 1000.0 * max(latencies) if latencies else 0.0
+        if len(timestamps) > 1 and timestamps[-1] > timestamps[0]:
+            fps = (len(timestamps) - 1) / (timestamps[-1] - timestamps[0])
+        else:
+            fps = 0.0
+        return {
+            "frames": frames,
+            "latency_ms": latency_ms,
+            "max_latency_ms": max_latency_ms,
+            "fps": fps,
+        }
+
+
+@dataclass
+class FramePacket:
+    """A frame travelling through the pipeline together with its intermediate results."""
+    seq: int
+    captured_at: float
+    raw: Any
+    image: Any
+    corrected: Any = None
+    correct_points_only: bool = False
+    raw_mode: bool = False
+    contour_detection: bool = True
+    contours: Optional[list] = field(default=None)
+    capture_time: Optional[float] = None  # time.monotonic() before the camera read, for FrameRingBuffer
+
+
+class VisionPipeline:
+    """
+    Optional staged version of VisionSystem.run.
+
+    Capture (+ brightness), correction and contour detection run on their own worker
+    threads joined by DropOldestQueue hand-offs. OpenCV releases the GIL, so the stages
+    overlap and the frame rate is bounded by the slowest stage instead of the sum of all
+    stages. Each finished frame is delivered through on_result(contours, frame, capture_time),
+    with the same (contours, frame) values VisionSystem.run would have returned and the
+    time.monotonic() at which its camera read started.
+    """
+
+    def __init__(self, vision_system, on_result: Callable = None, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.vision_system = vision_system
+        self.on_result = on_result
+        self.correct_queue = DropOldestQueue(queue_size)
+        self.detect_queue = DropOldestQueue(queue_size)
+        self.stats = {
+            "capture": StageStats("capture"),
+            "correct": StageStats("correct"),
+            "detect": StageStats("detect"),
+            "total": StageStats("total"),
+        }
+        self._stop_event = threading.Event()
+        self._threads = []
+        self._seq = 0
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop_event.clear()
+        for name, target in (("capture", self._capture_loop),
+                             ("correct", self._correct_loop),
+                             ("detect", self._detect_loop)):
+            thread = threading.Thread(target=target, name=f"VisionPipeline-{name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 1.0):
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def join(self):
+        """Blocks until the pipeline is stopped."""
+        self._stop_event.wait()
+
+    def is_running(self):
+        return bool(self._threads) and not self._stop_event.is_set()
+
+    def get_stats(self) -> dict:
+        """Per-stage latency / FPS plus the number of frames dropped between stages."""
+        stats = {name: stage.to_dict() for name, stage in self.stats.items()}
+        stats["dropped"] = {
+            "correct": self.correct_queue.dropped,
+            "detect": self.detect_queue.dropped,
+        }
+        return stats
+
+    """PRIVATE METHODS SECTION"""
+
+    def _capture_loop(self):
+        vs = self.vision_system
+        while not self._stop_event.is_set():
+            started = time.perf_counter()
+            capture_time = time.monotonic()
+            image = vs.camera.capture()
+
+            # Handle frame skipping
+            if vs.current_skip_frames < vs.camera_settings.get_skip_frames():
+                vs.current_skip_frames += 1
+                continue
+
+            if image is None:
+                continue
+
+            vs.state_manager.update_state(ServiceState.IDLE)
+            raw = image
+
+            # Handle brightness adjustment if enabled
+            if vs.camera_settings.get_brightness_auto():
+                image = vs.brightnessManager.adjust_frame(image)
+
+            self._seq += 1
+            packet = FramePacket(seq=self._seq,
+                                 captured_at=started,
+                                 raw=raw,
+                                 image=image,
+                                 raw_mode=vs.rawMode,
+                                 contour_detection=vs.camera_settings.get_contour_detection(),
+                                 capture_time=capture_time)
+            self.stats["capture"].record(started, time.perf_counter())
+            self.correct_queue.put(packet)
+
+    def _correct_loop(self):
+        vs = self.vision_system
+        while not self._stop_event.is_set():
+            packet = self.correct_queue.get(timeout=0.1)
+            if packet is None:
+                continue
+
+            started = time.perf_counter()
+            try:
+                if packet.raw_mode:
+                    packet.corrected = packet.raw
+                elif packet.contour_detection:
+                    packet.corrected, packet.correct_points_only = prepare_detection_image(vs, packet.image)
+                else:
+                    packet.corrected = vs.correctImage(packet.image)
+            except Exception as e:
+                print(f"[VisionPipeline] Correction failed for frame {packet.seq}: {e}")
+                continue
+            self.stats["correct"].record(started, time.perf_counter())
+            self.detect_queue.put(packet)
+
+    def _detect_loop(self):
+        vs = self.vision_system
+        while not self._stop_event.is_set():
+            packet = self.detect_queue.get(timeout=0.1)
+            if packet is None:
+                continue
+
+            started = time.perf_counter()
+            frame = packet.corrected
+            if not packet.raw_mode and packet.contour_detection:
+                try:
+                    packet.contours, frame, _ = detect_contours_in_image(vs, packet.corrected,
+                                                                         packet.correct_points_only)
+                except Exception as e:
+                    print(f"[VisionPipeline] Contour detection failed for frame {packet.seq}: {e}")
+                    continue
+            finished = time.perf_counter()
+            self.stats["detect"].record(started, finished)
+            self.stats["total"].record(packet.captured_at, finished)
+
+            # Expose the frame exactly like the sequential loop does
+            vs.rawImage = packet.raw
+            vs.image = packet.image
+            if not packet.raw_mode:
+                vs.correctedImage = frame
+
+            if self.on_result is not None:
+                self.on_result(packet.contours, frame, packet.capture_time)
@@ -1,4 +1,3 @@
-import copy
 from pathlib import Path
 from typing import Any, Tuple
 
@@ -9,8 +8,9 @@ from modules.contour_matching.matching.strategies.geometric_matching_strategy im
     GeometricMatchingStrategy
 from modules.contour_matching.matching.strategies.matching_strategy_interface import MatchingStrategy
 from modules.contour_matching.matching.strategies.ml_matching_strategy import MLMatchingStrategy
-from modules.contour_matching.matching_config import DEBUG_ALIGN_CONTOURS, USE_COMPARISON_MODEL
-from modules.shapeMatchinModelTraining.modelManager import load_latest_model
+from modules.contour_matching.matching.prefilter_index import get_prefilter_index
+from modules.contour_matching.matching_config import DEBUG_ALIGN_CONTOURS, USE_COMPARISON_MODEL, USE_PREFILTER_INDEX
+from modules.shapeMatchinModelTraining.modelRegistry import get_model_registry
 
 from modules.shared.core.ContourStandartized import Contour
 from modules.contour_matching.alignment.contour_aligner import _alignContours
@@ -26,9 +26,9 @@ def get_contour_objects(entries):
     return objects
 
 
-def load_model_with_fallback() -> Any:
+def get_model_dir() -> Path:
     """
-    Load the most recent trained ML model with a safe fallback mechanism.
+    Resolve the saved models directory with a safe fallback mechanism.
     """
     model_dir = (
         Path(__file__).resolve().parent
@@ -41,7 +41,23 @@ def load_model_with_fallback() -> Any:
         print(f"⚠️ Model directory not found at {model_dir}. Trying fallback path.")
         model_dir = Path.cwd() / "system" / "contourMatching" / "shapeMatchinModelTraining" / "saved_models"
 
-    return load_latest_model(save_dir=str(model_dir))
+    return model_dir
+
+
+def load_model_with_fallback() -> Any:
+    """
+    Return the most recent trained ML model.
+    The model is loaded once and kept in memory by the model registry, which reloads it
+    only when a newer model is saved.
+    """
+    return get_model_registry(get_model_dir()).get_model()
+
+
+def preload_matching_model():
+    """Load the ML matching model at startup (no-op when the comparison model is disabled)."""
+    if not USE_COMPARISON_MODEL:
+        return None
+    return get_model_registry(get_model_dir()).preload()
 
 def prepare_data_for_alignment(matched: list[MatchInfo]):
     """
@@ -52,7 +68,8 @@ def prepare_data_for_alignment(matched: list[MatchInfo]):
 
     for match in matched:
         # ✅ Use dataclass attributes instead of dict keys
-        workpiece = copy.deepcopy(match.workpiece)
+        # Read-only access: Contour objects copy-on-write, so the library workpiece is not copied
+        workpiece = match.workpiece
         # Prepare main contour object
         main_contour = workpiece.get_main_contour()
         contour_obj = Contour(main_contour)
@@ -117,10 +134,27 @@ def match_workpieces(
     noMatches: list[Contour] = []
     matchedContours: list[Contour] = []
 
-    for contour_data in newContours.copy():
-        contour = Contour(contour_data)
-        best = strategy.find_best_match(workpieces, contour)
+    contours = [Contour(contour_data) for contour_data in newContours]
+
+    candidates = None
+    if USE_PREFILTER_INDEX and workpieces:
+        # Narrow each contour down to the plausible workpieces before the expensive matching
+        index = get_prefilter_index(workpieces)
+        candidates = [index.query(contour,
+                                  top_k=getattr(strategy, "prefilter_top_k", None),
+                                  max_area_ratio=getattr(strategy, "prefilter_max_area_ratio", None))
+                      for contour in contours]
+
+    if hasattr(strategy, "find_best_matches"):
+        # Strategies that support it score all (workpiece, contour) pairs of the frame at once
+        best_matches = strategy.find_best_matches(workpieces, contours, candidates)
+    elif candidates is not None:
+        best_matches = [strategy.find_best_match([workpieces[i] for i in contour_candidates], contour)
+                        for contour, contour_candidates in zip(contours, candidates)]
+    else:
+        best_matches = [strategy.find_best_match(workpieces, contour) for contour in contours]
 
+    for contour, best in zip(contours, best_matches):
         if best.is_match:
             match_info = MatchInfo(
                 workpiece=best.workpiece,
@@ -1,4 +1,5 @@
 import copy
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict
 from typing import List, Optional, Tuple
 
@@ -9,7 +10,7 @@ from modules.contour_matching.matching.match_info import MatchInfo
 from modules.shared.core.ContourStandartized import Contour
 from modules.contour_matching.alignment.mask_refinement import _refine_alignment_with_mask
 from modules.contour_matching.alignment.workpiece_update import update_workpiece_data
-from modules.contour_matching.matching_config import REFINEMENT_THRESHOLD
+from modules.contour_matching.matching_config import REFINEMENT_THRESHOLD, ALIGNMENT_WORKERS
 
 
 def apply_rotation(contours, angle, pivot):
@@ -79,20 +80,27 @@ def align_contours_generic(
     spray_fills_list: Optional[List[List[Contour]]] = None,
     rotation_diffs: Optional[List[float]] = None,
     translation_diffs: Optional[List[Tuple[float, float]]] = None,
-    refine: bool = True
+    refine: bool = True,
+    max_workers: int = 1
 ) -> None:
     """
     Align multiple target contours to corresponding reference contours using `align_single_contour`.
+
+    Every alignment only touches its own target/spray objects, so with max_workers > 1 they
+    run on a bounded thread pool (the refinement is OpenCV/NumPy work that releases the GIL).
+    Results do not depend on scheduling; max_workers=1 aligns sequentially in list order.
+    On the pool a failing alignment does not stop the others; the first failure is re-raised
+    once all of them have finished.
     """
     spray_contours_list = spray_contours_list or [[] for _ in target_contours]
     spray_fills_list = spray_fills_list or [[] for _ in target_contours]
     rotation_diffs = rotation_diffs or [0.0] * len(target_contours)
     translation_diffs = translation_diffs or [(0.0, 0.0)] * len(target_contours)
 
-    for i, (target, reference) in enumerate(zip(target_contours, reference_contours)):
+    def align(i):
         align_single_contour(
-            target=target,
-            reference=reference,
+            target=target_contours[i],
+            reference=reference_contours[i],
             spray_contours=spray_contours_list[i],
             spray_fills=spray_fills_list[i],
             rotation_diff=rotation_diffs[i],
@@ -100,15 +108,38 @@ def align_contours_generic(
             refine=refine
         )
 
+    count = min(len(target_contours), len(reference_contours))
+    workers = max(1, min(max_workers, count))
+    if workers == 1:
+        for i in range(count):
+            align(i)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ContourAlign") as executor:
+        futures = [executor.submit(align, i) for i in range(count)]
+    # Every alignment has finished (a failure must not cancel the queued ones); the first
+    # failure in input order is re-raised
+    for future in futures:
+        future.result()
+
+
+
+def _aligned_variant(workpiece):
+    """Copy of a library workpiece that update_workpiece_data can write transformed geometry into."""
+    if hasattr(workpiece, "copy_with_shared_geometry"):
+        return workpiece.copy_with_shared_geometry()
+    return copy.deepcopy(workpiece)
 
 
-def _alignContours(matched: List[MatchInfo], debug: bool = False) -> Dict[str, List[Any]]:
+def _alignContours(matched: List[MatchInfo], debug: bool = False,
+                   max_workers: int = ALIGNMENT_WORKERS) -> Dict[str, List[Any]]:
     """
     Align matched contours to the workpieces using the workpiece-agnostic batch function.
 
     Args:
         matched (List[MatchInfo]): List of matched workpieces with contour info.
         debug (bool): Whether to generate debug plots.
+        max_workers (int): Matches aligned in parallel; 1 aligns them sequentially.
 
     Returns:
         Dict[str, List[Any]]: Aligned workpieces, orientations, ML confidences, ML results.
@@ -146,12 +177,13 @@ def _alignContours(matched: List[MatchInfo], debug: bool = False) -> Dict[str, L
         spray_fills_list=spray_fills_list,
         rotation_diffs=rotation_diffs,
         translation_diffs=translation_diffs,
-        refine=True
+        refine=True,
+        max_workers=max_workers
     )
 
     # --- Update workpieces and optionally generate debug plots ---
     for i, match in enumerate(matched):
-        workpiece = copy.deepcopy(match.workpiece)
+        workpiece = _aligned_variant(match.workpiece)
         contourObj = target_contours[i]
         sprayContourObjs = spray_contours_list[i]
         sprayFillObjs = spray_fills_list[i]
@@ -1,3 +1,5 @@
+from modules.contour_matching.alignment.rotation_search import RotationSearchEngine
+from modules.contour_matching.matching_config import USE_FAST_ROTATION_SEARCH
 from modules.shared.core.ContourStandartized import Contour
 from modules.utils.contours import calculate_mask_overlap
 
@@ -5,7 +7,9 @@ from modules.utils.contours import calculate_mask_overlap
 def _refine_alignment_with_mask(workpiece_contour, target_contour):
     """
     Refine the alignment of a contour by rotating it to maximize mask overlap with a target contour.
-    Performs three stages: coarse search, adaptive local refinement, and fine-tuning.
+    By default uses RotationSearchEngine (ROI-sized masks, batched coarse pass, full resolution
+    refinement). With USE_FAST_ROTATION_SEARCH disabled it performs the original three stages:
+    coarse search, adaptive local refinement, and fine-tuning on an 800x800 canvas.
 
     Args:
         workpiece_contour (np.ndarray or Contour): The contour to rotate and align.
@@ -17,6 +21,11 @@ def _refine_alignment_with_mask(workpiece_contour, target_contour):
             - best_rotation_angle (float): Optimal rotation angle in degrees [-180, 180].
             - best_overlap_score (float): Maximum mask overlap achieved.
     """
+    if USE_FAST_ROTATION_SEARCH:
+        best_rotation, best_overlap = RotationSearchEngine(workpiece_contour, target_contour).search()
+        print(f"      Final best rotation: {best_rotation:.2f}° with overlap: {best_overlap:.4f}")
+        return best_rotation, best_overlap
+
     contour_obj = Contour(workpiece_contour)
     centroid = contour_obj.getCentroid()
 
@@ -0,0 +1,136 @@
+import cv2
+import numpy as np
+
+from modules.shared.core.ContourStandartized import Contour
+
+COARSE_STEP = 2.0  # Degrees between candidates of the low resolution pass over 0-360°
+COARSE_MAX_SIDE = 160  # Longest side (px) of the downsampled ROI used for the coarse pass
+COARSE_CANDIDATES = 3  # Best coarse angles refined at full resolution
+REFINE_STEPS = ((0.5, 2.0), (0.1, 0.5))  # (step, ±range) in degrees of the full resolution passes
+ROI_MARGIN = 2  # Extra pixels around the ROI so filled borders are never clipped
+
+
+def rotate_points(points: np.ndarray, angles_deg, pivot) -> np.ndarray:
+    """
+    Rotate a (N, 2) point set around a pivot by every angle at once.
+
+    Returns:
+        np.ndarray: (len(angles), N, 2) rotated points, float32 like Contour.rotate
+    """
+    angles = np.radians(np.atleast_1d(np.asarray(angles_deg, dtype=np.float64)))
+    cos_a, sin_a = np.cos(angles)[:, None], np.sin(angles)[:, None]
+    p = np.asarray(pivot, dtype=np.float32)
+    pts = np.asarray(points, dtype=np.float32).reshape(-1, 2) - p
+    x = pts[:, 0][None, :]
+    y = pts[:, 1][None, :]
+    rotated = np.stack([x * cos_a - y * sin_a, x * sin_a + y * cos_a], axis=-1)
+    return (rotated + p).astype(np.float32)
+
+
+class RotationSearchEngine:
+    """
+    Finds the rotation of a contour (about its centroid) that maximises the mask IoU
+    with a fixed target contour.
+
+    The target is rasterised once into an ROI sized to the target and to the circle
+    swept by the rotating contour, so nothing is clipped and no pixels outside the
+    contours are touched. All angles of the 0-360° coarse pass are rotated in one
+    vectorised step and scored on a downsampled copy of the ROI; only the best few
+    are refined at full resolution. Full resolution scores use the same int32
+    rasterisation as calculate_mask_overlap, so the reported overlap is the same
+    value that function returns for an unclipped canvas.
+    """
+
+    def __init__(self, workpiece_contour, target_contour):
+        self.points = np.asarray(workpiece_contour, dtype=np.float32).reshape(-1, 2)
+        self.pivot = Contour(self.points).getCentroid()  # same pivot as the staged search
+        target = np.asarray(target_contour).reshape(-1, 2).astype(np.int32)
+
+        radius = float(np.max(np.linalg.norm(self.points - np.asarray(self.pivot, dtype=np.float32), axis=1))) \
+            if len(self.points) else 0.0
+        low = np.minimum(target.min(axis=0), np.floor(np.asarray(self.pivot) - radius)) - ROI_MARGIN
+        high = np.maximum(target.max(axis=0), np.ceil(np.asarray(self.pivot) + radius)) + ROI_MARGIN
+        self.offset = low.astype(np.int64)
+        self.size = (int(high[1] - low[1]) + 1, int(high[0] - low[0]) + 1)  # (height, width)
+
+        self.target_mask = np.zeros(self.size, dtype=np.uint8)
+        cv2.drawContours(self.target_mask, [(target - self.offset).astype(np.int32).reshape(-1, 1, 2)], -1, 1, -1)
+        self.target_area = int(cv2.countNonZero(self.target_mask))
+
+        self.coarse_scale = min(1.0, COARSE_MAX_SIDE / max(self.size))
+        coarse_size = (max(1, int(round(self.size[1] * self.coarse_scale))),
+                       max(1, int(round(self.size[0] * self.coarse_scale))))
+        self.coarse_target = cv2.resize(self.target_mask, coarse_size, interpolation=cv2.INTER_NEAREST)
+        self.coarse_target_area = int(cv2.countNonZero(self.coarse_target))
+
+    def overlap(self, angle: float) -> float:
+        """Full resolution IoU of the contour rotated by angle degrees with the target."""
+        return self.overlaps([angle])[0]
+
+    def overlaps(self, angles) -> np.ndarray:
+        """Full resolution IoU for a batch of angles."""
+        rotated = rotate_points(self.points, angles, self.pivot)
+        shifted = (rotated.astype(np.int32) - self.offset).astype(np.int32)
+        return self._score_masks(shifted, self.target_mask, self.target_area, exact=True)
+
+    def coarse_overlaps(self, angles) -> np.ndarray:
+        """Approximate IoU for a batch of angles on the downsampled ROI."""
+        rotated = rotate_points(self.points, angles, self.pivot)
+        scaled = ((rotated - self.offset.astype(np.float32)) * self.coarse_scale).astype(np.int32)
+        return self._score_masks(scaled, self.coarse_target, self.coarse_target_area)
+
+    def search(self):
+        """
+        Returns:
+            tuple: (best_rotation, best_overlap) with the rotation normalised to [-180, 180].
+            The rotation stays 0 unless another angle strictly improves the overlap.
+        """
+        best_rotation = 0.0
+        best_overlap = self.overlap(0.0)
+
+        coarse_angles = np.arange(-180.0, 180.0, COARSE_STEP)
+        coarse_scores = self.coarse_overlaps(coarse_angles)
+        for start in self._distinct_peaks(coarse_angles, coarse_scores):
+            center = float(start)
+            for step, span in REFINE_STEPS:
+                angles = center + np.arange(-span, span + step / 2, step)
+                scores = self.overlaps(angles)
+                center = float(angles[int(np.argmax(scores))])
+                if scores.max() > best_overlap:
+                    best_overlap = float(scores.max())
+                    best_rotation = center
+
+        best_rotation = (best_rotation + 180) % 360 - 180
+        return best_rotation, best_overlap
+
+    """PRIVATE METHODS SECTION"""
+
+    @staticmethod
+    def _distinct_peaks(angles, scores):
+        # Best coarse angles, skipping neighbours of an already chosen one (they share its peak)
+        min_separation = 2 * REFINE_STEPS[0][1]
+        chosen = []
+        for index in np.argsort(scores)[::-1]:
+            angle = angles[index]
+            if all(abs((angle - other + 180) % 360 - 180) > min_separation for other in chosen):
+                chosen.append(angle)
+                if len(chosen) == COARSE_CANDIDATES:
+                    break
+        return chosen
+
+    @staticmethod
+    def _score_masks(point_sets, target_mask, target_area, exact=False) -> np.ndarray:
+        # One reusable mask per batch; drawContours matches calculate_mask_overlap pixel for pixel
+        scores = np.empty(len(point_sets))
+        mask = np.zeros_like(target_mask)
+        for i, pts in enumerate(point_sets):
+            mask.fill(0)
+            if exact:
+                cv2.drawContours(mask, [pts.reshape(-1, 1, 2)], -1, 1, -1)
+            else:
+                cv2.fillPoly(mask, [pts.reshape(-1, 1, 2)], 1)
+            area = cv2.countNonZero(mask)
+            intersection = cv2.countNonZero(cv2.bitwise_and(mask, target_mask))
+            union = area + target_area - intersection
+            scores[i] = intersection / union if union > 0 else 0.0
+        return scores
@@ -0,0 +1,139 @@
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import numpy as np
+
+from modules.shapeMatchinModelTraining.featuresExtraction import ContourDescriptor, compute_contour_descriptor
+from modules.shared.core.ContourStandartized import Contour
+
+
+def contour_hash(points: np.ndarray) -> str:
+    """Content hash of a standardized (N, 2) contour."""
+    points = np.ascontiguousarray(points)
+    digest = hashlib.blake2b(points.tobytes(), digest_size=16)
+    digest.update(str(points.shape).encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class WorkpieceDescriptor:
+    """Cached matching data of one library workpiece."""
+    workpiece_id: Any
+    contour_hash: str
+    contour: Contour
+    area: float
+    _descriptor: Optional[ContourDescriptor] = None
+    # Contour object of the workpiece the entry was built from (validation token for get)
+    source: Any = field(default=None, repr=False, compare=False)
+
+    @property
+    def descriptor(self) -> ContourDescriptor:
+        # Computed on first use - the geometric strategy only needs contour and area
+        if self._descriptor is None:
+            self._descriptor = compute_contour_descriptor(self.contour.get())
+        return self._descriptor
+
+
+class WorkpieceDescriptorCache:
+    """
+    Shape descriptors of the library workpieces, keyed by workpiece ID and contour hash.
+
+    Entries are filled when workpieces are loaded or saved by the repository. A lookup only
+    checks that the workpiece still holds the contour object the entry was built from; if
+    the object was replaced the new contour is hashed, and described again only when its
+    points differ. Contour points edited in place are picked up when the repository saves
+    the workpiece (put).
+
+    version is bumped whenever an entry is added, replaced or removed, so indexes derived
+    from the cache (prefilter_index) know when to rebuild.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.version = 0
+
+    def put(self, workpiece, precompute: bool = True) -> Optional[WorkpieceDescriptor]:
+        """(Re)describe a workpiece. Returns None if it has no usable main contour."""
+        workpiece_id = getattr(workpiece, "workpieceId", None)
+        try:
+            contour = Contour(workpiece.get_main_contour())
+        except Exception as e:
+            print(f"[DescriptorCache] Skipping workpiece {workpiece_id}: {e}")
+            return None
+
+        entry = WorkpieceDescriptor(workpiece_id=workpiece_id,
+                                    contour_hash=contour_hash(contour.get()),
+                                    contour=contour,
+                                    area=contour.getArea(),
+                                    source=_contour_source(workpiece))
+        if precompute:
+            try:
+                _ = entry.descriptor
+            except Exception as e:
+                print(f"[DescriptorCache] Could not describe workpiece {workpiece_id}: {e}")
+
+        if workpiece_id is not None:
+            with self._lock:
+                self._entries[str(workpiece_id)] = entry
+                self.version += 1
+        return entry
+
+    def get(self, workpiece) -> WorkpieceDescriptor:
+        """Cached descriptor of a workpiece, recomputed if its contour no longer matches the cache."""
+        workpiece_id = getattr(workpiece, "workpieceId", None)
+        with self._lock:
+            entry = self._entries.get(str(workpiece_id)) if workpiece_id is not None else None
+
+        if entry is not None:
+            source = _contour_source(workpiece)
+            if source is not None and source is entry.source:
+                self.hits += 1
+                return entry
+            # Contour object replaced (e.g. workpiece reloaded) - only re-describe if the points changed
+            points = Contour(workpiece.get_main_contour()).get()
+            if contour_hash(points) == entry.contour_hash:
+                entry.source = source
+                self.hits += 1
+                return entry
+
+        self.misses += 1
+        entry = self.put(workpiece, precompute=False)
+        if entry is None:
+            raise ValueError(f"Workpiece {workpiece_id} has no usable main contour")
+        return entry
+
+    def remove(self, workpiece_id):
+        with self._lock:
+            if self._entries.pop(str(workpiece_id), None) is not None:
+                self.version += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.version += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _contour_source(workpiece):
+    """The object holding a workpiece's main contour points ({"contour": points} or the points), or None."""
+    contour = getattr(workpiece, "contour", None)
+    if isinstance(contour, dict):
+        contour = contour.get("contour")
+    return contour
+
+
+_descriptor_cache = WorkpieceDescriptorCache()
+
+
+def get_descriptor_cache() -> WorkpieceDescriptorCache:
+    """Returns the process-wide workpiece descriptor cache."""
+    return _descriptor_cache
@@ -0,0 +1,108 @@
+import bisect
+import threading
+from typing import Any, Optional
+
+import cv2
+import numpy as np
+
+from modules.contour_matching.matching.descriptor_cache import get_descriptor_cache
+from modules.shared.core.ContourStandartized import Contour
+
+N_HU = 4  # Higher order Hu moments are too noise sensitive to rank candidates with
+MIN_FEATURE_STD = 1e-3  # Floor for the per-feature spread used to normalise distances
+
+
+def compute_invariants(points: np.ndarray) -> np.ndarray:
+    """
+    Cheap rotation/translation invariant summary of a contour used by the prefilter:
+    log area, log perimeter, log-scaled Hu moments 1-4 and the elongation of the
+    minimum area rectangle (short side / long side).
+    """
+    contour = np.asarray(points, dtype=np.float32).reshape(-1, 1, 2)
+    area = cv2.contourArea(contour)
+    perimeter = cv2.arcLength(contour, True)
+    hu = cv2.HuMoments(cv2.moments(contour)).flatten()[:N_HU]
+    hu = -np.sign(hu) * np.log10(np.abs(hu) + 1e-10)
+    (_, _), (w, h), _ = cv2.minAreaRect(contour)
+    elongation = min(w, h) / max(w, h) if max(w, h) > 0 else 0.0
+    return np.concatenate(([np.log(max(area, 1e-6)), np.log(max(perimeter, 1e-6))], hu, [elongation]))
+
+
+class WorkpiecePrefilterIndex:
+    """
+    Coarse index over the workpiece library used to pick plausible candidates for a
+    detected contour before the expensive matching strategy runs.
+
+    Workpieces are kept sorted by log area. A query first bisects that array to the
+    band of workpieces whose area is within max_area_ratio of the contour (sublinear in
+    the library size), then ranks the band by the normalised distance of the invariant
+    vectors and keeps the top_k closest.
+    """
+
+    def __init__(self, entries: list, key: Any = None):
+        self.key = key
+        self._size = len(entries)
+
+        if entries:
+            invariants = np.array([compute_invariants(entry.contour.get()) for entry in entries])
+        else:
+            invariants = np.zeros((0, 3 + N_HU))
+        order = np.argsort(invariants[:, 0], kind="stable")
+        self._order = order
+        self._invariants = invariants[order]
+        self._log_areas = self._invariants[:, 0].tolist()
+        spread = invariants.std(axis=0) if len(invariants) > 1 else np.ones(invariants.shape[1])
+        self._scale = np.maximum(spread, MIN_FEATURE_STD)
+
+    def __len__(self):
+        return self._size
+
+    def query(self, contour: Contour, top_k: Optional[int] = None, max_area_ratio: Optional[float] = None) -> list[int]:
+        """
+        Returns:
+            list[int]: indices into the indexed workpiece list, in library order
+        """
+        invariants = compute_invariants(contour.get())
+        start, stop = 0, len(self._log_areas)
+        if max_area_ratio is not None:
+            log_ratio = np.log(max_area_ratio)
+            start = bisect.bisect_left(self._log_areas, invariants[0] - log_ratio)
+            stop = bisect.bisect_right(self._log_areas, invariants[0] + log_ratio)
+
+        band = np.arange(start, stop)
+        if top_k is not None and len(band) > top_k:
+            distances = np.linalg.norm((self._invariants[start:stop] - invariants) / self._scale, axis=1)
+            band = band[np.argpartition(distances, top_k - 1)[:top_k]]
+
+        return sorted(self._order[band].tolist())
+
+
+_index: Optional[WorkpiecePrefilterIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_prefilter_index(workpieces: list[Any]) -> WorkpiecePrefilterIndex:
+    """
+    Returns the prefilter index for this workpiece list, rebuilding it only when a
+    workpiece was added, removed or had its contour changed.
+
+    The index is keyed on the descriptor cache version (bumped by the repository's save,
+    delete, load and refresh hooks) and the workpiece IDs in list order, so a frame with an
+    unchanged library costs one ID per workpiece and no cache lookups.
+    """
+    global _index
+    cache = get_descriptor_cache()
+    # Read before the rebuild: descriptors created by it bump the version once more, and the
+    # next call rebuilds from the then complete cache instead of keeping a half-built key
+    key = (cache.version, tuple(_key_item(wp) for wp in workpieces))
+
+    with _index_lock:
+        if _index is None or _index.key != key:
+            _index = WorkpiecePrefilterIndex([cache.get(wp) for wp in workpieces], key)
+        return _index
+
+
+def _key_item(workpiece):
+    # Workpieces without an ID never get a cache entry - key those by the object itself
+    workpiece_id = getattr(workpiece, "workpieceId", None)
+    return workpiece if workpiece_id is None else workpiece_id
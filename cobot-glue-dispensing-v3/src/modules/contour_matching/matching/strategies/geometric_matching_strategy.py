@@ -5,12 +5,16 @@ import numpy as np
 
 from modules.contour_matching.debug.plot_generator import _create_debug_plot
 from modules.contour_matching.matching.best_match_result import BestMatchResult
+from modules.contour_matching.matching.descriptor_cache import get_descriptor_cache
 from modules.shared.core.ContourStandartized import Contour
 
 
 class GeometricMatchingStrategy:
     def __init__(self, similarity_threshold: float = 0.8):
         self.similarity_threshold = similarity_threshold
+        # Only the area ratio is scored, so the prefilter area band is exact and no top-k cut is needed
+        self.prefilter_top_k = None
+        self.prefilter_max_area_ratio = 1.0 / similarity_threshold * (1 + 1e-6) if similarity_threshold > 0 else None
 
     def find_best_match(
         self, workpieces: list[Any], contour: Contour
@@ -18,10 +22,14 @@ class GeometricMatchingStrategy:
         from modules.contour_matching.alignment.difference_calculator import _calculateDifferences
 
         best = BestMatchResult(workpiece=None, confidence=0.0, result="DIFFERENT")
+        cache = get_descriptor_cache()
+        contour_area = contour.getArea()
 
         for wp in workpieces:
-            wp_contour = Contour(wp.get_main_contour())
-            similarity = self._getSimilarity(wp_contour.get(), contour.get())
+            entry = cache.get(wp)
+            wp_contour = entry.contour
+            similarity = self._getSimilarity(wp_contour.get(), contour.get(),
+                                             area1=entry.area, area2=contour_area)
 
             if similarity > self.similarity_threshold * 100 and similarity > best.confidence:
                 centroid_diff, rotation_diff, contour_angle = _calculateDifferences(wp_contour, contour)
@@ -37,19 +45,22 @@ class GeometricMatchingStrategy:
 
         return best
 
-    def _getSimilarity(self,contour1, contour2, debug=True):
+    def _getSimilarity(self,contour1, contour2, debug=True, area1=None, area2=None):
         """
         Simplified contour similarity test using only area difference.
         Returns a percentage similarity score based on area ratio.
+        Precomputed areas (e.g. from the descriptor cache) can be passed in.
         """
-        contour1 = np.array(contour1, dtype=np.float32)
-        contour2 = np.array(contour2, dtype=np.float32)
+        contour1 = np.asarray(contour1, dtype=np.float32)
+        contour2 = np.asarray(contour2, dtype=np.float32)
 
         print(f"Calculating similarity between contours of lengths {len(contour1)} and {len(contour2)}")
 
         # Compute areas
-        area1 = cv2.contourArea(contour1)
-        area2 = cv2.contourArea(contour2)
+        if area1 is None:
+            area1 = cv2.contourArea(contour1)
+        if area2 is None:
+            area2 = cv2.contourArea(contour2)
         area_diff = abs(area1 - area2)
 
         if area1 > 0 and area2 > 0:
@@ -2,25 +2,71 @@ from typing import Any
 
 from modules.contour_matching.alignment.difference_calculator import _calculateDifferences
 from modules.contour_matching.matching.best_match_result import BestMatchResult
-from modules.contour_matching.matching_config import DEBUG_CALCULATE_DIFFERENCES
-from modules.shapeMatchinModelTraining.modelManager import predict_similarity
+from modules.contour_matching.matching.descriptor_cache import get_descriptor_cache
+from modules.contour_matching.matching_config import DEBUG_CALCULATE_DIFFERENCES, PREFILTER_TOP_K, \
+    PREFILTER_MAX_AREA_RATIO
+from modules.shapeMatchinModelTraining.featuresExtraction import compute_contour_descriptor, \
+    compute_features_from_descriptors
+from modules.shapeMatchinModelTraining.modelManager import predict_similarity_batch
 from modules.shared.core.ContourStandartized import Contour
 
 
 class MLMatchingStrategy:
     def __init__(self, model: Any):
         self.model = model
+        self.prefilter_top_k = PREFILTER_TOP_K
+        self.prefilter_max_area_ratio = PREFILTER_MAX_AREA_RATIO
 
     def find_best_match(
         self, workpieces: list[Any], contour: Contour
     ) -> BestMatchResult:
+        return self.find_best_matches(workpieces, [contour])[0]
 
+    def find_best_matches(
+        self, workpieces: list[Any], contours: list[Contour], candidates: list[list[int]] = None
+    ) -> list[BestMatchResult]:
+        """
+        Find the best workpiece for every contour of a frame.
+        Features for all (workpiece, contour) pairs are computed first and scored
+        with a single batched predict_proba call. The library side of the features comes
+        from the descriptor cache, so only the new contours are described here.
 
+        Args:
+            candidates: optional per-contour lists of workpiece indices (from the prefilter
+                index); only those pairs are scored. Defaults to every workpiece.
+        """
+        if candidates is None:
+            candidates = [range(len(workpieces))] * len(contours)
+
+        cache = get_descriptor_cache()
+        wp_entries = [cache.get(wp) for wp in workpieces]
+
+        feature_rows = []
+        for contour, contour_candidates in zip(contours, candidates):
+            if not contour_candidates:
+                continue
+            contour_descriptor = compute_contour_descriptor(contour.get())
+            for index in contour_candidates:
+                feature_rows.append(compute_features_from_descriptors(wp_entries[index].descriptor,
+                                                                      contour_descriptor))
+
+        predictions = predict_similarity_batch(self.model, feature_rows) if feature_rows else []
+
+        results = []
+        offset = 0
+        for contour, contour_candidates in zip(contours, candidates):
+            count = len(contour_candidates)
+            results.append(self._select_best([workpieces[i] for i in contour_candidates],
+                                             [wp_entries[i].contour for i in contour_candidates],
+                                             contour,
+                                             predictions[offset:offset + count]))
+            offset += count
+        return results
+
+    def _select_best(self, workpieces, wp_contours, contour, predictions) -> BestMatchResult:
         best = BestMatchResult(workpiece=None, confidence=0.0, result="DIFFERENT")
 
-        for wp in workpieces:
-            wp_contour = Contour(wp.get_main_contour())
-            result, confidence, _ = predict_similarity(self.model, wp_contour.get(), contour.get())
+        for wp, wp_contour, (result, confidence) in zip(workpieces, wp_contours, predictions):
             wp_id = getattr(wp, "workpieceId", None)
 
             if result == "SAME":
@@ -46,4 +92,3 @@ class MLMatchingStrategy:
                 )
 
         return best
-
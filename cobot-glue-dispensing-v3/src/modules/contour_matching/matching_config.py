@@ -1,3 +1,5 @@
+import os
+
 SIMILARITY_THRESHOLD = 80
 
 # Global debug flags - Set these to True to enable debugging
@@ -5,4 +7,10 @@ DEBUG_SIMILARITY = False
 DEBUG_CALCULATE_DIFFERENCES = False
 DEBUG_ALIGN_CONTOURS = False
 USE_COMPARISON_MODEL = False
-REFINEMENT_THRESHOLD = 0.1
\ No newline at end of file
+REFINEMENT_THRESHOLD = 0.1
+USE_FAST_ROTATION_SEARCH = True  # RotationSearchEngine instead of the staged full-canvas search
+ALIGNMENT_WORKERS = min(4, os.cpu_count() or 1)  # Threads used to align matched workpieces in parallel (1 = sequential)
+# Coarse prefilter over the workpiece library (see matching/prefilter_index.py)
+USE_PREFILTER_INDEX = True
+PREFILTER_TOP_K = 10  # ML strategy: candidates kept per contour after the area band
+PREFILTER_MAX_AREA_RATIO = 2.0  # ML strategy: ignore workpieces whose area differs by more than this factor
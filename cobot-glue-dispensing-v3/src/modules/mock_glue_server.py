@@ -38,6 +38,13 @@ consumption_rates = {
     3: 30.0    # Medium consumption - 30g/s
 }
 
+# Artificial response latency per meter (seconds), to reproduce a slow scale
+response_delays = {
+    1: 0.0,
+    2: 0.0,
+    3: 0.0
+}
+
 # Lock for thread-safe weight updates
 weight_lock = threading.Lock()
 
@@ -72,6 +79,7 @@ def get_weights():
 @app.route('/weight1')
 def weight1():
     """Endpoint for glue meter 1 (individual access)"""
+    time.sleep(response_delays[1])
     with weight_lock:
         current_weight = round(weights[1], 2)
 
@@ -84,6 +92,7 @@ def weight1():
 @app.route('/weight2')
 def weight2():
     """Endpoint for glue meter 2 (individual access)"""
+    time.sleep(response_delays[2])
     with weight_lock:
         current_weight = round(weights[2], 2)
 
@@ -96,6 +105,7 @@ def weight2():
 @app.route('/weight3')
 def weight3():
     """Endpoint for glue meter 3 (individual access)"""
+    time.sleep(response_delays[3])
     with weight_lock:
         current_weight = round(weights[3], 2)
 
@@ -120,6 +130,20 @@ def reset_weight(meter_id, new_weight):
         "new_weight": new_weight
     })
 
+@app.route('/delay/<int:meter_id>/<float:seconds>')
+def set_delay(meter_id, seconds):
+    """Endpoint to delay a specific meter's responses (for testing slow scales)"""
+    if meter_id not in response_delays:
+        return jsonify({"error": f"Invalid meter_id: {meter_id}"}), 400
+
+    response_delays[meter_id] = seconds
+
+    return jsonify({
+        "message": f"Responses of meter {meter_id} delayed by {seconds}s",
+        "meter_id": meter_id,
+        "delay": seconds
+    })
+
 @app.route('/status')
 def status():
     """Endpoint to get status of all meters"""
@@ -144,6 +168,7 @@ def index():
         <li><a href="/weight3">/weight3</a> - Glue Meter 3</li>
         <li><a href="/status">/status</a> - All meters status</li>
         <li>/reset/&lt;meter_id&gt;/&lt;new_weight&gt; - Reset meter weight (e.g., /reset/1/5000)</li>
+        <li>/delay/&lt;meter_id&gt;/&lt;seconds&gt; - Delay meter responses (e.g., /delay/2/0.5)</li>
     </ul>
 
     <h2>Configuration</h2>
@@ -0,0 +1,304 @@
+"""
+Single owner of a Modbus RTU serial line.
+
+Every transaction on a port is queued to one bus thread, which holds the only (persistent)
+serial handle and executes the queue in priority order:
+
+    PUMP_SPEED  >  CONTROL  >  SENSOR  >  HEALTH_CHECK
+
+Queued register reads (or writes) of the same slave and priority whose ranges touch are
+coalesced into a single multi-register frame (FC3 / FC16). Failed frames are retried with a
+bounded exponential backoff, and latency / error statistics are kept per slave.
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from enum import Enum, IntEnum
+
+import minimalmodbus
+
+from applications.glue_dispensing_application.services.glueSprayService.motorControl.errorCodes import \
+    ModbusExceptionType
+
+MAX_ATTEMPTS = 4  # Tries per frame before the error is reported
+RETRY_BASE_DELAY = 0.002  # Seconds before the first retry, doubled on every further retry
+RETRY_MAX_DELAY = 0.05  # Upper bound of the retry delay
+MAX_REGISTERS_PER_FRAME = 120  # Coalescing limit (FC3 allows 125, FC16 123)
+TRANSACTION_TIMEOUT = 5.0  # Seconds a caller waits for its transaction before giving up
+LATENCY_WINDOW = 512  # Latency samples kept per slave for the percentiles
+
+
+class ModbusPriority(IntEnum):
+    PUMP_SPEED = 0
+    CONTROL = 1  # generator, fan, motor on/off
+    SENSOR = 2  # state polling
+    HEALTH_CHECK = 3
+
+
+class ModbusOperation(Enum):
+    READ_REGISTERS = "read_registers"
+    WRITE_REGISTERS = "write_registers"
+    READ_BIT = "read_bit"
+    WRITE_BIT = "write_bit"
+
+
+class ModbusTransaction:
+    """One queued request; the caller blocks in wait() until the bus thread completes it."""
+
+    def __init__(self, slave, operation, address, count=1, values=None, priority=ModbusPriority.CONTROL,
+                 functioncode=None):
+        self.slave = slave
+        self.operation = operation
+        self.address = address
+        self.count = len(values) if values is not None else count
+        self.values = values
+        self.priority = priority
+        self.functioncode = functioncode
+        self.result = None
+        self.error = None
+        self.queued_at = time.perf_counter()
+        self._done = threading.Event()
+
+    @property
+    def end(self):
+        return self.address + self.count
+
+    def complete(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self._done.set()
+
+    def wait(self, timeout=TRANSACTION_TIMEOUT):
+        """Returns (result, error); error is a ModbusExceptionType or None."""
+        if not self._done.wait(timeout):
+            return None, ModbusExceptionType.TIMEOUT_ERROR
+        return self.result, self.error
+
+
+class SlaveStats:
+    """Frame latency, queue wait and error counters of one slave."""
+
+    def __init__(self, slave):
+        self.slave = slave
+        self._lock = threading.Lock()
+        self.transactions = 0
+        self.frames = 0
+        self.retries = 0
+        self.errors = {}  # ModbusExceptionType name -> count
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.queue_waits = deque(maxlen=LATENCY_WINDOW)
+
+    def record_frame(self, transactions, latency, queue_wait, retries, error=None):
+        with self._lock:
+            self.frames += 1
+            self.transactions += transactions
+            self.retries += retries
+            self.latencies.append(latency)
+            self.queue_waits.append(queue_wait)
+            if error is not None:
+                self.errors[error.name] = self.errors.get(error.name, 0) + 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            latencies = sorted(self.latencies)
+            waits = sorted(self.queue_waits)
+            return {
+                "transactions": self.transactions,
+                "frames": self.frames,
+                "retries": self.retries,
+                "errors": dict(self.errors),
+                "latency_p50_ms": _percentile(latencies, 0.5) * 1000,
+                "latency_p95_ms": _percentile(latencies, 0.95) * 1000,
+                "latency_max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+                "queue_wait_p95_ms": _percentile(waits, 0.95) * 1000,
+            }
+
+
+class ModbusBus:
+    """
+    Owns one serial port: a persistent minimalmodbus instrument driven by a single thread.
+    Use ModbusBus.for_port() to share the bus of a port across the application.
+    """
+
+    _buses = {}
+    _buses_lock = threading.Lock()
+
+    def __init__(self, port, baudrate=115200, bytesize=8, parity=minimalmodbus.serial.PARITY_NONE, stopbits=1,
+                 timeout=0.02, inter_byte_timeout=None, max_attempts=MAX_ATTEMPTS, retry_base_delay=RETRY_BASE_DELAY):
+        self.port = port
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.instrument = minimalmodbus.Instrument(port, 1, debug=False)
+        self.instrument.serial.baudrate = baudrate
+        self.instrument.serial.bytesize = bytesize
+        self.instrument.serial.parity = parity
+        self.instrument.serial.stopbits = stopbits
+        self.instrument.serial.timeout = timeout
+        if inter_byte_timeout is not None:
+            self.instrument.serial.inter_byte_timeout = inter_byte_timeout
+        self.instrument.mode = minimalmodbus.MODE_RTU
+        self.instrument.clear_buffers_before_each_transaction = True
+        self.instrument.close_port_after_each_call = False
+
+        self._queue = []  # heap of (priority, seq, transaction)
+        self._seq = itertools.count()
+        self._condition = threading.Condition()
+        self._running = True
+        self._stats = {}
+        self._thread = threading.Thread(target=self._run, name=f"ModbusBus[{port}]", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def for_port(cls, port, **settings) -> "ModbusBus":
+        """The bus of port, created with settings on first use."""
+        with cls._buses_lock:
+            bus = cls._buses.get(port)
+            if bus is None or not bus._running:
+                bus = cls(port, **settings)
+                cls._buses[port] = bus
+            return bus
+
+    def submit(self, transaction: ModbusTransaction) -> ModbusTransaction:
+        with self._condition:
+            if not self._running:
+                transaction.complete(error=ModbusExceptionType.CONNECTION_ERROR)
+                return transaction
+            heapq.heappush(self._queue, (transaction.priority, next(self._seq), transaction))
+            self._condition.notify()
+        return transaction
+
+    def read_registers(self, slave, start, count, priority=ModbusPriority.SENSOR):
+        """Returns (values, error)."""
+        return self.submit(ModbusTransaction(slave, ModbusOperation.READ_REGISTERS, start, count=count,
+                                             priority=priority)).wait()
+
+    def write_registers(self, slave, start, values, priority=ModbusPriority.CONTROL):
+        """Returns the ModbusExceptionType of a failed write, None on success."""
+        values = [int(value) & 0xFFFF for value in values]  # two's complement for signed values
+        return self.submit(ModbusTransaction(slave, ModbusOperation.WRITE_REGISTERS, start, values=values,
+                                             priority=priority)).wait()[1]
+
+    def read_bit(self, slave, address, functioncode=1, priority=ModbusPriority.SENSOR):
+        """Returns (value, error)."""
+        return self.submit(ModbusTransaction(slave, ModbusOperation.READ_BIT, address, priority=priority,
+                                             functioncode=functioncode)).wait()
+
+    def write_bit(self, slave, address, value, priority=ModbusPriority.CONTROL):
+        """Returns the ModbusExceptionType of a failed write, None on success."""
+        return self.submit(ModbusTransaction(slave, ModbusOperation.WRITE_BIT, address, values=[int(value)],
+                                             priority=priority)).wait()[1]
+
+    def get_stats(self) -> dict:
+        """Per-slave statistics: {slave: {transactions, frames, retries, errors, latency percentiles}}."""
+        return {slave: stats.snapshot() for slave, stats in list(self._stats.items())}
+
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._queue)
+
+    def close(self):
+        """Stop the bus thread, fail whatever is still queued and close the serial port."""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        self._thread.join()
+        with self._condition:
+            while self._queue:
+                heapq.heappop(self._queue)[2].complete(error=ModbusExceptionType.CONNECTION_ERROR)
+        self.instrument.serial.close()
+        with ModbusBus._buses_lock:
+            if ModbusBus._buses.get(self.port) is self:
+                del ModbusBus._buses[self.port]
+
+    """PRIVATE METHODS SECTION"""
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and not self._queue:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                batch = self._take_batch()
+            self._execute(batch)
+
+    def _take_batch(self):
+        """Pop the next transaction plus the queued ones that can share its frame."""
+        first = heapq.heappop(self._queue)[2]
+        batch = [first]
+        if first.operation not in (ModbusOperation.READ_REGISTERS, ModbusOperation.WRITE_REGISTERS):
+            return batch
+        start, end = first.address, first.end
+        while self._queue:
+            priority, _, candidate = self._queue[0]
+            if priority != first.priority or candidate.slave != first.slave or \
+                    candidate.operation is not first.operation or \
+                    candidate.address > end or candidate.end < start or \
+                    max(end, candidate.end) - min(start, candidate.address) > MAX_REGISTERS_PER_FRAME:
+                break
+            heapq.heappop(self._queue)
+            batch.append(candidate)
+            start, end = min(start, candidate.address), max(end, candidate.end)
+        return batch
+
+    def _execute(self, batch):
+        first = batch[0]
+        start = min(t.address for t in batch)
+        end = max(t.end for t in batch)
+        if first.operation is ModbusOperation.WRITE_REGISTERS:
+            registers = {}
+            for transaction in batch:  # queue order - later writes win
+                registers.update(zip(range(transaction.address, transaction.end), transaction.values))
+            if len(registers) != end - start:  # a gap cannot be sent in one frame
+                for transaction in batch:
+                    self._execute([transaction])
+                return
+            values = [registers[address] for address in range(start, end)]
+            call = lambda: self.instrument.write_registers(start, values)
+        elif first.operation is ModbusOperation.READ_REGISTERS:
+            call = lambda: self.instrument.read_registers(start, end - start)
+        elif first.operation is ModbusOperation.READ_BIT:
+            call = lambda: self.instrument.read_bit(first.address, functioncode=first.functioncode or 1)
+        else:
+            call = lambda: self.instrument.write_bit(first.address, first.values[0])
+
+        started = time.perf_counter()
+        result, error, retries = self._call_with_retry(first.slave, call)
+        latency = time.perf_counter() - started
+        self._stats_for(first.slave).record_frame(len(batch), latency, started - min(t.queued_at for t in batch),
+                                                  retries, error)
+        for transaction in batch:
+            if error is None and first.operation is ModbusOperation.READ_REGISTERS:
+                transaction.complete(result[transaction.address - start:transaction.end - start])
+            else:
+                transaction.complete(result, error)
+
+    def _call_with_retry(self, slave, call):
+        delay = self.retry_base_delay
+        error = None
+        for attempt in range(self.max_attempts):
+            try:
+                self.instrument.address = slave
+                return call(), None, attempt
+            except Exception as e:
+                error = ModbusExceptionType.from_exception(e)
+                if error is ModbusExceptionType.ILLEGAL_REQUEST_ERROR:  # the slave rejected it - retrying won't help
+                    return None, error, attempt
+                if attempt + 1 < self.max_attempts:
+                    time.sleep(delay)
+                    delay = min(delay * 2, RETRY_MAX_DELAY)
+        return None, error, self.max_attempts - 1
+
+    def _stats_for(self, slave) -> SlaveStats:
+        stats = self._stats.get(slave)
+        if stats is None:
+            stats = self._stats[slave] = SlaveStats(slave)
+        return stats
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
@@ -1,3 +1,4 @@
+from modules.modbusCommunication.ModbusBus import ModbusPriority
 from modules.modbusCommunication.ModbusClient import ModbusClient
 # from utils.linuxUtils import get_modbus_port
 import minimalmodbus
@@ -34,24 +35,18 @@ config = ModbusClientConfig(
 
 class ModbusController:
     @classmethod
-    def getModbusClient(cls,slaveId):
+    def getModbusClient(cls, slaveId, priority=ModbusPriority.CONTROL):
+        """
+        Client for slaveId on the configured port. Clients are cheap: they all share the
+        port's ModbusBus, which opens the serial port once with the settings above.
+        """
         # port = get_modbus_port()
         port = config.port
-        # port = "/dev/ttyS1"
-        # client = minimalmodbus.Instrument(port, slaveId)
-        client = ModbusClient(slave=slaveId, port=port)
-        # print(f"Connected Port: {port} Slave Id: {slaveId}")
-
-        """CLIENT CONFIG"""
-        client.client.serial.baudrate = config.baudrate
-        client.client.serial.bytesize = config.byte_size
-        client.client.serial.parity = config.parity
-        client.client.serial.stopbits = config.stop_bits
-        client.client.serial.timeout = config.timeout  # 10 ms timeout
-        client.clear_buffers_before_each_transaction = True
-        # client.close_port_after_each_call = False
-        client.mode = minimalmodbus.MODE_RTU
-        client.client.serial.inter_byte_timeout = config.inter_byte_timeout  # 10 ms delay
-
-        return client
-
+        return ModbusClient(slave=slaveId, port=port,
+                            baudrate=config.baudrate,
+                            bytesize=config.byte_size,
+                            stopbits=config.stop_bits,
+                            timeout=config.timeout,
+                            parity=config.parity.value,
+                            inter_byte_timeout=config.inter_byte_timeout,
+                            priority=priority)
@@ -1,8 +1,9 @@
 """
 modbusCommunication - Modbus RTU communication module
 
-Provides thread-safe Modbus RTU communication with automatic retry logic
-and error handling for hardware control in the cobot glue dispensing system.
+Provides Modbus RTU communication for hardware control in the cobot glue dispensing
+system. Each serial port is owned by one ModbusBus thread that executes requests by
+priority, coalesces adjacent register accesses and retries failed frames.
 
 Quick Start:
     >>> from modbusCommunication import ModbusController
@@ -10,19 +11,24 @@ Quick Start:
     >>> value, error = client.read(100)
 
 Main Components:
-    - ModbusClient: Core Modbus RTU client
+    - ModbusBus: Per-port transaction scheduler owning the serial handle
+    - ModbusPriority: Request priorities (pump speed > control > sensor > health check)
+    - ModbusClient: Modbus RTU client bound to a slave and priority
     - ModbusController: Factory for configured clients
     - ModbusClientSingleton: Singleton pattern wrapper
     - modbus_lock: Thread synchronization
     - MockClient: Testing mock
 """
 
+from .ModbusBus import ModbusBus, ModbusPriority
 from .ModbusClient import ModbusClient
 from .ModbusController import ModbusController
 from .ModbusClientSingleton import ModbusClientSingleton
 from .modbus_lock import modbus_lock
 
 __all__ = [
+    'ModbusBus',
+    'ModbusPriority',
     'ModbusClient',
     'ModbusController',
     'ModbusClientSingleton',
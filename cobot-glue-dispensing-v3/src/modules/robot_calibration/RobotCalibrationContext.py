@@ -120,8 +120,11 @@ class RobotCalibrationContext(Context):
     def flush_camera_buffer(self):
         """Flush camera buffer and get stable frame"""
         if self.system:
+            # Wait for min_camera_flush frames captured after this call instead of re-reading the same one
+            frame_ring = self.system.frame_ring
+            seq = frame_ring.seq
             for _ in range(self.min_camera_flush):
-                self.system.getLatestFrame()
+                seq, _ = frame_ring.wait_for_newer(seq, timeout=1.0)
 
     def to_debug_dict(self) -> dict:
         """
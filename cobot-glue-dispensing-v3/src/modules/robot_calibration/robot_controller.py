@@ -1,7 +1,13 @@
+import time
+
 import numpy as np
 
 from modules.utils.custom_logging import log_debug_message
 
+MOTION_DONE_TIMEOUT = 5.0  # s to wait for the robot to report motion done after a move
+SETTLE_TIME = 0.3  # s after motion done before a frame counts as still (vibration, exposure)
+SETTLED_FRAME_TIMEOUT = 2.0  # s to wait for the first frame captured after the settle time
+
 
 class CalibrationRobotController:
     def __init__(self, robot_service, adaptive_movement_config, logger_context):
@@ -88,6 +94,28 @@ class CalibrationRobotController:
     def get_current_position(self):
         return self.robot_service.get_current_position()
 
+    def wait_until_still(self, timeout):
+        """Block until the robot reports motion done, at most timeout seconds (replaces fixed settle sleeps)."""
+        return self.robot_service.wait_for_motion_complete(timeout)
+
+    def wait_until_settled(self, vision_system, settle_time=SETTLE_TIME, timeout=SETTLED_FRAME_TIMEOUT):
+        """
+        Block until the camera has a frame of the robot at rest: motion done, then settle_time,
+        then a frame whose capture started after that. A blocking move already returns in
+        position, but frames exposed during the move can still be in the capture/processing
+        pipeline, so a frame that is merely newer than the move is not enough.
+
+        Returns:
+            bool: True once such a frame is in the frame ring, False if none arrived within timeout.
+        """
+        self.wait_until_still(timeout=MOTION_DONE_TIMEOUT)
+        time.sleep(settle_time)
+        _, frame = vision_system.waitForFrameCapturedAfter(time.monotonic(), timeout=timeout)
+        if frame is None:
+            log_debug_message(self.logger_context, f"No camera frame within {timeout}s after the robot settled")
+            return False
+        return True
+
     def get_calibration_position(self):
         return self.robot_service.robot_config.getCalibrationPositionParsed()
 
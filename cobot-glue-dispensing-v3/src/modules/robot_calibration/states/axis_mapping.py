@@ -1,4 +1,3 @@
-import time
 
 import numpy as np
 
@@ -52,7 +51,6 @@ def auto_calibrate_image_to_robot_mapping(system, calibration_vision, calibratio
     MARKER_ID = 4
     MOVE_MM = 100
     MAX_ATTEMPTS = 100
-    DELAY_AFTER_MOVE = 1.0
 
     # Step 1: initial position
     before_x, before_y = get_marker_position(system, calibration_vision, MARKER_ID, MAX_ATTEMPTS)
@@ -61,7 +59,8 @@ def auto_calibrate_image_to_robot_mapping(system, calibration_vision, calibratio
     ret = calibration_robot_controller.move_x_relative(MOVE_MM, blocking=True)
     if ret != 0:
         raise RuntimeError(f"Robot failed to move X {MOVE_MM}")
-    time.sleep(DELAY_AFTER_MOVE)
+    if not calibration_robot_controller.wait_until_settled(system):
+        raise RuntimeError("No camera frame after the robot settled")
     after_x, after_y = get_marker_position(system, calibration_vision, MARKER_ID, MAX_ATTEMPTS)
     dx_img_xmove = after_x - before_x
     dy_img_xmove = after_y - before_y
@@ -72,7 +71,8 @@ def auto_calibrate_image_to_robot_mapping(system, calibration_vision, calibratio
     ret = calibration_robot_controller.move_y_relative(-MOVE_MM, blocking=True)
     if ret != 0:
         raise RuntimeError(f"Robot failed to move Y {-MOVE_MM}")
-    time.sleep(DELAY_AFTER_MOVE)
+    if not calibration_robot_controller.wait_until_settled(system):
+        raise RuntimeError("No camera frame after the robot settled")
     after_y_x, after_y_y = get_marker_position(system, calibration_vision, MARKER_ID, MAX_ATTEMPTS)
     dx_img_ymove = after_y_x - before_y_x
     dy_img_ymove = after_y_y - before_y_y
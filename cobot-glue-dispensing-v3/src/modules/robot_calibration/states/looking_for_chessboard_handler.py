@@ -25,9 +25,7 @@ def handle_looking_for_chessboard_state(context) -> RobotCalibrationStates:
         Next state to transition to
     """
     # Get frame for chessboard detection
-    chessboard_frame = None
-    while chessboard_frame is None:
-        chessboard_frame = context.system.getLatestFrame()
+    _, chessboard_frame = context.system.waitForNewFrame()
 
     # Find chessboard and compute pixels per millimeter
     result = context.calibration_vision.find_chessboard_and_compute_ppm(chessboard_frame)
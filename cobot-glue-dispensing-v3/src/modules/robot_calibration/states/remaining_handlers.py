@@ -97,7 +97,9 @@ def handle_align_robot_state(context) -> RobotCalibrationStates:
     log_debug_message(context.logger_context, message)
 
     if result == 0:
-        time.sleep(1)
+        # ITERATE_ALIGNMENT reads the latest frame - make sure it shows the robot at rest
+        if not context.calibration_robot_controller.wait_until_settled(context.system):
+            return _no_settled_frame_error(context, marker_id)
         return RobotCalibrationStates.ITERATE_ALIGNMENT
     else:
         return RobotCalibrationStates.ERROR
@@ -132,9 +134,7 @@ def handle_iterate_alignment_state(context) -> RobotCalibrationStates:
 
     # Capture frame
     capture_start = time.time()
-    iteration_image = None
-    while iteration_image is None:
-        iteration_image = context.system.getLatestFrame()
+    _, iteration_image = context.system.waitForNewFrame()
     capture_time = time.time() - capture_start
 
     # Detect marker
@@ -177,11 +177,9 @@ def handle_iterate_alignment_state(context) -> RobotCalibrationStates:
     result = None
 
     if alignment_success:
-        # Store pose and complete this marker
-        start_time = time.time()
-        while time.time() - start_time < 1.0:
-            current_pose = context.calibration_robot_controller.get_current_position()
-            time.sleep(0.05)
+        # Store pose and complete this marker (once the robot has settled)
+        context.calibration_robot_controller.wait_until_still(timeout=1.0)
+        current_pose = context.calibration_robot_controller.get_current_position()
 
         context.robot_positions_for_calibration[marker_id] = current_pose
         context.debug_draw.draw_image_center(iteration_image)
@@ -220,10 +218,13 @@ def handle_iterate_alignment_state(context) -> RobotCalibrationStates:
             )
             return RobotCalibrationStates.ERROR
 
-        # Stability wait
+        # Stability wait - motion done, settle time, then a frame captured after it
         stability_start = time.time()
-        time.sleep(context.fast_iteration_wait)
+        settled = context.calibration_robot_controller.wait_until_settled(
+            context.system, timeout=context.fast_iteration_wait)
         stability_time = time.time() - stability_start
+        if not settled:
+            return _no_settled_frame_error(context, marker_id)
         
         context.debug_draw.draw_image_center(iteration_image)
         show_live_feed(context, iteration_image, current_error_mm, broadcast_image=context.broadcast_events)
@@ -323,4 +324,15 @@ def handle_error_state(context) -> RobotCalibrationStates:
                 f"Failed to send error notification to UI: {e}"
             )
     
-    return RobotCalibrationStates.ERROR  # Stay in error state
\ No newline at end of file
+    return RobotCalibrationStates.ERROR  # Stay in error state
+
+def _no_settled_frame_error(context, marker_id) -> RobotCalibrationStates:
+    log_error_message(
+        context.logger_context,
+        f"No camera frame of the settled robot for marker {marker_id}. Stopping calibration process."
+    )
+    context.calibration_error_message = (
+        f"Calibration failed: the camera delivered no frame after the robot moved to marker {marker_id}. "
+        f"Check the camera connection."
+    )
+    return RobotCalibrationStates.ERROR
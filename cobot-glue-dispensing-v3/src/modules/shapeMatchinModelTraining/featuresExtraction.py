@@ -1,6 +1,8 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
 import cv2
 import numpy as np
-# from scipy.spatial.distance import directed_hausdorff
 
 # ===== AREA FEATURES =====
 
@@ -155,6 +157,7 @@ def compute_curvature_features(contour, n_bins=20):
 
 def hausdorff_distance(c1, c2):
     """Compute simple Hausdorff distance manually."""
+    from scipy.spatial.distance import directed_hausdorff
     pts1 = c1.reshape(-1, 2)
     pts2 = c2.reshape(-1, 2)
     return max(
@@ -498,6 +501,174 @@ def get_feature_extraction_metadata(n_curv_bins=16):
         }
     }
 
+# ===== PER-CONTOUR DESCRIPTORS =====
+
+@dataclass
+class ContourDescriptor:
+    """
+    The per-contour half of compute_enhanced_features.
+
+    Everything that depends on one contour only is computed once here, so a library
+    contour can be described once and compared against many detected contours.
+    Only matchShapes and the Hausdorff distance still need both contours.
+    """
+    contour: np.ndarray
+    area: float
+    perimeter: float
+    equivalent_diameter: float
+    n_curv_bins: int
+    solidity: float = 0.0
+    extent: float = 0.0
+    aspect_ratio: float = 0.0
+    convex_defect: Optional[float] = None
+    defects_count: int = 0
+    hu: Optional[np.ndarray] = None
+    fourier: Optional[np.ndarray] = None
+    perimeter_features: list = field(default_factory=list)
+    curvature: list = field(default_factory=list)
+    corners: Optional[dict] = None
+    errors: dict = field(default_factory=dict)
+
+
+def compute_contour_descriptor(contour, n_curv_bins=16):
+    """Precompute every single-contour term used by compute_enhanced_features."""
+    area = cv2.contourArea(contour)
+    perimeter = cv2.arcLength(contour, True)
+    descriptor = ContourDescriptor(contour=contour,
+                                   area=area,
+                                   perimeter=perimeter,
+                                   equivalent_diameter=np.sqrt(4 * area / np.pi) if area > 0 else 0,
+                                   n_curv_bins=n_curv_bins)
+    if area <= 0:
+        # compute_enhanced_features rejects such contours before any other feature is used
+        return descriptor
+
+    descriptor.solidity = solidity(contour)
+    descriptor.extent = extent(contour)
+    descriptor.aspect_ratio = aspect_ratio(contour)
+    descriptor.convex_defect = 1 - area / cv2.contourArea(cv2.convexHull(contour))
+    descriptor.defects_count = convexity_defects_count(contour)
+    descriptor.curvature = compute_curvature_features(contour, n_bins=n_curv_bins)
+
+    # Failures are kept and re-raised per pair, exactly where the pairwise functions raise them
+    try:
+        descriptor.hu = hu_moments_features(contour)
+    except Exception as e:
+        descriptor.errors['hu'] = e
+    try:
+        descriptor.fourier = fourier_descriptors(contour, 8)
+    except Exception as e:
+        descriptor.errors['fourier'] = e
+    try:
+        descriptor.perimeter_features = perimeter_features(contour)
+    except Exception as e:
+        descriptor.errors['perimeter_features'] = e
+    try:
+        descriptor.corners = detect_harris_corners(contour)
+    except Exception:
+        descriptor.corners = None
+    return descriptor
+
+
+def _descriptor_diff(d1, d2, key, name, expected_len):
+    for d in (d1, d2):
+        if key in d.errors:
+            raise RuntimeError(f"{name} extraction failed: {d.errors[key]}. "
+                               f"Contour shapes: c1={d1.contour.shape}, c2={d2.contour.shape}")
+    v1 = np.asarray(getattr(d1, key))
+    v2 = np.asarray(getattr(d2, key))
+    if len(v1) != expected_len or len(v2) != expected_len:
+        raise RuntimeError(f"{name} extraction failed: expected {expected_len} values, got {len(v1)} and {len(v2)}. "
+                           f"Contour shapes: c1={d1.contour.shape}, c2={d2.contour.shape}")
+    diff = np.abs(v1 - v2)
+    if np.any(np.isnan(diff)) or np.any(np.isinf(diff)):
+        raise RuntimeError(f"{name} extraction failed: invalid values {diff}. "
+                           f"Contour shapes: c1={d1.contour.shape}, c2={d2.contour.shape}")
+    return diff.tolist()
+
+
+def compute_features_from_descriptors(d1, d2):
+    """
+    Same feature vector as compute_enhanced_features(d1.contour, d2.contour),
+    built from two precomputed ContourDescriptors.
+    """
+    if d1.n_curv_bins != d2.n_curv_bins:
+        raise ValueError(f"Descriptors use different curvature bins: {d1.n_curv_bins} != {d2.n_curv_bins}")
+    n_curv_bins = d1.n_curv_bins
+    c1, c2 = d1.contour, d2.contour
+    area1, area2 = d1.area, d2.area
+    if area1 <= 0 or area2 <= 0:
+        raise ValueError(f"Invalid contour areas: c1_area={area1}, c2_area={area2}. Contours must have positive area.")
+
+    features = []
+
+    # 1. Area features (5 features)
+    features.extend([abs(area1 - area2),
+                     abs(d1.perimeter - d2.perimeter),
+                     scale_band_categorical(area1, area2),
+                     abs(d1.equivalent_diameter - d2.equivalent_diameter),
+                     abs(area1 - area2) / max(area1, area2)])
+
+    # 2. Shape similarity features (3 features) - the only truly pairwise terms
+    try:
+        m = cv2.matchShapes(c1, c2, cv2.CONTOURS_MATCH_I1, 0.0)
+        if np.isnan(m) or np.isinf(m):
+            raise ValueError(f"cv2.matchShapes returned invalid value: {m}. Check contour validity.")
+    except Exception as e:
+        if "invalid value" in str(e):
+            raise e
+        raise RuntimeError(f"cv2.matchShapes failed: {str(e)}. Contour shapes: c1={c1.shape}, c2={c2.shape}")
+    try:
+        hausdorff = hausdorff_distance(c1, c2)
+        if np.isnan(hausdorff) or np.isinf(hausdorff):
+            raise ValueError(f"Hausdorff distance calculation returned invalid value: {hausdorff}. Check contour point validity.")
+        perimeter_sum = d1.perimeter + d2.perimeter
+        hausdorff_normalized = hausdorff / (perimeter_sum / 2) if perimeter_sum > 0 else 0
+    except Exception as e:
+        if "invalid value" in str(e):
+            raise e
+        raise RuntimeError(f"Hausdorff distance calculation failed: {str(e)}. Contour shapes: c1={c1.shape}, c2={c2.shape}")
+    # convexity_ratio() is the same quantity as solidity()
+    features.extend([m, abs(d1.solidity - d2.solidity), hausdorff_normalized])
+
+    # 3. Geometric features (3 features)
+    features.extend([abs(d1.solidity - d2.solidity),
+                     abs(d1.extent - d2.extent),
+                     abs(d1.aspect_ratio - d2.aspect_ratio)])
+
+    # 4. Global features (15 features: 7 Hu + 8 Fourier)
+    features.extend(_descriptor_diff(d1, d2, 'hu', "Hu moments feature", 7))
+    features.extend(_descriptor_diff(d1, d2, 'fourier', "Fourier descriptors", 8))
+
+    # 5. Perimeter features (2 features)
+    features.extend(_descriptor_diff(d1, d2, 'perimeter_features', "Perimeter features", 2))
+
+    # 6. Local features (n_curv_bins features)
+    features.extend(np.abs(np.array(d1.curvature) - np.array(d2.curvature)).tolist())
+
+    # 7. Convexity features (2 features)
+    features.extend([abs(d1.convex_defect - d2.convex_defect),
+                     abs(d1.defects_count - d2.defects_count)])
+
+    # 8. Corner features (5 features)
+    corners1, corners2 = d1.corners, d2.corners
+    if corners1 is None or corners2 is None:
+        features.extend([0.0, 0.0, 0.0, 0.0, 0.0])
+    else:
+        features.extend([abs(corners1[key] - corners2[key])
+                         for key in ('corner_count', 'corner_density', 'response_mean', 'response_max', 'response_var')])
+
+    expected_count = 5 + 3 + 3 + 15 + 2 + n_curv_bins + 2 + 5
+    if len(features) != expected_count:
+        raise ValueError(f"Feature extraction must return exactly {expected_count} features, got {len(features)}.")
+
+    features_arr = np.array(features)
+    if np.any(np.isnan(features_arr)) or np.any(np.isinf(features_arr)):
+        raise ValueError(f"Feature extraction produced invalid values (nan/inf): {features_arr}")
+
+    return features_arr.tolist()
+
+
 def compute_features_parallel(pair,n_curv_bins=16):
     """Wrapper function for parallel feature computation"""
     return compute_enhanced_features(pair[0], pair[1],n_curv_bins)
@@ -1,6 +1,7 @@
 import os
 import json
 import joblib
+import numpy as np
 from datetime import datetime
 
 from modules.shapeMatchinModelTraining.featuresExtraction import get_feature_extraction_metadata, \
@@ -174,7 +175,32 @@ def predict_similarity(model, contour1, contour2):
     prediction = model.predict([features])[0]
     probability = model.predict_proba([features])[0]
     confidence = max(probability)
+    result = _classify_prediction(prediction, confidence)
+    return result, confidence, features
+
+def predict_similarity_batch(model, feature_rows):
+    """
+    Score many contour pairs with a single predict_proba call.
+
+    Args:
+        model: trained classifier exposing predict_proba and classes_
+        feature_rows: list of feature vectors from compute_enhanced_features
+
+    Returns:
+        list of (result, confidence) tuples, in the order of feature_rows
+    """
+    if len(feature_rows) == 0:
+        return []
 
+    probabilities = np.asarray(model.predict_proba(np.asarray(feature_rows, dtype=np.float64)))
+    # predict() is argmax over predict_proba for the classifiers we train
+    predictions = np.asarray(model.classes_)[np.argmax(probabilities, axis=1)]
+    confidences = probabilities.max(axis=1)
+
+    return [(_classify_prediction(prediction, float(confidence)), float(confidence))
+            for prediction, confidence in zip(predictions, confidences)]
+
+def _classify_prediction(prediction, confidence):
     # # Filter by confidence
 
     if prediction == 1: # SAME
@@ -182,14 +208,13 @@ def predict_similarity(model, contour1, contour2):
         conf_high = 0.95
 
         if conf_low < confidence < conf_high:
-            return "UNCERTAIN", confidence, features
+            return "UNCERTAIN"
         elif confidence < conf_low:
-            return "DIFFERENT", confidence, features
+            return "DIFFERENT"
         else:
-            return "SAME", confidence, features
-        
-    result = "SAME" if prediction == 1 else "DIFFERENT"
-    return result, confidence, features
+            return "SAME"
+
+    return "SAME" if prediction == 1 else "DIFFERENT"
 
 def get_model_metadata(model_path):
     """Get metadata for a saved model (supports both timestamped folders and direct files)"""
@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+
+from modules.shapeMatchinModelTraining.modelManager import load_model
+
+DEFAULT_CHECK_INTERVAL = 5.0  # seconds between scans of the model directory for newer models
+
+
+class ModelRegistry:
+    """
+    Keeps the latest trained similarity model loaded in memory.
+
+    The model is unpickled once (at startup via preload(), or on first use) and then
+    served from memory. The model directory is rescanned at most every
+    check_interval seconds; when a newer timestamped model folder (or direct .pkl file)
+    appears, it is loaded and swapped in without interrupting callers.
+    """
+
+    def __init__(self, save_dir, check_interval: float = DEFAULT_CHECK_INTERVAL):
+        self.save_dir = str(save_dir)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._model = None
+        self._model_path = None
+        self._last_check = 0.0
+
+    @property
+    def model_path(self):
+        return self._model_path
+
+    def preload(self):
+        """Load the latest model now so the first match does not pay for it."""
+        return self.get_model(force_check=True)
+
+    def get_model(self, force_check: bool = False):
+        """
+        Returns the in-memory model, reloading it if a newer one was saved.
+
+        A newer model that fails to load is logged and skipped; the current model stays in use.
+
+        Raises:
+            FileNotFoundError: if no model was ever found in save_dir
+            Exception: whatever load_model raised, if the first model cannot be loaded
+        """
+        now = time.monotonic()
+        if not force_check and self._model is not None and now - self._last_check < self.check_interval:
+            return self._model
+
+        with self._lock:
+            if force_check or self._model is None or now - self._last_check >= self.check_interval:
+                self._last_check = now
+                latest_path = find_latest_model_path(self.save_dir)
+                if latest_path is not None and latest_path != self._model_path:
+                    try:
+                        model = load_model(latest_path)
+                    except Exception as e:
+                        # A broken model must not take down matching - keep serving the current one
+                        print(f"❌ ModelRegistry: failed to load {latest_path}: {e}")
+                        if self._model is None:
+                            raise
+                    else:
+                        self._model, self._model_path = model, latest_path
+                        print(f"🔄 ModelRegistry: using model {latest_path}")
+
+            if self._model is None:
+                raise FileNotFoundError(f"No saved models found in {self.save_dir}. Please run training first to create a model.")
+            return self._model
+
+    def clear(self):
+        with self._lock:
+            self._model = None
+            self._model_path = None
+            self._last_check = 0.0
+
+
+def find_latest_model_path(save_dir):
+    """
+    Returns the path of the most recent model in save_dir, or None.
+    Same ordering as modelManager.list_saved_models, without loading or printing anything.
+    Model folders without metadata.json are skipped: save_model writes it after the .pkl,
+    so its absence means the save is still in progress.
+    """
+    if not os.path.isdir(save_dir):
+        return None
+
+    candidates = []
+    with os.scandir(save_dir) as entries:
+        for entry in entries:
+            if entry.is_dir() and entry.name.startswith('model_'):
+                if not os.path.exists(os.path.join(entry.path, 'metadata.json')):
+                    continue
+                timestamp = entry.name.replace('model_', '')
+                for name in sorted(os.listdir(entry.path)):
+                    if name.endswith('.pkl'):
+                        candidates.append((timestamp, os.path.join(entry.path, name)))
+            elif entry.is_file() and entry.name.endswith('.pkl'):
+                candidates.append((str(int(entry.stat().st_mtime)), entry.path))
+
+    if not candidates:
+        return None
+    candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+    return candidates[0][1]
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_model_registry(save_dir) -> ModelRegistry:
+    """Returns the shared ModelRegistry for a model directory."""
+    key = os.path.abspath(str(save_dir))
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = ModelRegistry(key)
+            _registries[key] = registry
+        return registry
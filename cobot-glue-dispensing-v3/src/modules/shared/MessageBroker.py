@@ -1,6 +1,72 @@
 import logging
+import threading
 import weakref
-from typing import Dict, List, Any, Callable
+from time import perf_counter
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+from modules.shared.message_delivery import DeliveryMode, OverflowPolicy, DEFAULT_QUEUE_SIZE, create_delivery, \
+    invoke_callback, callback_name
+from modules.shared.message_stats import BrokerStats, ENABLE_BROKER_STATS, STATS_TOPIC
+
+
+class _Subscription:
+    """A weakly referenced callback plus its delivery (None = synchronous)."""
+    __slots__ = ("ref", "delivery", "name")
+
+    def __init__(self, ref, delivery=None, name: str = ""):
+        self.ref = ref
+        self.delivery = delivery
+        self.name = name
+
+    def close(self):
+        if self.delivery is not None:
+            self.delivery.close()
+
+
+class _LatestValueSlot:
+    """
+    Single slot holding the current value of a latest-value topic.
+    order_lock is held by publish across update and delivery, so subscribers never see an
+    older value after a newer one.
+    """
+    __slots__ = ("value", "version", "has_value", "suppress_unchanged", "suppressed", "lock", "order_lock")
+
+    def __init__(self, suppress_unchanged: bool):
+        self.value = None
+        self.version = None
+        self.has_value = False
+        self.suppress_unchanged = suppress_unchanged
+        self.suppressed = 0
+        self.lock = threading.Lock()
+        self.order_lock = threading.RLock()  # re-entrant: a callback may publish to the same topic
+
+    def update(self, message: Any, version=None) -> bool:
+        """Store a new value. Returns False if the publish is suppressed as unchanged."""
+        with self.lock:
+            if self.has_value:
+                if version is not None and self.version is not None:
+                    unchanged = version <= self.version
+                else:
+                    unchanged = self.suppress_unchanged and _values_equal(self.value, message)
+                if unchanged:
+                    self.suppressed += 1
+                    return False
+            self.value = message
+            self.version = version
+            self.has_value = True
+            return True
+
+    def snapshot(self):
+        with self.lock:
+            return self.has_value, self.value
+
+
+def _values_equal(previous: Any, message: Any) -> bool:
+    # Only a plain True counts - numpy arrays and other non-bool comparisons are treated as changed
+    try:
+        return (previous == message) is True
+    except Exception:
+        return False
 
 
 class MessageBroker:
@@ -13,13 +79,35 @@ class MessageBroker:
         return cls._instance
 
     def _init(self):
-        self.subscribers: Dict[str, List[weakref.ref]] = {}
+        # topic -> immutable tuple of subscriptions; replaced (never mutated) under _lock, so
+        # publish can iterate a snapshot without copying or locking
+        self.subscribers: Dict[str, Tuple[_Subscription, ...]] = {}
+        self.latest_values: Dict[str, _LatestValueSlot] = {}
+        self.stats = BrokerStats()
+        self.stats_enabled = ENABLE_BROKER_STATS
+        self._lock = threading.RLock()  # re-entrant: weakref cleanups may fire while it is held
         self.logger = logging.getLogger(self.__class__.__name__)
 
-    def subscribe(self, topic: str, callback: Callable):
-        """Subscribe to a topic with automatic cleanup of dead references"""
-        if topic not in self.subscribers:
-            self.subscribers[topic] = []
+    def subscribe(self, topic: str, callback: Callable,
+                  delivery: DeliveryMode = DeliveryMode.SYNC,
+                  queue_size: int = DEFAULT_QUEUE_SIZE,
+                  overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST):
+        """
+        Subscribe to a topic with automatic cleanup of dead references.
+
+        Args:
+            delivery: SYNC (default) calls the callback on the publisher's thread. WORKER gives the
+                subscription its own thread and EXECUTOR uses the broker's shared thread pool; both
+                queue messages so a slow subscriber never stalls the publisher.
+            queue_size: maximum pending messages of an asynchronous subscription.
+            overflow: what publish does when that queue is full (BLOCK, DROP_OLDEST, DROP_NEWEST).
+
+        On a latest-value topic asynchronous subscriptions keep only the newest pending message,
+        and the current value (if any) is delivered right away.
+        """
+        slot = self.latest_values.get(topic)
+        if slot is not None:
+            queue_size, overflow = 1, OverflowPolicy.DROP_OLDEST
 
         # Create weak reference to avoid keeping objects alive
         if hasattr(callback, '__self__'):
@@ -29,154 +117,247 @@ class MessageBroker:
             # It's a function - use regular weak reference
             weak_callback = weakref.ref(callback, self._cleanup_callback(topic, callback))
 
-        self.subscribers[topic].append(weak_callback)
+        name = callback_name(callback)
+        stats = self.stats.for_topic(topic) if self.stats_enabled else None
+        subscription = _Subscription(weak_callback,
+                                     create_delivery(topic, weak_callback, delivery, queue_size, overflow, stats, name),
+                                     name)
+        if slot is None:
+            count = self._add_subscription(topic, subscription)
+        else:
+            # No publish may slip in between adding the subscription and sending it the current value
+            with slot.order_lock:
+                count = self._add_subscription(topic, subscription)
+                has_value, value = slot.snapshot()
+                if has_value:
+                    self._deliver(topic, subscription, callback, value)
         print(f"Subscribed to topic '{topic}' with callback {callback.__name__ if hasattr(callback, '__name__') else str(callback)}")
-        self.logger.debug(f"Subscribed to topic '{topic}'. Total subscribers: {len(self.subscribers[topic])}")
+        self.logger.debug("Subscribed to topic '%s'. Total subscribers: %d", topic, count)
+
+    def register_latest_value_topic(self, topic: str, suppress_unchanged: bool = True):
+        """
+        Turn a topic into a latest-value topic (for high-rate state streams).
+
+        Publishes overwrite a single slot, every asynchronous subscriber has at most one pending
+        update, late subscribers receive the current value on subscribe and publishes that don't
+        change the value are dropped - by equality when suppress_unchanged is set, or by the
+        version passed to publish (a version not newer than the stored one is dropped).
+        Safe to call again and after subscribers already exist.
+        """
+        with self._lock:
+            slot = self.latest_values.get(topic)
+            if slot is None:
+                slot = self.latest_values[topic] = _LatestValueSlot(suppress_unchanged)
+            slot.suppress_unchanged = suppress_unchanged
+
+            for subscription in self.subscribers.get(topic, ()):
+                if subscription.delivery is not None:
+                    subscription.delivery.queue.keep_latest_only()
+
+    def get_latest(self, topic: str, default: Any = None) -> Any:
+        """Current value of a latest-value topic, or default if nothing was published yet."""
+        slot = self.latest_values.get(topic)
+        if slot is None:
+            return default
+        has_value, value = slot.snapshot()
+        return value if has_value else default
 
     def _cleanup_callback(self, topic: str, original_callback: Callable):
         """Create a cleanup function that removes dead references"""
 
         def cleanup(weak_ref):
-            if topic in self.subscribers:
-                # Remove the dead reference
-                self.subscribers[topic] = [
-                    ref for ref in self.subscribers[topic]
-                    if ref is not weak_ref
-                ]
-                # Clean up empty topic
-                if topic in self.subscribers and not self.subscribers[topic]:
-                    del self.subscribers[topic]
-                self.logger.debug(f"Auto-cleaned up dead reference for topic '{topic}'")
+            self._remove_subscriptions(topic, lambda subscription: subscription.ref is weak_ref)
+            self.logger.debug("Auto-cleaned up dead reference for topic '%s'", topic)
 
         return cleanup
 
+    @staticmethod
+    def _deliver(topic: str, subscription: _Subscription, callback: Callable, message: Any) -> bool:
+        """Queue the message for an asynchronous subscription or call a synchronous one."""
+        if subscription.delivery is not None:
+            return subscription.delivery.submit(message)
+        return invoke_callback(topic, callback, message)
+
+    def _add_subscription(self, topic: str, subscription: _Subscription) -> int:
+        """Swap in a new snapshot with the subscription appended; returns the subscriber count."""
+        with self._lock:
+            self.subscribers[topic] = self.subscribers.get(topic, ()) + (subscription,)
+            if topic in self.latest_values and subscription.delivery is not None:
+                # The topic may have become a latest-value topic after subscribe looked it up
+                subscription.delivery.queue.keep_latest_only()
+            return len(self.subscribers[topic])
+
+    def _remove_subscriptions(self, topic: str, should_remove: Callable) -> int:
+        """Swap in a new snapshot without the matching subscriptions; returns how many were removed."""
+        with self._lock:
+            current = self.subscribers.get(topic)
+            if current is None:
+                return 0
+            remaining = tuple(subscription for subscription in current if not should_remove(subscription))
+            if remaining:
+                self.subscribers[topic] = remaining
+            else:
+                del self.subscribers[topic]  # Clean up empty topic
+        for subscription in current:
+            if subscription not in remaining:
+                subscription.close()
+        return len(current) - len(remaining)
+
     def unsubscribe(self, topic: str, callback: Callable):
         """Manually unsubscribe from a topic"""
-        if topic not in self.subscribers:
-            return
-
-        # Find and remove matching callbacks
-        original_count = len(self.subscribers[topic])
-        self.subscribers[topic] = [
-            ref for ref in self.subscribers[topic]
-            if ref() is not None and ref() != callback
-        ]
 
-        # Clean up empty topic
-        if not self.subscribers[topic]:
-            del self.subscribers[topic]
+        def matches(subscription):
+            live = subscription.ref()
+            return live is None or live == callback
 
-        removed_count = original_count - len(self.subscribers.get(topic, []))
+        removed_count = self._remove_subscriptions(topic, matches)
         if removed_count > 0:
-            self.logger.debug(f"Unsubscribed {removed_count} callback(s) from topic '{topic}'")
+            self.logger.debug("Unsubscribed %d callback(s) from topic '%s'", removed_count, topic)
+
+    def publish(self, topic: str, message: Any, version=None):
+        """
+        Publish message to all live subscribers.
+        Synchronous subscribers are called before publish returns; asynchronous ones only get
+        the message queued (according to their overflow policy).
+
+        On a latest-value topic concurrent publishes are serialized, so the order subscribers see
+        matches the order the slot accepted the values in.
+
+        Args:
+            version: optional increasing counter of the value, used instead of equality to
+                detect unchanged values on latest-value topics. Ignored on other topics.
+        """
+        slot = self.latest_values.get(topic)
+        if slot is None:
+            self._publish_to_subscribers(topic, message)
+            return
 
-    def publish(self, topic: str, message: Any):
-        """Publish message to all live subscribers"""
-        # print(f"[MessageBroker] Publishing to topic '{topic}' message: {message}")
+        with slot.order_lock:
+            if slot.update(message, version):
+                self._publish_to_subscribers(topic, message)
 
-        if topic not in self.subscribers:
-            # print(f"[MessageBroker] WARNING: No subscribers for topic '{topic}'")
-            self.logger.debug(f"No subscribers for topic '{topic}'")
+    def _publish_to_subscribers(self, topic: str, message: Any):
+        """Deliver a message to the current subscriber snapshot of a topic."""
+        subscriptions = self.subscribers.get(topic)  # immutable snapshot - no copy needed
+        if not subscriptions:
+            self.logger.debug("No subscribers for topic '%s'", topic)
             return
-        # Get all live callbacks and clean up dead ones
-        live_callbacks = []
-        dead_refs = []
-
-        for weak_ref in self.subscribers[topic]:
-            callback = weak_ref()
-            if callback is not None:
-                live_callbacks.append(callback)
-            else:
-                dead_refs.append(weak_ref)
-
-        # Remove dead references
-        if dead_refs:
-            self.subscribers[topic] = [
-                ref for ref in self.subscribers[topic]
-                if ref not in dead_refs
-            ]
-            self.logger.debug(f"Cleaned up {len(dead_refs)} dead references for topic '{topic}'")
-
-        # Call all live callbacks
-        successful_calls = 0
+
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        stats = self.stats.for_topic(topic) if self.stats_enabled else None
+        samples = [] if stats is not None else None
+        has_dead = False
+        delivered = 0
         failed_calls = 0
 
-        for callback in live_callbacks:
-            try:
-                self.logger.debug(f"Publishing to topic: '{topic}' message: {message}")
-                callback(message)
-                successful_calls += 1
-            except Exception as e:
-                import traceback
-                traceback.print_exc()
+        for subscription in subscriptions:
+            callback = subscription.ref()
+            if callback is None:
+                has_dead = True
+                continue
+            delivered += 1
+            if subscription.delivery is not None:
+                # A BLOCK queue may park us in submit - don't keep the subscriber alive meanwhile,
+                # its collection is what closes the queue and releases us
+                del callback
+                subscription.delivery.submit(message)
+                continue
+            if debug:
+                self.logger.debug("Publishing to topic: '%s' message: %s", topic, message)
+            # Errors are reported per callback - don't break, continue with other subscribers
+            if samples is None:
+                succeeded = invoke_callback(topic, callback, message)
+            else:
+                started = perf_counter()
+                succeeded = invoke_callback(topic, callback, message)
+                samples.append((subscription.name, perf_counter() - started, succeeded))
+            if not succeeded:
                 failed_calls += 1
-                # DEBUG: Show which object/method is causing the error
-                callback_info = f"{callback.__self__.__class__.__name__}.{callback.__name__}" if hasattr(callback, '__self__') else str(callback)
-                self.logger.error(f"Error calling subscriber for topic '{topic}': {e} [Callback: {callback_info}]")
-                # Don't break - continue with other subscribers
 
-        if successful_calls > 0:
-            self.logger.debug(f"Successfully published to {successful_calls} subscribers for topic '{topic}'")
-        if failed_calls > 0:
-            self.logger.warning(f"Failed to publish to {failed_calls} subscribers for topic '{topic}'")
+        if stats is not None:
+            stats.record_publish(delivered, samples, perf_counter())
 
-        # Clean up empty topic
-        if not self.subscribers[topic]:
-            del self.subscribers[topic]
+        if has_dead:
+            removed = self._remove_subscriptions(topic, lambda subscription: subscription.ref() is None)
+            self.logger.debug("Cleaned up %d dead references for topic '%s'", removed, topic)
+        if failed_calls > 0:
+            self.logger.warning("Failed to publish to %d subscribers for topic '%s'", failed_calls, topic)
 
     def get_subscriber_count(self, topic: str) -> int:
         """Get the number of active subscribers for a topic"""
-        if topic not in self.subscribers:
-            return 0
-
         # Count only live references
-        live_count = sum(1 for ref in self.subscribers[topic] if ref() is not None)
-        return live_count
+        return sum(1 for subscription in self.subscribers.get(topic, ()) if subscription.ref() is not None)
 
     def get_all_topics(self) -> List[str]:
         """Get list of all topics with active subscribers"""
         return list(self.subscribers.keys())
 
+    def get_stats(self, topic: Optional[str] = None) -> dict:
+        """
+        Per-topic metrics: publish count and rate, fan-out, callback latency histogram and the
+        slowest subscriber. Also available to any component as request(STATS_TOPIC, topic_or_None).
+        """
+        return self.stats.snapshot(topic)
+
+    def reset_stats(self):
+        self.stats.reset()
+        with self._lock:
+            for topic, subscriptions in self.subscribers.items():
+                stats = self.stats.for_topic(topic) if self.stats_enabled else None
+                for subscription in subscriptions:
+                    if subscription.delivery is not None:
+                        subscription.delivery.stats = stats
+
     def clear_topic(self, topic: str):
         """Clear all subscribers for a specific topic"""
-        if topic in self.subscribers:
-            count = len(self.subscribers[topic])
-            del self.subscribers[topic]
-            self.logger.debug(f"Cleared {count} subscribers from topic '{topic}'")
+        with self._lock:
+            subscriptions = self.subscribers.pop(topic, ())
+        for subscription in subscriptions:
+            subscription.close()
+        if subscriptions:
+            self.logger.debug("Cleared %d subscribers from topic '%s'", len(subscriptions), topic)
 
     def request(self, topic: str, message: Any, timeout: float = 1.0):
-        """Synchronous request-response pattern - returns first non-None response"""
-        if topic not in self.subscribers:
-            self.logger.debug(f"No subscribers for request topic '{topic}'")
+        """
+        Synchronous request-response pattern - returns first non-None response.
+        Responders are always called on the caller's thread, whatever their delivery mode.
+        The broker itself answers STATS_TOPIC with get_stats(message).
+        """
+        if topic == STATS_TOPIC:
+            return self.get_stats(message)
+
+        subscriptions = self.subscribers.get(topic)
+        if not subscriptions:
+            self.logger.debug("No subscribers for request topic '%s'", topic)
             return None
 
-        # Get all live callbacks
-        live_callbacks = []
-        for weak_ref in self.subscribers[topic]:
-            callback = weak_ref()
-            if callback is not None:
-                live_callbacks.append(callback)
-
-        # Call callbacks until we get a non-None response
-        for callback in live_callbacks:
+        # Call live callbacks until we get a non-None response
+        for subscription in subscriptions:
+            callback = subscription.ref()
+            if callback is None:
+                continue
             try:
-                self.logger.debug(f"Making request to topic: '{topic}' message: {message}")
+                self.logger.debug("Making request to topic: '%s' message: %s", topic, message)
                 result = callback(message)
                 if result is not None:
-                    self.logger.debug(f"Got response from topic '{topic}': {result}")
+                    self.logger.debug("Got response from topic '%s': %s", topic, result)
                     return result
             except Exception as e:
                 self.logger.error(f"Error in request callback for topic '{topic}': {e}")
                 continue
 
-        self.logger.debug(f"No response received for request topic '{topic}'")
+        self.logger.debug("No response received for request topic '%s'", topic)
         return None
 
     def clear_all(self):
         """Clear all subscribers from all topics"""
-        total_cleared = sum(len(subs) for subs in self.subscribers.values())
-        self.subscribers.clear()
-        self.logger.debug(f"Cleared all {total_cleared} subscribers from all topics")
+        with self._lock:
+            all_subscriptions = list(self.subscribers.values())
+            self.subscribers.clear()
+        for subscriptions in all_subscriptions:
+            for subscription in subscriptions:
+                subscription.close()
+        self.logger.debug("Cleared all %d subscribers from all topics", sum(len(subs) for subs in all_subscriptions))
 
 
 # Example usage and testing:
@@ -67,11 +67,13 @@ class Contour:
         return cv2.matchShapes(self.as_cv(), other, 1, 0.0)
 
     # --- Transformations ---
+    # Transformations replace the point array instead of writing into it, so a Contour
+    # built from shared (e.g. library workpiece) points never modifies the original.
     def translate(self, dx, dy):
-        self.contour_points += np.array([dx, dy], dtype=np.float32)
+        self.contour_points = self.contour_points + np.array([dx, dy], dtype=np.float32)
 
     def scale(self, factor):
-        self.contour_points *= factor
+        self.contour_points = (self.contour_points * factor).astype(np.float32)
 
     def rotate(self, angle_deg, pivot):
         angle_rad = np.radians(angle_deg)
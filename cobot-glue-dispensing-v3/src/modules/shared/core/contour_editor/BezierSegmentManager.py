@@ -7,6 +7,7 @@ from PyQt6.QtCore import QPointF
 import copy
 
 from frontend.contour_editor.widgets import SegmentSettingsWidget
+from modules.utils.path_simplification import rdp_indices
 
 
 class Segment:
@@ -404,7 +405,8 @@ class BezierSegmentManager:
         
         return True
 
-    def get_robot_path(self, samples_per_segment=5):
+    def get_robot_path(self, samples_per_segment=5, tolerance=0.0):
+        """Flatten all segments to one polyline; with tolerance > 0 points closer than that to the simplified path are dropped."""
         path_points = []
 
         def is_cp_effective(p0, cp, p1, threshold=1.0):
@@ -427,6 +429,9 @@ class BezierSegmentManager:
                 else:
                     path_points.extend([p0, p1])
 
+        if tolerance > 0 and len(path_points) > 2:
+            kept = rdp_indices([(p.x(), p.y()) for p in path_points], tolerance)
+            path_points = [path_points[i] for i in kept.tolist()]
         return path_points
 
     def delete_segment(self, seg_index):
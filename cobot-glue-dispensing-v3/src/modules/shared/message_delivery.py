@@ -0,0 +1,258 @@
+import logging
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Any, Callable, Optional
+
+DEFAULT_QUEUE_SIZE = 16  # Pending messages per asynchronous subscription
+SHARED_EXECUTOR_WORKERS = 4  # Threads of the executor shared by all EXECUTOR subscriptions
+
+_logger = logging.getLogger("MessageBroker")
+
+
+class DeliveryMode(Enum):
+    SYNC = "sync"  # callback runs on the publisher's thread (default, original behaviour)
+    WORKER = "worker"  # callback runs on a dedicated thread of the subscription
+    EXECUTOR = "executor"  # callback runs on the broker's shared thread pool
+
+
+class OverflowPolicy(Enum):
+    BLOCK = "block"  # publisher waits until the subscriber made room
+    DROP_OLDEST = "drop_oldest"  # oldest pending message is discarded
+    DROP_NEWEST = "drop_newest"  # message being published is discarded
+
+
+class BoundedMessageQueue:
+    """Bounded FIFO between a publisher and one asynchronous subscription."""
+
+    EMPTY = object()
+
+    def __init__(self, maxsize: int = DEFAULT_QUEUE_SIZE, overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST):
+        if maxsize < 1:
+            raise ValueError("queue_size must be at least 1")
+        self.maxsize = maxsize
+        self.overflow = OverflowPolicy(overflow)
+        self._items = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+        self.on_drop: Optional[Callable[[int], None]] = None  # called with the number of items dropped
+
+    def put(self, item) -> bool:
+        """Queue an item according to the overflow policy. Returns False if it was dropped."""
+        with self._condition:
+            if self._closed:
+                return False
+            if len(self._items) >= self.maxsize:
+                if self.overflow is OverflowPolicy.DROP_NEWEST:
+                    self._dropped_locked(1)
+                    return False
+                if self.overflow is OverflowPolicy.DROP_OLDEST:
+                    self._items.popleft()
+                    self._dropped_locked(1)
+                else:
+                    self._condition.wait_for(lambda: len(self._items) < self.maxsize or self._closed)
+                    if self._closed:
+                        return False
+            self._items.append(item)
+            self._condition.notify_all()
+            return True
+
+    def get(self, timeout: float = None):
+        """Oldest item, or EMPTY on timeout / when the queue was closed."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._items or self._closed, timeout=timeout)
+            return self._pop_locked()
+
+    def get_nowait(self):
+        with self._condition:
+            return self._pop_locked()
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._items.clear()
+            self._condition.notify_all()
+
+    def keep_latest_only(self):
+        """Switch to latest-value semantics: at most one pending item, newer ones replace it."""
+        with self._condition:
+            self.maxsize = 1
+            self.overflow = OverflowPolicy.DROP_OLDEST
+            if len(self._items) > 1:
+                excess = len(self._items) - 1
+                for _ in range(excess):
+                    self._items.popleft()
+                self._dropped_locked(excess)
+            self._condition.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __len__(self):
+        return len(self._items)
+
+    """PRIVATE METHODS SECTION"""
+
+    def _dropped_locked(self, count: int):
+        self.dropped += count
+        if self.on_drop is not None:
+            self.on_drop(count)
+
+    def _pop_locked(self):
+        if not self._items:
+            return self.EMPTY
+        item = self._items.popleft()
+        self._condition.notify_all()  # wake publishers blocked on a full queue
+        return item
+
+
+def callback_name(callback: Callable) -> str:
+    """Readable name of a subscriber callback, e.g. 'DashboardWidget.on_state'."""
+    if hasattr(callback, '__self__'):
+        return f"{callback.__self__.__class__.__name__}.{callback.__name__}"
+    return getattr(callback, '__qualname__', None) or str(callback)
+
+
+def invoke_callback(topic: str, callback: Callable, message: Any) -> bool:
+    """Call a subscriber, reporting (but never propagating) its exceptions."""
+    try:
+        callback(message)
+        return True
+    except Exception as e:
+        traceback.print_exc()
+        _logger.error(f"Error calling subscriber for topic '{topic}': {e} [Callback: {callback_name(callback)}]")
+        return False
+
+
+def timed_invoke(topic: str, callback: Callable, message: Any, stats=None, name: str = None) -> bool:
+    """invoke_callback, recording the callback latency in stats (a TopicStats) when given."""
+    if stats is None:
+        return invoke_callback(topic, callback, message)
+    started = time.perf_counter()
+    succeeded = invoke_callback(topic, callback, message)
+    stats.record_callback(name, time.perf_counter() - started, succeeded)
+    return succeeded
+
+
+class WorkerDelivery:
+    """Delivers the messages of one subscription on its own daemon thread, in publish order."""
+
+    def __init__(self, topic: str, weak_callback, queue_size: int, overflow: OverflowPolicy,
+                 stats=None, name: str = None):
+        self.topic = topic
+        self.weak_callback = weak_callback
+        self.queue = BoundedMessageQueue(queue_size, overflow)
+        self.queue.on_drop = self._record_drop
+        self.stats = stats
+        self.name = name
+        self._thread = threading.Thread(target=self._run, name=f"MessageBroker-{topic}", daemon=True)
+        self._thread.start()
+
+    def submit(self, message: Any) -> bool:
+        return self.queue.put(message)
+
+    def close(self):
+        self.queue.close()
+
+    """PRIVATE METHODS SECTION"""
+
+    def _record_drop(self, count):
+        stats = self.stats
+        if stats is not None:
+            stats.record_drop(count)
+
+    def _run(self):
+        while not self.queue.closed:
+            message = self.queue.get(timeout=1.0)
+            if message is BoundedMessageQueue.EMPTY:
+                continue
+            callback = self.weak_callback()
+            if callback is None:
+                self.queue.close()  # subscriber is gone - release publishers blocked on a full queue
+                break
+            timed_invoke(self.topic, callback, message, self.stats, self.name)
+            del callback  # don't keep the subscriber alive while waiting
+
+
+class ExecutorDelivery:
+    """
+    Delivers the messages of one subscription on a shared thread pool.
+    At most one drain task per subscription is scheduled at a time, so messages are still
+    delivered one after another and in publish order.
+    """
+
+    def __init__(self, topic: str, weak_callback, queue_size: int, overflow: OverflowPolicy,
+                 executor: ThreadPoolExecutor, stats=None, name: str = None):
+        self.topic = topic
+        self.weak_callback = weak_callback
+        self.queue = BoundedMessageQueue(queue_size, overflow)
+        self.queue.on_drop = self._record_drop
+        self.stats = stats
+        self.name = name
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._scheduled = False
+
+    def submit(self, message: Any) -> bool:
+        queued = self.queue.put(message)
+        if queued:
+            with self._lock:
+                if not self._scheduled:
+                    self._scheduled = True
+                    self._executor.submit(self._drain)
+        return queued
+
+    def close(self):
+        self.queue.close()
+
+    """PRIVATE METHODS SECTION"""
+
+    def _record_drop(self, count):
+        stats = self.stats
+        if stats is not None:
+            stats.record_drop(count)
+
+    def _drain(self):
+        while True:
+            with self._lock:
+                message = self.queue.get_nowait()
+                if message is BoundedMessageQueue.EMPTY:
+                    self._scheduled = False
+                    return
+            callback = self.weak_callback()
+            if callback is None:
+                self.queue.close()
+                continue
+            timed_invoke(self.topic, callback, message, self.stats, self.name)
+            del callback
+
+
+_shared_executor: Optional[ThreadPoolExecutor] = None
+_shared_executor_lock = threading.Lock()
+
+
+def get_shared_executor() -> ThreadPoolExecutor:
+    """Thread pool used by all EXECUTOR subscriptions (created on first use)."""
+    global _shared_executor
+    with _shared_executor_lock:
+        if _shared_executor is None:
+            _shared_executor = ThreadPoolExecutor(max_workers=SHARED_EXECUTOR_WORKERS,
+                                                  thread_name_prefix="MessageBroker")
+        return _shared_executor
+
+
+def create_delivery(topic: str, weak_callback, delivery: DeliveryMode, queue_size: int, overflow: OverflowPolicy,
+                    stats=None, name: str = None):
+    """Delivery object for an asynchronous subscription, or None for SYNC."""
+    delivery = DeliveryMode(delivery)
+    overflow = OverflowPolicy(overflow)
+    if delivery is DeliveryMode.SYNC:
+        return None
+    if delivery is DeliveryMode.WORKER:
+        return WorkerDelivery(topic, weak_callback, queue_size, overflow, stats, name)
+    return ExecutorDelivery(topic, weak_callback, queue_size, overflow, get_shared_executor(), stats, name)
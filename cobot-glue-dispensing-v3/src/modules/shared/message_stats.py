@@ -0,0 +1,137 @@
+import bisect
+import threading
+from time import perf_counter
+from typing import Optional
+
+ENABLE_BROKER_STATS = True  # Per-topic publish/callback metrics of the MessageBroker
+STATS_TOPIC = "broker/stats"  # Request topic answered by the broker itself with its statistics
+LATENCY_BUCKETS_US = (10, 50, 100, 500, 1_000, 5_000, 10_000, 50_000, 100_000)  # Upper bounds (µs)
+RATE_SMOOTHING = 0.1  # Weight of the newest interval in the smoothed publish rate
+
+
+class TopicStats:
+    """
+    Counters of one topic: publish rate, fan-out and callback latencies.
+
+    Callback latencies go into a fixed bucket histogram per topic and are also
+    accumulated per subscriber, so the slowest subscriber of a topic can be named.
+    Drops are messages discarded by full asynchronous subscriber queues.
+    """
+
+    def __init__(self, topic: str):
+        self.topic = topic
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.publishes = 0
+            self.deliveries = 0
+            self.drops = 0
+            self.max_fanout = 0
+            self.first_publish = None
+            self.last_publish = None
+            self.mean_interval = None
+            self.callbacks = 0
+            self.errors = 0
+            self.callback_time = 0.0
+            self.max_callback_time = 0.0
+            self.histogram = [0] * (len(LATENCY_BUCKETS_US) + 1)
+            self.subscribers = {}  # name -> [calls, total seconds, max seconds]
+
+    def record_publish(self, fanout: int, samples=None, now: float = None):
+        """
+        Record one publish reaching fanout subscribers, plus the (subscriber name, seconds,
+        succeeded) samples of its synchronous callbacks - all under a single lock acquisition.
+        """
+        now = perf_counter() if now is None else now
+        with self._lock:
+            if self.last_publish is None:
+                self.first_publish = now
+            else:
+                interval = now - self.last_publish
+                self.mean_interval = interval if self.mean_interval is None else \
+                    self.mean_interval + RATE_SMOOTHING * (interval - self.mean_interval)
+            self.last_publish = now
+            self.publishes += 1
+            self.deliveries += fanout
+            if fanout > self.max_fanout:
+                self.max_fanout = fanout
+            if samples:
+                for name, seconds, succeeded in samples:
+                    self._record_locked(name, seconds, succeeded)
+
+    def record_drop(self, count: int = 1):
+        with self._lock:
+            self.drops += count
+
+    def record_callback(self, name: str, seconds: float, succeeded: bool = True):
+        with self._lock:
+            self._record_locked(name, seconds, succeeded)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            elapsed = (self.last_publish - self.first_publish) if self.publishes > 1 else 0.0
+            slowest = None
+            if self.subscribers:
+                name, (calls, total, worst) = max(self.subscribers.items(), key=lambda item: item[1][1] / item[1][0])
+                slowest = {"name": name, "calls": calls, "mean_ms": total / calls * 1000, "max_ms": worst * 1000}
+            return {
+                "publishes": self.publishes,
+                "publish_rate_hz": (1.0 / self.mean_interval) if self.mean_interval else 0.0,
+                "average_rate_hz": ((self.publishes - 1) / elapsed) if elapsed > 0 else 0.0,
+                "mean_fanout": self.deliveries / self.publishes if self.publishes else 0.0,
+                "max_fanout": self.max_fanout,
+                "drops": self.drops,
+                "callbacks": self.callbacks,
+                "errors": self.errors,
+                "mean_callback_ms": self.callback_time / self.callbacks * 1000 if self.callbacks else 0.0,
+                "max_callback_ms": self.max_callback_time * 1000,
+                "latency_histogram_us": dict(zip([f"<={b}" for b in LATENCY_BUCKETS_US] + ["inf"], self.histogram)),
+                "slowest_subscriber": slowest,
+            }
+
+    """PRIVATE METHODS SECTION"""
+
+    def _record_locked(self, name, seconds, succeeded):
+        self.callbacks += 1
+        if not succeeded:
+            self.errors += 1
+        self.callback_time += seconds
+        if seconds > self.max_callback_time:
+            self.max_callback_time = seconds
+        self.histogram[bisect.bisect_left(LATENCY_BUCKETS_US, seconds * 1e6)] += 1
+        entry = self.subscribers.get(name)
+        if entry is None:
+            self.subscribers[name] = [1, seconds, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            if seconds > entry[2]:
+                entry[2] = seconds
+
+
+class BrokerStats:
+    """TopicStats of every topic published so far."""
+
+    def __init__(self):
+        self._topics = {}
+        self._lock = threading.Lock()
+
+    def for_topic(self, topic: str) -> TopicStats:
+        stats = self._topics.get(topic)
+        if stats is None:
+            with self._lock:
+                stats = self._topics.setdefault(topic, TopicStats(topic))
+        return stats
+
+    def snapshot(self, topic: Optional[str] = None) -> dict:
+        """{topic: stats dict} of all topics, or of a single one."""
+        if topic is not None:
+            stats = self._topics.get(topic)
+            return {topic: stats.snapshot()} if stats is not None else {}
+        return {name: stats.snapshot() for name, stats in list(self._topics.items())}
+
+    def reset(self):
+        with self._lock:
+            self._topics.clear()
@@ -3,13 +3,18 @@ from enum import Enum
 import requests
 import json
 import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Optional
+
+from requests.adapters import HTTPAdapter
 from modules.SensorPublisher import Sensor
 from communication_layer.api.v1.topics import GlueTopics
 from modules.shared.MessageBroker import MessageBroker
 import time
 from pathlib import Path
 import logging
-import inspect
 
 from modules.utils import PathResolver
 from modules.utils.custom_logging import LoggingLevel, ColoredFormatter
@@ -78,34 +83,17 @@ else:
     glue_cell_logger = None
 
 
-def log_if_enabled(level, message):
+def log_if_enabled(level, message, *args):
     """Helper function to log only if logging is enabled"""
     if ENABLE_LOGGING and glue_cell_logger:
-        # Get the calling function's name
-        caller_frame = inspect.currentframe().f_back
-        caller_name = caller_frame.f_code.co_name
-        
-        # Convert LoggingLevel enum to string if necessary
+        # Convert LoggingLevel enum to a level number if necessary
         if isinstance(level, LoggingLevel):
-            level_name = level.name.lower()
-        else:
-            level_name = level
-        
-        # Create a temporary log record with the caller's function name
-        log_method = getattr(glue_cell_logger, level_name)
-        
-        # Temporarily modify the logger to show the actual caller
-        original_findCaller = glue_cell_logger.findCaller
-        def mock_findCaller(stack_info=False, stacklevel=1):
-            # Return the caller's info instead of log_if_enabled
-            return (caller_frame.f_code.co_filename, caller_frame.f_lineno, caller_name, None)
-        
-        glue_cell_logger.findCaller = mock_findCaller
-        try:
-            log_method(message)
-        finally:
-            # Restore original findCaller
-            glue_cell_logger.findCaller = original_findCaller
+            level = level.value
+        elif isinstance(level, str):
+            level = logging.getLevelName(level.upper())
+
+        # stacklevel=2 attributes the record to the caller instead of this helper
+        glue_cell_logger.log(level, message, *args, stacklevel=2)
 
 
 
@@ -125,7 +113,43 @@ class GlueType(Enum):
         return self.value
 
 
+DEFAULT_SERVER_URL = "http://192.168.222.143"
+DEFAULT_MOCK_SERVER_URL = "http://localhost:5000"
+DEFAULT_FETCH_TIMEOUT = 5  # Seconds per request, unless the cell config sets "fetch_timeout"
+DEFAULT_FETCH_INTERVAL = 0.1  # Seconds between polls, unless the config sets "DATA_FETCH_INTERVAL_MS"
+LATENCY_WINDOW = 256  # Round trips kept per cell for the latency percentiles
+
+WEIGHT_TOPICS = {
+    1: GlueTopics.GLUE_METER_1_VALUE,
+    2: GlueTopics.GLUE_METER_2_VALUE,
+    3: GlueTopics.GLUE_METER_3_VALUE,
+}
+
+
+def cell_weight_url(config_data, cell_cfg):
+    """Weight endpoint of a configured cell: the mock server's /weight<id> in test mode, the cell's url otherwise."""
+    if config_data.get("MODE", "production") == "test":
+        return f"{config_data.get('MOCK_SERVER_URL', DEFAULT_MOCK_SERVER_URL)}/weight{cell_cfg['id']}"
+    return cell_cfg["url"]
+
+
+@dataclass
+class GlueWeightReading:
+    cell_id: int
+    weight: float
+    timestamp: float  # time.time() when the reading was taken
+    latency: Optional[float] = None  # request round trip in seconds, None if the request failed
+
+
 class GlueDataFetcher:
+    """
+    Polls the weight endpoint of every configured glue cell and publishes the weights.
+
+    All cells are polled concurrently every fetch interval over one pooled keep-alive session,
+    each request with its cell's timeout. A cell whose previous request is still in flight is
+    skipped for that round, so a slow scale neither delays the other cells nor piles up
+    requests. Weight topics are latest-value topics, so only changed weights reach subscribers.
+    """
     _instance = None
     _lock = threading.Lock()
 
@@ -144,34 +168,25 @@ class GlueDataFetcher:
         self.weight1 = 0
         self.weight2 = 0
         self.weight3 = 0
-
-        # Load config to determine mode and URL
-        try:
-            with config_path.open("r") as f:
-                config_data = json.load(f)
-
-            mode = config_data.get("MODE", "production")
-            if mode == "test":
-                # Start mock server automatically in test mode
-                self._start_mock_server()
-
-                base_url = config_data.get("MOCK_SERVER_URL", "http://localhost:5000")
-                self.url = f"{base_url}/weights"
-                print(f"[GlueDataFetcher] Running in TEST mode - using {self.url}")
-            else:
-                base_url = config_data.get("PRODUCTION_SERVER_URL", "http://192.168.222.143")
-                weights_endpoint = config_data.get("WEIGHTS_ENDPOINT", "/weights")
-                self.url = f"{base_url}{weights_endpoint}"
-                print(f"[GlueDataFetcher] Running in PRODUCTION mode - using {self.url}")
-        except Exception as e:
-            print(f"[GlueDataFetcher] Error loading config: {e}, defaulting to production mode")
-            self.url = "http://192.168.222.143/weights"
-
-        self.fetchTimeout = 5
+        self.readings = {}  # cell id -> latest GlueWeightReading
+
+        self.fetchTimeout = DEFAULT_FETCH_TIMEOUT
+        self.fetchInterval = DEFAULT_FETCH_INTERVAL
+        self.endpoints = []  # (cell id, url, timeout)
+        self._load_config("Running in")
+        self.session = self._create_session()
+
+        self._executor = None
+        self._in_flight = {}  # cell id -> Future of its pending request
+        self._stats_lock = threading.Lock()
+        self._latencies = {}  # cell id -> deque of round trips in seconds
+        self._errors = {}  # cell id -> failed requests
         self._stop_thread = threading.Event()
         self.thread = None
         self._initialized = True
         self.broker = MessageBroker()
+        for topic in WEIGHT_TOPICS.values():
+            self.broker.register_latest_value_topic(topic)  # unchanged weights are not re-published
 
     def _start_mock_server(self):
         """Start the mock server in a background thread"""
@@ -217,63 +232,39 @@ class GlueDataFetcher:
             print(f"[GlueDataFetcher] Error starting mock server: {e}")
 
     def fetch(self):
-        log_if_enabled(LoggingLevel.DEBUG, f"Fetching weights from {self.url}")
-        try:
-            response = requests.get(self.url, timeout=self.fetchTimeout)
-            response.raise_for_status()
-            weights = json.loads(response.text.strip())
-
-            log_if_enabled(LoggingLevel.DEBUG, f"Raw weights received: {weights}")
-            self.weight1 = float(weights.get("weight1", 0))
-            self.weight2 = float(weights.get("weight2", 0))
-            self.weight3 = float(weights.get("weight3", 0))
-
-            log_if_enabled(LoggingLevel.INFO, f"WEIGHT DATA UPDATED:")
-            log_if_enabled(LoggingLevel.INFO, f"  ├─ Weight 1: {self.weight1:.2f}g")
-            log_if_enabled(LoggingLevel.INFO, f"  ├─ Weight 2: {self.weight2:.2f}g") 
-            log_if_enabled(LoggingLevel.INFO, f"  └─ Weight 3: {self.weight3:.2f}g")
-
-            self.broker.publish(GlueTopics.GLUE_METER_1_VALUE, self.weight1)
-            self.broker.publish(GlueTopics.GLUE_METER_2_VALUE, self.weight2)
-            self.broker.publish(GlueTopics.GLUE_METER_3_VALUE, self.weight3)
-            log_if_enabled(LoggingLevel.DEBUG, "Published weights to message broker")
-            
-        except requests.exceptions.ConnectionError:
-            log_if_enabled(LoggingLevel.ERROR, f"🔴 CONNECTION ERROR: Network unreachable or service down at {self.url}")
-            log_if_enabled(LoggingLevel.WARNING, "Setting all weights to 0.0g due to connection failure")
-            # Set weights to 0 when connection fails
-            self.weight1 = self.weight2 = self.weight3 = 0.0
-            
-        except requests.exceptions.Timeout:
-            log_if_enabled(LoggingLevel.WARNING, f"⏱️  TIMEOUT: Request to {self.url} took longer than {self.fetchTimeout}s")
-            log_if_enabled(LoggingLevel.DEBUG, "Keeping previous weight values during timeout")
-            # Keep previous values on timeout
-            
-        except requests.exceptions.HTTPError as e:
-            log_if_enabled(LoggingLevel.ERROR, f"🔴 HTTP ERROR: {e.response.status_code} - {e.response.reason} from {self.url}")
-            log_if_enabled(LoggingLevel.WARNING, "Setting all weights to 0.0g due to server error")
-            # Set weights to 0 when server returns error
-            self.weight1 = self.weight2 = self.weight3 = 0.0
-            
-        except json.JSONDecodeError:
-            log_if_enabled(LoggingLevel.ERROR, f"🔴 JSON ERROR: Invalid response format from {self.url}")
-            log_if_enabled(LoggingLevel.DEBUG, "Keeping previous weight values during parsing error")
-            # Keep previous values on parsing error
-            
-        except ValueError as e:
-            log_if_enabled(LoggingLevel.ERROR, f"🔴 VALUE ERROR: Unable to convert weight values to float - {e}")
-            log_if_enabled(LoggingLevel.DEBUG, "Keeping previous weight values during conversion error")
-            # Keep previous values on conversion error
-            
-        except Exception as e:
-            log_if_enabled(LoggingLevel.ERROR, f"🔴 UNEXPECTED ERROR: {type(e).__name__}: {e} from {self.url}")
-            log_if_enabled(LoggingLevel.DEBUG, "Keeping previous weight values during unexpected error")
-            # Keep previous values on unexpected errors
+        """Poll every cell once, concurrently, and wait for all of them."""
+        futures = [self._submit(endpoint) for endpoint in self.endpoints]
+        wait([future for future in futures if future is not None])
+
+    def get_reading(self, cell_id) -> Optional[GlueWeightReading]:
+        return self.readings.get(cell_id)
+
+    def get_latency_stats(self) -> dict:
+        """Per-cell round trips: {cell id: {samples, errors, p50_ms, p95_ms, p99_ms, max_ms}}."""
+        with self._stats_lock:
+            stats = {}
+            for cell_id, _, _ in self.endpoints:
+                latencies = sorted(self._latencies.get(cell_id, ()))
+                stats[cell_id] = {
+                    "samples": len(latencies),
+                    "errors": self._errors.get(cell_id, 0),
+                    "p50_ms": _percentile(latencies, 0.5) * 1000,
+                    "p95_ms": _percentile(latencies, 0.95) * 1000,
+                    "p99_ms": _percentile(latencies, 0.99) * 1000,
+                    "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+                }
+            return stats
 
     def _fetch_loop(self):
+        next_poll = time.monotonic()
         while not self._stop_thread.is_set():
-            self.fetch()
-            time.sleep(0.1)
+            for endpoint in self.endpoints:
+                self._submit(endpoint)
+            next_poll += self.fetchInterval
+            delay = next_poll - time.monotonic()
+            if delay < 0:  # fell behind - resume the schedule from now instead of bursting
+                next_poll, delay = time.monotonic(), 0
+            self._stop_thread.wait(delay)
 
     def reload_config(self):
         """Reload configuration and restart the fetcher with new settings"""
@@ -284,26 +275,9 @@ class GlueDataFetcher:
         if was_running:
             self.stop()
 
-        # Reload config
-        try:
-            with config_path.open("r") as f:
-                config_data = json.load(f)
-
-            mode = config_data.get("MODE", "production")
-            if mode == "test":
-                # Start mock server automatically in test mode
-                self._start_mock_server()
-
-                base_url = config_data.get("MOCK_SERVER_URL", "http://localhost:5000")
-                self.url = f"{base_url}/weights"
-                print(f"[GlueDataFetcher] Switched to TEST mode - using {self.url}")
-            else:
-                base_url = config_data.get("PRODUCTION_SERVER_URL", "http://192.168.222.143")
-                weights_endpoint = config_data.get("WEIGHTS_ENDPOINT", "/weights")
-                self.url = f"{base_url}{weights_endpoint}"
-                print(f"[GlueDataFetcher] Switched to PRODUCTION mode - using {self.url}")
-        except Exception as e:
-            print(f"[GlueDataFetcher] Error reloading config: {e}, keeping current settings")
+        self._load_config("Switched to")
+        self.session.close()
+        self.session = self._create_session()
 
         # Restart if it was running
         if was_running:
@@ -319,7 +293,131 @@ class GlueDataFetcher:
         self._stop_thread.set()
         if self.thread is not None:
             self.thread.join()
+        if self._executor is not None:
+            # Requests already on the wire finish on their own; they are bounded by their timeouts
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._in_flight.clear()
+
+    """PRIVATE METHODS SECTION"""
 
+    def _load_config(self, announce):
+        try:
+            with config_path.open("r") as f:
+                config_data = json.load(f)
+
+            mode = config_data.get("MODE", "production")
+            if mode == "test":
+                # Start mock server automatically in test mode
+                self._start_mock_server()
+
+            self.fetchTimeout = config_data.get("FETCH_TIMEOUT", DEFAULT_FETCH_TIMEOUT)
+            self.fetchInterval = config_data.get("DATA_FETCH_INTERVAL_MS", DEFAULT_FETCH_INTERVAL * 1000) / 1000
+            self.endpoints = [(cell_cfg["id"], cell_weight_url(config_data, cell_cfg),
+                               cell_cfg.get("fetch_timeout", self.fetchTimeout))
+                              for cell_cfg in config_data["CELL_CONFIG"]]
+            print(f"[GlueDataFetcher] {announce} {mode.upper()} mode - polling "
+                  f"{', '.join(url for _, url, _ in self.endpoints)}")
+        except Exception as e:
+            if self.endpoints:
+                print(f"[GlueDataFetcher] Error loading config: {e}, keeping current settings")
+                return
+            print(f"[GlueDataFetcher] Error loading config: {e}, defaulting to production mode")
+            self.endpoints = [(cell_id, f"{DEFAULT_SERVER_URL}/weight{cell_id}", self.fetchTimeout)
+                              for cell_id in WEIGHT_TOPICS]
+
+    def _create_session(self):
+        """Keep-alive session with a connection per cell, so concurrent polls never wait for a socket."""
+        session = requests.Session()
+        pool_size = max(1, len(self.endpoints))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _submit(self, endpoint):
+        """Start a request for the cell unless its previous one is still in flight."""
+        cell_id = endpoint[0]
+        pending = self._in_flight.get(cell_id)
+        if pending is not None and not pending.done():
+            return None
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=max(1, len(self.endpoints)),
+                                                thread_name_prefix="GlueDataFetcher")
+        future = self._executor.submit(self._fetch_cell, *endpoint)
+        self._in_flight[cell_id] = future
+        return future
+
+    def _fetch_cell(self, cell_id, url, timeout):
+        log_if_enabled(LoggingLevel.DEBUG, "Fetching weight of cell %s from %s", cell_id, url)
+        started = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=timeout)
+            latency = time.perf_counter() - started
+            response.raise_for_status()
+            weight = self._parse_weight(response.text, cell_id)
+
+        except requests.exceptions.ConnectionError:
+            self._record_error(cell_id)
+            log_if_enabled(LoggingLevel.ERROR, f"🔴 CONNECTION ERROR: Network unreachable or service down at {url}")
+            log_if_enabled(LoggingLevel.WARNING, f"Setting cell {cell_id} weight to 0.0g due to connection failure")
+            self._update(GlueWeightReading(cell_id, 0.0, time.time()))
+            return
+
+        except requests.exceptions.Timeout:
+            self._record_error(cell_id)
+            log_if_enabled(LoggingLevel.WARNING, f"⏱️  TIMEOUT: Request to {url} took longer than {timeout}s")
+            log_if_enabled(LoggingLevel.DEBUG, "Keeping previous weight value during timeout")
+            return
+
+        except requests.exceptions.HTTPError as e:
+            self._record_error(cell_id)
+            log_if_enabled(LoggingLevel.ERROR, f"🔴 HTTP ERROR: {e.response.status_code} - {e.response.reason} from {url}")
+            log_if_enabled(LoggingLevel.WARNING, f"Setting cell {cell_id} weight to 0.0g due to server error")
+            self._update(GlueWeightReading(cell_id, 0.0, time.time()))
+            return
+
+        except ValueError as e:  # includes json.JSONDecodeError
+            self._record_error(cell_id)
+            log_if_enabled(LoggingLevel.ERROR, f"🔴 VALUE ERROR: Invalid weight response from {url} - {e}")
+            log_if_enabled(LoggingLevel.DEBUG, "Keeping previous weight value during parsing error")
+            return
+
+        except Exception as e:
+            self._record_error(cell_id)
+            log_if_enabled(LoggingLevel.ERROR, f"🔴 UNEXPECTED ERROR: {type(e).__name__}: {e} from {url}")
+            log_if_enabled(LoggingLevel.DEBUG, "Keeping previous weight value during unexpected error")
+            return
+
+        with self._stats_lock:
+            self._latencies.setdefault(cell_id, deque(maxlen=LATENCY_WINDOW)).append(latency)
+        self._update(GlueWeightReading(cell_id, weight, time.time(), latency))
+
+    @staticmethod
+    def _parse_weight(text, cell_id):
+        """Weight from a cell response: {"weight": ...}, the combined {"weight<id>": ...} or a bare number."""
+        data = json.loads(text.strip())
+        if isinstance(data, dict):
+            data = data.get("weight", data.get(f"weight{cell_id}", 0))
+        return float(data)
+
+    def _update(self, reading):
+        self.readings[reading.cell_id] = reading
+        setattr(self, f"weight{reading.cell_id}", reading.weight)
+        log_if_enabled(LoggingLevel.DEBUG, "Cell %s weight: %.2fg", reading.cell_id, reading.weight)
+        topic = WEIGHT_TOPICS.get(reading.cell_id)
+        if topic is not None:
+            self.broker.publish(topic, reading.weight)
+
+    def _record_error(self, cell_id):
+        with self._stats_lock:
+            self._errors[cell_id] = self._errors.get(cell_id, 0) + 1
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
 
 
 class GlueCell:
@@ -698,14 +796,8 @@ class GlueCellsManagerSingleton:
                 "TypeD": GlueType.TypeD
             }
 
-            # Determine the base URL based on MODE
             mode = config_data.get("MODE", "production")
-            if mode == "test":
-                base_url = config_data.get("MOCK_SERVER_URL", "http://localhost:5000")
-                print(f"[GlueCellsManager] Running in TEST mode - using mock server: {base_url}")
-            else:
-                base_url = config_data.get("PRODUCTION_SERVER_URL", "http://192.168.222.143")
-                print(f"[GlueCellsManager] Running in PRODUCTION mode - using server: {base_url}")
+            print(f"[GlueCellsManager] Running in {mode.upper()} mode")
 
             cells = []
             for cell_cfg in config_data["CELL_CONFIG"]:
@@ -713,11 +805,7 @@ class GlueCellsManagerSingleton:
                 if glue_type is None:
                     raise ValueError(f"Unknown glue type in config: {cell_cfg['type']}")
 
-                # Override URL based on mode
-                if mode == "test":
-                    url = f"{base_url}/weight{cell_cfg['id']}"
-                else:
-                    url = cell_cfg["url"]
+                url = cell_weight_url(config_data, cell_cfg)
 
                 print(f"[GlueCellsManager] Cell {cell_cfg['id']}: {url}")
 
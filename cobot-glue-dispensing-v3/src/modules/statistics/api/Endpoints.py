@@ -10,6 +10,7 @@ STATS_PUMP_BY_ID = "/stats/pumps/{pump_id}"
 STATS_FAN = "/stats/fan"
 STATS_LOADCELLS = "/stats/loadcells"
 STATS_LOADCELL_BY_ID = "/stats/loadcells/{loadcell_id}"
+STATS_HISTORY = "/stats/history/{name}"  # ?start=&end=&bucket_seconds=
 
 # -----------------------------
 # Write / Action Operations (POST / PUT)
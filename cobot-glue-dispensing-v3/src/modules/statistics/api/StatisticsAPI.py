@@ -75,6 +75,16 @@ class StatisticsAPI:
             return self.controller.loadcells[loadcell_id].to_dict()
         return {"status": "error", "error": f"Loadcell {loadcell_id} not found"}
 
+    def get_history(self, name: str, start: Optional[float] = None, end: Optional[float] = None,
+                    bucket_seconds: int = 3600) -> Dict[str, Any]:
+        """Get time-bucketed usage (e.g. "pump_1_glue_qty" per hour) from local service."""
+        try:
+            buckets = self.service.get_history(name, start, end, bucket_seconds)
+            return {"name": name, "bucket_seconds": bucket_seconds,
+                    "buckets": [{"start": bucket_start, "value": value} for bucket_start, value in buckets]}
+        except Exception as e:
+            return {"status": "error", "error": str(e)}
+
     # ============================================================================
     # RESET OPERATIONS (existing functionality)
     # ============================================================================
@@ -1,28 +1,58 @@
 import os
 import json
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from modules.statistics.backend.StatsStore import FLUSH_INTERVAL, StatsStore
+
+STATS_DB_FILE = "statistics.db"
+
 
 class StatsPersistence:
-    def __init__(self, storage_folder: str):
+    """
+    Statistic documents (one dict per component) and usage history in a StatsStore.
+    Saves are batched by the store; per-component <key>.json files of older versions are
+    imported on first load.
+    """
+
+    def __init__(self, storage_folder: str, flush_interval: float = FLUSH_INTERVAL):
         self.storage_folder = storage_folder
         os.makedirs(self.storage_folder, exist_ok=True)
+        self.store = StatsStore(os.path.join(self.storage_folder, STATS_DB_FILE), flush_interval)
 
     def _get_file_path(self, key: str) -> str:
         return os.path.join(self.storage_folder, f"{key}.json")
 
     def save(self, key: str, data: Dict[str, Any]) -> None:
-        file_path = self._get_file_path(key)
-        with open(file_path, "w") as f:
-            json.dump(data, f, indent=4)
+        self.store.put_document(key, data)
 
     def load(self, key: str, default_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        data = self.store.get_document(key)
+        if data is not None:
+            return data
         file_path = self._get_file_path(key)
-        if not os.path.exists(file_path):
-            # file missing → create with default
+        if os.path.exists(file_path):
+            # written by the JSON persistence - import it once
+            with open(file_path, "r") as f:
+                data = json.load(f)
+        else:
+            # missing → create with default
             if default_data is None:
                 default_data = {"name": key, "value": 0.0, "unit": "s", "start_time": time.time()}
-            self.save(key, default_data)
-            return default_data
-        with open(file_path, "r") as f:
-            return json.load(f)
+            data = default_data
+        self.save(key, data)
+        return data
+
+    def record(self, name: str, amount: float) -> None:
+        """Add amount to the usage history of name (e.g. on-seconds, pumped glue)."""
+        self.store.increment(name, amount)
+
+    def history(self, name: str, start: Optional[float] = None, end: Optional[float] = None,
+                bucket_seconds: int = 3600) -> List[Tuple[float, float]]:
+        return self.store.history(name, start, end, bucket_seconds)
+
+    def flush(self) -> None:
+        self.store.flush()
+
+    def close(self) -> None:
+        self.store.close()
@@ -14,7 +14,7 @@ class StatsService:
     # GENERATOR
     # -------------------------
     def toggle_generator(self, on: bool):
-        self.controller.generator.toggle(on)
+        self._toggle("generator", self.controller.generator, on)
         self.persistence.save("generator", self.controller.generator.to_dict())
 
     def reset_generator(self):
@@ -25,7 +25,7 @@ class StatsService:
     # TRANSDUCER
     # -------------------------
     def toggle_transducer(self, on: bool):
-        self.controller.transducer.toggle(on)
+        self._toggle("transducer", self.controller.transducer, on)
         self.persistence.save("transducer", self.controller.transducer.to_dict())
 
     def reset_transducer(self):
@@ -37,12 +37,13 @@ class StatsService:
     # -------------------------
     def toggle_pump(self, index: int, on: bool):
         pump: PumpStats = self.controller.pumps[index]
-        pump.toggle(on)
+        self._toggle(f"pump_{index+1}", pump, on)
         self.persistence.save(f"pump_{index+1}", pump.to_dict())
 
     def pump_glue(self, index: int, qty: float):
         pump: PumpStats = self.controller.pumps[index]
         pump.pump_glue(qty)
+        self.persistence.record(f"pump_{index+1}_glue_qty", qty)
         self.persistence.save(f"pump_{index+1}", pump.to_dict())
 
     def reset_pump_motor(self, index: int):
@@ -65,7 +66,7 @@ class StatsService:
     # -------------------------
     def toggle_fan(self, on: bool):
         fan: FanStats = self.controller.fan
-        fan.toggle(on)
+        self._toggle("fan", fan, on)
         self.persistence.save("fan", fan.to_dict())
 
     def reset_fan(self):
@@ -86,6 +87,23 @@ class StatsService:
         lc.reset()
         self.persistence.save(f"loadcell_{index+1}", lc.to_dict())
 
+    # -------------------------
+    # USAGE HISTORY
+    # -------------------------
+    def get_history(self, name: str, start: float = None, end: float = None, bucket_seconds: int = 3600):
+        """
+        Usage per time bucket, e.g. "generator_on_seconds", "pump_1_on_seconds" or
+        "pump_1_glue_qty": [(bucket start, amount)], oldest first.
+        """
+        return self.persistence.history(name, start, end, bucket_seconds)
+
+    def _toggle(self, name: str, stats, on: bool):
+        """Toggle and add the on-time it completed to the usage history."""
+        before = stats.total_on_seconds
+        stats.toggle(on)
+        if stats.total_on_seconds > before:
+            self.persistence.record(f"{name}_on_seconds", stats.total_on_seconds - before)
+
     # -------------------------
     # FULL SAVE/LOAD
     # -------------------------
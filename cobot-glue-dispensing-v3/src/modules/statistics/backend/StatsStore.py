@@ -0,0 +1,234 @@
+"""
+SQLite (WAL mode) backend of the statistics.
+
+Counters and documents are kept in memory; writers only touch the in-memory copy and mark
+the key dirty. A flusher thread writes everything dirty in one transaction every
+``flush_interval`` seconds, so a shift of increments costs one commit per interval instead
+of one full-file rewrite per increment. WAL commits are atomic - a power cut loses at most
+the last interval and never leaves a half-written file.
+
+Besides the current totals every increment is added to a per-minute history bucket, which
+backs the time-bucketed usage queries (``history``). On startup minute buckets older than
+``compact_after`` are folded into hourly buckets and the WAL is checkpointed into the
+database file.
+"""
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+FLUSH_INTERVAL = 1.0  # Seconds between batched commits
+HISTORY_RESOLUTION = 60  # Seconds per history bucket
+COMPACTED_RESOLUTION = 3600  # Seconds per history bucket after compaction
+COMPACT_AFTER = 30 * 24 * 3600  # Age in seconds after which minute buckets are folded into hours
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS counters (key TEXT PRIMARY KEY, value REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS documents (name TEXT PRIMARY KEY, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS history (
+    bucket REAL NOT NULL,
+    key TEXT NOT NULL,
+    delta REAL NOT NULL,
+    PRIMARY KEY (key, bucket)
+);
+"""
+
+
+class StatsStore:
+    def __init__(self, db_path: str, flush_interval: float = FLUSH_INTERVAL,
+                 history_resolution: int = HISTORY_RESOLUTION, compact_after: float = COMPACT_AFTER):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.history_resolution = history_resolution
+        self.compact_after = compact_after
+        self.commits = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=FULL")  # the WAL is synced on every (batched) commit
+        self._db.executescript(_SCHEMA)
+        self._db_lock = threading.Lock()  # the connection is shared with the flusher thread; taken before _lock
+        self._lock = threading.Lock()  # in-memory state
+        self._counters: Dict[str, float] = dict(self._db.execute("SELECT key, value FROM counters"))
+        self._documents: Dict[str, dict] = {name: json.loads(data) for name, data in
+                                            self._db.execute("SELECT name, data FROM documents")}
+        self._dirty_counters = set()
+        self._dirty_documents = set()
+        self._deleted_counters = set()
+        self._pending_history: Dict[Tuple[str, float], float] = {}
+        self._compact()
+
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="StatsStoreFlusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # -------------------------
+    # COUNTERS
+    # -------------------------
+    def increment(self, key: str, amount: float = 1.0) -> float:
+        """Add amount to the counter and to its current history bucket; returns the new total."""
+        bucket = self._bucket(time.time())
+        with self._lock:
+            value = self._counters.get(key, 0) + amount
+            self._counters[key] = value
+            self._dirty_counters.add(key)
+            self._deleted_counters.discard(key)
+            self._pending_history[(key, bucket)] = self._pending_history.get((key, bucket), 0) + amount
+            return value
+
+    def set(self, key: str, value: float) -> None:
+        """Overwrite the counter. Not recorded in the history - only increments are usage."""
+        with self._lock:
+            self._counters[key] = value
+            self._dirty_counters.add(key)
+            self._deleted_counters.discard(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._counters.get(key, default)
+
+    def values(self, prefix: str = "") -> Dict[str, float]:
+        with self._lock:
+            return {key: value for key, value in self._counters.items() if key.startswith(prefix)}
+
+    def clear(self) -> None:
+        """Drop every counter. The usage history is kept."""
+        with self._lock:
+            self._deleted_counters.update(self._counters)
+            self._counters.clear()
+            self._dirty_counters.clear()
+
+    # -------------------------
+    # DOCUMENTS
+    # -------------------------
+    def put_document(self, name: str, data: Dict[str, Any]) -> None:
+        with self._lock:
+            self._documents[name] = json.loads(json.dumps(data))  # detached copy, JSON types only
+            self._dirty_documents.add(name)
+
+    def get_document(self, name: str, default: Optional[dict] = None) -> Optional[dict]:
+        with self._lock:
+            data = self._documents.get(name)
+        return json.loads(json.dumps(data)) if data is not None else default
+
+    # -------------------------
+    # HISTORY
+    # -------------------------
+    def history(self, key: str, start: Optional[float] = None, end: Optional[float] = None,
+                bucket_seconds: int = 3600) -> List[Tuple[float, float]]:
+        """
+        Usage of key per time bucket: [(bucket start, sum of increments)], oldest first.
+        Buckets are aligned to multiples of bucket_seconds (UTC) and empty ones are omitted.
+        """
+        self.flush()
+        start = 0.0 if start is None else start
+        end = time.time() + 1 if end is None else end
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT CAST(bucket / ? AS INTEGER) * ? AS b, SUM(delta) FROM history "
+                "WHERE key = ? AND bucket >= ? AND bucket < ? GROUP BY b ORDER BY b",
+                (bucket_seconds, bucket_seconds, key, start, end)).fetchall()
+        return [(float(bucket), total) for bucket, total in rows]
+
+    # -------------------------
+    # PERSISTENCE
+    # -------------------------
+    def flush(self) -> None:
+        """Write everything changed since the last flush in one transaction."""
+        with self._db_lock:  # held across snapshot and write, so commits land in snapshot order
+            if self._db is None:
+                return
+            with self._lock:
+                if not (self._dirty_counters or self._dirty_documents or self._deleted_counters
+                        or self._pending_history):
+                    return
+                counters = [(key, self._counters[key]) for key in self._dirty_counters]
+                documents = [(name, json.dumps(self._documents[name])) for name in self._dirty_documents]
+                deleted = [(key,) for key in self._deleted_counters]
+                history = [(bucket, key, delta) for (key, bucket), delta in self._pending_history.items()]
+                self._dirty_counters.clear()
+                self._dirty_documents.clear()
+                self._deleted_counters.clear()
+                self._pending_history.clear()
+
+            try:
+                with self._transaction():
+                    self._db.executemany("DELETE FROM counters WHERE key = ?", deleted)
+                    self._db.executemany(
+                        "INSERT INTO counters (key, value) VALUES (?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET value = excluded.value", counters)
+                    self._db.executemany(
+                        "INSERT INTO documents (name, data) VALUES (?, ?) "
+                        "ON CONFLICT(name) DO UPDATE SET data = excluded.data", documents)
+                    self._db.executemany(
+                        "INSERT INTO history (bucket, key, delta) VALUES (?, ?, ?) "
+                        "ON CONFLICT(key, bucket) DO UPDATE SET delta = delta + excluded.delta", history)
+            except sqlite3.Error as e:
+                logger.error(f"Statistics flush failed, retrying with the next one: {e}")
+                self._requeue(counters, documents, deleted, history)
+                return
+            self.commits += 1
+
+    def close(self) -> None:
+        """Stop the flusher, write what is pending and close the database."""
+        self._stop_event.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+        self.flush()
+        with self._db_lock:
+            if self._db is not None:
+                self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._db.close()
+                self._db = None
+        atexit.unregister(self.close)
+
+    """PRIVATE METHODS SECTION"""
+
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+
+    def _requeue(self, counters, documents, deleted, history):
+        with self._lock:
+            self._dirty_counters.update(key for key, _ in counters if key in self._counters)
+            self._dirty_documents.update(name for name, _ in documents)
+            self._deleted_counters.update(key for (key,) in deleted if key not in self._counters)
+            for bucket, key, delta in history:
+                self._pending_history[(key, bucket)] = self._pending_history.get((key, bucket), 0) + delta
+
+    def _bucket(self, timestamp: float) -> float:
+        return float(int(timestamp // self.history_resolution) * self.history_resolution)
+
+    def _compact(self):
+        """Fold old history buckets into hours and move the WAL into the database file."""
+        cutoff = self._bucket(time.time() - self.compact_after)
+        with self._db_lock, self._transaction():
+            self._db.execute(
+                "CREATE TEMP TABLE compacted AS "
+                "SELECT CAST(bucket / ? AS INTEGER) * ? AS bucket, key, SUM(delta) AS delta "
+                "FROM history WHERE bucket < ? GROUP BY key, 1",
+                (COMPACTED_RESOLUTION, COMPACTED_RESOLUTION, cutoff))
+            self._db.execute("DELETE FROM history WHERE bucket < ?", (cutoff,))
+            self._db.execute("INSERT INTO history (bucket, key, delta) SELECT bucket, key, delta FROM compacted")
+            self._db.execute("DROP TABLE compacted")
+        self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    @contextmanager
+    def _transaction(self):
+        """BEGIN/COMMIT around a block (the connection runs in autocommit mode), ROLLBACK on error."""
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
@@ -0,0 +1,82 @@
+"""
+Batched image -> robot transformation for whole jobs.
+
+All contours of a job are concatenated into one (N, 2) array plus a segment offsets table
+(offsets[i]:offsets[i + 1] are the rows of contour i). The homography, the transducer offsets
+and the z / rx / ry / rz columns are then applied to all points at once, and the result is
+split back into per-contour views of the same array.
+
+The arithmetic follows utils.applyTransformation step by step (float32 points, one
+cv2.perspectiveTransform, offsets added in float32, rounding to 6 decimals), so a batched
+job gives exactly the points the per-contour path gave.
+"""
+from typing import List, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+ROUND_DECIMALS = 6  # applyTransformation rounds transformed points to this many decimals
+DEFAULT_RX = 180.0
+DEFAULT_RY = 0.0
+
+
+def concat_segments(contours: Sequence, dtype=np.float32) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Concatenate contours (any (n, 2) / (n, 1, 2) array or nested list each) into one (N, 2)
+    array of dtype. Returns (points, offsets) with offsets of length len(contours) + 1.
+    """
+    arrays = [np.asarray(contour, dtype=dtype).reshape(-1, 2) for contour in contours]
+    offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+    if arrays:
+        np.cumsum([len(array) for array in arrays], out=offsets[1:])
+        points = np.concatenate(arrays)
+    else:
+        points = np.empty((0, 2), dtype=dtype)
+    return points, offsets
+
+
+def split_segments(array: np.ndarray, offsets: np.ndarray) -> List[np.ndarray]:
+    """Rows offsets[i]:offsets[i + 1] of array for every segment - views, nothing is copied."""
+    return [array[start:stop] for start, stop in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+
+def segment_lengths(offsets: np.ndarray) -> np.ndarray:
+    return np.diff(offsets)
+
+
+def transform_points(camera_to_robot_matrix, points: np.ndarray, x_offset: float = 0.0,
+                     y_offset: float = 0.0, apply_offset: bool = True) -> np.ndarray:
+    """
+    Image -> robot (mm) for an (N, 2) array: homography, then the transducer offsets at rz=0.
+
+    Returns:
+        np.ndarray: (N, 2) float32, rounded to ROUND_DECIMALS like applyTransformation.
+    """
+    points = np.ascontiguousarray(points, dtype=np.float32).reshape(-1, 1, 2)
+    if len(points) == 0:
+        return np.empty((0, 2), dtype=np.float32)
+    transformed = cv2.perspectiveTransform(points, camera_to_robot_matrix).reshape(-1, 2)
+    if apply_offset:
+        # Column-wise with the offsets as given, so the promotion (and rounding back into
+        # float32) is the same as the per-point assignment in applyTransformation
+        transformed[:, 0] = transformed[:, 0] + x_offset
+        transformed[:, 1] = transformed[:, 1] + y_offset
+    return np.round(transformed, decimals=ROUND_DECIMALS)
+
+
+def robot_poses(points: np.ndarray, offsets: np.ndarray, z, rz, rx: float = DEFAULT_RX,
+                ry: float = DEFAULT_RY) -> np.ndarray:
+    """
+    (N, 6) [x, y, z, rx, ry, rz] float64 poses for the (N, 2) points of a job.
+
+    Args:
+        z, rz: a scalar for the whole job or one value per segment.
+    """
+    lengths = segment_lengths(offsets)
+    poses = np.empty((len(points), 6), dtype=np.float64)
+    poses[:, :2] = points
+    poses[:, 2] = np.repeat(np.broadcast_to(np.asarray(z, dtype=np.float64), lengths.shape), lengths)
+    poses[:, 3] = rx
+    poses[:, 4] = ry
+    poses[:, 5] = np.repeat(np.broadcast_to(np.asarray(rz, dtype=np.float64), lengths.shape), lengths)
+    return poses
@@ -1,9 +1,44 @@
+"""
+Logging helpers shared by the services.
+
+Records are written by one background thread: every logger from setup_logger gets a
+QueueHandler on a process-wide queue, and a QueueListener drains it into the colored console
+handler. A log call therefore only builds the record and puts it on the queue - formatting
+(messages take %-style args and are formatted on the writer thread), timestamps and the
+console write happen off the calling thread.
+
+The log_* helpers return after a single attribute check when their LoggerContext is disabled,
+and look the caller up from the calling frame through a per-call-site cache instead of
+walking the stack (or patching logger.findCaller) on every call. log_every_n and
+log_throttled are for per-frame / per-sample sites that would otherwise flood the log.
+
+Environment switches (read at import):
+    COBOT_LOG_SYNC=1           write from the calling thread instead of the background writer
+    COBOT_LOG_DECORATORS=0     log_calls_with_timestamp_decorator returns functions unwrapped
+"""
+import atexit
+import datetime
+import functools
+import inspect
+import itertools
 import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
 from enum import Enum
+
 from modules.shared.MessageBroker import MessageBroker
-import functools
-import inspect
-import datetime
+
+
+def _env_flag(name, default):
+    return os.environ.get(name, default).strip().lower() not in ("0", "false", "no", "off", "")
+
+
+ASYNC_LOGGING = not _env_flag("COBOT_LOG_SYNC", "0")
+DECORATORS_ENABLED = _env_flag("COBOT_LOG_DECORATORS", "1")
 
 class LoggingLevel(Enum):
     DEBUG = logging.DEBUG
@@ -38,7 +73,6 @@ class ColoredFormatter(logging.Formatter):
 
     def formatTime(self, record, datefmt=None):
         """Override to add milliseconds support"""
-        import datetime
         ct = datetime.datetime.fromtimestamp(record.created)
         if datefmt:
             # Custom handling for milliseconds
@@ -54,43 +88,71 @@ class ColoredFormatter(logging.Formatter):
         return s
 
 class LoggerContext:
+    # Slots keep the enabled check on the disabled fast path a plain slot read
+    __slots__ = ("enabled", "logger", "broadcast_to_ui", "topic")
+
     def __init__(self,enabled:bool,logger:logging.Logger,broadcast_to_ui:bool=False,topic="log"):
         self.enabled=enabled
         self.logger=logger
         self.broadcast_to_ui = broadcast_to_ui
         self.topic = topic
 
-def log_warning_message(logger_context:LoggerContext, message:str):
-    log_if_enabled(enabled=logger_context.enabled,
-                   logger=logger_context.logger,
-                   message=message,
-                   level=LoggingLevel.WARNING,
-                   broadcast_to_ui=logger_context.broadcast_to_ui,
-                   topic=logger_context.topic)
-
-def log_info_message(logger_context:LoggerContext, message:str):
-    log_if_enabled(enabled=logger_context.enabled,
-                   logger=logger_context.logger,
-                   message=message,
-                   level=LoggingLevel.INFO,
-                   broadcast_to_ui=logger_context.broadcast_to_ui,
-                   topic=logger_context.topic)
-
-def log_debug_message(logger_context:LoggerContext, message:str):
-    log_if_enabled(enabled=logger_context.enabled,
-                   logger=logger_context.logger,
-                   message=message,
-                   level=LoggingLevel.DEBUG,
-                   broadcast_to_ui=logger_context.broadcast_to_ui,
-                   topic=logger_context.topic)
-
-def log_error_message(logger_context:LoggerContext, message:str):
-    log_if_enabled(enabled=logger_context.enabled,
-                   logger=logger_context.logger,
-                   message=message,
-                   level=LoggingLevel.ERROR,
-                   broadcast_to_ui=logger_context.broadcast_to_ui,
-                   topic=logger_context.topic)
+def log_warning_message(logger_context:LoggerContext, message:str, *args):
+    if logger_context.enabled:
+        _log(logger_context.logger, logging.WARNING, message, args, sys._getframe(1),
+             logger_context.broadcast_to_ui, logger_context.topic)
+
+def log_info_message(logger_context:LoggerContext, message:str, *args):
+    if logger_context.enabled:
+        _log(logger_context.logger, logging.INFO, message, args, sys._getframe(1),
+             logger_context.broadcast_to_ui, logger_context.topic)
+
+def log_debug_message(logger_context:LoggerContext, message:str, *args):
+    if logger_context.enabled:
+        _log(logger_context.logger, logging.DEBUG, message, args, sys._getframe(1),
+             logger_context.broadcast_to_ui, logger_context.topic)
+
+def log_error_message(logger_context:LoggerContext, message:str, *args):
+    if logger_context.enabled:
+        _log(logger_context.logger, logging.ERROR, message, args, sys._getframe(1),
+             logger_context.broadcast_to_ui, logger_context.topic)
+
+def log_every_n(logger_context:LoggerContext, n:int, message:str, *args, level=LoggingLevel.DEBUG):
+    """
+    Log only the 1st, (n+1)th, (2n+1)th ... call made from this call site - for per-frame and
+    per-sample messages. The count is kept per call site, not per message text.
+    """
+    if not logger_context.enabled:
+        return
+    frame = sys._getframe(1)
+    key = (frame.f_code, frame.f_lineno)
+    counter = _site_counters.get(key)
+    if counter is None:
+        counter = _site_counters.setdefault(key, itertools.count())
+    if next(counter) % max(int(n), 1) == 0:
+        _log(logger_context.logger, _level_number(level), message, args, frame,
+             logger_context.broadcast_to_ui, logger_context.topic)
+
+def log_throttled(logger_context:LoggerContext, interval_s:float, message:str, *args, level=LoggingLevel.DEBUG):
+    """
+    Log at most once per interval_s seconds from this call site. The first message after a
+    quiet period says how many were dropped since the previous one.
+    """
+    if not logger_context.enabled:
+        return
+    frame = sys._getframe(1)
+    key = (frame.f_code, frame.f_lineno)
+    now = time.monotonic()
+    with _throttle_lock:
+        last, suppressed = _site_throttle.get(key, (None, 0))
+        if last is not None and now - last < interval_s:
+            _site_throttle[key] = (last, suppressed + 1)
+            return
+        _site_throttle[key] = (now, 0)
+    if suppressed:
+        message = f"{message} ({suppressed} similar messages suppressed)"
+    _log(logger_context.logger, _level_number(level), message, args, frame,
+         logger_context.broadcast_to_ui, logger_context.topic)
 
 def setup_logger(name:str):
     """Setup a specialized logger for RobotWrapper operations"""
@@ -101,64 +163,26 @@ def setup_logger(name:str):
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
 
-    # Create console handler with custom formatter
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.DEBUG)
-
-    # Custom format with function name and values
-    formatter = ColoredFormatter(
-        fmt='[%(asctime)s] [%(levelname)s] [%(funcName)s] %(message)s',
-        datefmt='%H:%M:%S.%f'
-    )
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    if ASYNC_LOGGING:
+        # Records go onto the shared queue; the background writer formats and prints them
+        logger.addHandler(_queue_handler())
+    else:
+        logger.addHandler(_console_handler())
 
     # Prevent propagation to avoid duplicate messages
     logger.propagate = False
 
     return logger
 
-def log_if_enabled(enabled, logger, level, message, broadcast_to_ui=False, topic="log"):
-    """Helper function to log only if logging is enabled"""
-    if enabled and logger:
-
-        if broadcast_to_ui:
-            broker = MessageBroker()
-            broker.publish(topic, message)
-
-        import inspect
-        # Get the calling function's name
-        caller_frame = inspect.currentframe().f_back
-        caller_name = caller_frame.f_code.co_name
-
-        # Convert LoggingLevel enum to string if necessary
-        if isinstance(level, LoggingLevel):
-            level_name = level.name.lower()
-        elif isinstance(level, str):
-            level_name = level.lower()
-        else:
-            # Fallback to info if level is invalid
-            level_name = 'info'
-
-        # Create a temporary log record with the caller's function name
-        log_method = getattr(logger, level_name)
-
-        # Temporarily modify the logger to show the actual caller
-        original_findCaller = logger.findCaller
-
-        def mock_findCaller(stack_info=False, stacklevel=1):
-            # Return the caller's info instead of log_if_enabled
-            return (caller_frame.f_code.co_filename, caller_frame.f_lineno, caller_name, None)
-
-        logger.findCaller = mock_findCaller
-        try:
-            log_method(message)
-        finally:
-            # Restore original findCaller
-            logger.findCaller = original_findCaller
-
-
+def flush_logs():
+    """Wait until every record queued so far has been written (no-op with COBOT_LOG_SYNC)."""
+    if _listener is not None:
+        _log_queue.join()
 
+def log_if_enabled(enabled, logger, level, message, *args, broadcast_to_ui=False, topic="log"):
+    """Helper function to log only if logging is enabled"""
+    if enabled:
+        _log(logger, _level_number(level), message, args, sys._getframe(1), broadcast_to_ui, topic)
 
 
 def log_calls_with_timestamp_decorator(logger=None, enabled=True):
@@ -167,29 +191,38 @@ def log_calls_with_timestamp_decorator(logger=None, enabled=True):
 
     Args:
         logger: Logger instance (must have .info/.debug/.error methods). If None, prints to console.
-        enabled: Toggle logging on/off.
+        enabled: Toggle logging on/off. Disabled (or COBOT_LOG_DECORATORS=0) returns the
+            function itself, so it costs nothing per call.
     """
 
     def decorator(func):
+        if not (enabled and DECORATORS_ENABLED):
+            return func
+
+        # Resolved once per decorated function, not on every call
+        signature = inspect.signature(func)
+        if logger:
+            log_method = logger.debug if hasattr(logger, "debug") else logger.info
+        else:
+            log_method = None
+        is_enabled_for = getattr(logger, "isEnabledFor", None)
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            if enabled:
+            if is_enabled_for is None or is_enabled_for(logging.DEBUG):
                 # Timestamp
                 timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
 
                 # Get function arguments
-                bound_args = inspect.signature(func).bind(*args, **kwargs)
+                bound_args = signature.bind(*args, **kwargs)
                 bound_args.apply_defaults()
                 args_repr = ", ".join(f"{k}={v!r}" for k, v in bound_args.arguments.items())
 
                 # Log message
                 message = f"[{timestamp}] CALL {func.__qualname__}({args_repr})"
 
-                if logger:
-                    if hasattr(logger, "debug"):
-                        logger.debug(message)
-                    else:
-                        logger.info(message)
+                if log_method:
+                    log_method(message)
                 else:
                     print(message)
 
@@ -198,3 +231,100 @@ def log_calls_with_timestamp_decorator(logger=None, enabled=True):
         return wrapper
 
     return decorator
+
+
+"""PRIVATE METHODS SECTION"""
+
+_LEVEL_NAMES = {"debug": logging.DEBUG, "info": logging.INFO, "warning": logging.WARNING,
+                "warn": logging.WARNING, "error": logging.ERROR, "critical": logging.CRITICAL}
+
+# (code object, line) of a log call -> (file, line, function) recorded in its LogRecords
+_call_sites = {}
+# Per-call-site state of log_every_n / log_throttled
+_site_counters = {}
+_site_throttle = {}
+_throttle_lock = threading.Lock()
+
+_log_queue = queue.Queue(-1)
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def _level_number(level):
+    if isinstance(level, LoggingLevel):
+        return level.value
+    if isinstance(level, str):
+        # Fallback to info if level is invalid
+        return _LEVEL_NAMES.get(level.lower(), logging.INFO)
+    if isinstance(level, int):
+        return level
+    return logging.INFO
+
+
+def _call_site(frame):
+    key = (frame.f_code, frame.f_lineno)
+    site = _call_sites.get(key)
+    if site is None:
+        site = _call_sites.setdefault(key, (frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name))
+    return site
+
+
+def _log(logger, levelno, message, args, frame, broadcast_to_ui, topic):
+    """
+    Emit one record attributed to frame's call site. args are formatted by the handler, on the
+    writer thread, so they should not be mutated after the call.
+    """
+    if not logger:
+        return
+    if broadcast_to_ui:
+        MessageBroker().publish(topic, message % args if args else message)
+    if not logger.isEnabledFor(levelno):
+        return
+    filename, lineno, func_name = _call_site(frame)
+    # Built directly rather than through logger.debug(...) so findCaller is never involved
+    record = logger.makeRecord(logger.name, levelno, filename, lineno, message, args or None, None, func_name)
+    logger.handle(record)
+
+
+def _console_handler():
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.DEBUG)
+
+    # Custom format with function name and values
+    formatter = ColoredFormatter(
+        fmt='[%(asctime)s] [%(levelname)s] [%(funcName)s] %(message)s',
+        datefmt='%H:%M:%S.%f'
+    )
+    console_handler.setFormatter(formatter)
+    return console_handler
+
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues the record as is. The stock prepare() formats the message on
+    the calling thread (it has to be picklable for multiprocessing queues); this queue never
+    leaves the process, so formatting is left to the writer thread.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def _queue_handler():
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            _listener = logging.handlers.QueueListener(_log_queue, _console_handler(), respect_handler_level=True)
+            _listener.start()
+            atexit.register(_stop_listener)
+    handler = _LazyQueueHandler(_log_queue)
+    handler.setLevel(logging.DEBUG)
+    return handler
+
+
+def _stop_listener():
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
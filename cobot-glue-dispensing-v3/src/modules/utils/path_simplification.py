@@ -0,0 +1,207 @@
+"""
+Geometry simplification for robot paths.
+
+Spray and editor paths are densely sampled polylines; most of their points are collinear
+or lie on simple arcs. Every point costs an RPC, pump-controller bookkeeping and motion
+blending, so paths are reduced before execution:
+
+- rdp_indices / simplify_path: Ramer-Douglas-Peucker under a tolerance. The result is a
+  plain polyline and is safe for every trajectory backend.
+- fit_primitives: greedy MoveL / MoveC segment fitting with a maximum deviation guarantee,
+  for robots that execute one motion command per segment.
+
+Distances are measured on x, y, z (mm); orientations are taken from the kept points.
+"""
+from dataclasses import dataclass
+from enum import Enum
+from typing import List, Optional
+
+import numpy as np
+
+DEFAULT_PATH_TOLERANCE_MM = 0.2  # Max distance of a dropped point from the simplified polyline
+MAX_ARC_SWEEP_DEG = 180.0  # Longest arc emitted as a single MoveC
+MIN_ARC_POINTS = 4  # Points an arc has to cover to replace MoveL segments (start, via, ..., end)
+
+
+class MotionType(Enum):
+    MOVE_L = "MoveL"
+    MOVE_C = "MoveC"
+
+
+@dataclass
+class MotionPrimitive:
+    kind: MotionType
+    end_index: int  # index of the target point in the fitted path
+    via_index: Optional[int] = None  # index of the intermediate point (MOVE_C only)
+
+
+def rdp_indices(points, tolerance: float) -> np.ndarray:
+    """
+    Ramer-Douglas-Peucker on the xyz columns of an (N, >=2) array.
+
+    Returns:
+        np.ndarray: sorted indices of the points to keep (always includes first and last)
+    """
+    xyz = _xyz(points)
+    n = len(xyz)
+    if n < 3 or tolerance <= 0:
+        return np.arange(n)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]  # iterative - recursion depth would follow the point count on spirals
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        distances = _segment_distances(xyz[start + 1:end], xyz[start], xyz[end])
+        worst = int(np.argmax(distances))
+        if distances[worst] > tolerance:
+            split = start + 1 + worst
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return np.flatnonzero(keep)
+
+
+def simplify_path(path, tolerance: float = DEFAULT_PATH_TOLERANCE_MM) -> list:
+    """
+    Drop every point of path that lies within tolerance (mm) of the simplified polyline.
+
+    Args:
+        path: sequence of points ([x, y] or [x, y, z, rx, ry, rz])
+
+    Returns:
+        list: the kept points, unchanged and in their original order
+    """
+    if len(path) < 3 or tolerance <= 0:
+        return list(path)
+    return [path[i] for i in rdp_indices(path, tolerance).tolist()]
+
+
+def fit_primitives(path, max_deviation: float, max_arc_sweep_deg: float = MAX_ARC_SWEEP_DEG) -> List[MotionPrimitive]:
+    """
+    Cover path with MoveL and MoveC segments. Every path point and every midpoint between two
+    consecutive path points stays within max_deviation (mm) of the emitted geometry. Each
+    segment is extended greedily; an arc is used only when it covers more points than a line.
+
+    Returns:
+        list[MotionPrimitive]: segments in order, the first one starting at path[0]
+    """
+    xyz = _xyz(path)
+    n = len(xyz)
+    max_sweep = np.radians(max_arc_sweep_deg)
+    primitives = []
+    start = 0
+    while start < n - 1:
+        line_end = start + 1
+        while line_end + 1 < n and \
+                np.max(_segment_distances(xyz[start + 1:line_end + 2], xyz[start], xyz[line_end + 1])) <= max_deviation:
+            line_end += 1
+
+        arc_end = None
+        end = start + MIN_ARC_POINTS - 1
+        while end < n and _arc_fits(xyz[start:end + 1], max_deviation, max_sweep):
+            arc_end = end
+            end += 1
+
+        if arc_end is not None and arc_end > line_end:
+            primitives.append(MotionPrimitive(MotionType.MOVE_C, arc_end, via_index=(start + arc_end) // 2))
+            start = arc_end
+        else:
+            primitives.append(MotionPrimitive(MotionType.MOVE_L, line_end))
+            start = line_end
+    return primitives
+
+
+def max_deviation(path, kept_indices=None, primitives=None) -> float:
+    """
+    Largest distance (mm) of a path point from its simplified geometry: the polyline through
+    kept_indices, or the MoveL/MoveC segments in primitives. With both, primitives were fitted
+    to the kept points (path[kept_indices]) and every original point of path is checked
+    against them, so the RDP and fitting errors are measured together.
+    """
+    xyz = _xyz(path)
+    if len(xyz) < 3:
+        return 0.0
+    worst = 0.0
+    if primitives is not None and kept_indices is not None:
+        kept = np.asarray(kept_indices).tolist()
+        primitives = [MotionPrimitive(primitive.kind, kept[primitive.end_index],
+                                      kept[primitive.via_index] if primitive.via_index is not None else None)
+                      for primitive in primitives]
+    if primitives is None:
+        kept = np.asarray(kept_indices if kept_indices is not None else np.arange(len(xyz)))
+        for start, end in zip(kept[:-1].tolist(), kept[1:].tolist()):
+            if end - start > 1:
+                worst = max(worst, float(np.max(_segment_distances(xyz[start + 1:end], xyz[start], xyz[end]))))
+        return worst
+    start = 0
+    for primitive in primitives:
+        end = primitive.end_index
+        if end - start > 1:
+            if primitive.kind is MotionType.MOVE_C:
+                covered = xyz[start:end + 1]
+                inner = np.concatenate([covered, (covered[:-1] + covered[1:]) / 2.0])
+                circle = _circle_through(xyz[start], xyz[primitive.via_index], xyz[end])
+                distances = _circle_distances(inner, *circle)
+            else:
+                distances = _segment_distances(xyz[start + 1:end], xyz[start], xyz[end])
+            worst = max(worst, float(np.max(distances)))
+        start = end
+    return worst
+
+
+def _xyz(points) -> np.ndarray:
+    array = np.asarray(points, dtype=np.float64)
+    if array.ndim == 1:
+        array = array.reshape(-1, 2)
+    if array.shape[1] >= 3:
+        return array[:, :3]
+    return np.column_stack([array[:, :2], np.zeros(len(array))])
+
+
+def _segment_distances(points: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Distances of (M, 3) points from the segment a-b (from a when a == b, e.g. closed contours)."""
+    ab = b - a
+    length_sq = float(ab @ ab)
+    if length_sq == 0.0:
+        return np.linalg.norm(points - a, axis=1)
+    t = np.clip((points - a) @ ab / length_sq, 0.0, 1.0)
+    return np.linalg.norm(points - (a + t[:, None] * ab), axis=1)
+
+
+def _circle_through(p0, p1, p2):
+    """Center, unit normal and radius of the circle through three points; None if they are collinear."""
+    u, w = p1 - p0, p2 - p0
+    normal = np.cross(u, w)
+    normal_sq = float(normal @ normal)
+    if normal_sq < 1e-12 * max(float(u @ u) * float(w @ w), 1e-12):
+        return None
+    center = p0 + np.cross(float(u @ u) * w - float(w @ w) * u, normal) / (2.0 * normal_sq)
+    return center, normal / np.sqrt(normal_sq), float(np.linalg.norm(p0 - center))
+
+
+def _circle_distances(points, center, normal, radius) -> np.ndarray:
+    offsets = points - center
+    height = offsets @ normal
+    radial = np.linalg.norm(offsets - height[:, None] * normal, axis=1)
+    return np.hypot(height, radial - radius)
+
+
+def _arc_fits(points: np.ndarray, max_deviation: float, max_sweep: float) -> bool:
+    """True if the arc from points[0] through the middle point to points[-1] follows every point in order."""
+    circle = _circle_through(points[0], points[(len(points) - 1) // 2], points[-1])
+    if circle is None:
+        return False
+    center, normal, radius = circle
+    midpoints = (points[:-1] + points[1:]) / 2.0
+    if np.max(_circle_distances(points, center, normal, radius)) > max_deviation or \
+            np.max(_circle_distances(midpoints, center, normal, radius)) > max_deviation:
+        return False
+    # The normal follows the travel direction p0 -> via -> end, so angles must grow monotonically
+    u = (points[0] - center) / radius
+    v = np.cross(normal, u)
+    offsets = points - center
+    angles = np.mod(np.arctan2(offsets @ v, offsets @ u), 2 * np.pi)
+    angles[0] = 0.0
+    return bool(np.all(np.diff(angles) >= 0.0) and angles[-1] <= max_sweep)
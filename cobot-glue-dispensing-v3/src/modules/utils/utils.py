@@ -2,6 +2,7 @@ import cv2
 from matplotlib import pyplot as plt
 
 from libs.plvision.PLVision import Contouring
+from modules.utils import batched_transform
 # from matplotlib import pyplot as plt
 
 import numpy as np
@@ -275,65 +276,14 @@ def applyTransformation(cameraToRobotMatrix, contours, apply_transducer_offset=T
         - The actual rotation of the transducer will be handled later in the robot path generation phase.
         :param dynamic_offsets_config:
     """
-    transformedContours = []
-    print("Camera to Robot Matrix:\n", cameraToRobotMatrix)
-    print("Contours to be transformed:", contours)
-    print(f"Transducer offset settings: apply={apply_transducer_offset}, x_offset={x_offset}, y_offset={y_offset}")
-
-    for contour_idx, contour in enumerate(contours):
-        print(f"In loop contour {contour_idx}: {contour}")
-        # Convert contour to a numpy array and reshape it for perspective transformation
-        contour = np.array(contour, dtype=np.float32).reshape(-1, 1, 2)
-
-        # Apply perspective transformation using the camera-to-robot matrix
-        transformed_points = cv2.perspectiveTransform(contour, cameraToRobotMatrix)
-
-        # Apply transducer geometry offset correction AFTER homography transformation
-        # Offsets are applied at rz=0 (no rotation) since rotation will be handled in robot path generation
-        if apply_transducer_offset:
-            print(f"Applying transducer geometry offset to contour {contour_idx} (at rz=0)")
-            
-            print(f"   Applying offsets: ({x_offset:.2f}, {y_offset:.2f}) mm")
-            
-            # Apply the offsets directly to all points (no rotation since rz=0)
-            for point_idx in range(transformed_points.shape[0]):
-                original_x = transformed_points[point_idx, 0, 0]
-                original_y = transformed_points[point_idx, 0, 1]
-
-                # dynamic_offsets_config = None
-                # if dynamic_offsets_config is not None:
-                # x_distance, x_step_offset, y_distance, y_step_offset, direction_map = dynamic_offsets_config
-
-                # # Call the new function
-                # dynamic_x_offset, dynamic_y_offset = compute_dynamic_tcp_offset_new(
-                #     base=(x_offset, y_offset),
-                #     current=(original_x, original_y),
-                #     base_offset=(x_offset, y_offset),
-                #     offset_step=(x_step_offset, y_step_offset),
-                #     offset_direction_map=direction_map
-                # )
-                # print(f"Calculated dynamic offsets x->{dynamic_x_offset} y->{dynamic_y_offset}")
-                # else:
-                dynamic_x_offset = x_offset
-                dynamic_y_offset = y_offset
-
-                # Apply offset directly (no rotation)
-                print(f"Apply offsets {(dynamic_x_offset, dynamic_y_offset)} to point {point_idx}")
-                transformed_points[point_idx, 0, 0] = original_x + dynamic_x_offset
-                transformed_points[point_idx, 0, 1] = original_y + dynamic_y_offset
-                
-                if point_idx < 3:  # Debug first few points
-                    print(f"   Point {point_idx}: ({original_x:.2f}, {original_y:.2f}) -> "
-                          f"({transformed_points[point_idx, 0, 0]:.2f}, {transformed_points[point_idx, 0, 1]:.2f})")
-
-        # Round the transformed points to 6 decimal places
-        transformed_points = np.round(transformed_points, decimals=6)
-
-        # Append the transformed points as a list of tuples
-        transformedContours.append(transformed_points.tolist())
-        print(f"Transformed contour {contour_idx} added to transformedContours with {len(transformed_points)} points")
-        
-    return transformedContours
+    print(f"Transforming {len(contours)} contours, transducer offset: apply={apply_transducer_offset}, "
+          f"x_offset={x_offset}, y_offset={y_offset}")
+
+    # One homography and one offset addition for all contours, then split back per contour
+    points, offsets = batched_transform.concat_segments(contours)
+    transformed = batched_transform.transform_points(cameraToRobotMatrix, points, x_offset, y_offset,
+                                                     apply_offset=apply_transducer_offset)
+    return [segment.reshape(-1, 1, 2).tolist() for segment in batched_transform.split_segments(transformed, offsets)]
 
 
 def shrinkContour(contourParam, offset_x, offset_y):
@@ -0,0 +1,100 @@
+"""
+Microbenchmark: MessageBroker.publish hot path.
+
+Compares the previous publish implementation (copy of the subscriber list, weakref cleanup
+bookkeeping and a debug f-string per callback even with debug logging off) with the current
+snapshot-based path, with and without per-topic statistics.
+
+Run from the src directory:
+    PYTHONPATH=. python ../tests/benchmarks/bench_broker_publish.py
+"""
+import logging
+import time
+import weakref
+
+from modules.shared.MessageBroker import MessageBroker
+from modules.shared.message_delivery import invoke_callback
+
+PUBLISHES = 50_000
+FANOUTS = (0, 1, 4, 16)
+
+
+class LegacyPublisher:
+    """The publish loop as it was before the snapshot rework, over plain weakref lists."""
+
+    def __init__(self):
+        self.subscribers = {}
+        self.logger = logging.getLogger("LegacyBroker")
+
+    def subscribe(self, topic, callback):
+        self.subscribers.setdefault(topic, []).append(weakref.WeakMethod(callback))
+
+    def publish(self, topic, message):
+        if topic not in self.subscribers:
+            self.logger.debug(f"No subscribers for topic '{topic}'")
+            return
+        live_callbacks = []
+        dead_refs = []
+        for ref in self.subscribers[topic]:
+            callback = ref()
+            if callback is not None:
+                live_callbacks.append(callback)
+            else:
+                dead_refs.append(ref)
+        if dead_refs:
+            self.subscribers[topic] = [ref for ref in self.subscribers[topic] if ref not in dead_refs]
+        successful_calls = 0
+        for callback in live_callbacks:
+            self.logger.debug(f"Publishing to topic: '{topic}' message: {message}")
+            if invoke_callback(topic, callback, message):
+                successful_calls += 1
+        if successful_calls > 0:
+            self.logger.debug(f"Successfully published to {successful_calls} subscribers for topic '{topic}'")
+
+
+class Subscriber:
+    def __init__(self):
+        self.count = 0
+
+    def on_message(self, message):
+        self.count += 1
+
+
+def measure(publisher, topic, message):
+    for _ in range(1000):  # warm-up
+        publisher.publish(topic, message)
+    started = time.perf_counter()
+    for _ in range(PUBLISHES):
+        publisher.publish(topic, message)
+    return (time.perf_counter() - started) / PUBLISHES * 1e6
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)  # debug logging off, as in production
+    message = {"state": "moving", "position": [100.0, 200.0, 300.0, 180.0, 0.0, 90.0], "speed": 12.5, "accel": 0.1}
+    broker = MessageBroker()
+
+    print(f"{PUBLISHES} publishes per case, µs per publish")
+    print(f"{'fan-out':>8} {'legacy':>9} {'no stats':>9} {'stats':>9}")
+    for fanout in FANOUTS:
+        topic = f"bench/fanout{fanout}"
+        subscribers = [Subscriber() for _ in range(fanout)]
+        legacy = LegacyPublisher()
+        for subscriber in subscribers:
+            legacy.subscribe(topic, subscriber.on_message)
+            broker.subscribe(topic, subscriber.on_message)
+
+        legacy_us = measure(legacy, topic, message)
+        broker.stats_enabled = False
+        plain_us = measure(broker, topic, message)
+        broker.stats_enabled = True
+        stats_us = measure(broker, topic, message)
+        print(f"{fanout:>8} {legacy_us:>9.2f} {plain_us:>9.2f} {stats_us:>9.2f}")
+
+    stats = broker.request("broker/stats", "bench/fanout16")["bench/fanout16"]
+    print(f"broker/stats sample: {stats['publishes']} publishes, mean fan-out {stats['mean_fanout']:.1f}, "
+          f"slowest subscriber {stats['slowest_subscriber']['name']}")
+
+
+if __name__ == "__main__":
+    main()
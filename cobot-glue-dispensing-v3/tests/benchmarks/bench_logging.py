@@ -0,0 +1,108 @@
+"""
+Microbenchmark: cost of a log call on the calling thread.
+
+Compares the previous log_if_enabled (inspect.currentframe, eager f-string, findCaller patched
+on the logger, synchronous StreamHandler) with the current custom_logging helpers for a
+disabled LoggerContext, a call filtered out by the logger level and an emitted record
+(written by the background writer). The console output goes to /dev/null in both.
+
+Run from the src directory:
+    PYTHONPATH=. python ../tests/benchmarks/bench_logging.py [--calls N]
+"""
+import argparse
+import inspect
+import logging
+import os
+import timeit
+
+from modules.utils import custom_logging
+from modules.utils.custom_logging import ColoredFormatter, LoggerContext, LoggingLevel, flush_logs, \
+    log_debug_message, setup_logger
+
+CALLS = 200_000
+REPEATS = 7
+DISABLED_TARGET_NS = 100
+
+
+def legacy_log_if_enabled(enabled, logger, level, message, broadcast_to_ui=False, topic="log"):
+    """log_if_enabled as it was before the queue-based rework (without the UI broadcast)."""
+    if enabled and logger:
+        caller_frame = inspect.currentframe().f_back
+        caller_name = caller_frame.f_code.co_name
+        log_method = getattr(logger, level.name.lower())
+        original_findCaller = logger.findCaller
+
+        def mock_findCaller(stack_info=False, stacklevel=1):
+            return (caller_frame.f_code.co_filename, caller_frame.f_lineno, caller_name, None)
+
+        logger.findCaller = mock_findCaller
+        try:
+            log_method(message)
+        finally:
+            logger.findCaller = original_findCaller
+
+
+def legacy_log_debug_message(logger_context, message):
+    legacy_log_if_enabled(enabled=logger_context.enabled, logger=logger_context.logger, message=message,
+                          level=LoggingLevel.DEBUG, broadcast_to_ui=logger_context.broadcast_to_ui,
+                          topic=logger_context.topic)
+
+
+def make_legacy_logger(name, stream):
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.DEBUG)
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(ColoredFormatter(fmt='[%(asctime)s] [%(levelname)s] [%(funcName)s] %(message)s',
+                                          datefmt='%H:%M:%S.%f'))
+    logger.addHandler(handler)
+    logger.propagate = False
+    return logger
+
+
+def ns_per_call(stmt, namespace, calls):
+    return min(timeit.repeat(stmt, globals=namespace, number=calls, repeat=REPEATS)) / calls * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=CALLS)
+    args = parser.parse_args()
+
+    with open(os.devnull, "w") as devnull:
+        legacy_logger = make_legacy_logger("bench.legacy", devnull)
+        logger = setup_logger("bench.current")
+        if custom_logging._listener is not None:
+            custom_logging._listener.handlers[0].setStream(devnull)
+        else:
+            logger.handlers[0].setStream(devnull)
+
+        value = 12.3456
+        cases = {
+            "disabled context": (LoggerContext(False, legacy_logger), LoggerContext(False, logger), None),
+            "filtered by level": (LoggerContext(True, legacy_logger), LoggerContext(True, logger), logging.INFO),
+            "emitted": (LoggerContext(True, legacy_logger), LoggerContext(True, logger), logging.DEBUG),
+        }
+        rows = []
+        for name, (legacy_context, context, level) in cases.items():
+            if level is not None:
+                legacy_logger.setLevel(level)
+                logger.setLevel(level)
+            namespace = dict(legacy=legacy_log_debug_message, current=log_debug_message,
+                             legacy_context=legacy_context, context=context, value=value)
+            calls = args.calls if name != "emitted" else args.calls // 10
+            legacy_ns = ns_per_call("legacy(legacy_context, f'weight {value:.2f}g')", namespace, calls)
+            current_ns = ns_per_call("current(context, 'weight %.2fg', value)", namespace, calls)
+            rows.append((name, legacy_ns, current_ns))
+            flush_logs()
+
+    print(f"{args.calls} calls per case ({args.calls // 10} emitted), ns per call on the calling thread")
+    print(f"{'case':>18} {'legacy':>9} {'current':>9}")
+    for name, legacy_ns, current_ns in rows:
+        print(f"{name:>18} {legacy_ns:>9.0f} {current_ns:>9.0f}")
+    disabled_ns = rows[0][2]
+    verdict = "OK" if disabled_ns < DISABLED_TARGET_NS else "ABOVE TARGET"
+    print(f"disabled call: {disabled_ns:.0f} ns (target < {DISABLED_TARGET_NS} ns) {verdict}")
+
+
+if __name__ == "__main__":
+    main()
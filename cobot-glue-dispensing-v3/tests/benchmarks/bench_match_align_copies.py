@@ -0,0 +1,112 @@
+"""
+Benchmark: workpiece copies on the match -> align -> save path.
+
+Compares the old deepcopy-based flow (deepcopy in prepare_data_for_alignment, again in
+_alignContours and before serialising) with the structural-sharing flow
+(copy_with_shared_geometry + non-mutating serialize) on a synthetic 50-workpiece library.
+
+Run from the src directory:
+    PYTHONPATH=. python ../tests/benchmarks/bench_match_align_copies.py
+"""
+import copy
+import json
+import time
+import tracemalloc
+
+import numpy as np
+
+from applications.glue_dispensing_application.model.workpiece.GlueWorkpiece import GlueWorkpiece
+from modules.contour_matching.alignment.workpiece_update import update_workpiece_data
+from modules.contour_matching.CompareContours import get_contour_objects
+from modules.shared.core.ContourStandartized import Contour
+from modules.shared.tools.GlueCell import GlueType
+from modules.shared.tools.enums.Gripper import Gripper
+from modules.shared.tools.enums.Program import Program
+from modules.shared.tools.enums.ToolID import ToolID
+
+LIBRARY_SIZE = 50
+CONTOUR_POINTS = 1000
+SPRAY_CONTOURS = 4
+SPRAY_FILLS = 2
+FILL_POINTS = 2000
+CYCLES = 20
+
+
+def make_ring(n, radius, center=(640.0, 360.0)):
+    t = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    points = np.stack([center[0] + radius * np.cos(t), center[1] + radius * np.sin(t)], axis=1)
+    return points.astype(np.float32).reshape(-1, 1, 2)
+
+
+def make_workpiece(index):
+    settings = {"glue_speed": 10, "spray_width": 5, "fan_speed": 100}
+    spray_pattern = {
+        "Contour": [{"contour": make_ring(CONTOUR_POINTS, 150 - 10 * i), "settings": dict(settings)}
+                    for i in range(SPRAY_CONTOURS)],
+        "Fill": [{"contour": make_ring(FILL_POINTS, 80 - 10 * i), "settings": dict(settings)}
+                 for i in range(SPRAY_FILLS)],
+    }
+    return GlueWorkpiece(workpieceId=str(index), name=f"wp{index}", description="synthetic",
+                         toolID=ToolID.Tool0, gripperID=Gripper.BELT, glueType=GlueType.TypeA,
+                         program=Program.TRACE, material="wood",
+                         contour={"contour": make_ring(CONTOUR_POINTS, 160), "settings": dict(settings)},
+                         offset=0, height=4, nozzles=[1, 2], contourArea=0, glueQty=1, sprayWidth=5,
+                         pickupPoint="640.0,360.0", sprayPattern=spray_pattern)
+
+
+def align_cycle(library, shared):
+    """One cycle: prepare every match and write its aligned geometry into a variant (kept, like the tray results)."""
+    variants = []
+    for library_workpiece in library:
+        source = library_workpiece if shared else copy.deepcopy(library_workpiece)
+        contour_obj = Contour(source.get_main_contour())
+        spray_objs = get_contour_objects(source.get_spray_pattern_contours())
+        fill_objs = get_contour_objects(source.get_spray_pattern_fills())
+        for obj in [contour_obj] + spray_objs + fill_objs:
+            obj.rotate(5.0, (640, 360))
+            obj.translate(3.0, -2.0)
+
+        variant = library_workpiece.copy_with_shared_geometry() if shared else copy.deepcopy(library_workpiece)
+        update_workpiece_data(variant, contour_obj, spray_objs, fill_objs, None)
+        variants.append(variant)
+    return variants
+
+
+def save_all(library, shared):
+    """Serialise every workpiece the way GlueWorkpieceJsonRepository.save_workpiece does."""
+    for workpiece in library:
+        json.dumps(GlueWorkpiece.serialize(workpiece if shared else copy.deepcopy(workpiece)))
+
+
+def measure(function, library, shared, repeats):
+    function(library, shared)  # warm-up
+    started = time.perf_counter()
+    for _ in range(repeats):
+        function(library, shared)
+    elapsed = (time.perf_counter() - started) / repeats
+
+    tracemalloc.start()
+    function(library, shared)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    library = [make_workpiece(i) for i in range(LIBRARY_SIZE)]
+    before = [wp.get_main_contour().copy() for wp in library]
+
+    print(f"Library: {LIBRARY_SIZE} workpieces")
+    for name, function, repeats in (("align cycle", align_cycle, CYCLES), ("save all", save_all, 1)):
+        deep_time, deep_peak = measure(function, library, False, repeats)
+        shared_time, shared_peak = measure(function, library, True, repeats)
+        print(f"{name:12s} deepcopy: {deep_time * 1000:8.1f} ms, peak {deep_peak / 1e6:6.1f} MB | "
+              f"shared: {shared_time * 1000:8.1f} ms, peak {shared_peak / 1e6:6.1f} MB | "
+              f"{deep_time / shared_time:.2f}x")
+
+    untouched = all(np.array_equal(b, wp.get_main_contour()) for b, wp in zip(before, library))
+    print(f"library geometry untouched: {untouched}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Benchmark: point-count reduction and maximum deviation of path simplification.
+
+Runs RDP (simplify_path, as used by WorkpieceToSprayPathsGenerator) and MoveL/MoveC fitting
+(fit_primitives, as used by the MOVE_L trajectory backend) over the contour and spray
+pattern of every *_workpiece.json under the given directory. Workpiece geometry is stored
+in image pixels; it is scaled by --mm-per-pixel as a stand-in for the camera-to-robot
+transform. Without a directory a synthetic library (rounded contours and zigzag fills) is used.
+
+Run from the src directory:
+    PYTHONPATH=. python ../tests/benchmarks/bench_path_simplification.py [workpiece_dir] [--tolerance 0.2]
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from modules.utils.path_simplification import DEFAULT_PATH_TOLERANCE_MM, MotionType, fit_primitives, \
+    max_deviation, rdp_indices
+
+WORKPIECE_FILE_SUFFIX = "_workpiece.json"
+MM_PER_PIXEL = 0.5
+SYNTHETIC_WORKPIECES = 20
+
+
+def load_paths(directory, mm_per_pixel):
+    """(label, (N, 2) mm array) for the contour and every spray-pattern entry of each workpiece file."""
+    paths = []
+    for root, _, files in os.walk(directory):
+        for file in sorted(files):
+            if not file.endswith(WORKPIECE_FILE_SUFFIX):
+                continue
+            with open(os.path.join(root, file), "r") as f:
+                data = json.load(f)
+            name = data.get("name", file)
+            contour = data.get("contour")
+            if isinstance(contour, dict):
+                contour = contour.get("contour")
+            if contour:
+                paths.append((f"{name}/contour", _to_mm(contour, mm_per_pixel)))
+            spray_pattern = data.get("sprayPattern") or {}
+            for kind, entries in spray_pattern.items():
+                for i, entry in enumerate(entries):
+                    points = entry.get("contour") if isinstance(entry, dict) else entry
+                    if points:
+                        paths.append((f"{name}/{kind}[{i}]", _to_mm(points, mm_per_pixel)))
+    return paths
+
+
+def synthetic_paths(count=SYNTHETIC_WORKPIECES, spacing=0.5):
+    """Dense rounded-rectangle contours and zigzag fills, sampled every `spacing` mm."""
+    rng = np.random.default_rng(7)
+    paths = []
+    for i in range(count):
+        width, height = rng.uniform(100, 400), rng.uniform(80, 300)
+        radius = rng.uniform(5, min(width, height) / 3)
+        paths.append((f"synthetic_{i}/contour", _rounded_rectangle(width, height, radius, spacing)))
+        paths.append((f"synthetic_{i}/fill", _zigzag(width - 10, height - 10, 8.0, spacing)))
+    return paths
+
+
+def run(paths, tolerance):
+    rows = []
+    for label, points in paths:
+        if len(points) < 3:
+            continue
+        pose_path = np.column_stack([points, np.full(len(points), 50.0), np.tile([180.0, 0.0, 90.0], (len(points), 1))])
+        started = time.perf_counter()
+        kept = rdp_indices(pose_path, tolerance)
+        rdp_time = time.perf_counter() - started
+        started = time.perf_counter()
+        primitives = fit_primitives(pose_path[kept], tolerance)
+        fit_time = time.perf_counter() - started
+        rows.append({
+            "label": label,
+            "points": len(points),
+            "rdp_points": len(kept),
+            "rdp_deviation": max_deviation(pose_path, kept_indices=kept),
+            "commands": len(primitives) + 1,  # + approach to the first point
+            "arcs": sum(p.kind is MotionType.MOVE_C for p in primitives),
+            "fit_deviation": max_deviation(pose_path[kept], primitives=primitives),
+            "total_deviation": max_deviation(pose_path, kept_indices=kept, primitives=primitives),
+            "time_ms": (rdp_time + fit_time) * 1000,
+        })
+    return rows
+
+
+def report(rows, tolerance):
+    print(f"{'path':<32} {'points':>7} {'rdp':>6} {'dev mm':>7} {'cmds':>5} {'arcs':>5} {'dev mm':>7} {'total':>7} "
+          f"{'ms':>7}")
+    for row in rows:
+        print(f"{row['label'][:32]:<32} {row['points']:>7} {row['rdp_points']:>6} {row['rdp_deviation']:>7.3f} "
+              f"{row['commands']:>5} {row['arcs']:>5} {row['fit_deviation']:>7.3f} {row['total_deviation']:>7.3f} "
+              f"{row['time_ms']:>7.1f}")
+    total = sum(row["points"] for row in rows)
+    rdp_total = sum(row["rdp_points"] for row in rows)
+    commands = sum(row["commands"] for row in rows)
+    worst_rdp = max(row["rdp_deviation"] for row in rows)
+    worst_fit = max(row["fit_deviation"] for row in rows)
+    worst_total = max(row["total_deviation"] for row in rows)
+    print(f"\n{len(rows)} paths, tolerance {tolerance} mm")
+    print(f"points:   {total} -> {rdp_total} after RDP ({100 * (1 - rdp_total / total):.1f}% fewer), "
+          f"{commands} MoveL/MoveC commands ({100 * (1 - commands / total):.1f}% fewer)")
+    print(f"max deviation: RDP {worst_rdp:.3f} mm, MoveL/MoveC on the RDP path {worst_fit:.3f} mm, "
+          f"MoveL/MoveC from the original points {worst_total:.3f} mm")
+    assert worst_rdp <= tolerance + 1e-9, "RDP exceeded its tolerance"
+    assert worst_fit <= tolerance + 1e-9, "MoveL/MoveC fitting exceeded its tolerance"
+    # Fitting sees only the RDP points, so against the original samples the two errors can add up
+    assert worst_total <= 2 * tolerance + 1e-9, "RDP + MoveL/MoveC exceeded their combined tolerance"
+
+
+def _to_mm(points, mm_per_pixel):
+    return np.asarray(points, dtype=np.float64).reshape(-1, 2) * mm_per_pixel
+
+
+def _rounded_rectangle(width, height, radius, spacing):
+    corners = [(width - radius, height - radius), (radius, height - radius), (radius, radius), (width - radius, radius)]
+    points = []
+    for k, (cx, cy) in enumerate(corners):
+        start = k * np.pi / 2
+        angles = np.arange(start, start + np.pi / 2, spacing / radius)
+        points.extend(zip(cx + radius * np.cos(angles), cy + radius * np.sin(angles)))
+        end = start + np.pi / 2
+        a = np.array([cx + radius * np.cos(end), cy + radius * np.sin(end)])
+        nx, ny = corners[(k + 1) % 4]
+        b = np.array([nx + radius * np.cos(end), ny + radius * np.sin(end)])
+        steps = max(1, int(np.linalg.norm(b - a) / spacing))
+        points.extend(a + t * (b - a) for t in np.arange(steps) / steps)
+    points.append(points[0])
+    return np.array(points, dtype=np.float64)
+
+
+def _zigzag(width, height, pitch, spacing):
+    points = []
+    for row, y in enumerate(np.arange(0, height, pitch)):
+        xs = np.arange(0, width, spacing)
+        points.extend((x, y) for x in (xs if row % 2 == 0 else xs[::-1]))
+    return np.array(points, dtype=np.float64)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", nargs="?", help="workpiece storage directory (searched recursively)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_PATH_TOLERANCE_MM, help="max deviation in mm")
+    parser.add_argument("--mm-per-pixel", type=float, default=MM_PER_PIXEL)
+    args = parser.parse_args()
+
+    paths = load_paths(args.directory, args.mm_per_pixel) if args.directory else synthetic_paths()
+    if not paths:
+        raise SystemExit(f"No *{WORKPIECE_FILE_SUFFIX} files with geometry under {args.directory}")
+    report(run(paths, args.tolerance), args.tolerance)
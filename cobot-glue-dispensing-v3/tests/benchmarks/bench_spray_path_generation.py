@@ -0,0 +1,116 @@
+"""
+Benchmark: image -> robot spray path generation for a job, per point vs batched.
+
+per-point - what WorkpieceToSprayPathsGenerator did: one cv2.perspectiveTransform per point
+            (applyTransformation was handed an (N, 1, 2) array and looped over it), offsets
+            and [x, y, z, rx, ry, rz] lists built point by point. Its per-point prints are
+            left out, so this understates the old cost.
+batched   - WorkpieceToSprayPathsGenerator.generate_robot_paths: the whole job concatenated,
+            one homography, offsets and pose columns as array operations, paths as views.
+Both simplify every path with the same tolerance (--tolerance 0 keeps every point).
+
+Run from the src directory:
+    PYTHONPATH=. python ../tests/benchmarks/bench_spray_path_generation.py [--points 10000] [--paths 8]
+"""
+import argparse
+import contextlib
+import io
+import time
+import types
+
+import cv2
+import numpy as np
+
+from applications.glue_dispensing_application.handlers.workpieces_to_spray_paths_handler import \
+    WorkpieceToSprayPathsGenerator
+from modules.utils.path_simplification import DEFAULT_PATH_TOLERANCE_MM, simplify_path
+
+CAMERA_TO_ROBOT = np.array([[0.52, 0.013, -310.2], [-0.011, -0.51, 640.7], [1.1e-5, 2.3e-6, 1.0]])
+TRANSDUCER_OFFSETS = [-2.528, 78.335]
+Z_MIN = 100
+SETTINGS = {"Spraying Height": "5", "RZ Angle": "90"}
+REPEATS = 5
+
+
+class SyntheticWorkpiece:
+    """Spray paths only - a zigzag fill per path, split evenly over the point budget."""
+
+    def __init__(self, points, paths):
+        per_path = points // paths
+        self.height = 4
+        self.contour = {"contour": self._zigzag(per_path, 0), "settings": dict(SETTINGS)}
+        self.fills = [{"contour": self._zigzag(per_path, i).reshape(-1, 2), "settings": dict(SETTINGS)}
+                      for i in range(paths)]
+
+    @staticmethod
+    def _zigzag(n, shift):
+        t = np.linspace(0, 40, n)
+        x = 400.0 + 300.0 * np.abs((t % 2) - 1) + shift
+        y = 150.0 + 10.0 * t + np.sin(t * 7.0)  # not collinear, so simplification keeps work to do
+        return np.stack([x, y], axis=1).astype(np.float32).reshape(-1, 1, 2)
+
+    def get_spray_pattern_contours(self):
+        return []
+
+    def get_spray_pattern_fills(self):
+        return self.fills
+
+
+def make_application():
+    robot_config = types.SimpleNamespace(safety_limits=types.SimpleNamespace(z_min=Z_MIN))
+    return types.SimpleNamespace(visionService=types.SimpleNamespace(cameraToRobotMatrix=CAMERA_TO_ROBOT),
+                                 robotService=types.SimpleNamespace(robot_config=robot_config),
+                                 get_transducer_offsets=lambda: TRANSDUCER_OFFSETS)
+
+
+def per_point_paths(workpiece, tolerance):
+    paths = []
+    for entry in workpiece.get_spray_pattern_fills():
+        points = np.array(entry["contour"], dtype=float).reshape(-1, 2).tolist()
+        robot_points = []
+        for point in np.array(points, dtype=np.float32).reshape(-1, 1, 2):
+            transformed = cv2.perspectiveTransform(point.reshape(-1, 1, 2), CAMERA_TO_ROBOT)
+            transformed[0, 0, 0] = transformed[0, 0, 0] + TRANSDUCER_OFFSETS[0]
+            transformed[0, 0, 1] = transformed[0, 0, 1] + TRANSDUCER_OFFSETS[1]
+            x, y = np.round(transformed, decimals=6).tolist()[0][0]
+            robot_points.append([float(x), float(y)])
+        settings = entry["settings"]
+        z = Z_MIN + float(settings["Spraying Height"]) + int(workpiece.height)
+        path = [[p[0], p[1], z, 180.0, 0.0, float(settings["RZ Angle"])] for p in robot_points]
+        paths.append((simplify_path(path, tolerance), settings))
+    return paths
+
+
+def best_of(fn):
+    times = []
+    result = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=10000, help="points per job")
+    parser.add_argument("--paths", type=int, default=8, help="spray paths the points are split over")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_PATH_TOLERANCE_MM)
+    args = parser.parse_args()
+
+    workpiece = SyntheticWorkpiece(args.points, args.paths)
+    generator = WorkpieceToSprayPathsGenerator(make_application(), args.tolerance)
+    old_time, old_paths = best_of(lambda: per_point_paths(workpiece, args.tolerance))
+    new_time, new_paths = best_of(lambda: generator.generate_robot_paths([workpiece]))
+
+    kept = sum(len(path) for path, _ in new_paths)
+    print(f"{args.points} points in {args.paths} paths, tolerance {args.tolerance:g} mm -> {kept} points kept")
+    print(f"{'mode':<11}{'ms':>9}")
+    print(f"{'per-point':<11}{old_time * 1000:>9.1f}")
+    print(f"{'batched':<11}{new_time * 1000:>9.1f}   ({old_time / new_time:.0f}x)")
+    print(f"identical output: {old_paths == new_paths}")
+
+
+if __name__ == "__main__":
+    main()
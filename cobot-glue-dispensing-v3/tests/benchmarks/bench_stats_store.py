@@ -0,0 +1,135 @@
+"""
+Benchmark: statistics increments per second and fsyncs per minute, JSON file vs StatsStore.
+
+json-rewrite   - what Statistics did: json.dump of the whole statistics dict on every increment
+                 (no fsync - the file is not crash safe).
+json-fsync     - the same made crash safe: temp file, fsync, os.replace on every increment.
+stats-store    - StatsStore (SQLite WAL): in-memory increment, one batched commit per flush
+                 interval. With synchronous=FULL each commit syncs the WAL once, so commits are
+                 the fsync count (checkpoints on startup/close not included).
+
+The throughput run does --increments back to back. The fsync run replays a machine that
+increments --rate times per second for --seconds and reports the syncs extrapolated to a minute.
+
+Run from the src directory:
+    PYTHONPATH=. python ../tests/benchmarks/bench_stats_store.py [--increments 2000] [--rate 50]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from modules.statistics.backend.StatsStore import FLUSH_INTERVAL, StatsStore
+
+COUNTER_KEYS = ["generator_on_seconds", "fan_on_seconds"] + [f"pump_on_seconds/{i}" for i in range(1, 7)]
+
+
+class JsonStats:
+    """The whole-file JSON persistence; fsync=True adds temp file + fsync + rename."""
+
+    def __init__(self, path, fsync=False):
+        self.path = path
+        self.fsync = fsync
+        self.fsyncs = 0
+        self.stats = {key: 0.0 for key in COUNTER_KEYS}
+
+    def increment(self, key, amount):
+        self.stats[key] += amount
+        if not self.fsync:
+            with open(self.path, "w") as f:
+                json.dump(self.stats, f, indent=2)
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.stats, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        self.fsyncs += 1
+        os.replace(tmp_path, self.path)
+
+    def syncs(self):
+        return self.fsyncs
+
+    def close(self):
+        pass
+
+
+class StoreStats:
+    def __init__(self, path, flush_interval):
+        self.store = StatsStore(path, flush_interval=flush_interval)
+
+    def increment(self, key, amount):
+        self.store.increment(key, amount)
+
+    def syncs(self):
+        return self.store.commits
+
+    def close(self):
+        self.store.close()
+
+
+def make_backends(directory, flush_interval):
+    return {
+        "json-rewrite": lambda: JsonStats(os.path.join(directory, "rewrite.json")),
+        "json-fsync": lambda: JsonStats(os.path.join(directory, "fsync.json"), fsync=True),
+        "stats-store": lambda: StoreStats(os.path.join(directory, f"store-{time.time_ns()}.db"), flush_interval),
+    }
+
+
+def run_throughput(factory, increments):
+    backend = factory()
+    start = time.perf_counter()
+    for i in range(increments):
+        backend.increment(COUNTER_KEYS[i % len(COUNTER_KEYS)], 0.1)
+    elapsed = time.perf_counter() - start
+    backend.close()
+    return increments / elapsed
+
+
+def run_fsyncs(factory, rate, seconds):
+    """Syncs per minute while incrementing at rate/s; increments are spread over each second."""
+    backend = factory()
+    period = 1.0 / rate
+    start = time.monotonic()
+    next_at = start
+    i = 0
+    while next_at - start < seconds:
+        backend.increment(COUNTER_KEYS[i % len(COUNTER_KEYS)], period)
+        i += 1
+        next_at += period
+        time.sleep(max(0.0, next_at - time.monotonic()))
+    syncs = backend.syncs()
+    elapsed = time.monotonic() - start
+    backend.close()
+    return syncs * 60.0 / elapsed
+
+
+def report(rows):
+    print(f"{'backend':<14}{'increments/s':>16}{'fsyncs/min':>14}")
+    for name, throughput, fsyncs in rows:
+        fsyncs_text = "n/a (unsafe)" if fsyncs is None else f"{fsyncs:.0f}"
+        print(f"{name:<14}{throughput:>16.0f}{fsyncs_text:>14}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--increments", type=int, default=2000, help="increments in the throughput run")
+    parser.add_argument("--rate", type=float, default=50.0, help="increments per second in the fsync run")
+    parser.add_argument("--seconds", type=float, default=5.0, help="duration of the fsync run")
+    parser.add_argument("--flush-interval", type=float, default=FLUSH_INTERVAL)
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, factory in make_backends(directory, args.flush_interval).items():
+            throughput = run_throughput(factory, args.increments)
+            fsyncs = None if name == "json-rewrite" else run_fsyncs(factory, args.rate, args.seconds)
+            rows.append((name, throughput, fsyncs))
+    print(f"{args.increments} increments over {len(COUNTER_KEYS)} counters; "
+          f"fsync run: {args.rate:g} increments/s for {args.seconds:g}s, flush interval {args.flush_interval:g}s")
+    report(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark: file size and load time of a dense workpiece, inline JSON geometry vs .npy sidecar.
+
+Load = read the workpiece file(s) and GlueWorkpiece.deserialize; access = one call of
+get_spray_pattern_contours + get_spray_pattern_fills on the loaded workpiece.
+
+Run from the src directory:
+    PYTHONPATH=. python ../tests/benchmarks/bench_workpiece_geometry.py [--fill-points 20000] [--fills 10]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from applications.glue_dispensing_application.model.workpiece.GlueWorkpiece import GlueWorkpiece
+from applications.glue_dispensing_application.model.workpiece.workpiece_geometry import geometry_path_for, \
+    load_packed, save_geometry
+from modules.shared.tools.GlueCell import GlueType
+from modules.shared.tools.enums.Gripper import Gripper
+from modules.shared.tools.enums.Program import Program
+from modules.shared.tools.enums.ToolID import ToolID
+
+REPEATS = 5
+
+
+def make_zigzag(n, width=300.0, rows=50):
+    t = np.linspace(0, rows, n)
+    x = 490.0 + width * np.abs((t % 2) - 1)
+    y = 210.0 + 6.0 * t
+    return np.stack([x, y], axis=1).astype(np.float32).reshape(-1, 1, 2)
+
+
+def make_workpiece(fills, fill_points):
+    settings = {"glue_speed": 10, "spraying_height": 5}
+    ring = np.linspace(0, 2 * np.pi, 2000, endpoint=False)
+    contour = np.stack([640 + 160 * np.cos(ring), 360 + 160 * np.sin(ring)], axis=1).astype(np.float32)
+    return GlueWorkpiece(workpieceId="1", name="dense", description="synthetic",
+                         toolID=ToolID.Tool0, gripperID=Gripper.BELT, glueType=GlueType.TypeA,
+                         program=Program.TRACE, material="wood",
+                         contour={"contour": contour.reshape(-1, 1, 2), "settings": dict(settings)},
+                         offset=0, height=4, nozzles=[1], contourArea=0, glueQty=1, sprayWidth=5,
+                         pickupPoint=None,
+                         sprayPattern={"Contour": [{"contour": contour.reshape(-1, 1, 2), "settings": dict(settings)}],
+                                       "Fill": [{"contour": make_zigzag(fill_points), "settings": dict(settings)}
+                                                for _ in range(fills)]})
+
+
+def best_of(fn):
+    times = []
+    result = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def load_json(path):
+    with open(path, "r") as f:
+        return GlueWorkpiece.deserialize(json.load(f))
+
+
+def load_binary(path):
+    with open(path, "r") as f:
+        return GlueWorkpiece.deserialize(load_packed(path, json.load(f)))
+
+
+def access(workpiece):
+    workpiece.get_spray_pattern_contours()
+    workpiece.get_spray_pattern_fills()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fills", type=int, default=10)
+    parser.add_argument("--fill-points", type=int, default=20000)
+    args = parser.parse_args()
+
+    workpiece = make_workpiece(args.fills, args.fill_points)
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "json_workpiece.json")
+        with open(json_path, "w") as f:
+            f.write(json.dumps(GlueWorkpiece.serialize(workpiece), indent=4))
+
+        binary_path = os.path.join(directory, "binary_workpiece.json")
+        geometry_path = geometry_path_for(binary_path)
+        packed, blob = GlueWorkpiece.serialize_packed(workpiece, os.path.basename(geometry_path))
+        save_geometry(geometry_path, blob)
+        with open(binary_path, "w") as f:
+            f.write(json.dumps(packed, indent=4))
+
+        rows = []
+        for label, path, load, size in (
+                ("json", json_path, load_json, os.path.getsize(json_path)),
+                ("npy sidecar", binary_path, load_binary, os.path.getsize(binary_path) + os.path.getsize(geometry_path))):
+            load_time, loaded = best_of(lambda: load(path))
+            access_time, _ = best_of(lambda: access(loaded))
+            rows.append((label, size, load_time, access_time))
+
+    print(f"{len(blob)} points ({args.fills} fills x {args.fill_points} + contours)")
+    print(f"{'format':<13}{'size MB':>9}{'load ms':>10}{'access ms':>11}")
+    for label, size, load_time, access_time in rows:
+        print(f"{label:<13}{size / 1e6:>9.2f}{load_time * 1000:>10.1f}{access_time * 1000:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: workpiece repository startup time and memory as the library grows.
+
+full-load   - what the repository did: os.walk the storage tree, json.load and deserialise
+              every workpiece at startup.
+index-cold  - first start with the index: every file is read once to build the manifest.
+index-warm  - later starts: the manifest is read and the tree is only stat'ed.
+Lookup is get_workpiece_by_id of one workpiece right after startup (first access loads it).
+
+Run from the src directory:
+    PYTHONPATH=. python ../tests/benchmarks/bench_workpiece_repository.py [--sizes 100 500 2000]
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from applications.glue_dispensing_application.model.workpiece.GlueWorkpiece import GlueWorkpiece
+from applications.glue_dispensing_application.repositories.workpiece.glue_workpiece_json_repository import \
+    GlueWorkpieceJsonRepository
+from applications.glue_dispensing_application.repositories.workpiece.workpiece_index import MANIFEST_FILE
+from modules.contour_matching.matching.descriptor_cache import get_descriptor_cache
+from modules.shared.tools.GlueCell import GlueType
+from modules.shared.tools.enums.Gripper import Gripper
+from modules.shared.tools.enums.Program import Program
+from modules.shared.tools.enums.ToolID import ToolID
+
+CONTOUR_POINTS = 500
+FILL_POINTS = 1000
+
+
+def make_ring(n, radius, center=(640.0, 360.0)):
+    t = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    points = np.stack([center[0] + radius * np.cos(t), center[1] + radius * np.sin(t)], axis=1)
+    return points.astype(np.float32).reshape(-1, 1, 2)
+
+
+def make_serialized_workpiece(index):
+    settings = {"glue_speed": 10, "spray_width": 5}
+    workpiece = GlueWorkpiece(workpieceId=str(index), name=f"wp{index}", description="synthetic",
+                              toolID=ToolID.Tool0, gripperID=Gripper.BELT, glueType=GlueType.TypeA,
+                              program=Program.TRACE, material="wood",
+                              contour={"contour": make_ring(CONTOUR_POINTS, 160), "settings": settings},
+                              offset=0, height=4, nozzles=[1], contourArea=0, glueQty=1, sprayWidth=5,
+                              pickupPoint=None,
+                              sprayPattern={"Contour": [{"contour": make_ring(CONTOUR_POINTS, 150), "settings": settings}],
+                                            "Fill": [{"contour": make_ring(FILL_POINTS, 80), "settings": settings}]})
+    return json.dumps(GlueWorkpiece.serialize(workpiece))
+
+
+def build_library(directory, size):
+    content = make_serialized_workpiece(0)
+    for i in range(size):
+        folder = os.path.join(directory, "2025-01-01", f"2025-01-01_00-00-00-{i:06d}")
+        os.makedirs(folder)
+        with open(os.path.join(folder, f"2025-01-01_00-00-00-{i:06d}_workpiece.json"), "w") as f:
+            f.write(content.replace('"workpieceId": "0"', f'"workpieceId": "{i}"', 1))
+
+
+def full_load(directory):
+    objects = []
+    for root, _, files in os.walk(directory):
+        for file in files:
+            if file.endswith(GlueWorkpieceJsonRepository.WORKPIECE_FILE_SUFFIX):
+                with open(os.path.join(root, file), "r") as f:
+                    objects.append(GlueWorkpiece.deserialize(json.load(f)))
+    return objects
+
+
+def measure(start_up, lookup):
+    get_descriptor_cache().clear()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = start_up()
+    startup = time.perf_counter() - start
+    start = time.perf_counter()
+    lookup(result)
+    lookup_time = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return startup, lookup_time, peak
+
+
+def run(size):
+    directory = tempfile.mkdtemp(prefix="workpieces-")
+    try:
+        build_library(directory, size)
+        target = str(size // 2)
+        rows = [("full-load",) + measure(
+            lambda: full_load(directory),
+            lambda objects: next(wp for wp in objects if str(wp.workpieceId) == target))]
+        for label in ("index-cold", "index-warm"):
+            rows.append((label,) + measure(
+                lambda: GlueWorkpieceJsonRepository(directory, [], GlueWorkpiece),
+                lambda repository: repository.get_workpiece_by_id(target)))
+        manifest_kb = os.path.getsize(os.path.join(directory, MANIFEST_FILE)) / 1024
+        return rows, manifest_kb
+    finally:
+        shutil.rmtree(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 2000])
+    args = parser.parse_args()
+
+    print(f"{'workpieces':>10}  {'mode':<11}{'startup ms':>12}{'lookup ms':>11}{'peak MB':>10}")
+    for size in args.sizes:
+        rows, manifest_kb = run(size)
+        for label, startup, lookup, peak in rows:
+            print(f"{size:>10}  {label:<11}{startup * 1000:>12.1f}{lookup * 1000:>11.2f}{peak / 1e6:>10.1f}")
+        print(f"{'':>10}  manifest {manifest_kb:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+align_contours_generic on its bounded thread pool: every target ends up aligned to its own
+reference exactly as the sequential path would, and a failing alignment neither cancels nor
+undoes the others.
+
+Run from src:  PYTHONPATH=. python -m pytest -q ../tests/contour_matching
+"""
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from modules.contour_matching.alignment import contour_aligner
+from modules.contour_matching.alignment.contour_aligner import align_contours_generic
+from modules.shared.core.ContourStandartized import Contour
+
+PARTS = 10
+
+
+def part_outline(index):
+    """A differently sized asymmetric outline per index, placed on a tray grid."""
+    scale = 1.0 + 0.15 * index
+    outline = np.array([[-40, -12], [20, -12], [20, -30], [50, 0], [20, 30], [20, 12], [-40, 12]],
+                       dtype=np.float32) * scale
+    return outline + np.array([150.0 + 120 * (index % 5), 150.0 + 250 * (index // 5)], dtype=np.float32)
+
+
+def make_batch():
+    """Targets offset and rotated from their references, each with one spray contour."""
+    targets, references, sprays, rotations, translations = [], [], [], [], []
+    for i in range(PARTS):
+        reference = part_outline(i)
+        angle = 7.0 * (i - PARTS / 2)
+        target = Contour(reference.copy())
+        target.rotate(-angle - 3.0, target.getCentroid())  # 3° left for the mask refinement
+        target.translate(-5.0 - i, 4.0)
+        spray = Contour(target.get().reshape(-1, 2) * 0.9 + np.asarray(target.getCentroid()) * 0.1)
+        targets.append(target)
+        references.append(reference)
+        sprays.append([spray])
+        rotations.append(angle)
+        translations.append((5.0 + i, -4.0))
+    return targets, references, sprays, rotations, translations
+
+
+def run_alignment(max_workers):
+    targets, references, sprays, rotations, translations = make_batch()
+    align_contours_generic(targets, references, spray_contours_list=sprays, rotation_diffs=rotations,
+                           translation_diffs=translations, refine=True, max_workers=max_workers)
+    return targets, references, sprays
+
+
+def test_pool_results_match_sequential_and_keep_input_order():
+    sequential, references, sequential_sprays = run_alignment(max_workers=1)
+    threaded, _, threaded_sprays = run_alignment(max_workers=4)
+
+    for i in range(PARTS):
+        assert np.array_equal(threaded[i].get(), sequential[i].get())
+        assert np.array_equal(threaded_sprays[i][0].get(), sequential_sprays[i][0].get())
+        # Target i was aligned onto reference i, not onto a neighbour's
+        centroid = np.asarray(threaded[i].getCentroid())
+        distances = [np.linalg.norm(centroid - np.asarray(Contour(r).getCentroid())) for r in references]
+        assert int(np.argmin(distances)) == i and distances[i] < 2.0
+
+
+def test_failing_job_does_not_lose_the_others(monkeypatch):
+    original = contour_aligner.align_single_contour
+    failing = {1, 6}
+    started = []
+    lock = threading.Lock()
+
+    def flaky_align(target, reference, **kwargs):
+        index = next(i for i, r in enumerate(references) if r is reference)
+        with lock:
+            started.append(index)
+        if index in failing:
+            raise RuntimeError(f"alignment {index} failed")
+        time.sleep(0.01)  # keep jobs queued behind the failure
+        original(target, reference, **kwargs)
+
+    monkeypatch.setattr(contour_aligner, "align_single_contour", flaky_align)
+    targets, references, sprays, rotations, translations = make_batch()
+    before = [target.get().copy() for target in targets]
+
+    with pytest.raises(RuntimeError, match="alignment 1 failed"):
+        align_contours_generic(targets, references, spray_contours_list=sprays, rotation_diffs=rotations,
+                               translation_diffs=translations, refine=True, max_workers=2)
+
+    assert sorted(started) == list(range(PARTS))
+    for i in range(PARTS):
+        moved = not np.array_equal(targets[i].get(), before[i])
+        assert moved == (i not in failing)
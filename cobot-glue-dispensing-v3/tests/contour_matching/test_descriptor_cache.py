@@ -0,0 +1,72 @@
+"""
+WorkpieceDescriptorCache: lookups validate against the workpiece's contour object and only
+rehash (and re-describe) when that object was replaced.
+
+Run from src:  PYTHONPATH=. python -m pytest -q ../tests/contour_matching
+"""
+import numpy as np
+import pytest
+
+from modules.contour_matching.matching import descriptor_cache as descriptor_cache_module
+from modules.contour_matching.matching.descriptor_cache import WorkpieceDescriptorCache
+
+
+class FakeWorkpiece:
+    def __init__(self, workpiece_id, points):
+        self.workpieceId = workpiece_id
+        self.contour = {"contour": points, "settings": {}}
+
+    def get_main_contour(self):
+        return np.asarray(self.contour["contour"], dtype=np.float32).reshape(-1, 1, 2)
+
+
+def square(size):
+    return np.array([[0, 0], [size, 0], [size, size], [0, size]], dtype=np.float32).reshape(-1, 1, 2)
+
+
+@pytest.fixture
+def hash_calls(monkeypatch):
+    calls = []
+    original = descriptor_cache_module.contour_hash
+    monkeypatch.setattr(descriptor_cache_module, "contour_hash", lambda points: calls.append(1) or original(points))
+    return calls
+
+
+def test_lookup_of_an_unchanged_workpiece_does_not_rehash(hash_calls):
+    cache = WorkpieceDescriptorCache()
+    workpiece = FakeWorkpiece("1", square(10))
+    entry = cache.put(workpiece, precompute=False)
+    hash_calls.clear()
+
+    for _ in range(5):
+        assert cache.get(workpiece) is entry
+    assert hash_calls == [] and cache.hits == 5
+
+
+def test_replaced_contour_object_is_rehashed_and_only_redescribed_if_changed(hash_calls):
+    cache = WorkpieceDescriptorCache()
+    workpiece = FakeWorkpiece("1", square(10))
+    entry = cache.put(workpiece, precompute=False)
+    version = cache.version
+    hash_calls.clear()
+
+    # Reloaded from disk: same points in a new array
+    workpiece.contour = {"contour": square(10).copy(), "settings": {}}
+    assert cache.get(workpiece) is entry and len(hash_calls) == 1
+    assert cache.get(workpiece) is entry and len(hash_calls) == 1
+    assert cache.version == version
+
+    workpiece.contour = {"contour": square(20), "settings": {}}
+    changed = cache.get(workpiece)
+    assert changed is not entry and changed.area == pytest.approx(400)
+    assert cache.misses == 1 and cache.version == version + 1
+
+
+def test_version_tracks_put_and_remove():
+    cache = WorkpieceDescriptorCache()
+    cache.put(FakeWorkpiece("1", square(10)), precompute=False)
+    version = cache.version
+    cache.remove("missing")
+    assert cache.version == version
+    cache.remove("1")
+    assert cache.version == version + 1 and len(cache) == 0
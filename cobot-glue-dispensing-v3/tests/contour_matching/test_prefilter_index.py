@@ -0,0 +1,67 @@
+"""
+get_prefilter_index: an unchanged library reuses the index without touching the descriptor
+cache; repository-style put/remove calls trigger a rebuild.
+
+Run from src:  PYTHONPATH=. python -m pytest -q ../tests/contour_matching
+"""
+import numpy as np
+import pytest
+
+from modules.contour_matching.matching import prefilter_index as prefilter_index_module
+from modules.contour_matching.matching.descriptor_cache import get_descriptor_cache
+from modules.contour_matching.matching.prefilter_index import get_prefilter_index
+from modules.shared.core.ContourStandartized import Contour
+
+
+class FakeWorkpiece:
+    def __init__(self, workpiece_id, size):
+        self.workpieceId = workpiece_id
+        self.contour = {"contour": rectangle(size, size / 2), "settings": {}}
+
+    def get_main_contour(self):
+        return self.contour["contour"]
+
+
+def rectangle(width, height):
+    return np.array([[0, 0], [width, 0], [width, height], [0, height]], dtype=np.float32).reshape(-1, 1, 2)
+
+
+@pytest.fixture
+def library(monkeypatch):
+    cache = get_descriptor_cache()
+    cache.clear()
+    monkeypatch.setattr(prefilter_index_module, "_index", None)
+    workpieces = [FakeWorkpiece(str(i), 10 * (i + 1)) for i in range(5)]
+    for workpiece in workpieces:
+        cache.put(workpiece, precompute=False)
+    yield workpieces
+    cache.clear()
+
+
+def test_unchanged_library_reuses_the_index_without_cache_lookups(library, monkeypatch):
+    index = get_prefilter_index(list(library))
+    lookups = []
+    cache = get_descriptor_cache()
+    original_get = cache.get
+    monkeypatch.setattr(cache, "get", lambda wp: lookups.append(wp) or original_get(wp))
+
+    for _ in range(3):
+        assert get_prefilter_index(list(library)) is index
+    assert lookups == []
+    assert index.query(Contour(rectangle(30, 15)), top_k=1) == [2]
+
+
+def test_save_and_delete_rebuild_the_index(library):
+    index = get_prefilter_index(library)
+
+    # Repository save: new contour, cache.put
+    library[0].contour = {"contour": rectangle(200, 100), "settings": {}}
+    get_descriptor_cache().put(library[0], precompute=False)
+    rebuilt = get_prefilter_index(library)
+    assert rebuilt is not index
+    assert rebuilt.query(Contour(rectangle(200, 100)), top_k=1) == [0]
+
+    # Repository delete: cache.remove and the workpiece leaves the list
+    get_descriptor_cache().remove(library[0].workpieceId)
+    smaller = get_prefilter_index(library[1:])
+    assert len(smaller) == 4 and smaller is not rebuilt
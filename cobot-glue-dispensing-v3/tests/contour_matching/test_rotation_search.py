@@ -0,0 +1,75 @@
+"""
+RotationSearchEngine: the ROI-sized, coarse-to-fine search finds the same best angle as an
+exhaustive search with calculate_mask_overlap on the full 800x800 canvas, and reports the
+overlap that function returns for that angle.
+
+Run from src:  PYTHONPATH=. python -m pytest -q ../tests/contour_matching
+"""
+import numpy as np
+import pytest
+
+from modules.contour_matching.alignment.rotation_search import RotationSearchEngine, rotate_points
+from modules.shared.core.ContourStandartized import Contour
+from modules.utils.contours import calculate_mask_overlap
+
+
+def arrow_contour(center=(400.0, 400.0), scale=3.0):
+    """Asymmetric closed outline - exactly one rotation maps it onto itself."""
+    outline = np.array([[-40, -12], [20, -12], [20, -30], [50, 0], [20, 30], [20, 12], [-40, 12], [-40, 25],
+                        [-55, 0], [-40, -25]], dtype=np.float32)
+    return outline * scale + np.asarray(center, dtype=np.float32)
+
+
+def rotated(points, angle):
+    return rotate_points(points, [angle], Contour(points).getCentroid())[0]
+
+
+def full_image_search(workpiece, target):
+    """Exhaustive search on the 800x800 canvas: 1° over the full turn, then 0.1° around the best."""
+    pivot = Contour(workpiece).getCentroid()
+
+    def best_of(angles):
+        scores = [calculate_mask_overlap(rotate_points(workpiece, [angle], pivot)[0], target) for angle in angles]
+        index = int(np.argmax(scores))
+        return float(angles[index]), scores[index]
+
+    coarse, _ = best_of(np.arange(-180.0, 180.0, 1.0))
+    return best_of(coarse + np.arange(-1.0, 1.05, 0.1))
+
+
+def angle_difference(a, b):
+    return abs((a - b + 180) % 360 - 180)
+
+
+@pytest.mark.parametrize("true_angle", [37.3, -121.6, 178.2])
+def test_same_best_angle_as_full_image_search(true_angle):
+    workpiece = arrow_contour()
+    target = rotated(workpiece, true_angle)
+
+    fast_angle, fast_overlap = RotationSearchEngine(workpiece, target).search()
+    full_angle, full_overlap = full_image_search(workpiece, target)
+
+    assert angle_difference(fast_angle, full_angle) <= 0.2
+    assert angle_difference(fast_angle, true_angle) <= 0.2
+    assert fast_overlap == pytest.approx(full_overlap, abs=0.01)
+    assert fast_overlap > 0.97
+
+
+def test_reported_overlap_matches_calculate_mask_overlap():
+    workpiece = arrow_contour()
+    target = rotated(workpiece, 63.0)
+    engine = RotationSearchEngine(workpiece, target)
+    pivot = Contour(workpiece).getCentroid()
+
+    for angle in (0.0, 30.0, 63.0, -90.0):
+        expected = calculate_mask_overlap(rotate_points(workpiece, [angle], pivot)[0], target)
+        assert engine.overlap(angle) == pytest.approx(expected)
+
+
+def test_rotation_stays_zero_when_already_aligned():
+    workpiece = arrow_contour()
+
+    angle, overlap = RotationSearchEngine(workpiece, workpiece.copy()).search()
+
+    assert angle == 0.0
+    assert overlap == pytest.approx(1.0)
@@ -0,0 +1,123 @@
+"""
+custom_logging: background writer, lazy formatting, call-site attribution, rate limiting
+and the decorator switch.
+
+Run from src:  PYTHONPATH=. python -m pytest -q ../tests/custom_logging
+"""
+import logging
+import threading
+
+import pytest
+
+from modules.utils import custom_logging
+from modules.utils.custom_logging import LoggerContext, LoggingLevel, flush_logs, log_calls_with_timestamp_decorator, \
+    log_debug_message, log_every_n, log_if_enabled, log_info_message, log_throttled, setup_logger
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+        self.threads = []
+
+    def emit(self, record):
+        self.records.append(record)
+        self.threads.append(threading.get_ident())
+
+
+class Unformattable:
+    """Fails the test if it is ever turned into a string."""
+
+    def __str__(self):
+        raise AssertionError("formatted although the record was filtered out")
+
+
+@pytest.fixture
+def recorded():
+    logger = logging.getLogger("test_custom_logging")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    handler = RecordingHandler()
+    logger.addHandler(handler)
+    yield logger, handler
+    logger.removeHandler(handler)
+
+
+def test_records_name_the_calling_function_and_line(recorded):
+    logger, handler = recorded
+    context = LoggerContext(True, logger)
+
+    def caller():
+        log_info_message(context, "value %d", 42)
+        log_if_enabled(enabled=True, logger=logger, level=LoggingLevel.WARNING, message="plain")
+
+    caller()
+    first, second = handler.records
+    assert first.funcName == "caller" and first.pathname == __file__
+    assert second.lineno == first.lineno + 1
+    assert first.getMessage() == "value 42" and second.levelno == logging.WARNING
+    # The logger is never patched, so concurrent callers cannot see each other's call site
+    assert "findCaller" not in vars(logger)
+
+
+def test_disabled_and_filtered_calls_never_format(recorded):
+    logger, handler = recorded
+    log_debug_message(LoggerContext(False, logger), "%s", Unformattable())
+    logger.setLevel(logging.INFO)
+    log_debug_message(LoggerContext(True, logger), "%s", Unformattable())
+    log_if_enabled(True, None, LoggingLevel.ERROR, "no logger")
+    assert handler.records == []
+
+
+def test_log_every_n_and_log_throttled_limit_per_call_site(recorded, monkeypatch):
+    logger, handler = recorded
+    context = LoggerContext(True, logger)
+    for i in range(10):
+        log_every_n(context, 4, "frame %d", i)
+    assert [record.getMessage() for record in handler.records] == ["frame 0", "frame 4", "frame 8"]
+
+    handler.records.clear()
+    now = [100.0]
+    monkeypatch.setattr(custom_logging.time, "monotonic", lambda: now[0])
+    for _ in range(5):
+        log_throttled(context, 1.0, "sample %s", "x", level=LoggingLevel.INFO)
+        now[0] += 0.3
+    assert [record.getMessage() for record in handler.records] == [
+        "sample x", "sample x (3 similar messages suppressed)"]
+
+
+def test_setup_logger_writes_on_the_background_thread(capsys):
+    if not custom_logging.ASYNC_LOGGING:
+        pytest.skip("COBOT_LOG_SYNC is set")
+    logger = setup_logger("test_custom_logging.async")
+    handler = RecordingHandler()
+    custom_logging._listener.handlers += (handler,)
+    try:
+        items = [1, 2]
+        log_info_message(LoggerContext(True, logger), "items %s", items)
+        flush_logs()
+    finally:
+        custom_logging._listener.handlers = custom_logging._listener.handlers[:-1]
+    assert handler.records[0].getMessage() == "items [1, 2]"
+    assert handler.threads == [custom_logging._listener._thread.ident]
+    assert isinstance(logger.handlers[0], logging.handlers.QueueHandler)
+
+
+def test_decorator_caches_signature_and_compiles_to_noop(recorded, monkeypatch):
+    logger, handler = recorded
+
+    def add(a, b=2):
+        return a + b
+
+    signature_calls = []
+    original_signature = custom_logging.inspect.signature
+    monkeypatch.setattr(custom_logging.inspect, "signature",
+                        lambda func: signature_calls.append(func) or original_signature(func))
+    wrapped = log_calls_with_timestamp_decorator(logger)(add)
+    assert wrapped(1) == 3 and wrapped(1, b=5) == 6
+    assert len(signature_calls) == 1
+    assert "CALL" in handler.records[0].getMessage() and "a=1, b=2" in handler.records[0].getMessage()
+
+    assert log_calls_with_timestamp_decorator(logger, enabled=False)(add) is add
+    monkeypatch.setattr(custom_logging, "DECORATORS_ENABLED", False)
+    assert log_calls_with_timestamp_decorator(logger)(add) is add
@@ -0,0 +1,110 @@
+import ctypes
+import random
+
+import pytest
+
+from libs.fairino.linux.fairino.Robot import RobotStatePkg, RobotStateStreamParser
+
+FRAME_SIZE = ctypes.sizeof(RobotStatePkg)
+DATA_LEN = FRAME_SIZE - RobotStateStreamParser.PREFIX_SIZE - RobotStateStreamParser.CHECKSUM_SIZE
+
+
+def make_frame(frame_cnt, x, corrupt_checksum=False):
+    """Encode one controller frame the way the controller sends it on port 20004."""
+    pkg = RobotStatePkg()
+    pkg.frame_head = 0x5A5A
+    pkg.frame_cnt = frame_cnt if frame_cnt < 128 else frame_cnt - 256
+    pkg.data_len = DATA_LEN
+    pkg.robot_state = 2
+    pkg.tool = 1
+    pkg.tl_cur_pos[:] = [x, 200.0, 300.0, 180.0, 0.0, 90.0]
+    pkg.jt_cur_pos[:] = [0x5A5A, 0x5A, 0.0, 0.0, 0.0, 0.0]  # head-like bytes inside the data
+    raw = bytearray(bytes(pkg))
+    checksum = sum(raw[:FRAME_SIZE - 2]) & 0xFFFF
+    if corrupt_checksum:
+        checksum ^= 0x0101
+    raw[-2:] = checksum.to_bytes(2, "little")
+    return bytes(raw)
+
+
+class ReplaySocket:
+    """Serves a recorded byte stream through recv_into in irregular chunk sizes."""
+
+    def __init__(self, data, seed=0, max_chunk=700):
+        self.data = memoryview(data)
+        self.random = random.Random(seed)
+        self.max_chunk = max_chunk
+
+    def recv_into(self, buffer):
+        count = min(len(buffer), len(self.data), self.random.randint(1, self.max_chunk))
+        buffer[:count] = self.data[:count]
+        self.data = self.data[count:]
+        return count
+
+
+def replay(parser, capture, **kwargs):
+    sock = ReplaySocket(capture, **kwargs)
+    states = []
+    while parser.recv_from(sock) > 0:
+        if parser.latest is not None and (not states or states[-1] is not parser.latest):
+            states.append(parser.latest)
+    return states
+
+
+@pytest.fixture
+def capture(tmp_path):
+    """A stream with noise, a corrupt frame, a bogus head and a lost frame, stored as a capture file."""
+    stream = bytearray(b"\x00\x13\x5a")  # connection picked up mid-frame
+    for cnt in range(10):
+        stream += make_frame(cnt, 100.0 + cnt)
+    stream += b"\x5a\x5a\x00\xff\xff"  # head with an impossible length
+    stream += make_frame(10, 999.0, corrupt_checksum=True)
+    stream += make_frame(12, 112.0)  # frame 11 never arrived
+    for cnt in range(13, 300):
+        stream += make_frame(cnt & 0xFF, 100.0 + cnt)
+    path = tmp_path / "state_stream.bin"
+    path.write_bytes(bytes(stream))
+    return path
+
+
+def test_replay_recovers_all_valid_frames(capture):
+    parser = RobotStateStreamParser()
+    states = replay(parser, capture.read_bytes())
+
+    assert parser.frames == 298
+    assert parser.checksum_errors == 1
+    assert parser.length_errors == 2  # the stray 0x5A before the first head, and the bogus head
+    assert parser.missed_frames == 2  # frame 10 (corrupt) and 11 (lost)
+    assert parser.latest.tl_cur_pos[0] == pytest.approx(399.0)
+    assert parser.latest.tool == 1 and parser.latest.robot_state == 2
+    assert all(state.tl_cur_pos[0] != 999.0 for state in states)
+
+
+@pytest.mark.parametrize("seed,max_chunk", [(1, 1), (2, 7), (3, FRAME_SIZE), (4, 5000)])
+def test_chunking_does_not_change_result(capture, seed, max_chunk):
+    data = capture.read_bytes()
+    parser = RobotStateStreamParser()
+    replay(parser, data, seed=seed, max_chunk=max_chunk)
+
+    assert parser.counters["frames"] == 298
+    assert parser.counters["checksum_errors"] == 1
+    assert parser.latest.tl_cur_pos[0] == pytest.approx(399.0)
+
+
+def test_published_state_is_a_stable_copy():
+    parser = RobotStateStreamParser()
+    parser.feed(make_frame(0, 1.0))
+    first = parser.latest
+    parser.feed(make_frame(1, 2.0) * 50)
+
+    assert first.tl_cur_pos[0] == pytest.approx(1.0)
+    assert parser.latest.tl_cur_pos[0] == pytest.approx(2.0)
+
+
+def test_garbage_only_stream_is_skipped():
+    parser = RobotStateStreamParser(buffer_size=2 * FRAME_SIZE)
+    parser.feed(bytes(range(256)) * 20)
+
+    assert parser.frames == 0 and parser.latest is None
+    assert parser.skipped_bytes > 0
+    assert parser.feed(make_frame(0, 5.0)) == 1
@@ -0,0 +1,130 @@
+"""
+GlueDataFetcher against the Flask mock glue server.
+
+The mock server runs in-process on a free port; each test points the cell config at it and
+injects per-meter latency through mock_glue_server.response_delays to play a slow scale.
+
+Run from src:  PYTHONPATH=. python -m pytest -q ../tests/glue_cells
+"""
+import json
+import threading
+import time
+
+import pytest
+from werkzeug.serving import make_server
+
+from communication_layer.api.v1.topics import GlueTopics
+from modules import mock_glue_server
+from modules.shared.MessageBroker import MessageBroker
+from modules.shared.tools import GlueCell
+from modules.shared.tools.GlueCell import GlueDataFetcher
+
+CELL_IDS = (1, 2, 3)
+
+
+@pytest.fixture
+def server_url(monkeypatch):
+    monkeypatch.setattr(mock_glue_server, "weights", {1: 5000.0, 2: 7500.0, 3: 3000.0})
+    monkeypatch.setattr(mock_glue_server, "response_delays", {1: 0.0, 2: 0.0, 3: 0.0})
+    server = make_server("127.0.0.1", 0, mock_glue_server.app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    thread.join()
+
+
+@pytest.fixture
+def make_fetcher(server_url, tmp_path, monkeypatch):
+    monkeypatch.setattr(GlueDataFetcher, "_instance", None)
+    monkeypatch.setattr(MessageBroker, "_instance", None)
+    fetchers = []
+
+    def make(interval_ms=20, timeouts=None):
+        timeouts = timeouts or {}
+        config = {
+            "MODE": "production",
+            "FETCH_TIMEOUT": 2,
+            "DATA_FETCH_INTERVAL_MS": interval_ms,
+            "CELL_CONFIG": [{"id": cell_id, "url": f"{server_url}/weight{cell_id}", "type": "TypeA",
+                             "capacity": 10000, "fetch_timeout": timeouts.get(cell_id, 2)}
+                            for cell_id in CELL_IDS],
+        }
+        path = tmp_path / "glue_cell_config.json"
+        path.write_text(json.dumps(config))
+        monkeypatch.setattr(GlueCell, "config_path", path)
+        fetcher = GlueDataFetcher()
+        fetchers.append(fetcher)
+        return fetcher
+
+    yield make
+    for fetcher in fetchers:
+        fetcher.stop()
+        fetcher.session.close()
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def test_polls_every_cell_over_kept_alive_connections(make_fetcher, server_url):
+    fetcher = make_fetcher()
+    fetcher.start()
+    wait_until(lambda: all(stats["samples"] >= 10 for stats in fetcher.get_latency_stats().values()))
+    fetcher.stop()
+
+    assert (fetcher.weight1, fetcher.weight2, fetcher.weight3) == (5000.0, 7500.0, 3000.0)
+    assert [fetcher.get_reading(cell_id).weight for cell_id in CELL_IDS] == [5000.0, 7500.0, 3000.0]
+    # 30+ requests, at most one connection per cell
+    pool = fetcher.session.get_adapter(server_url).poolmanager.connection_from_url(server_url)
+    assert pool.num_connections <= len(CELL_IDS)
+
+
+def test_slow_scale_does_not_hold_up_the_other_cells(make_fetcher):
+    mock_glue_server.response_delays[2] = 0.3
+    fetcher = make_fetcher()
+    fetcher.start()
+    time.sleep(0.75)
+    fetcher.stop()
+
+    stats = fetcher.get_latency_stats()
+    assert stats[1]["samples"] >= 10 and stats[3]["samples"] >= 10
+    assert 1 <= stats[2]["samples"] <= 3  # one request in flight at a time, no pile-up
+    assert stats[2]["p50_ms"] >= 300
+    assert stats[1]["p95_ms"] < 300
+
+
+def test_timeout_keeps_previous_weight(make_fetcher):
+    fetcher = make_fetcher(timeouts={3: 0.1})
+    fetcher.fetch()
+    first = fetcher.get_reading(3)
+
+    mock_glue_server.response_delays[3] = 0.3
+    mock_glue_server.weights[3] = 2500.0
+    fetcher.fetch()
+
+    assert fetcher.weight3 == 3000.0
+    assert fetcher.get_reading(3) is first
+    assert fetcher.get_latency_stats()[3]["errors"] == 1
+
+
+def test_only_changed_weights_are_published(make_fetcher):
+    published = []
+
+    def on_weight(weight):
+        published.append(weight)
+
+    fetcher = make_fetcher()
+    MessageBroker().subscribe(GlueTopics.GLUE_METER_1_VALUE, on_weight)
+    for _ in range(3):
+        fetcher.fetch()
+    first = fetcher.get_reading(1)
+    mock_glue_server.weights[1] = 4950.0
+    fetcher.fetch()
+
+    assert published == [5000.0, 4950.0]
+    assert fetcher.get_reading(1).timestamp > first.timestamp
+    assert fetcher.get_reading(1).latency > 0
@@ -0,0 +1,191 @@
+"""
+Event-driven pump speed adjustment against a simulated robot monitor.
+
+The fake robot service publishes one pose every SAMPLE_PERIOD along a straight path, the
+way the state-stream monitor does, and counts how often the controller woke up and how
+often it wrote the pump speed.
+
+Run from src:  PYTHONPATH=. python -m pytest -q ../tests/glue_process
+"""
+import threading
+import time
+
+import pytest
+
+from applications.glue_dispensing_application.glue_process import dynamicPumpSpeedAdjustment as pump
+from applications.glue_dispensing_application.glue_process.pump_trace import PumpTraceBuffer
+from applications.glue_dispensing_application.glue_process.state_machine.GlueProcessState import GlueProcessState
+from modules.utils.custom_logging import LoggerContext
+
+SAMPLE_PERIOD = 0.002
+
+
+class FakeSprayService:
+    def __init__(self):
+        self.speeds = []
+
+    def adjustMotorSpeed(self, motorAddress, speed):
+        self.speeds.append(speed)
+        return True
+
+
+class FakeRobotService:
+    """Publishes the start pose, then moves along x at a constant step per sample; velocity changes once halfway."""
+
+    logger_context = LoggerContext(enabled=False, logger=None)
+
+    def __init__(self, path, step=0.5, velocities=(100.0, 150.0)):
+        self.path = path
+        self.step = step
+        self.velocities = velocities
+        self.position = list(path[0])
+        self.velocity = velocities[0]
+        self.seq = 0
+        self.wakeups = 0
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def wait_for_robot_sample(self, after_seq=0, timeout=None):
+        self.wakeups += 1
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.seq > after_seq, timeout=timeout):
+                return after_seq, None
+            return self.seq, list(self.position)
+
+    def get_current_velocity(self):
+        return self.velocity
+
+    def get_current_acceleration(self):
+        return 0.0
+
+    """PRIVATE METHODS SECTION"""
+
+    def _run(self):
+        start_x, end_x = self.path[0][0], self.path[-1][0]
+        x = start_x
+        while not self._stop.is_set():
+            time.sleep(SAMPLE_PERIOD)
+            with self._condition:
+                self.position = [x] + list(self.path[0][1:])
+                self.velocity = self.velocities[0] if x < (start_x + end_x) / 2 else self.velocities[1]
+                self.seq += 1
+                self._condition.notify_all()
+            x = min(x + self.step, end_x)
+
+
+class FakeStateMachine:
+    def __init__(self, state=GlueProcessState.SENDING_PATH_POINTS):
+        self.state = state
+
+
+class FakeContext:
+    def __init__(self, state_machine):
+        self.state_machine = state_machine
+
+
+def make_path(count=40, spacing=2.0):
+    return [[100.0 + i * spacing, 200.0, 50.0, 180.0, 0.0, 90.0] for i in range(count)]
+
+
+@pytest.fixture(autouse=True)
+def trace_in_tmp(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def run_controller(robot, spray, path, execution_context=None):
+    return pump.adjustPumpSpeedDynamically(spray, robot, glue_speed_coefficient=100, glue_acceleration_coefficient=0,
+                                           motorAddress=0, path=path, threshold=1.0, execution_context=execution_context)
+
+
+def test_follows_samples_and_writes_only_speed_changes(trace_in_tmp):
+    path = make_path()
+    robot = FakeRobotService(path).start()
+    spray = FakeSprayService()
+
+    success, progress = run_controller(robot, spray, path)
+    robot.stop()
+
+    assert success and progress == len(path) - 1
+    assert spray.speeds == [10000, 15000]  # one write per velocity level, none per sample
+    # One wakeup per sample (plus timeouts), not a spin loop
+    assert robot.wakeups <= robot.seq + 5
+    trace = (trace_in_tmp / "robot_pump_values.txt").read_text()
+    assert trace.count("Pump speed") > 100
+    assert "Checkpoint 37 reached" in trace
+
+
+def test_checkpoint_cursor_only_moves_forward():
+    path = make_path(count=20)
+
+    passed = pump.update_checkpoint_progress(path[5], path, 0, 0, FakeRobotService(path))
+    assert passed == 6
+    # Close to an earlier checkpoint again - the cursor does not go back
+    assert pump.update_checkpoint_progress(path[2], path, passed, 0, FakeRobotService(path)) == 6
+    # Nothing reached inside the lookahead window - the rest of the path is scanned
+    assert pump.update_checkpoint_progress(path[19], path, passed, 0, FakeRobotService(path)) == 20
+    # Between checkpoints the cursor stays put
+    between = [path[10][0] + 1.0] + path[10][1:]
+    assert pump.update_checkpoint_progress(between, path, passed, 0, FakeRobotService(path)) == 6
+
+
+def test_finishes_when_samples_skip_more_than_the_lookahead_window():
+    # 0.1 mm spacing with 2 mm per sample: each sample jumps ~20 checkpoints
+    path = make_path(count=400, spacing=0.1)
+    robot = FakeRobotService(path, step=2.0).start()
+
+    done = []
+    worker = threading.Thread(target=lambda: done.append(run_controller(robot, FakeSprayService(), path)), daemon=True)
+    worker.start()
+    worker.join(timeout=5)
+    robot.stop()
+
+    assert not worker.is_alive()
+    success, progress = done[0]
+    assert success and progress == len(path) - 1
+
+
+def test_deadband_and_write_interval():
+    spray = FakeSprayService()
+    writer = pump.PumpSpeedWriter(spray, motorAddress=0, deadband=100, min_interval=0.05)
+
+    assert writer.update(10000)
+    assert not writer.update(10050)  # inside the deadband
+    assert not writer.update(11000)  # too soon after the last write
+    time.sleep(0.06)
+    assert writer.update(11000)
+    assert spray.speeds == [10000, 11000]
+
+
+def test_pause_returns_resume_point():
+    path = make_path()
+    robot = FakeRobotService(path, step=0.05).start()
+    state_machine = FakeStateMachine()
+    pauser = threading.Timer(0.3, lambda: setattr(state_machine, "state", GlueProcessState.PAUSED))
+    pauser.start()
+
+    success, resume_index = run_controller(robot, FakeSprayService(), path, FakeContext(state_machine))
+    robot.stop()
+
+    assert not success
+    assert 0 < resume_index < len(path) - 1
+
+
+def test_trace_buffer_drops_oldest_when_flusher_falls_behind(trace_in_tmp):
+    trace = PumpTraceBuffer(capacity=8, flush_interval=60).start()
+    for i in range(20):
+        trace.record("checkpoint", float(i), i)
+    trace.close()
+
+    assert trace.dropped == 12
+    lines = (trace_in_tmp / "robot_pump_values.txt").read_text().split()
+    assert "Checkpoint" in lines and "12" in lines and "11" not in lines
@@ -0,0 +1,145 @@
+"""
+MessageBroker metrics: publish, delivery and drop counters and callback latencies after a
+known sequence, in-flight publishes iterating their own subscriber snapshot, and the
+broker answering STATS_TOPIC only when ENABLE_BROKER_STATS is on.
+
+Run from src:  PYTHONPATH=. python -m pytest -q ../tests/message_broker
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from modules.shared import MessageBroker as message_broker_module
+from modules.shared import message_delivery
+from modules.shared.MessageBroker import MessageBroker
+from modules.shared.message_delivery import DeliveryMode, OverflowPolicy
+from modules.shared.message_stats import STATS_TOPIC
+
+TIMEOUT = 2.0
+SLOW_CALLBACK = 0.005
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    monkeypatch.setattr(MessageBroker, "_instance", None)
+    return MessageBroker()
+
+
+@pytest.fixture
+def stalled_executor(monkeypatch):
+    """A one-thread shared executor that runs nothing until release is set."""
+    executor = ThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+    executor.submit(release.wait)
+    monkeypatch.setattr(message_delivery, "_shared_executor", executor)
+    yield release
+    release.set()
+    executor.shutdown(wait=True)
+
+
+class Subscriber:
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.received = []
+
+    def on_message(self, message):
+        self.received.append(message)
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("subscriber failure")
+
+
+def test_counters_and_latencies_after_a_known_sequence(broker):
+    fast, slow, failing = Subscriber(), Subscriber(delay=SLOW_CALLBACK), Subscriber(fail=True)
+    for subscriber in (fast, slow, failing):
+        broker.subscribe("counted", subscriber.on_message)
+
+    for i in range(4):
+        broker.publish("counted", i)
+
+    stats = broker.get_stats("counted")["counted"]
+    assert stats["publishes"] == 4
+    assert stats["mean_fanout"] == 3 and stats["max_fanout"] == 3
+    assert stats["callbacks"] == 12 and stats["errors"] == 4
+    assert stats["drops"] == 0
+    assert sum(stats["latency_histogram_us"].values()) == 12
+    assert stats["max_callback_ms"] >= SLOW_CALLBACK * 1000
+    assert stats["mean_callback_ms"] > 0
+    assert stats["slowest_subscriber"]["name"] == "Subscriber.on_message"
+    assert stats["slowest_subscriber"]["calls"] == 12
+    assert stats["publish_rate_hz"] > 0 and stats["average_rate_hz"] > 0
+
+
+def test_full_async_queue_counts_drops(broker, stalled_executor):
+    subscriber = Subscriber()
+    broker.subscribe("bursty", subscriber.on_message, delivery=DeliveryMode.EXECUTOR, queue_size=2,
+                     overflow=OverflowPolicy.DROP_OLDEST)
+
+    for i in range(5):
+        broker.publish("bursty", i)
+
+    stats = broker.get_stats("bursty")["bursty"]
+    assert stats["publishes"] == 5 and stats["drops"] == 3
+    stalled_executor.set()
+    deadline = time.monotonic() + TIMEOUT
+    while len(subscriber.received) < 2 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert subscriber.received == [3, 4]
+    assert broker.get_stats("bursty")["bursty"]["callbacks"] == 2
+
+
+def test_subscribe_and_unsubscribe_during_publish_keep_the_in_flight_snapshot(broker):
+    late, removed = Subscriber(), Subscriber()
+
+    class Mutator:
+        def __init__(self):
+            self.calls = 0
+
+        def on_message(self, message):
+            self.calls += 1
+            if self.calls == 1:
+                broker.subscribe("snapshot", late.on_message)
+                broker.unsubscribe("snapshot", removed.on_message)
+
+    mutator = Mutator()
+    broker.subscribe("snapshot", mutator.on_message)
+    broker.subscribe("snapshot", removed.on_message)
+
+    broker.publish("snapshot", "first")
+    # The publish in flight still used the subscribers it started with
+    assert removed.received == ["first"] and late.received == []
+
+    broker.publish("snapshot", "second")
+    assert removed.received == ["first"] and late.received == ["second"]
+    stats = broker.get_stats("snapshot")["snapshot"]
+    assert stats["publishes"] == 2 and stats["callbacks"] == 4
+
+
+def test_stats_topic_is_answered_when_enabled(broker):
+    subscriber = Subscriber()
+    broker.subscribe("measured", subscriber.on_message)
+    broker.publish("measured", 1)
+
+    everything = broker.request(STATS_TOPIC, None)
+    single = broker.request(STATS_TOPIC, "measured")
+
+    assert everything["measured"]["publishes"] == 1
+    assert single == broker.get_stats("measured")
+    assert STATS_TOPIC not in everything  # the request itself is not counted as a publish
+
+
+def test_nothing_is_recorded_when_disabled(monkeypatch):
+    monkeypatch.setattr(message_broker_module, "ENABLE_BROKER_STATS", False)
+    monkeypatch.setattr(MessageBroker, "_instance", None)
+    broker = MessageBroker()
+    subscriber = Subscriber()
+    broker.subscribe("measured", subscriber.on_message)
+
+    broker.publish("measured", 1)
+
+    assert subscriber.received == [1]
+    assert broker.request(STATS_TOPIC, None) == {}
@@ -0,0 +1,133 @@
+"""
+Latest-value topics: unchanged and stale publishes are dropped, asynchronous subscribers keep
+only the newest pending value, late subscribers get the current value and concurrent
+publishers never deliver an older value after a newer one.
+
+Run from src:  PYTHONPATH=. python -m pytest -q ../tests/message_broker
+"""
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from modules.shared import message_delivery
+from modules.shared.MessageBroker import MessageBroker
+from modules.shared.message_delivery import DeliveryMode
+
+TIMEOUT = 2.0
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    monkeypatch.setattr(MessageBroker, "_instance", None)
+    return MessageBroker()
+
+
+@pytest.fixture
+def stalled_executor(monkeypatch):
+    """A one-thread shared executor that runs nothing until release is set."""
+    executor = ThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+    executor.submit(release.wait)
+    monkeypatch.setattr(message_delivery, "_shared_executor", executor)
+    yield release
+    release.set()
+    executor.shutdown(wait=True)
+
+
+class Recorder:
+    """Subscribers are weakly referenced - keep a bound method of a live object."""
+
+    def __init__(self):
+        self.received = []
+
+    def on_message(self, message):
+        self.received.append(message)
+
+
+def test_unchanged_values_are_suppressed(broker):
+    recorder = Recorder()
+    broker.register_latest_value_topic("state")
+    broker.subscribe("state", recorder.on_message)
+
+    for value in (1, 1, 2, 2, 1):
+        broker.publish("state", value)
+
+    assert recorder.received == [1, 2, 1]
+    assert broker.latest_values["state"].suppressed == 2
+    assert broker.get_latest("state") == 1
+
+
+def test_versions_not_newer_than_the_stored_one_are_rejected(broker):
+    recorder = Recorder()
+    broker.register_latest_value_topic("state")
+    broker.subscribe("state", recorder.on_message)
+
+    broker.publish("state", "a", version=2)
+    broker.publish("state", "stale", version=1)
+    broker.publish("state", "repeat", version=2)
+    broker.publish("state", "a", version=3)  # same value, newer version - delivered
+
+    assert recorder.received == ["a", "a"]
+    assert broker.get_latest("state") == "a"
+
+
+def test_async_subscriber_keeps_only_the_newest_pending_value(broker, stalled_executor):
+    received = []
+    done = threading.Event()
+
+    def callback(message):
+        received.append(message)
+        done.set()
+
+    broker.register_latest_value_topic("state")
+    broker.subscribe("state", callback, delivery=DeliveryMode.EXECUTOR)
+    for value in range(5):
+        broker.publish("state", value)
+    stalled_executor.set()
+
+    assert done.wait(TIMEOUT)
+    assert received == [4]
+
+
+def test_registering_converts_existing_async_subscribers(broker):
+    def callback(message):
+        pass
+
+    broker.subscribe("state", callback, delivery=DeliveryMode.WORKER, queue_size=16)
+    broker.register_latest_value_topic("state")
+
+    assert broker.subscribers["state"][0].delivery.queue.maxsize == 1
+
+
+def test_late_subscriber_receives_the_current_value(broker):
+    broker.register_latest_value_topic("state")
+    broker.publish("state", {"x": 1})
+    broker.publish("state", {"x": 2})
+
+    recorder = Recorder()
+    broker.subscribe("state", recorder.on_message)
+
+    assert recorder.received == [{"x": 2}]
+
+
+def test_concurrent_publishers_deliver_versions_in_order(broker):
+    recorder = Recorder()
+    broker.register_latest_value_topic("state")
+    broker.subscribe("state", recorder.on_message)
+    versions = itertools.count(1)
+
+    def publisher():
+        for _ in range(2000):
+            version = next(versions)
+            broker.publish("state", version, version=version)
+
+    threads = [threading.Thread(target=publisher) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(TIMEOUT * 5)
+
+    received = recorder.received
+    assert received and all(a < b for a, b in zip(received, received[1:]))
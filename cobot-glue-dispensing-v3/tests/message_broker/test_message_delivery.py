@@ -0,0 +1,169 @@
+"""
+Asynchronous MessageBroker delivery: overflow policies of the per-subscription queue,
+per-subscriber ordering on the shared executor and queue shutdown when a subscription ends.
+
+Run from src:  PYTHONPATH=. python -m pytest -q ../tests/message_broker
+"""
+import gc
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from modules.shared import message_delivery
+from modules.shared.MessageBroker import MessageBroker
+from modules.shared.message_delivery import BoundedMessageQueue, DeliveryMode, OverflowPolicy
+
+TIMEOUT = 2.0
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    monkeypatch.setattr(MessageBroker, "_instance", None)
+    return MessageBroker()
+
+
+@pytest.fixture
+def stalled_executor(monkeypatch):
+    """A one-thread shared executor that runs nothing until release is set."""
+    executor = ThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+    executor.submit(release.wait)
+    monkeypatch.setattr(message_delivery, "_shared_executor", executor)
+    yield release
+    release.set()
+    executor.shutdown(wait=True)
+
+
+def drain(queue):
+    items = []
+    while (item := queue.get_nowait()) is not BoundedMessageQueue.EMPTY:
+        items.append(item)
+    return items
+
+
+def start_publisher(target):
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_drop_oldest_keeps_the_newest_items():
+    queue = BoundedMessageQueue(3, OverflowPolicy.DROP_OLDEST)
+    assert all(queue.put(i) for i in range(5))
+    assert drain(queue) == [2, 3, 4] and queue.dropped == 2
+
+
+def test_drop_newest_rejects_items_published_into_a_full_queue():
+    queue = BoundedMessageQueue(3, OverflowPolicy.DROP_NEWEST)
+    assert [queue.put(i) for i in range(5)] == [True, True, True, False, False]
+    assert drain(queue) == [0, 1, 2] and queue.dropped == 2
+
+
+def test_block_waits_for_room_without_dropping():
+    queue = BoundedMessageQueue(2, OverflowPolicy.BLOCK)
+    queue.put(0)
+    queue.put(1)
+    results = []
+    publisher = start_publisher(lambda: results.append(queue.put(2)))
+
+    publisher.join(0.1)
+    assert publisher.is_alive()
+    assert queue.get(timeout=TIMEOUT) == 0
+    publisher.join(TIMEOUT)
+    assert results == [True]
+    assert drain(queue) == [1, 2] and queue.dropped == 0
+
+
+def test_executor_delivery_keeps_publish_order_per_subscriber(broker):
+    count = 200
+    received = {name: [] for name in ("a", "b", "c")}
+    done = threading.Event()
+
+    def make_callback(name):
+        def callback(message):
+            if message % 7 == 0:
+                time.sleep(0.001)  # let the other subscribers' drains interleave
+            received[name].append(message)
+            if all(len(messages) == count for messages in received.values()):
+                done.set()
+        return callback
+
+    callbacks = [make_callback(name) for name in received]
+    for callback in callbacks:
+        broker.subscribe("orders", callback, delivery=DeliveryMode.EXECUTOR, queue_size=4,
+                         overflow=OverflowPolicy.BLOCK)
+    for i in range(count):
+        broker.publish("orders", i)
+
+    assert done.wait(TIMEOUT)
+    for messages in received.values():
+        assert messages == list(range(count))
+
+
+def test_unsubscribe_closes_the_queue_and_releases_a_blocked_publisher(broker, stalled_executor):
+    def callback(message):
+        pass
+
+    broker.subscribe("stalled", callback, delivery=DeliveryMode.EXECUTOR, queue_size=1,
+                     overflow=OverflowPolicy.BLOCK)
+    delivery = broker.subscribers["stalled"][0].delivery
+    broker.publish("stalled", 1)  # fills the queue - the drain task cannot run
+    publisher = start_publisher(lambda: broker.publish("stalled", 2))
+    publisher.join(0.1)
+    assert publisher.is_alive()
+
+    broker.unsubscribe("stalled", callback)
+    publisher.join(TIMEOUT)
+    assert not publisher.is_alive()
+    assert delivery.queue.closed and len(delivery.queue) == 0
+    assert "stalled" not in broker.subscribers
+
+
+def test_garbage_collected_subscriber_releases_a_blocked_publisher(broker, stalled_executor):
+    class Subscriber:
+        def on_message(self, message):
+            pass
+
+    subscriber = Subscriber()
+    broker.subscribe("stalled", subscriber.on_message, delivery=DeliveryMode.EXECUTOR, queue_size=1,
+                     overflow=OverflowPolicy.BLOCK)
+    delivery = broker.subscribers["stalled"][0].delivery
+    broker.publish("stalled", 1)
+    publisher = start_publisher(lambda: broker.publish("stalled", 2))
+    publisher.join(0.1)
+    assert publisher.is_alive()
+
+    del subscriber
+    gc.collect()
+    publisher.join(TIMEOUT)
+    assert not publisher.is_alive()
+    assert delivery.queue.closed
+    assert "stalled" not in broker.subscribers
+
+
+def test_worker_thread_exits_after_unsubscribe(broker):
+    in_callback = threading.Event()
+    release = threading.Event()
+
+    def callback(message):
+        in_callback.set()
+        release.wait(TIMEOUT)
+
+    broker.subscribe("worker", callback, delivery=DeliveryMode.WORKER, queue_size=1, overflow=OverflowPolicy.BLOCK)
+    delivery = broker.subscribers["worker"][0].delivery
+    broker.publish("worker", 1)
+    assert in_callback.wait(TIMEOUT)
+    broker.publish("worker", 2)  # queued behind the running callback
+    publisher = start_publisher(lambda: broker.publish("worker", 3))
+    publisher.join(0.1)
+    assert publisher.is_alive()
+
+    broker.unsubscribe("worker", callback)
+    publisher.join(TIMEOUT)
+    assert not publisher.is_alive()
+
+    release.set()
+    delivery._thread.join(TIMEOUT)
+    assert not delivery._thread.is_alive()
@@ -0,0 +1,214 @@
+"""
+ModbusBus against a fake RTU slave on a pseudo terminal.
+
+The fake slave answers FC3 (read holding registers), FC16 (write multiple registers) and
+FC5/FC1 (coils) on the pty master while the bus drives the real minimalmodbus instrument on
+the pty slave end. It can hold back a response (to let a queue build up behind it), drop
+responses (to exercise retries) and records every frame it receives.
+
+Run from src:  PYTHONPATH=. python -m pytest -q ../tests/modbus
+"""
+import os
+import select
+import struct
+import threading
+import tty
+
+import pytest
+
+from applications.glue_dispensing_application.services.glueSprayService.motorControl.errorCodes import \
+    ModbusExceptionType
+from modules.modbusCommunication.ModbusBus import ModbusBus, ModbusOperation, ModbusPriority, ModbusTransaction
+from modules.modbusCommunication.ModbusClient import ModbusClient
+
+SLAVE = 1
+REGISTER_COUNT = 200
+
+
+def crc16(frame: bytes) -> bytes:
+    crc = 0xFFFF
+    for byte in frame:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return struct.pack("<H", crc)
+
+
+class FakeRtuSlave:
+    """Register/coil memory of one RTU slave served on the master side of a pty."""
+
+    def __init__(self, master_fd, slave=SLAVE):
+        self.fd = master_fd
+        self.slave = slave
+        self.registers = [0] * REGISTER_COUNT
+        self.coils = [0] * REGISTER_COUNT
+        self.frames = []  # (function code, address, count)
+        self.drop_responses = 0
+        self.hold = threading.Event()
+        self.hold.set()
+        self.received = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    """PRIVATE METHODS SECTION"""
+
+    def _run(self):
+        while not self._stop.is_set():
+            header = self._read(2)
+            if header is None:
+                continue
+            slave, function = header
+            if function == 16:
+                rest = self._read(5)
+                rest += self._read(rest[-1] + 2)
+            else:
+                rest = self._read(6)
+            request = header + rest
+            if crc16(request[:-2]) != request[-2:] or slave != self.slave:
+                continue
+            address, count = struct.unpack(">HH", request[2:6])
+            self.frames.append((function, address, count))
+            self.received.set()
+            self.hold.wait()
+            if self.drop_responses:
+                self.drop_responses -= 1
+                continue
+            body = self._handle(function, address, count, request)
+            response = bytes([slave]) + body
+            os.write(self.fd, response + crc16(response))
+
+    def _handle(self, function, address, count, request):
+        if function in (3, 16) and address + count > REGISTER_COUNT:
+            return bytes([function | 0x80, 2])  # illegal data address
+        if function == 3:
+            values = self.registers[address:address + count]
+            return bytes([3, 2 * count]) + struct.pack(f">{count}H", *values)
+        if function == 16:
+            self.registers[address:address + count] = struct.unpack(f">{count}H", request[7:7 + 2 * count])
+            return request[1:6]
+        if function == 5:
+            self.coils[address] = 1 if count == 0xFF00 else 0
+            return request[1:6]
+        if function == 1:
+            return bytes([1, 1, self.coils[address]])
+        return bytes([function | 0x80, 1])
+
+    def _read(self, size):
+        data = b""
+        while len(data) < size:
+            if self._stop.is_set():
+                return None
+            ready, _, _ = select.select([self.fd], [], [], 0.05)
+            if ready:
+                data += os.read(self.fd, size - len(data))
+            elif not data:
+                return None
+        return data
+
+
+@pytest.fixture
+def rtu():
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    fake = FakeRtuSlave(master).start()
+    bus = ModbusBus.for_port(os.ttyname(slave), timeout=0.05, retry_base_delay=0.001)
+    yield fake, bus
+    fake.hold.set()
+    bus.close()
+    fake.stop()
+    os.close(master)
+    os.close(slave)
+
+
+def block_bus(fake, bus):
+    """Occupy the bus with a held-back request so that the following submissions queue up."""
+    fake.hold.clear()
+    fake.received.clear()
+    blocker = bus.submit(ModbusTransaction(SLAVE, ModbusOperation.READ_REGISTERS, 190, count=1,
+                                           priority=ModbusPriority.PUMP_SPEED))
+    assert fake.received.wait(1.0)
+    fake.frames.clear()
+    return blocker
+
+
+def test_client_round_trip(rtu):
+    fake, bus = rtu
+    client = ModbusClient(slave=SLAVE, port=bus.port)
+    assert client.bus is bus  # clients of a port share its bus
+
+    assert client.writeRegisters(10, [1, 2, 3]) is None
+    assert client.writeRegister(13, -2, signed=True) is None
+    assert client.readRegisters(10, 4) == ([1, 2, 3, 0xFFFE], None)
+    assert client.read(11) == (2, None)
+    client.writeBit(5, 1)
+    assert client.readBit(5) == 1
+
+
+def test_queue_is_served_by_priority(rtu):
+    fake, bus = rtu
+    blocker = block_bus(fake, bus)
+    queued = [
+        bus.submit(ModbusTransaction(SLAVE, ModbusOperation.READ_REGISTERS, 30, priority=ModbusPriority.HEALTH_CHECK)),
+        bus.submit(ModbusTransaction(SLAVE, ModbusOperation.READ_REGISTERS, 20, priority=ModbusPriority.SENSOR)),
+        bus.submit(ModbusTransaction(SLAVE, ModbusOperation.WRITE_REGISTERS, 0, values=[7, 0],
+                                     priority=ModbusPriority.PUMP_SPEED)),
+    ]
+    fake.hold.set()
+
+    assert blocker.wait(1.0)[1] is None
+    assert all(t.wait(1.0)[1] is None for t in queued)
+    assert [address for _, address, _ in fake.frames] == [0, 20, 30]
+
+
+def test_adjacent_requests_share_one_frame(rtu):
+    fake, bus = rtu
+    fake.registers[40:46] = [40, 41, 42, 43, 44, 45]
+    blocker = block_bus(fake, bus)
+    reads = [bus.submit(ModbusTransaction(SLAVE, ModbusOperation.READ_REGISTERS, address, count=count,
+                                          priority=ModbusPriority.SENSOR))
+             for address, count in ((40, 2), (42, 1), (41, 5))]
+    writes = [bus.submit(ModbusTransaction(SLAVE, ModbusOperation.WRITE_REGISTERS, address, values=values,
+                                           priority=ModbusPriority.CONTROL))
+              for address, values in ((60, [1, 2]), (62, [3]), (61, [9]))]
+    fake.hold.set()
+    blocker.wait(1.0)
+
+    assert [t.wait(1.0) for t in reads] == [([40, 41], None), ([42], None), ([41, 42, 43, 44, 45], None)]
+    assert all(t.wait(1.0)[1] is None for t in writes)
+    assert fake.frames == [(16, 60, 3), (3, 40, 6)]
+    assert fake.registers[60:63] == [1, 9, 3]  # the later write to 61 wins
+    stats = bus.get_stats()[SLAVE]
+    assert stats["transactions"] == 7 and stats["frames"] == 3
+
+
+def test_lost_responses_are_retried_with_backoff(rtu):
+    fake, bus = rtu
+    fake.drop_responses = 2
+
+    assert bus.write_registers(SLAVE, 0, [5]) is None
+    assert fake.frames == [(16, 0, 1)] * 3
+    stats = bus.get_stats()[SLAVE]
+    assert stats["retries"] == 2 and stats["errors"] == {}
+
+    fake.drop_responses = bus.max_attempts
+    values, error = bus.read_registers(SLAVE, 0, 1)
+    assert values is None and error is not None
+    assert bus.get_stats()[SLAVE]["errors"] == {error.name: 1}
+
+
+def test_illegal_address_is_not_retried(rtu):
+    fake, bus = rtu
+
+    values, error = bus.read_registers(SLAVE, REGISTER_COUNT - 1, 2)
+
+    assert values is None and error is ModbusExceptionType.ILLEGAL_REQUEST_ERROR
+    assert len(fake.frames) == 1
+    assert bus.get_stats()[SLAVE]["retries"] == 0
@@ -0,0 +1,109 @@
+"""
+Path simplification: point reduction and deviation bounds of RDP and MoveL/MoveC fitting.
+
+Run from src:  PYTHONPATH=. python -m pytest -q ../tests/path_simplification
+"""
+import numpy as np
+import pytest
+
+from modules.utils.path_simplification import MotionType, fit_primitives, max_deviation, rdp_indices, \
+    simplify_path
+
+
+def make_pose_path(xy, z=50.0, rz=90.0):
+    xy = np.asarray(xy, dtype=np.float64)
+    return [[x, y, z, 180.0, 0.0, rz] for x, y in xy.tolist()]
+
+
+def make_rounded_rectangle(width=200.0, height=120.0, radius=20.0, spacing=0.5):
+    """Closed rounded rectangle sampled every `spacing` mm, like a dense spray contour."""
+    points = []
+    corners = [(width - radius, height - radius, 0.0), (radius, height - radius, np.pi / 2),
+               (radius, radius, np.pi), (width - radius, radius, 3 * np.pi / 2)]
+    for k, (cx, cy, start) in enumerate(corners):
+        for angle in np.arange(start, start + np.pi / 2, spacing / radius):
+            points.append((cx + radius * np.cos(angle), cy + radius * np.sin(angle)))
+        end = start + np.pi / 2
+        x0, y0 = cx + radius * np.cos(end), cy + radius * np.sin(end)
+        nx, ny = corners[(k + 1) % 4][:2]
+        x1, y1 = nx + radius * np.cos(end), ny + radius * np.sin(end)
+        steps = max(1, int(np.hypot(x1 - x0, y1 - y0) / spacing))
+        for t in np.arange(steps) / steps:
+            points.append((x0 + t * (x1 - x0), y0 + t * (y1 - y0)))
+    points.append(points[0])
+    return np.array(points)
+
+
+def test_rdp_keeps_only_endpoints_of_straight_line():
+    path = make_pose_path([(i * 0.5, 10.0) for i in range(400)])
+
+    assert rdp_indices(path, 0.1).tolist() == [0, 399]
+    assert simplify_path(path, 0.1) == [path[0], path[-1]]
+
+
+def test_rdp_respects_tolerance_on_closed_contour():
+    path = make_pose_path(make_rounded_rectangle())
+
+    kept = rdp_indices(path, 0.2)
+
+    assert kept[0] == 0 and kept[-1] == len(path) - 1
+    assert len(kept) < len(path) // 10
+    assert max_deviation(path, kept_indices=kept) <= 0.2
+
+
+def test_zero_tolerance_keeps_every_point():
+    path = make_pose_path([(0, 0), (1, 0), (2, 0)])
+
+    assert simplify_path(path, 0) == path
+
+
+def test_primitives_cover_arcs_and_lines_within_deviation():
+    path = make_pose_path(make_rounded_rectangle())
+
+    primitives = fit_primitives(path, 0.05)
+
+    kinds = [p.kind for p in primitives]
+    assert kinds.count(MotionType.MOVE_C) == 4
+    assert kinds.count(MotionType.MOVE_L) == 4
+    assert primitives[-1].end_index == len(path) - 1
+    assert max_deviation(path, primitives=primitives) <= 0.05
+
+
+def test_arc_is_not_fitted_through_a_corner():
+    path = make_pose_path([(x, 0.0) for x in range(10)] + [(9.0, y) for y in range(1, 10)])
+
+    primitives = fit_primitives(path, 0.1)
+
+    assert [(p.kind, p.end_index) for p in primitives] == [(MotionType.MOVE_L, 9), (MotionType.MOVE_L, 18)]
+
+
+@pytest.mark.parametrize("sweep_deg", [90, 179])
+def test_single_arc_becomes_one_move_c(sweep_deg):
+    angles = np.radians(np.linspace(0, sweep_deg, 120))
+    path = make_pose_path(np.column_stack([50 * np.cos(angles), 50 * np.sin(angles)]))
+
+    primitives = fit_primitives(path, 0.05)
+
+    assert len(primitives) == 1
+    assert primitives[0].kind is MotionType.MOVE_C
+    assert 0 < primitives[0].via_index < len(path) - 1
+
+
+def test_fitted_deviation_is_measured_against_the_original_points():
+    # The bump is dropped by RDP, so the fit only sees a straight line
+    path = make_pose_path([(0, 0), (1, 0), (2, 0.15), (3, 0), (4, 0)])
+    kept = rdp_indices(path, 0.2)
+    primitives = fit_primitives([path[i] for i in kept.tolist()], 0.2)
+
+    assert kept.tolist() == [0, 4]
+    assert max_deviation([path[i] for i in kept.tolist()], primitives=primitives) == 0.0
+    assert max_deviation(path, kept_indices=kept, primitives=primitives) == pytest.approx(0.15)
+
+
+def test_rdp_and_fitting_stay_within_their_combined_tolerance_of_the_original_points():
+    path = make_pose_path(make_rounded_rectangle())
+    kept = rdp_indices(path, 0.2)
+
+    primitives = fit_primitives([path[i] for i in kept.tolist()], 0.2)
+
+    assert max_deviation(path, kept_indices=kept, primitives=primitives) <= 0.4
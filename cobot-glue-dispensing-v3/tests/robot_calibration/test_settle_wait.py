@@ -0,0 +1,76 @@
+"""
+Settle waits after calibration moves: frames are only trusted once their capture started
+after motion done + settle time, not merely once they left the pipeline after the move.
+
+Run from src:  PYTHONPATH=. python -m pytest -q ../tests/robot_calibration
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from core.services.vision.frame_ring_buffer import FrameRingBuffer
+from modules.robot_calibration.robot_controller import CalibrationRobotController
+from modules.utils.custom_logging import LoggerContext
+
+
+class FakeVision:
+    """The frame-ring part of VisionService."""
+
+    def __init__(self):
+        self.frame_ring = FrameRingBuffer(slots=4)
+
+    def waitForFrameCapturedAfter(self, timestamp, timeout=None):
+        return self.frame_ring.wait_for_captured_after(timestamp, timeout)
+
+
+def frame(value):
+    return np.full((4, 4, 3), value, dtype=np.uint8)
+
+
+def make_controller(events):
+    robot_service = SimpleNamespace(wait_for_motion_complete=lambda timeout: events.append("motion done") or True)
+    return CalibrationRobotController(robot_service, None, LoggerContext(False, None))
+
+
+def test_frames_captured_before_the_timestamp_do_not_count():
+    ring = FrameRingBuffer(slots=4)
+    moved_at = time.monotonic()
+    # Exposed during the move, written after it (pipeline latency)
+    ring.write(frame(1), captured_at=moved_at - 0.05)
+    assert ring.wait_for_captured_after(moved_at, timeout=0.01) == (1, None)
+
+    ring.write(frame(2), captured_at=moved_at + 0.01)
+    seq, view = ring.wait_for_captured_after(moved_at, timeout=0.01)
+    assert seq == 2 and view[0, 0, 0] == 2
+    assert ring.captured_at == moved_at + 0.01
+
+
+def test_wait_until_settled_needs_a_frame_captured_after_the_settle_time():
+    events = []
+    vision = FakeVision()
+    controller = make_controller(events)
+    started = time.monotonic()
+
+    def camera():
+        # A frame whose capture started before the settle time ended comes out of the
+        # pipeline first, then one captured afterwards
+        time.sleep(0.1)
+        vision.frame_ring.write(frame(1), captured_at=started)
+        time.sleep(0.1)
+        vision.frame_ring.write(frame(2), captured_at=time.monotonic())
+
+    thread = threading.Thread(target=camera)
+    thread.start()
+    assert controller.wait_until_settled(vision, settle_time=0.05, timeout=1.0)
+    thread.join()
+    assert events == ["motion done"]
+    assert vision.frame_ring.seq == 2
+    assert time.monotonic() - started >= 0.2
+
+
+def test_wait_until_settled_reports_a_missing_frame():
+    vision = FakeVision()
+    vision.frame_ring.write(frame(1))
+    assert not make_controller([]).wait_until_settled(vision, settle_time=0.0, timeout=0.05)
@@ -0,0 +1,230 @@
+"""
+TrajectoryExecutor against a fake streaming controller.
+
+The fake answers every command after a simulated RPC latency and executes queued points
+at a fixed time per segment, so it can report the upload time, the gaps between
+consecutive commands and how long the motion starved waiting for the next point.
+
+Run from src:  PYTHONPATH=. python -m pytest -q ../tests/robot_service
+"""
+import time
+
+import numpy as np
+import pytest
+
+from core.services.robot_service.impl.trajectory_executor import TrajectoryExecutor, TrajectoryBackend, \
+    resample_by_arc_length
+
+
+class FakeStreamingController:
+    supports_trajectory_streaming = True
+    supports_circular_moves = True
+
+    def __init__(self, rpc_latency=0.0005, segment_time=0.004, fail_at=None):
+        self.rpc_latency = rpc_latency
+        self.segment_time = segment_time
+        self.fail_at = fail_at
+        self.calls = []  # (name, perf_counter, args)
+        self.points = []  # (perf_counter, position, last)
+
+    # --- motion commands ---
+    def move_liner(self, position, tool=0, user=0, vel=30, acc=30, blendR=0):
+        return self._point("move_liner", position, False)
+
+    def move_circular(self, via, position, tool=0, user=0, vel=30, acc=30, blendR=0):
+        return self._point("move_circular", position, False)
+
+    def spline_start(self, average_time_ms=2000):
+        return self._call("spline_start", average_time_ms)
+
+    def spline_point(self, position, tool=0, user=0, last=False, vel=30, acc=30, blendR=0):
+        return self._point("spline_point", position, last)
+
+    def spline_end(self):
+        return self._call("spline_end")
+
+    def servo_start(self):
+        return self._call("servo_start")
+
+    def servo_cart(self, position, period=0.008):
+        return self._point("servo_cart", position, False)
+
+    def servo_end(self):
+        return self._call("servo_end")
+
+    # --- measurements ---
+    @property
+    def names(self):
+        return [name for name, _, _ in self.calls]
+
+    def upload_time(self):
+        return self.points[-1][0] - self.points[0][0]
+
+    def command_gaps(self):
+        return np.diff([t for t, _, _ in self.points])
+
+    def starvation(self):
+        """Total time the simulated motion waited for a point that had not arrived yet."""
+        motion_time = self.points[0][0]
+        starved = 0.0
+        for received, _, _ in self.points[1:]:
+            motion_time += self.segment_time  # previous segment finished, next point needed now
+            if received > motion_time:
+                starved += received - motion_time
+                motion_time = received
+        return starved
+
+    """PRIVATE METHODS SECTION"""
+
+    def _call(self, name, *args):
+        time.sleep(self.rpc_latency)
+        self.calls.append((name, time.perf_counter(), args))
+        return 0
+
+    def _point(self, name, position, last):
+        if self.fail_at is not None and len(self.points) == self.fail_at:
+            return 14
+        self._call(name, position, last)
+        self.points.append((time.perf_counter(), position, last))
+        return 0
+
+
+class CountingToken:
+    """Cancels itself after a number of checks."""
+
+    def __init__(self, cancel_after):
+        self.checks = 0
+        self.cancel_after = cancel_after
+
+    def is_cancelled(self):
+        self.checks += 1
+        return self.checks > self.cancel_after
+
+
+def make_path(count=200, spacing=0.5):
+    return [[100.0 + i * spacing, 200.0, 50.0, 180.0, 0.0, 90.0] for i in range(count)]
+
+
+def test_spline_upload_streams_whole_path_in_one_block():
+    robot = FakeStreamingController()
+    path = make_path()
+
+    result = TrajectoryExecutor(robot, TrajectoryBackend.SPLINE).execute(path, tool=0, user=0, velocity=30,
+                                                                         acceleration=30)
+
+    assert result.code == 0 and not result.cancelled
+    assert result.next_index == len(path)
+    assert robot.names[0] == "spline_start" and robot.names[-1] == "spline_end"
+    assert [last for _, _, last in robot.points] == [False] * (len(path) - 1) + [True]
+    assert result.commands_sent == len(path)
+    assert result.upload_time == pytest.approx(robot.upload_time(), abs=0.01)
+    # RPC latency below the segment time: the controller never waits for a point
+    assert robot.starvation() < 0.05 * robot.segment_time * len(path)
+    print(f"\nspline: upload {robot.upload_time() * 1000:.1f} ms, max gap {robot.command_gaps().max() * 1000:.2f} ms")
+
+
+def test_servo_stream_runs_at_fixed_period():
+    robot = FakeStreamingController(rpc_latency=0.0)
+    path = make_path(count=50, spacing=1.0)  # 49 mm
+    period = 0.008
+
+    result = TrajectoryExecutor(robot, TrajectoryBackend.SERVO, servo_period=period).execute(
+        path, tool=0, user=0, velocity=500, acceleration=30)  # 4 mm per period
+
+    assert result.code == 0
+    assert robot.names[0] == "servo_start" and robot.names[-1] == "servo_end"
+    assert len(robot.points) == 13  # ceil(49 / 4)
+    assert robot.points[-1][1] == pytest.approx(path[-1])
+    gaps = robot.command_gaps()
+    assert gaps.mean() == pytest.approx(period, rel=0.25)
+    assert result.max_command_gap < 4 * period
+    print(f"\nservo: mean gap {gaps.mean() * 1000:.2f} ms, max gap {gaps.max() * 1000:.2f} ms")
+
+
+def test_cancel_returns_resume_index_and_closes_block():
+    robot = FakeStreamingController(rpc_latency=0.0)
+
+    result = TrajectoryExecutor(robot, TrajectoryBackend.SPLINE).execute(
+        make_path(50), tool=0, user=0, velocity=30, acceleration=30, index_offset=100,
+        cancellation_token=CountingToken(cancel_after=20))
+
+    assert result.cancelled and result.code == 0
+    assert result.next_index == 120
+    assert len(robot.points) == 20
+    assert robot.names[-1] == "spline_end"
+
+
+def test_error_reports_failing_point():
+    robot = FakeStreamingController(rpc_latency=0.0, fail_at=7)
+
+    result = TrajectoryExecutor(robot, TrajectoryBackend.MOVE_L).execute(make_path(20), tool=0, user=0, velocity=30,
+                                                                         acceleration=30, index_offset=3)
+
+    assert result.code == 14 and not result.cancelled
+    assert result.next_index == 10
+
+
+def test_move_l_with_arc_tolerance_sends_one_command_per_segment():
+    robot = FakeStreamingController(rpc_latency=0.0)
+    angles = np.linspace(0, np.pi / 2, 91)
+    arc = [[100 * np.cos(a), 100 * np.sin(a), 50.0, 180.0, 0.0, 90.0] for a in angles]
+    line = [[0.0, 100.0 + i, 50.0, 180.0, 0.0, 90.0] for i in range(1, 41)]
+    path = arc + line
+
+    result = TrajectoryExecutor(robot, TrajectoryBackend.MOVE_L, arc_tolerance=0.1).execute(
+        path, tool=0, user=0, velocity=30, acceleration=30, index_offset=10)
+
+    assert result.code == 0
+    assert robot.names == ["move_liner", "move_circular", "move_liner"]
+    assert robot.points[-1][1] == path[-1]
+    assert result.next_index == 10 + len(path)
+
+
+def test_move_l_fitting_error_resumes_at_the_failed_segment_start():
+    robot = FakeStreamingController(rpc_latency=0.0, fail_at=2)  # approach, MoveC, then the line fails
+    angles = np.linspace(0, np.pi / 2, 91)
+    arc = [[100 * np.cos(a), 100 * np.sin(a), 50.0, 180.0, 0.0, 90.0] for a in angles]
+    line = [[0.0, 100.0 + i, 50.0, 180.0, 0.0, 90.0] for i in range(1, 41)]
+
+    result = TrajectoryExecutor(robot, TrajectoryBackend.MOVE_L, arc_tolerance=0.1).execute(
+        arc + line, tool=0, user=0, velocity=30, acceleration=30, index_offset=10)
+
+    assert result.code == 14
+    assert robot.names == ["move_liner", "move_circular"]
+    assert result.next_index == 10 + len(arc)
+
+
+def test_move_l_without_circular_moves_sends_every_point():
+    class LinearOnlyController(FakeStreamingController):
+        supports_circular_moves = False
+
+    robot = LinearOnlyController(rpc_latency=0.0)
+    path = make_path(30)
+
+    result = TrajectoryExecutor(robot, TrajectoryBackend.MOVE_L, arc_tolerance=0.1).execute(
+        path, tool=0, user=0, velocity=30, acceleration=30)
+
+    assert result.code == 0
+    assert robot.names == ["move_liner"] * len(path)
+
+
+def test_progress_is_reported_per_segment_up_to_last_point():
+    robot = FakeStreamingController(rpc_latency=0.0)
+    reports = []
+
+    TrajectoryExecutor(robot, TrajectoryBackend.SPLINE, progress_interval=10).execute(
+        make_path(35), tool=0, user=0, velocity=30, acceleration=30, index_offset=5, on_progress=reports.append)
+
+    assert [p.point_index for p in reports] == [5, 15, 25, 35, 39]
+    assert all(p.points_total == 35 for p in reports)
+
+
+def test_resample_keeps_orientation_continuous_across_180():
+    points = np.array([[0, 0, 0, 179.0, 0, 0], [10, 0, 0, -179.0, 0, 0]])
+
+    targets, segments = resample_by_arc_length(points, 2.5)
+
+    assert len(targets) == 4
+    assert np.allclose(np.diff(targets[:, 0]), 2.5)
+    assert np.all(np.abs(np.abs(targets[:, 3]) - 179.75) <= 1.0)  # passes through ±180, not through 0
+    assert list(segments) == [0, 0, 0, 1]
@@ -0,0 +1,101 @@
+"""
+ModelRegistry: hot reload of a newer model, partial and broken saves are never swapped in,
+and the batched scorer agrees with the per-pair one.
+
+Run from src:  PYTHONPATH=. python -m pytest -q ../tests/shape_matching_model
+"""
+import json
+import os
+
+import cv2
+import joblib
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from modules.shapeMatchinModelTraining.featuresExtraction import compute_enhanced_features
+from modules.shapeMatchinModelTraining.modelManager import predict_similarity, predict_similarity_batch
+from modules.shapeMatchinModelTraining.modelRegistry import ModelRegistry
+
+
+def write_model(save_dir, timestamp, model, with_metadata=True):
+    folder = os.path.join(save_dir, f"model_{timestamp}")
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, "model.pkl")
+    joblib.dump(model, path)
+    if with_metadata:
+        with open(os.path.join(folder, "metadata.json"), "w") as f:
+            json.dump({"model_info": {"timestamp": timestamp}}, f)
+    return path
+
+
+def ellipse(width, height, angle=0):
+    points = cv2.ellipse2Poly((200, 200), (width, height), angle, 0, 360, 10)
+    return points.astype(np.float32).reshape(-1, 1, 2)
+
+
+def rectangle(width, height):
+    return np.array([[0, 0], [width, 0], [width, height], [0, height]], dtype=np.float32).reshape(-1, 1, 2)
+
+
+def test_reloads_when_a_newer_model_is_saved(tmp_path):
+    first = write_model(str(tmp_path), "20250101_000000", {"name": "first"})
+    registry = ModelRegistry(tmp_path, check_interval=0)
+    assert registry.preload() == {"name": "first"}
+    assert registry.model_path == first
+
+    second = write_model(str(tmp_path), "20250102_000000", {"name": "second"})
+
+    assert registry.get_model() == {"name": "second"}
+    assert registry.model_path == second
+
+
+def test_ignores_a_save_without_metadata(tmp_path):
+    first = write_model(str(tmp_path), "20250101_000000", {"name": "first"})
+    registry = ModelRegistry(tmp_path, check_interval=0)
+    registry.preload()
+
+    # save_model writes metadata.json after the .pkl - this save is still in progress
+    write_model(str(tmp_path), "20250102_000000", {"name": "partial"}, with_metadata=False)
+
+    assert registry.get_model() == {"name": "first"}
+    assert registry.model_path == first
+
+
+def test_keeps_the_current_model_when_the_newer_one_fails_to_load(tmp_path):
+    first = write_model(str(tmp_path), "20250101_000000", {"name": "first"})
+    registry = ModelRegistry(tmp_path, check_interval=0)
+    registry.preload()
+
+    broken = write_model(str(tmp_path), "20250102_000000", None)
+    with open(broken, "wb") as f:
+        f.write(b"not a pickle")
+
+    assert registry.get_model() == {"name": "first"}
+    assert registry.model_path == first
+
+
+def test_first_load_failure_is_raised(tmp_path):
+    broken = write_model(str(tmp_path), "20250101_000000", None)
+    with open(broken, "wb") as f:
+        f.write(b"not a pickle")
+
+    with pytest.raises(Exception):
+        ModelRegistry(tmp_path, check_interval=0).preload()
+
+
+def test_batch_scores_match_per_pair_scores():
+    shapes = [ellipse(80, 40), ellipse(82, 41, 30), ellipse(60, 60), rectangle(120, 60),
+              rectangle(118, 62), rectangle(50, 150), ellipse(100, 30, 90)]
+    pairs = [(a, b) for a in shapes for b in shapes]
+    features = [compute_enhanced_features(a, b) for a, b in pairs]
+    labels = [int(abs(cv2.contourArea(a) - cv2.contourArea(b)) < 0.1 * cv2.contourArea(a)) for a, b in pairs]
+    model = LogisticRegression(max_iter=2000).fit(features, labels)
+
+    batch = predict_similarity_batch(model, features)
+
+    assert len(batch) == len(pairs)
+    for (a, b), (result, confidence) in zip(pairs, batch):
+        expected_result, expected_confidence, _ = predict_similarity(model, a, b)
+        assert result == expected_result
+        assert confidence == pytest.approx(expected_confidence)
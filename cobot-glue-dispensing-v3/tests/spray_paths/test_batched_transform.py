@@ -0,0 +1,115 @@
+"""
+Batched image -> robot transformation and spray path generation against the per-contour,
+per-point computation they replace.
+
+Run from src:  PYTHONPATH=. python -m pytest -q ../tests/spray_paths
+"""
+import types
+
+import cv2
+import numpy as np
+import pytest
+
+from applications.glue_dispensing_application.handlers.workpieces_to_spray_paths_handler import \
+    WorkpieceToSprayPathsGenerator
+from modules.utils import batched_transform, utils
+from modules.utils.path_simplification import simplify_path
+
+CAMERA_TO_ROBOT = np.array([[0.52, 0.013, -310.2], [-0.011, -0.51, 640.7], [1.1e-5, 2.3e-6, 1.0]])
+TRANSDUCER_OFFSETS = [-2.528, 78.335]
+Z_MIN = 100
+SETTINGS = {"Spraying Height": "5", "RZ Angle": "90"}
+
+
+def per_point_transformation(matrix, contours, x_offset, y_offset):
+    """applyTransformation as it was: one perspectiveTransform per contour, offsets point by point."""
+    result = []
+    for contour in contours:
+        points = cv2.perspectiveTransform(np.array(contour, dtype=np.float32).reshape(-1, 1, 2), matrix)
+        for i in range(points.shape[0]):
+            points[i, 0, 0] = points[i, 0, 0] + x_offset
+            points[i, 0, 1] = points[i, 0, 1] + y_offset
+        result.append(np.round(points, decimals=6).tolist())
+    return result
+
+
+def per_point_robot_path(contour, settings, workpiece_height, tolerance):
+    """WorkpieceToSprayPathsGenerator.contour_to_robot_path as it was (every point went through as its own contour)."""
+    points = np.array(contour, dtype=float).reshape(-1, 2).tolist()
+    transformed = per_point_transformation(CAMERA_TO_ROBOT, np.array(points, dtype=np.float32).reshape(-1, 1, 2),
+                                           *TRANSDUCER_OFFSETS)
+    z = Z_MIN + float(settings["Spraying Height"]) + int(workpiece_height)
+    path = [[float(p[0][0][0]), float(p[0][0][1]), z, 180.0, 0.0, float(settings["RZ Angle"])] for p in transformed]
+    return simplify_path(path, tolerance)
+
+
+def make_application():
+    robot_config = types.SimpleNamespace(safety_limits=types.SimpleNamespace(z_min=Z_MIN))
+    return types.SimpleNamespace(visionService=types.SimpleNamespace(cameraToRobotMatrix=CAMERA_TO_ROBOT),
+                                 robotService=types.SimpleNamespace(robot_config=robot_config),
+                                 get_transducer_offsets=lambda: TRANSDUCER_OFFSETS)
+
+
+def make_spiral(n, turns=5.0):
+    t = np.linspace(0, 2 * np.pi * turns, n)
+    r = 40 + 20 * t
+    return np.stack([640 + r * np.cos(t), 360 + r * np.sin(t)], axis=1).astype(np.float32).reshape(-1, 1, 2)
+
+
+class FakeWorkpiece:
+    def __init__(self, contour, spray_contours, fills, height=4):
+        self.contour = {"contour": contour, "settings": dict(SETTINGS)}
+        self.height = height
+        self.sprayPattern = {"Contour": [{"contour": c, "settings": dict(SETTINGS)} for c in spray_contours],
+                             "Fill": [{"contour": c, "settings": dict(SETTINGS)} for c in fills]}
+
+    def get_spray_pattern_contours(self):
+        return [{"contour": e["contour"].reshape(-1, 2), "settings": e["settings"]} for e in self.sprayPattern["Contour"]]
+
+    def get_spray_pattern_fills(self):
+        return [{"contour": e["contour"].reshape(-1, 2), "settings": e["settings"]} for e in self.sprayPattern["Fill"]]
+
+
+def test_segments_round_trip_as_views():
+    contours = [make_spiral(10), make_spiral(1), np.zeros((0, 1, 2), np.float32), make_spiral(5)]
+    points, offsets = batched_transform.concat_segments(contours)
+    assert offsets.tolist() == [0, 10, 11, 11, 16]
+    segments = batched_transform.split_segments(points, offsets)
+    assert [len(segment) for segment in segments] == [10, 1, 0, 5]
+    assert all(np.shares_memory(segment, points) for segment in segments if len(segment))
+
+
+@pytest.mark.parametrize("x_offset", [TRANSDUCER_OFFSETS[0], np.float64(1.234567)])
+def test_apply_transformation_matches_per_point_result(x_offset):
+    rng = np.random.default_rng(3)
+    contours = [rng.uniform(0, 1280, (n, 1, 2)).astype(np.float32) for n in (50, 1, 7)]
+    expected = per_point_transformation(CAMERA_TO_ROBOT, contours, x_offset, TRANSDUCER_OFFSETS[1])
+    assert utils.applyTransformation(CAMERA_TO_ROBOT, contours, x_offset=x_offset,
+                                     y_offset=TRANSDUCER_OFFSETS[1]) == expected
+    assert utils.applyTransformation(CAMERA_TO_ROBOT, contours, apply_transducer_offset=False) == \
+           per_point_transformation(CAMERA_TO_ROBOT, contours, 0.0, 0.0)
+
+
+@pytest.mark.parametrize("tolerance", [0.2, 0.0])
+def test_job_paths_match_per_point_generation(tolerance):
+    workpieces = [FakeWorkpiece(make_spiral(500), [make_spiral(2000), make_spiral(300)], [make_spiral(4000)]),
+                  FakeWorkpiece(make_spiral(800), [make_spiral(3000)], [], height=7)]
+    generator = WorkpieceToSprayPathsGenerator(make_application(), tolerance)
+
+    paths = generator.generate_robot_paths(workpieces)
+
+    expected = [per_point_robot_path(entry["contour"], entry["settings"], wp.height, tolerance)
+                for wp in workpieces
+                for entry in wp.get_spray_pattern_contours() + wp.get_spray_pattern_fills()]
+    assert [path for path, _ in paths] == expected
+    assert all(settings == SETTINGS for _, settings in paths)
+
+
+def test_main_contour_fallback_keeps_image_points():
+    workpiece = FakeWorkpiece(make_spiral(20), [], [])
+    paths = WorkpieceToSprayPathsGenerator(make_application(), 0.0).generate_robot_paths([workpiece])
+
+    (path, settings), = paths
+    assert settings == SETTINGS
+    assert path == [[float(x), float(y), Z_MIN + 5.0 + 4, 180.0, 0.0, 90.0]
+                    for x, y in make_spiral(20).reshape(-1, 2).tolist()]
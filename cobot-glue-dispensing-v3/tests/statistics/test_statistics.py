@@ -0,0 +1,48 @@
+"""
+Statistics facade: one StatsStore per process even when the first increments race.
+
+Run from src:  PYTHONPATH=. python -m pytest -q ../tests/statistics
+"""
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from modules import Statistics as statistics_module
+from modules.Statistics import Statistics, StatisticKey
+from modules.statistics.backend.StatsStore import StatsStore
+
+
+def test_concurrent_first_increments_share_one_store(tmp_path, monkeypatch):
+    created = []
+
+    class SlowStatsStore(StatsStore):
+        def __init__(self, db_path, **kwargs):
+            created.append(self)
+            time.sleep(0.05)  # widen the window between the None check and the assignment
+            super().__init__(db_path, flush_interval=3600, **kwargs)
+
+    monkeypatch.setattr(statistics_module, "StatsStore", SlowStatsStore)
+    monkeypatch.setattr(statistics_module, "STATISTICS_DB_PATH", str(tmp_path / "statistics.db"))
+    monkeypatch.setattr(statistics_module, "STATISTICS_PATH", str(tmp_path / "statistics.json"))
+    monkeypatch.setattr(Statistics, "_store", None)
+
+    start = threading.Barrier(8)
+
+    def increment():
+        start.wait()
+        Statistics.incrementGeneratorOnSeconds(1)
+
+    threads = [threading.Thread(target=increment) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    try:
+        assert len(created) == 1
+        assert Statistics.getGeneratorOnSeconds() == 8
+        assert Statistics.getStartedAt() is not None
+    finally:
+        Statistics._store.close()
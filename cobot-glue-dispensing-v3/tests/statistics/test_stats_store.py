@@ -0,0 +1,141 @@
+"""
+StatsStore: batched commits, crash safety, time-bucketed history and startup compaction.
+
+Run from src:  PYTHONPATH=. python -m pytest -q ../tests/statistics
+"""
+import json
+import shutil
+import sqlite3
+import types
+
+import pytest
+
+from modules.statistics.backend import StatsStore as stats_store_module
+from modules.statistics.backend.StatsPersistence import StatsPersistence
+from modules.statistics.backend.StatsStore import StatsStore
+
+NO_PERIODIC_FLUSH = 3600
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(stats_store_module, "time", types.SimpleNamespace(time=clock.time))
+    return clock
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "statistics.db")
+
+
+def test_increments_are_committed_in_batches(db_path):
+    store = StatsStore(db_path, flush_interval=NO_PERIODIC_FLUSH)
+    for _ in range(1000):
+        store.increment("generator_on_seconds", 0.5)
+
+    assert store.get("generator_on_seconds") == 500.0
+    assert store.commits == 0
+    store.flush()
+    store.flush()  # nothing new - no commit
+    assert store.commits == 1
+    store.close()
+
+    reopened = StatsStore(db_path, flush_interval=NO_PERIODIC_FLUSH)
+    assert reopened.get("generator_on_seconds") == 500.0
+    reopened.close()
+
+
+def test_power_cut_keeps_last_flushed_state(db_path, tmp_path):
+    store = StatsStore(db_path, flush_interval=NO_PERIODIC_FLUSH)
+    store.increment("pump_on_seconds/1", 10)
+    store.put_document("meta", {"started_at": "2025-01-01T00:00:00Z"})
+    store.flush()
+    store.increment("pump_on_seconds/1", 5)  # not flushed when the power goes
+
+    # The files as they are on disk at this moment, database and WAL
+    crashed = tmp_path / "crashed"
+    crashed.mkdir()
+    for suffix in ("", "-wal"):
+        shutil.copy(db_path + suffix, crashed / ("statistics.db" + suffix))
+    store.close()
+
+    recovered = StatsStore(str(crashed / "statistics.db"), flush_interval=NO_PERIODIC_FLUSH)
+    assert recovered.get("pump_on_seconds/1") == 10
+    assert recovered.get_document("meta") == {"started_at": "2025-01-01T00:00:00Z"}
+    recovered.close()
+
+
+def test_history_is_bucketed_by_time(db_path, clock):
+    store = StatsStore(db_path, flush_interval=NO_PERIODIC_FLUSH)
+    start = clock.now - clock.now % 3600
+    for offset, amount in ((0, 1), (30, 2), (70, 4), (3700, 8)):
+        clock.now = start + offset
+        store.increment("pump_1_glue_qty", amount)
+    store.set("pump_1_glue_qty", 0)  # a reset is not usage
+
+    assert store.history("pump_1_glue_qty", bucket_seconds=60) == [(start, 3.0), (start + 60, 4.0),
+                                                                    (start + 3660, 8.0)]
+    assert store.history("pump_1_glue_qty", bucket_seconds=3600) == [(start, 7.0), (start + 3600, 8.0)]
+    assert store.history("pump_1_glue_qty", start=start + 60, end=start + 3600, bucket_seconds=60) == \
+           [(start + 60, 4.0)]
+    assert store.get("pump_1_glue_qty") == 0
+    store.close()
+
+
+def test_startup_compacts_old_minute_buckets(db_path, clock):
+    day = 24 * 3600
+    store = StatsStore(db_path, flush_interval=NO_PERIODIC_FLUSH, compact_after=day)
+    start = clock.now - clock.now % 3600
+    for minute in range(120):  # two hours of per-minute usage
+        clock.now = start + minute * 60
+        store.increment("generator_on_seconds", 60)
+    store.close()
+
+    clock.now = start + 3 * day
+    reopened = StatsStore(db_path, flush_interval=NO_PERIODIC_FLUSH, compact_after=day)
+
+    assert reopened.history("generator_on_seconds", bucket_seconds=3600) == [(start, 3600.0), (start + 3600, 3600.0)]
+    assert reopened.get("generator_on_seconds") == 7200
+    reopened.close()
+    with sqlite3.connect(db_path) as db:
+        assert db.execute("SELECT COUNT(*) FROM history").fetchone()[0] == 2
+
+
+def test_clear_drops_counters_but_keeps_history(db_path):
+    store = StatsStore(db_path, flush_interval=NO_PERIODIC_FLUSH)
+    store.increment("generator_on_seconds", 5)
+    store.flush()
+    store.clear()
+    store.close()
+
+    reopened = StatsStore(db_path, flush_interval=NO_PERIODIC_FLUSH)
+    assert reopened.values() == {}
+    assert sum(total for _, total in reopened.history("generator_on_seconds")) == 5
+    reopened.close()
+
+
+def test_persistence_imports_json_files_and_records_usage(tmp_path):
+    (tmp_path / "generator.json").write_text(json.dumps({"name": "generator_on_seconds", "value": 12.0}))
+    persistence = StatsPersistence(str(tmp_path), flush_interval=NO_PERIODIC_FLUSH)
+
+    assert persistence.load("generator")["value"] == 12.0
+    assert persistence.load("fan", default_data={"name": "fan_on_seconds", "value": 0.0}) == \
+           {"name": "fan_on_seconds", "value": 0.0}
+    persistence.save("generator", {"name": "generator_on_seconds", "value": 13.0})
+    persistence.record("generator_on_seconds", 1.0)
+    persistence.close()
+
+    (tmp_path / "generator.json").unlink()
+    reopened = StatsPersistence(str(tmp_path), flush_interval=NO_PERIODIC_FLUSH)
+    assert reopened.load("generator")["value"] == 13.0
+    assert [total for _, total in reopened.history("generator_on_seconds")] == [1.0]
+    reopened.close()
@@ -0,0 +1,103 @@
+"""
+CorrectionEngine: the single remap table reproduces cv2.undistort + cv2.warpPerspective within
+interpolation tolerance, points map to the same place as the image, and the table is only
+rebuilt when the calibration changes.
+
+Run from src:  PYTHONPATH=. python -m pytest -q ../tests/vision_system
+"""
+import cv2
+import numpy as np
+import pytest
+
+from modules.VisionSystem.correction_engine import UNDISTORT_ALPHA, CorrectionEngine
+
+WIDTH, HEIGHT = 640, 480
+
+
+@pytest.fixture
+def calibration():
+    camera_matrix = np.array([[600.0, 0.0, 322.0], [0.0, 605.0, 236.0], [0.0, 0.0, 1.0]])
+    dist_coeffs = np.array([[-0.28, 0.09, 0.001, -0.0005, 0.0]])
+    source = np.float32([[60, 40], [580, 50], [600, 440], [40, 430]])
+    target = np.float32([[0, 0], [WIDTH, 0], [WIDTH, HEIGHT], [0, HEIGHT]])
+    perspective_matrix = cv2.getPerspectiveTransform(source, target)
+    return camera_matrix, dist_coeffs, perspective_matrix
+
+
+def synthetic_frame():
+    """Smooth gradients plus blurred shapes - sharp edges would only measure interpolation noise."""
+    y, x = np.mgrid[0:HEIGHT, 0:WIDTH].astype(np.float32)
+    frame = np.dstack([x / WIDTH * 200, y / HEIGHT * 200, (x + y) / (WIDTH + HEIGHT) * 200]).astype(np.uint8)
+    cv2.circle(frame, (200, 180), 70, (255, 255, 255), -1)
+    cv2.rectangle(frame, (380, 260), (540, 400), (30, 30, 30), -1)
+    return cv2.GaussianBlur(frame, (0, 0), 3)
+
+
+def reference_correction(frame, camera_matrix, dist_coeffs, perspective_matrix):
+    size = (WIDTH, HEIGHT)
+    new_camera_matrix, _ = cv2.getOptimalNewCameraMatrix(camera_matrix, dist_coeffs, size, UNDISTORT_ALPHA, size)
+    undistorted = cv2.undistort(frame, camera_matrix, dist_coeffs, None, new_camera_matrix)
+    if perspective_matrix is None:
+        return undistorted
+    return cv2.warpPerspective(undistorted, perspective_matrix, size)
+
+
+def valid_region(frame, margin=3):
+    """Pixels that are image content in both results, away from the black fill at the borders."""
+    inside = np.all(frame > 0, axis=2).astype(np.uint8)
+    return cv2.erode(inside, np.ones((2 * margin + 1, 2 * margin + 1), np.uint8)).astype(bool)
+
+
+@pytest.mark.parametrize("with_perspective", [False, True])
+def test_remap_matches_undistort_and_warp(calibration, with_perspective):
+    camera_matrix, dist_coeffs, perspective_matrix = calibration
+    perspective_matrix = perspective_matrix if with_perspective else None
+    frame = synthetic_frame()
+
+    corrected = CorrectionEngine().correct(frame, camera_matrix, dist_coeffs, perspective_matrix, WIDTH, HEIGHT)
+    expected = reference_correction(frame, camera_matrix, dist_coeffs, perspective_matrix)
+
+    assert corrected.shape == expected.shape
+    region = valid_region(corrected) & valid_region(expected)
+    assert region.mean() > 0.8
+    difference = np.abs(corrected.astype(np.int16) - expected.astype(np.int16))[region]
+    assert difference.mean() < 0.5
+    assert np.percentile(difference, 99.9) <= 3
+
+
+def test_points_land_where_the_image_content_lands(calibration):
+    camera_matrix, dist_coeffs, perspective_matrix = calibration
+    frame = np.zeros((HEIGHT, WIDTH), np.uint8)
+    raw_point = (150.0, 120.0)
+    cv2.circle(frame, (int(raw_point[0]), int(raw_point[1])), 4, 255, -1)
+    engine = CorrectionEngine()
+
+    corrected = engine.correct(frame, camera_matrix, dist_coeffs, perspective_matrix, WIDTH, HEIGHT)
+    mapped = engine.correct_points([raw_point], camera_matrix, dist_coeffs, perspective_matrix, WIDTH, HEIGHT)
+
+    moments = cv2.moments(corrected)
+    centroid = (moments["m10"] / moments["m00"], moments["m01"] / moments["m00"])
+    assert mapped.shape == (1, 1, 2)
+    assert np.hypot(*(mapped[0, 0] - centroid)) < 1.5
+
+
+def test_table_is_rebuilt_only_when_the_calibration_changes(calibration, monkeypatch):
+    camera_matrix, dist_coeffs, perspective_matrix = calibration
+    engine = CorrectionEngine()
+    builds = []
+    original_build = engine.build
+    monkeypatch.setattr(engine, "build", lambda *args: builds.append(args) or original_build(*args))
+    frame = synthetic_frame()
+
+    for _ in range(3):
+        engine.correct(frame, camera_matrix, dist_coeffs, perspective_matrix, WIDTH, HEIGHT)
+    assert len(builds) == 1
+
+    engine.correct(frame, camera_matrix.copy(), dist_coeffs, perspective_matrix, WIDTH, HEIGHT)
+    engine.correct(frame, camera_matrix, dist_coeffs, perspective_matrix, WIDTH // 2, HEIGHT // 2)
+    assert len(builds) == 3
+
+    engine.invalidate()
+    assert not engine.is_ready()
+    engine.correct(frame, camera_matrix, dist_coeffs, perspective_matrix, WIDTH, HEIGHT)
+    assert len(builds) == 4
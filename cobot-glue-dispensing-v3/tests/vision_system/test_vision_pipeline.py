@@ -0,0 +1,176 @@
+"""
+VisionPipeline against a fake vision system: frames come out in capture order, a slow stage
+drops the oldest frames instead of stalling capture, a failing frame does not stop the
+pipeline, and stop() ends every worker thread.
+
+Run from src:  PYTHONPATH=. python -m pytest -q ../tests/vision_system
+"""
+import threading
+import time
+
+import pytest
+
+from modules.VisionSystem import vision_pipeline
+from modules.VisionSystem.vision_pipeline import DropOldestQueue, VisionPipeline
+
+TIMEOUT = 2.0
+FRAME_PERIOD = 0.001
+
+
+class FakeCamera:
+    """Returns increasing frame numbers, one every FRAME_PERIOD."""
+
+    def __init__(self):
+        self.captured = 0
+
+    def capture(self):
+        time.sleep(FRAME_PERIOD)
+        self.captured += 1
+        return self.captured
+
+
+class FakeCameraSettings:
+    def __init__(self, contour_detection=False):
+        self.contour_detection = contour_detection
+
+    def get_skip_frames(self):
+        return 0
+
+    def get_brightness_auto(self):
+        return False
+
+    def get_contour_detection(self):
+        return self.contour_detection
+
+
+class FakeStateManager:
+    def update_state(self, state):
+        pass
+
+
+class FakeVisionSystem:
+    def __init__(self, correct_delay=0.0, contour_detection=False):
+        self.camera = FakeCamera()
+        self.camera_settings = FakeCameraSettings(contour_detection)
+        self.state_manager = FakeStateManager()
+        self.current_skip_frames = 0
+        self.rawMode = False
+        self.correct_delay = correct_delay
+
+    def correctImage(self, image):
+        if self.correct_delay:
+            time.sleep(self.correct_delay)
+        return image
+
+
+class ResultCollector:
+    def __init__(self, wanted):
+        self.wanted = wanted
+        self.results = []  # (contours, frame, capture_time)
+        self.done = threading.Event()
+
+    def __call__(self, contours, frame, capture_time):
+        self.results.append((contours, frame, capture_time))
+        if len(self.results) >= self.wanted:
+            self.done.set()
+
+    @property
+    def frames(self):
+        return [frame for _, frame, _ in self.results]
+
+
+@pytest.fixture
+def run_pipeline():
+    pipelines = []
+
+    def run(vision_system, wanted):
+        collector = ResultCollector(wanted)
+        pipeline = VisionPipeline(vision_system, on_result=collector)
+        pipelines.append(pipeline)
+        pipeline.start()
+        assert collector.done.wait(TIMEOUT)
+        pipeline.stop()
+        return pipeline, collector
+
+    yield run
+    for pipeline in pipelines:
+        pipeline.stop()
+
+
+def test_drop_oldest_queue_keeps_the_newest_items():
+    queue = DropOldestQueue(2)
+    for i in range(5):
+        queue.put(i)
+
+    assert queue.dropped == 3
+    assert [queue.get(timeout=0), queue.get(timeout=0)] == [3, 4]
+    assert queue.get(timeout=0.01) is None
+
+
+def test_frames_are_delivered_in_capture_order(run_pipeline):
+    vision_system = FakeVisionSystem()
+
+    pipeline, collector = run_pipeline(vision_system, wanted=50)
+
+    frames = collector.frames
+    capture_times = [capture_time for _, _, capture_time in collector.results]
+    assert all(a < b for a, b in zip(frames, frames[1:]))
+    assert all(a < b for a, b in zip(capture_times, capture_times[1:]))
+    assert vision_system.image == vision_system.rawImage  # exposed like the sequential loop
+    assert pipeline.get_stats()["total"]["frames"] == len(frames)
+
+
+def test_slow_stage_drops_the_oldest_frames_instead_of_stalling_capture(run_pipeline):
+    vision_system = FakeVisionSystem(correct_delay=10 * FRAME_PERIOD)
+
+    pipeline, collector = run_pipeline(vision_system, wanted=10)
+
+    stats = pipeline.get_stats()
+    assert stats["dropped"]["correct"] > 0
+    # Capture kept running at its own pace while correction lagged behind
+    assert vision_system.camera.captured > 3 * len(collector.results)
+    frames = collector.frames
+    assert all(a < b for a, b in zip(frames, frames[1:]))
+    # Frames captured while correction was busy were skipped, not delivered late
+    assert max(b - a for a, b in zip(frames, frames[1:])) > 1
+
+
+def test_failing_frame_is_skipped_and_the_pipeline_continues(run_pipeline, monkeypatch):
+    def prepare(vs, image):
+        return image, False
+
+    def detect(vs, image, correct_points_only):
+        if image == 5:
+            raise RuntimeError("detection failed")
+        return [f"contour {image}"], image, None
+
+    monkeypatch.setattr(vision_pipeline, "prepare_detection_image", prepare)
+    monkeypatch.setattr(vision_pipeline, "detect_contours_in_image", detect)
+    vision_system = FakeVisionSystem(contour_detection=True)
+
+    _, collector = run_pipeline(vision_system, wanted=20)
+
+    assert 5 not in collector.frames
+    assert all(contours == [f"contour {frame}"] for contours, frame, _ in collector.results)
+
+
+def test_stop_ends_every_worker_thread():
+    collector = ResultCollector(wanted=5)
+    pipeline = VisionPipeline(FakeVisionSystem(), on_result=collector)
+    pipeline.start()
+    threads = list(pipeline._threads)
+    assert collector.done.wait(TIMEOUT)
+    assert pipeline.is_running()
+
+    pipeline.stop(timeout=TIMEOUT)
+
+    assert not pipeline.is_running()
+    assert not any(thread.is_alive() for thread in threads)
+    delivered = len(collector.results)
+    time.sleep(20 * FRAME_PERIOD)
+    assert len(collector.results) == delivered
+    # join() returns right away once stopped
+    joiner = threading.Thread(target=pipeline.join)
+    joiner.start()
+    joiner.join(TIMEOUT)
+    assert not joiner.is_alive()
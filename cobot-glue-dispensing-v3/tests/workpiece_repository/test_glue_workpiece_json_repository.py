@@ -0,0 +1,131 @@
+"""
+GlueWorkpieceJsonRepository: manifest index, lazy geometry loading and mtime refresh.
+
+Run from src:  PYTHONPATH=. python -m pytest -q ../tests/workpiece_repository
+"""
+import json
+import os
+
+import numpy as np
+import pytest
+
+from applications.glue_dispensing_application.model.workpiece.GlueWorkpiece import GlueWorkpiece
+from applications.glue_dispensing_application.repositories.workpiece.glue_workpiece_json_repository import \
+    GlueWorkpieceJsonRepository
+from applications.glue_dispensing_application.repositories.workpiece.workpiece_index import MANIFEST_FILE
+from modules.contour_matching.matching.descriptor_cache import get_descriptor_cache
+from modules.shared.tools.GlueCell import GlueType
+from modules.shared.tools.enums.Gripper import Gripper
+from modules.shared.tools.enums.Program import Program
+from modules.shared.tools.enums.ToolID import ToolID
+
+
+def make_ring(n, radius, center=(640.0, 360.0)):
+    t = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    points = np.stack([center[0] + radius * np.cos(t), center[1] + radius * np.sin(t)], axis=1)
+    return points.astype(np.float32).reshape(-1, 1, 2)
+
+
+def make_workpiece(workpiece_id, radius=100.0):
+    settings = {"glue_speed": 10}
+    return GlueWorkpiece(workpieceId=str(workpiece_id), name=f"wp{workpiece_id}", description="synthetic",
+                         toolID=ToolID.Tool0, gripperID=Gripper.BELT, glueType=GlueType.TypeA,
+                         program=Program.TRACE, material="wood",
+                         contour={"contour": make_ring(64, radius), "settings": dict(settings)},
+                         offset=0, height=4, nozzles=[1], contourArea=0, glueQty=1, sprayWidth=5,
+                         pickupPoint=None,
+                         sprayPattern={"Contour": [{"contour": make_ring(64, radius - 10), "settings": settings}],
+                                       "Fill": []})
+
+
+@pytest.fixture
+def deserialize_calls(monkeypatch):
+    calls = []
+    original = GlueWorkpiece.deserialize
+
+    def counting_deserialize(data):
+        calls.append(data["workpieceId"])
+        return original(data)
+
+    monkeypatch.setattr(GlueWorkpiece, "deserialize", staticmethod(counting_deserialize))
+    yield calls
+    get_descriptor_cache().clear()
+
+
+def open_repository(directory):
+    return GlueWorkpieceJsonRepository(str(directory), [], GlueWorkpiece)
+
+
+def test_startup_reads_the_index_not_the_geometry(tmp_path, deserialize_calls):
+    repository = open_repository(tmp_path)
+    for i in range(5):
+        assert repository.save_workpiece(make_workpiece(i, radius=50.0 + i))[0]
+
+    reopened = open_repository(tmp_path)
+    assert deserialize_calls == []
+    summaries = {entry.workpiece_id: entry for entry in reopened.get_summaries()}
+    assert sorted(summaries) == ["0", "1", "2", "3", "4"]
+    assert summaries["2"].name == "wp2"
+    assert summaries["2"].bounds == pytest.approx([588.0, 308.0, 692.0, 412.0], abs=0.01)
+
+    workpiece = reopened.get_workpiece_by_id(2)
+    assert workpiece.name == "wp2"
+    assert reopened.get_workpiece_by_id("2") is workpiece
+    assert reopened.get_workpiece_by_id("missing") is None
+    assert deserialize_calls == ["2"]
+    assert [wp.workpieceId for wp in reopened.data] == ["0", "1", "2", "3", "4"]
+    assert sorted(deserialize_calls) == ["0", "1", "2", "3", "4"]
+
+
+def test_unchanged_files_are_not_reread_on_startup(tmp_path, deserialize_calls):
+    repository = open_repository(tmp_path)
+    repository.save_workpiece(make_workpiece("a"))
+    repository.save_workpiece(make_workpiece("b"))
+
+    assert open_repository(tmp_path).index.load() == 0
+
+    # A file copied in by hand is picked up on the next start
+    extra_dir = tmp_path / "2024-01-01" / "2024-01-01_00-00-00-000000"
+    extra_dir.mkdir(parents=True)
+    (extra_dir / "2024-01-01_00-00-00-000000_workpiece.json").write_text(
+        json.dumps(GlueWorkpiece.serialize(make_workpiece("c"))))
+    reopened = open_repository(tmp_path)
+    assert reopened.get_workpiece_by_id("c").name == "wpc"
+    assert len(reopened.get_summaries()) == 3
+
+
+def test_changed_file_is_reloaded(tmp_path, deserialize_calls):
+    repository = open_repository(tmp_path)
+    repository.save_workpiece(make_workpiece("a"))
+    reopened = open_repository(tmp_path)
+    assert reopened.get_workpiece_by_id("a").name == "wpa"
+
+    path = reopened.index.absolute_path(reopened.index.get("a"))
+    with open(path) as f:
+        data = json.load(f)
+    data["name"] = "renamed by hand"
+    with open(path, "w") as f:
+        json.dump(data, f)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert reopened.get_workpiece_by_id("a").name == "renamed by hand"
+    assert reopened.index.get("a").name == "renamed by hand"
+
+
+def test_update_overwrites_in_place_and_delete_removes_folder(tmp_path, deserialize_calls):
+    repository = open_repository(tmp_path)
+    repository.save_workpiece(make_workpiece("a"))
+    path = repository.index.absolute_path(repository.index.get("a"))
+
+    updated = make_workpiece("a", radius=20.0)
+    assert repository.save_workpiece(updated) == (True, "Workpiece updated successfully")
+    assert repository.index.absolute_path(repository.index.get("a")) == path
+    assert repository.get_workpiece_by_id("a") is updated
+
+    assert repository.delete_workpiece_by_id("a") == (True, "Workpiece 'a' deleted successfully.")
+    assert not os.path.exists(os.path.dirname(path))
+    assert repository.deleteWorkpiece("a")[0] is False
+    reopened = open_repository(tmp_path)
+    assert reopened.get_summaries() == []
+    assert os.listdir(tmp_path) == [MANIFEST_FILE]
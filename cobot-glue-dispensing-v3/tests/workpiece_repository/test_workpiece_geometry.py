@@ -0,0 +1,110 @@
+"""
+Binary workpiece geometry: pack/unpack round trip, repository sidecar files and the migration tool.
+
+Run from src:  PYTHONPATH=. python -m pytest -q ../tests/workpiece_repository
+"""
+import json
+import os
+
+import numpy as np
+import pytest
+
+from applications.glue_dispensing_application.model.workpiece.GlueWorkpiece import GlueWorkpiece
+from applications.glue_dispensing_application.model.workpiece.workpiece_geometry import GEOMETRY_SUFFIX, \
+    is_packed, unpack_geometry
+from applications.glue_dispensing_application.repositories.workpiece import migrate_workpiece_geometry
+from applications.glue_dispensing_application.repositories.workpiece.glue_workpiece_json_repository import \
+    GlueWorkpieceJsonRepository
+from modules.contour_matching.matching.descriptor_cache import get_descriptor_cache
+from modules.shared.tools.GlueCell import GlueType
+from modules.shared.tools.enums.Gripper import Gripper
+from modules.shared.tools.enums.Program import Program
+from modules.shared.tools.enums.ToolID import ToolID
+
+
+def make_ring(n, radius, center=(640.0, 360.0)):
+    t = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    points = np.stack([center[0] + radius * np.cos(t), center[1] + radius * np.sin(t)], axis=1)
+    return points.astype(np.float32).reshape(-1, 1, 2)
+
+
+def make_workpiece(workpiece_id):
+    settings = {"glue_speed": 10, "spraying_height": 5}
+    return GlueWorkpiece(workpieceId=str(workpiece_id), name=f"wp{workpiece_id}", description="synthetic",
+                         toolID=ToolID.Tool0, gripperID=Gripper.BELT, glueType=GlueType.TypeA,
+                         program=Program.TRACE, material="wood",
+                         contour={"contour": make_ring(200, 160.123), "settings": dict(settings)},
+                         offset=0, height=4, nozzles=[1], contourArea=0, glueQty=1, sprayWidth=5,
+                         pickupPoint="640.0,360.0",
+                         sprayPattern={
+                             "Contour": [{"contour": make_ring(300, 150 - i), "settings": dict(settings)}
+                                         for i in range(3)],
+                             "Fill": [{"contour": make_ring(1000, 80), "settings": dict(settings)},
+                                      {"contour": np.array([[1.5, 2.5]], dtype=np.float32), "settings": {}}],
+                         })
+
+
+@pytest.fixture(autouse=True)
+def clear_descriptor_cache():
+    yield
+    get_descriptor_cache().clear()
+
+
+def test_packed_round_trip_is_lossless_and_returns_views():
+    workpiece = make_workpiece(1)
+    packed, blob = GlueWorkpiece.serialize_packed(workpiece, "1" + GEOMETRY_SUFFIX)
+    json.dumps(packed)  # metadata only, JSON-ready
+    assert blob.dtype == np.float32 and blob.shape == (200 + 900 + 1000 + 1, 2)
+
+    loaded = GlueWorkpiece.deserialize(unpack_geometry(json.loads(json.dumps(packed)), blob))
+    assert GlueWorkpiece.serialize(loaded) == GlueWorkpiece.serialize(workpiece)
+    assert np.shares_memory(loaded.get_main_contour(), blob)
+    fills = loaded.get_spray_pattern_fills()
+    assert all(np.shares_memory(entry["contour"], blob) for entry in fills)
+    assert fills[1]["contour"].tolist() == [[1.5, 2.5]]
+    # JSON-loaded float32 points are not copied either
+    from_json = GlueWorkpiece.deserialize(json.loads(json.dumps(GlueWorkpiece.serialize(workpiece))))
+    stored = from_json.sprayPattern["Contour"][0]["contour"]
+    assert np.shares_memory(from_json.get_spray_pattern_contours()[0]["contour"], stored)
+
+
+def test_repository_writes_and_reads_geometry_sidecar(tmp_path):
+    repository = GlueWorkpieceJsonRepository(str(tmp_path), [], GlueWorkpiece, binary_geometry=True)
+    workpiece = make_workpiece("a")
+    repository.save_workpiece(workpiece)
+    json_path = repository.index.absolute_path(repository.index.get("a"))
+    geometry_path = json_path[:-len(".json")] + GEOMETRY_SUFFIX
+    with open(json_path) as f:
+        assert is_packed(json.load(f))
+    assert os.path.exists(geometry_path)
+    assert repository.index.get("a").bounds == pytest.approx([479.877, 199.877, 800.123, 520.123], abs=0.01)
+
+    reopened = GlueWorkpieceJsonRepository(str(tmp_path), [], GlueWorkpiece)
+    assert GlueWorkpiece.serialize(reopened.get_workpiece_by_id("a")) == GlueWorkpiece.serialize(workpiece)
+
+    # Saving without binary geometry inlines the points again and drops the sidecar
+    reopened.save_workpiece(reopened.get_workpiece_by_id("a"))
+    assert not os.path.exists(geometry_path)
+    with open(json_path) as f:
+        assert not is_packed(json.load(f))
+
+
+def test_migration_tool_converts_both_ways(tmp_path):
+    repository = GlueWorkpieceJsonRepository(str(tmp_path), [], GlueWorkpiece)
+    for i in range(3):
+        repository.save_workpiece(make_workpiece(i))
+    expected = {str(i): GlueWorkpiece.serialize(make_workpiece(i)) for i in range(3)}
+
+    assert migrate_workpiece_geometry.migrate_directory(str(tmp_path), dry_run=True)[:3] == (3, 0, 0)
+    converted, skipped, failed, before, after = migrate_workpiece_geometry.migrate_directory(str(tmp_path))
+    assert (converted, skipped, failed) == (3, 0, 0)
+    assert after < before / 5
+    assert migrate_workpiece_geometry.migrate_directory(str(tmp_path))[:3] == (0, 3, 0)
+
+    binary = GlueWorkpieceJsonRepository(str(tmp_path), [], GlueWorkpiece)
+    assert {wp.workpieceId: GlueWorkpiece.serialize(wp) for wp in binary.data} == expected
+
+    assert migrate_workpiece_geometry.migrate_directory(str(tmp_path), "json")[:3] == (3, 0, 0)
+    assert not [file for _, _, files in os.walk(tmp_path) for file in files if file.endswith(GEOMETRY_SUFFIX)]
+    inline = GlueWorkpieceJsonRepository(str(tmp_path), [], GlueWorkpiece)
+    assert {wp.workpieceId: GlueWorkpiece.serialize(wp) for wp in inline.data} == expected